@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build or update a SQLite design catalogue.
+
+Ingests design JSON files (the same format overstand-cli reads) into the
+catalogue and recomputes rows stored by an older engine version.
+
+Usage:
+    python3 scripts/build_catalogue.py designs.db designs/ more_designs/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from design_catalogue import DesignCatalogue
+
+
+def build_catalogue(db_path, paths):
+    """Ingest paths into the catalogue at db_path and bring it up to date"""
+    with DesignCatalogue(db_path) as catalogue:
+        result = catalogue.ingest(paths)
+        recomputed = catalogue.recompute()
+
+        for error in result['errors']:
+            print(f"⚠ {error['path']}: {error['error']}")
+        print(f"✓ Ingested: {result['ingested']}")
+        print(f"✓ Unchanged: {result['skipped']}")
+        print(f"✓ Recomputed for engine update: {recomputed}")
+        print(f"✓ Total designs: {len(catalogue)}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+
+    build_catalogue(sys.argv[1], sys.argv[2:])
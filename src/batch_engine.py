@@ -0,0 +1,455 @@
+"""
+Overstand - Batch Geometry Engine
+
+Vectorized (NumPy) counterpart of instrument_geometry.calculate_derived_values.
+
+Instead of one params dict, the batch engine takes a struct-of-arrays: one
+array per parameter key, where row i of every array describes design i.
+Scalars are broadcast across all rows, so a single design can be varied along
+one axis with e.g. {**params, 'overstand': np.linspace(5, 15, 1000)}.
+
+The VIOLIN/VIOL/GUITAR_MANDOLIN branches of the scalar path are evaluated with
+masks. Every formula mirrors geometry_engine, including its fallbacks for
+missing values, so results match the scalar path to within float tolerance.
+
+Conventions:
+- A NaN entry in an input column means "not provided" and takes the same
+  fallback the scalar path uses for a missing key.
+- Rows the scalar path would reject (division by zero, impossible guitar
+  geometry, fret index out of range) come back as NaN in every output.
+- Keys the scalar path only emits for one family (e.g. break_start_x for
+  viols) are NaN in rows of the other families.
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Optional
+from constants import (
+    DEFAULT_FINGERBOARD_RADIUS,
+    DEFAULT_FB_VISIBLE_HEIGHT_AT_NUT,
+    DEFAULT_FB_VISIBLE_HEIGHT_AT_JOIN,
+    DEFAULT_FB_WIDTH_AT_NUT,
+    DEFAULT_FB_WIDTH_AT_END,
+    DEFAULT_FRETS_VIOL,
+    DEFAULT_FRETS_GUITAR,
+    DEFAULT_FRETS_VIOLIN,
+    EPSILON
+)
+from parameter_registry import InstrumentFamily
+from bezier import evaluate_cubic_bezier_batch, find_t_for_coordinate_batch
+import fret_kernel
+
+
+VIOLIN = InstrumentFamily.VIOLIN.name
+VIOL = InstrumentFamily.VIOL.name
+GUITAR_MANDOLIN = InstrumentFamily.GUITAR_MANDOLIN.name
+
+
+# ============================================================================
+# Input Handling
+# ============================================================================
+
+def _is_array_like(value: Any) -> bool:
+    return isinstance(value, (list, tuple, np.ndarray))
+
+
+def infer_batch_size(columns: Dict[str, Any]) -> int:
+    """
+    Infer the number of rows from the array-valued columns.
+
+    All array-valued columns must have the same length. If every column is a
+    scalar, the batch has a single row.
+    """
+    size = None
+    for key, value in columns.items():
+        if not _is_array_like(value):
+            continue
+        length = len(value)
+        if size is None:
+            size = length
+        elif length != size:
+            raise ValueError(f"Column '{key}' has {length} rows, expected {size}")
+    return 1 if size is None else size
+
+
+def _column(columns: Dict[str, Any], key: str, n: int) -> Optional[np.ndarray]:
+    """Return a float column of length n, or None if the key is absent."""
+    value = columns.get(key)
+    if value is None:
+        return None
+    if _is_array_like(value):
+        arr = np.array([np.nan if v is None else v for v in value], dtype=float) \
+            if not isinstance(value, np.ndarray) else value.astype(float)
+        return arr
+    return np.full(n, float(value))
+
+
+def _get(columns: Dict[str, Any], key: str, default: float, n: int) -> np.ndarray:
+    """Vector equivalent of params.get(key, default)."""
+    arr = _column(columns, key, n)
+    if arr is None:
+        return np.full(n, float(default))
+    return np.where(np.isnan(arr), default, arr)
+
+
+def _get_or(columns: Dict[str, Any], key: str, default: float, n: int) -> np.ndarray:
+    """Vector equivalent of params.get(key) or default (zero also falls back)."""
+    arr = _get(columns, key, default, n)
+    return np.where(arr == 0, default, arr)
+
+
+def _family_column(columns: Dict[str, Any], n: int) -> np.ndarray:
+    """Resolve instrument_family to an array of enum names."""
+    value = columns.get('instrument_family')
+    if _is_array_like(value):
+        families = np.array([v or VIOLIN for v in value], dtype=object)
+    else:
+        families = np.full(n, value or VIOLIN, dtype=object)
+
+    valid = (families == VIOLIN) | (families == VIOL) | (families == GUITAR_MANDOLIN)
+    if not np.all(valid):
+        bad = sorted(set(families[~valid].tolist()))
+        raise ValueError(f"Invalid calculation mode: {bad}")
+    return families
+
+
+def columns_from_params(params_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convert a list of params dicts into struct-of-arrays columns.
+
+    Numeric keys become float arrays with NaN where a dict lacks the key;
+    instrument_family becomes an object array of names. Other non-numeric
+    keys (instrument_name, show_measurements, ...) are not needed by the
+    engine and are dropped.
+    """
+    keys = []
+    for params in params_list:
+        for key in params:
+            if key not in keys:
+                keys.append(key)
+
+    columns: Dict[str, Any] = {}
+    for key in keys:
+        values = [params.get(key) for params in params_list]
+        if key == 'instrument_family':
+            columns[key] = np.array(values, dtype=object)
+            continue
+        if any(isinstance(v, (str, bool)) for v in values):
+            continue
+        columns[key] = np.array([np.nan if v is None else v for v in values], dtype=float)
+    return columns
+
+
+# ============================================================================
+# Vectorized Stages
+# ============================================================================
+
+def _sagitta(radius: np.ndarray, width: np.ndarray) -> np.ndarray:
+    """Vector equivalent of geometry_engine.calculate_sagitta."""
+    half_width = width / 2.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        approx = width ** 2 / (8.0 * radius)
+        exact = radius - np.sqrt(np.maximum(radius ** 2 - half_width ** 2, 0.0))
+    result = np.where(half_width >= radius, approx, exact)
+    return np.where((radius <= 0) | (width <= 0), 0.0, result)
+
+
+def _neck_block_max_width(columns: Dict[str, Any], families: np.ndarray, n: int) -> np.ndarray:
+    """Vector equivalent of calculate_cross_section_geometry's neck_block_max_width."""
+    rib_height = _get(columns, 'rib_height', 35.0, n)
+    top_block_height = _get(columns, 'top_block_height', np.nan, n)
+    block_height = np.where((families == VIOL) & ~np.isnan(top_block_height),
+                            top_block_height, rib_height)
+
+    button_width = _get(columns, 'button_width_at_join', 28.0, n)
+    neck_width_at_ribs = _get(columns, 'neck_width_at_top_of_ribs', 30.0, n)
+    overstand = _get(columns, 'overstand', 6.0, n)
+
+    fb_width_at_nut = _get(columns, 'fingerboard_width_at_nut', DEFAULT_FB_WIDTH_AT_NUT, n)
+    fb_width_at_end = _get(columns, 'fingerboard_width_at_end', DEFAULT_FB_WIDTH_AT_END, n)
+    fingerboard_length = _get(columns, 'fingerboard_length', 270.0, n)
+    fingerboard_radius = _get(columns, 'fingerboard_radius', DEFAULT_FINGERBOARD_RADIUS, n)
+    fb_visible_height_at_join = _get(columns, 'fb_visible_height_at_join', DEFAULT_FB_VISIBLE_HEIGHT_AT_JOIN, n)
+
+    vsl = _get(columns, 'vsl', 330.0, n)
+    body_stop = _get(columns, 'body_stop', 195.0, n)
+    neck_stop = vsl - body_stop
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        position_ratio = np.where(fingerboard_length > 0,
+                                  np.minimum(neck_stop / fingerboard_length, 1.0), 0.0)
+    fb_width_at_body_join = fb_width_at_nut + (fb_width_at_end - fb_width_at_nut) * position_ratio
+
+    sagitta_at_join = _sagitta(fingerboard_radius, fb_width_at_body_join)
+    fb_thickness_at_join = fb_visible_height_at_join + sagitta_at_join
+
+    y_button = 0.0
+    y_top_of_block = block_height
+    y_fb_bottom = block_height + overstand
+
+    half_button_width = button_width / 2.0
+    half_neck_width_at_ribs = neck_width_at_ribs / 2.0
+    half_fb_width = fb_width_at_body_join / 2.0
+
+    fb_blend_percent = _get(columns, 'fb_blend_percent', 0.0, n)
+    fb_visible_height = fb_thickness_at_join - sagitta_at_join
+
+    # Blend curve control points (see geometry_engine.calculate_blend_curve)
+    p0 = (half_neck_width_at_ribs, y_top_of_block)
+    curve_end_y = y_fb_bottom + (fb_blend_percent / 100.0) * fb_visible_height
+    p3 = (half_fb_width, curve_end_y)
+
+    dx_straight = half_neck_width_at_ribs - half_button_width
+    dy_straight = y_top_of_block - y_button
+    curve_length = np.sqrt((p3[0] - p0[0]) ** 2 + (p3[1] - p0[1]) ** 2)
+    t1 = curve_length / 3.0
+    t2 = curve_length / 3.0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        tangent_length = np.sqrt(dx_straight * dx_straight + dy_straight * dy_straight)
+        has_tangent = dx_straight > EPSILON
+        cp1 = (np.where(has_tangent, p0[0] + t1 * dx_straight / tangent_length, p0[0] + t1 * 0.1),
+               np.where(has_tangent, p0[1] + t1 * dy_straight / tangent_length, p0[1] + t1))
+    cp2 = (p3[0], p3[1] - t2)
+
+    with np.errstate(invalid='ignore'):
+        t = find_t_for_coordinate_batch(p0, cp1, cp2, p3, y_fb_bottom)
+        x_at_fb_bottom, _ = evaluate_cubic_bezier_batch(p0, cp1, cp2, p3, t)
+
+    blend_width = np.select(
+        [fb_blend_percent < EPSILON, y_fb_bottom <= y_top_of_block, y_fb_bottom >= curve_end_y],
+        [half_fb_width * 2, half_neck_width_at_ribs * 2, half_fb_width * 2],
+        default=x_at_fb_bottom * 2
+    )
+    return np.where(half_fb_width > half_neck_width_at_ribs, blend_width, fb_width_at_body_join)
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+def calculate_derived_values_batch(columns: Dict[str, Any], size: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Calculate derived values for many parameter sets at once.
+
+    Args:
+        columns: Struct-of-arrays input, one array (or broadcast scalar) per
+                 parameter key. instrument_family may be a name or an array
+                 of names.
+        size: Number of rows. Inferred from the array columns if omitted.
+
+    Returns:
+        Dictionary with the same keys as calculate_derived_values, each
+        mapped to a float array of length size.
+    """
+    n = size if size is not None else infer_batch_size(columns)
+    families = _family_column(columns, n)
+    is_viol = families == VIOL
+    is_guitar = families == GUITAR_MANDOLIN
+    is_bowed = ~is_guitar
+
+    invalid = np.zeros(n, dtype=bool)
+    derived: Dict[str, np.ndarray] = {}
+
+    vsl = _get_or(columns, 'vsl', 0, n)
+    arching_height = _get_or(columns, 'arching_height', 0, n)
+    bridge_height = _get_or(columns, 'bridge_height', 0, n)
+    overstand = _get_or(columns, 'overstand', 0, n)
+    string_height_nut = _get_or(columns, 'string_height_nut', 0, n)
+    fingerboard_length = _get_or(columns, 'fingerboard_length', 0, n)
+
+    # Fingerboard thickness
+    fingerboard_radius = _get_or(columns, 'fingerboard_radius', DEFAULT_FINGERBOARD_RADIUS, n)
+    fb_visible_height_at_nut = _get_or(columns, 'fb_visible_height_at_nut', DEFAULT_FB_VISIBLE_HEIGHT_AT_NUT, n)
+    fb_visible_height_at_join = _get_or(columns, 'fb_visible_height_at_join', DEFAULT_FB_VISIBLE_HEIGHT_AT_JOIN, n)
+    fb_width_at_nut = _get_or(columns, 'fingerboard_width_at_nut', DEFAULT_FB_WIDTH_AT_NUT, n)
+    fb_width_at_join = _get_or(columns, 'fingerboard_width_at_end', DEFAULT_FB_WIDTH_AT_END, n)
+
+    sagitta_at_nut = _sagitta(fingerboard_radius, fb_width_at_nut)
+    sagitta_at_join = _sagitta(fingerboard_radius, fb_width_at_join)
+    fb_thickness_at_nut = fb_visible_height_at_nut + sagitta_at_nut
+    fb_thickness_at_join = fb_visible_height_at_join + sagitta_at_join
+
+    derived['sagitta_at_nut'] = sagitta_at_nut
+    derived['sagitta_at_join'] = sagitta_at_join
+    derived['fb_thickness_at_nut'] = fb_thickness_at_nut
+    derived['fb_thickness_at_join'] = fb_thickness_at_join
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        # String angles - VIOLIN/VIOL (body stop driven)
+        body_stop_in = _get_or(columns, 'body_stop', 0, n)
+        string_height_eof = _get_or(columns, 'string_height_eof', 0, n)
+
+        v_height_at_join = (string_height_eof - string_height_nut) * ((vsl - body_stop_in) / fingerboard_length) + string_height_nut
+        v_opposite = arching_height + bridge_height - overstand - fb_thickness_at_join - v_height_at_join
+        v_angle_rad = np.arctan(v_opposite / body_stop_in)
+        v_string_to_join = np.sqrt(v_opposite ** 2 + body_stop_in ** 2)
+        v_neck_stop = np.cos(v_angle_rad) * (vsl - v_string_to_join)
+        v_angle_to_fb = np.arctan((string_height_eof - string_height_nut) / fingerboard_length) * 180 / np.pi
+        invalid |= is_bowed & ((body_stop_in == 0) | (fingerboard_length == 0))
+
+        # String angles - GUITAR_MANDOLIN (fret join driven)
+        fret_join = _get_or(columns, 'fret_join', 12, n)
+        no_frets = _column(columns, 'no_frets', n)
+        default_frets = np.select([is_viol, is_guitar], [DEFAULT_FRETS_VIOL, DEFAULT_FRETS_GUITAR],
+                                  default=DEFAULT_FRETS_VIOLIN)
+        no_frets = default_frets if no_frets is None else np.where(np.isnan(no_frets), default_frets, no_frets)
+        string_height_12th_fret = _get_or(columns, 'string_height_12th_fret', 0, n)
+
+        # fret_positions[fret_join] and fret_positions[12], as in geometry_engine
+        fret_at_join = fret_kernel.fret_position_batch(vsl, fret_join + 1)
+        fret_12 = fret_kernel.fret_position_batch(vsl, 13)
+        g_height_at_join = ((string_height_12th_fret - string_height_nut) * (fret_at_join / fret_12)) + string_height_nut
+        g_hypotenuse = vsl - fret_at_join
+        g_opposite = arching_height + bridge_height - overstand - fb_thickness_at_join - g_height_at_join
+        sin_value = g_opposite / g_hypotenuse
+        g_angle_rad = np.arcsin(sin_value)
+        g_neck_stop = np.cos(g_angle_rad) * fret_at_join
+        g_body_stop = np.cos(g_angle_rad) * g_hypotenuse
+        g_angle_to_fb = np.arctan((g_height_at_join - string_height_nut) / fret_at_join) * 180 / np.pi
+        invalid |= is_guitar & ((no_frets <= fret_join) | (no_frets <= 12) | (g_hypotenuse == 0)
+                                | ~(np.abs(sin_value) <= 1.0) | (fret_at_join == 0) | (fret_12 == 0))
+
+        body_stop = np.where(is_guitar, g_body_stop, body_stop_in)
+        neck_stop = np.where(is_guitar, g_neck_stop, v_neck_stop)
+        string_angle_to_ribs_rad = np.where(is_guitar, g_angle_rad, v_angle_rad)
+        string_angle_to_fb = np.where(is_guitar, g_angle_to_fb, v_angle_to_fb)
+
+        derived['body_stop'] = body_stop
+        derived['neck_stop'] = neck_stop
+        derived['string_angle_to_ribs_rad'] = string_angle_to_ribs_rad
+        derived['string_angle_to_fb'] = string_angle_to_fb
+        derived['string_angle_to_ribs'] = string_angle_to_ribs_rad * 180 / np.pi
+        derived['string_angle_to_fingerboard'] = string_angle_to_fb
+
+        # Neck geometry
+        bridge_top_x = body_stop
+        bridge_top_y = arching_height + bridge_height
+        nut_top_x = -neck_stop
+        nut_top_y = bridge_top_y - np.sin(string_angle_to_ribs_rad) * vsl
+
+        fingerboard_angle = np.arctan((fb_thickness_at_join - fb_thickness_at_nut) / neck_stop) * 180 / np.pi
+        neck_angle = 90 - (string_angle_to_ribs_rad * 180 / np.pi - string_angle_to_fb - fingerboard_angle)
+        neck_angle_rad = neck_angle * np.pi / 180
+        invalid |= neck_stop == 0
+
+        neck_end_x = 0 - neck_stop + np.cos(neck_angle_rad) * fb_thickness_at_nut
+        neck_end_y = overstand - neck_stop * np.cos(neck_angle_rad)
+        neck_line_angle = np.arctan2(neck_end_y - overstand, neck_end_x - 0)
+
+        derived['neck_angle'] = neck_angle
+        derived['neck_angle_rad'] = neck_angle_rad
+        derived['neck_end_x'] = neck_end_x
+        derived['neck_end_y'] = neck_end_y
+        derived['nut_draw_radius'] = fb_thickness_at_nut + string_height_nut
+        derived['neck_line_angle'] = neck_line_angle
+        derived['nut_top_x'] = nut_top_x
+        derived['nut_top_y'] = nut_top_y
+        derived['bridge_top_x'] = bridge_top_x
+        derived['bridge_top_y'] = bridge_top_y
+        derived['string_length'] = np.sqrt((bridge_top_x - nut_top_x) ** 2 + (bridge_top_y - nut_top_y) ** 2)
+        derived['nut_relative_to_ribs'] = nut_top_y
+
+        # Fingerboard geometry
+        fb_direction_angle = neck_line_angle + np.pi
+        fb_bottom_end_x = neck_end_x + fingerboard_length * np.cos(fb_direction_angle)
+        fb_bottom_end_y = neck_end_y + fingerboard_length * np.sin(fb_direction_angle)
+        fb_thickness_at_end = fb_thickness_at_nut + (fb_thickness_at_join - fb_thickness_at_nut) * (fingerboard_length / neck_stop)
+
+        derived['fb_direction_angle'] = fb_direction_angle
+        derived['fb_bottom_end_x'] = fb_bottom_end_x
+        derived['fb_bottom_end_y'] = fb_bottom_end_y
+        derived['fb_thickness_at_end'] = fb_thickness_at_end
+
+        # String height and dimension points
+        perp_angle = fb_direction_angle + np.pi / 2
+        perp_dx = np.cos(perp_angle)
+        perp_dy = np.sin(perp_angle)
+        fb_top_right_x = fb_bottom_end_x + fb_thickness_at_end * perp_dx
+        fb_top_right_y = fb_bottom_end_y + fb_thickness_at_end * perp_dy
+
+        perp_neck_dx = -(neck_end_y - overstand)
+        perp_neck_dy = neck_end_x - 0
+        string_dx = bridge_top_x - nut_top_x
+        string_dy = bridge_top_y - nut_top_y
+
+        det = string_dx * perp_neck_dy - string_dy * perp_neck_dx
+        has_intersection = np.abs(det) > EPSILON
+        t = ((0 - nut_top_x) * perp_neck_dy - (overstand - nut_top_y) * perp_neck_dx) / det
+        intersect_x = np.where(has_intersection, nut_top_x + t * string_dx, 0.0)
+        intersect_y = np.where(has_intersection, nut_top_y + t * string_dy, 0.0)
+        nut_to_perp_distance = np.where(
+            has_intersection,
+            np.sqrt((intersect_x - nut_top_x) ** 2 + (intersect_y - nut_top_y) ** 2),
+            0.0
+        )
+
+        derived['nut_perpendicular_intersection_x'] = intersect_x
+        derived['nut_perpendicular_intersection_y'] = intersect_y
+        derived['nut_to_perpendicular_distance'] = nut_to_perp_distance
+
+        fb_dx = fb_bottom_end_x - neck_end_x
+        fb_dy = fb_bottom_end_y - neck_end_y
+        t = np.select([string_dx != 0, string_dy != 0],
+                      [fb_dx / string_dx, fb_dy / string_dy], default=0.0)
+
+        string_x_at_fb_end = nut_top_x + t * string_dx
+        string_y_at_fb_end = nut_top_y + t * string_dy
+        string_height_at_fb_end = ((string_x_at_fb_end - fb_top_right_x) * perp_dx
+                                   + (string_y_at_fb_end - fb_top_right_y) * perp_dy)
+
+        derived['string_x_at_fb_end'] = string_x_at_fb_end
+        derived['string_y_at_fb_end'] = string_y_at_fb_end
+        derived['fb_surface_point_x'] = string_x_at_fb_end - string_height_at_fb_end * perp_dx
+        derived['fb_surface_point_y'] = string_y_at_fb_end - string_height_at_fb_end * perp_dy
+        derived['string_height_at_fb_end'] = string_height_at_fb_end
+
+        derived['neck_line_angle_deg'] = neck_line_angle * 180 / np.pi
+        derived['fb_direction_angle_deg'] = fb_direction_angle * 180 / np.pi
+
+        # Afterlength, break angle and downward force
+        body_length = _get(columns, 'body_length', 0, n)
+        belly_edge_thickness = _get(columns, 'belly_edge_thickness', 0, n)
+        tailpiece_height = _get(columns, 'tailpiece_height', 0, n)
+
+        afterlength_angle = np.arctan2(bridge_top_y - (belly_edge_thickness + tailpiece_height),
+                                       body_length - bridge_top_x) * 180 / np.pi
+        derived['afterlength_angle'] = afterlength_angle
+        derived['string_break_angle'] = 180 - derived['string_angle_to_ribs'] - afterlength_angle
+        derived['downward_force_percent'] = (np.sin(derived['string_angle_to_ribs'] * np.pi / 180)
+                                             + np.sin(afterlength_angle * np.pi / 180)) * 100
+
+        # Viol back break
+        break_angle_rad = np.radians(_get(columns, 'break_angle', 15.0, n))
+        top_block_height = _get(columns, 'top_block_height', 40.0, n)
+        rib_height = _get(columns, 'rib_height', 100.0, n)
+        viol_body_length = _get(columns, 'body_length', 355.0, n)
+        viol_belly = _get(columns, 'belly_edge_thickness', 3.5, n)
+
+        break_horizontal = np.where(break_angle_rad < 0.001, viol_body_length,
+                                    (rib_height - top_block_height) / np.tan(break_angle_rad))
+        break_horizontal = np.where(break_horizontal > viol_body_length, viol_body_length, break_horizontal)
+
+        derived['back_break_length'] = np.where(is_viol, viol_body_length - break_horizontal, 0.0)
+        derived['break_start_x'] = np.where(is_viol, 0.0, np.nan)
+        derived['break_start_y'] = np.where(is_viol, viol_belly - top_block_height, np.nan)
+        derived['break_end_x'] = np.where(is_viol, break_horizontal, np.nan)
+        derived['break_end_y'] = np.where(is_viol, viol_belly - rib_height, np.nan)
+        derived['break_angle_rad'] = np.where(is_viol, break_angle_rad, np.nan)
+
+    derived['neck_block_max_width'] = _neck_block_max_width(columns, families, n)
+
+    if invalid.any():
+        for key in derived:
+            derived[key] = np.where(invalid, np.nan, derived[key])
+
+    return derived
+
+
+def derived_row(derived: Dict[str, np.ndarray], index: int) -> Dict[str, float]:
+    """Extract one row of a batch result as a plain dict, dropping NaN-only keys."""
+    row = {}
+    for key, values in derived.items():
+        value = float(values[index])
+        if not np.isnan(value):
+            row[key] = value
+    return row
@@ -0,0 +1,295 @@
+"""
+Overstand - Bezier Kernel
+
+Shared cubic (and quadratic) Bezier helpers used by the geometry engine,
+the batch engine and the SVG exporter:
+
+- Closed-form real root solve of the cubic polynomial, used to find the
+  parameter t at which a curve reaches a given coordinate.
+- Exact bounding boxes from the roots of the curve's derivative.
+- Batched (NumPy) evaluation over arrays of t and batched root solving.
+
+A cubic Bezier coordinate with control values (a0, a1, a2, a3) is the
+polynomial  a*t^3 + b*t^2 + c*t + d  with
+    a = -a0 + 3*a1 - 3*a2 + a3
+    b = 3*a0 - 6*a1 + 3*a2
+    c = -3*a0 + 3*a1
+    d = a0
+"""
+
+import math
+import numpy as np
+from typing import List, Tuple
+
+Point2D = Tuple[float, float]
+
+# Roots within this distance of [0, 1] are treated as lying on the curve
+T_TOLERANCE = 1e-9
+
+
+# ============================================================================
+# Scalar Evaluation
+# ============================================================================
+
+def evaluate_cubic_bezier(p0: tuple, cp1: tuple, cp2: tuple, p3: tuple,
+                          t: float) -> tuple:
+    """
+    Evaluate a cubic Bezier curve at parameter t.
+
+    Args:
+        p0: Start point (x, y)
+        cp1: First control point
+        cp2: Second control point
+        p3: End point
+        t: Parameter value (0 to 1)
+
+    Returns:
+        (x, y) coordinates at parameter t
+    """
+    mt = 1 - t
+    mt2 = mt * mt
+    mt3 = mt2 * mt
+    t2 = t * t
+    t3 = t2 * t
+
+    x = mt3 * p0[0] + 3*mt2*t * cp1[0] + 3*mt*t2 * cp2[0] + t3 * p3[0]
+    y = mt3 * p0[1] + 3*mt2*t * cp1[1] + 3*mt*t2 * cp2[1] + t3 * p3[1]
+
+    return (x, y)
+
+
+def cubic_coefficients(a0: float, a1: float, a2: float, a3: float) -> Tuple[float, float, float, float]:
+    """Power-basis coefficients (a, b, c, d) of one Bezier coordinate."""
+    return (-a0 + 3*a1 - 3*a2 + a3,
+            3*a0 - 6*a1 + 3*a2,
+            -3*a0 + 3*a1,
+            a0)
+
+
+# ============================================================================
+# Closed-Form Root Solving
+# ============================================================================
+
+def _solve_quadratic(a: float, b: float, c: float) -> List[float]:
+    """Real roots of a*t^2 + b*t + c (degrading to linear when a is ~0)."""
+    scale = max(abs(a), abs(b), abs(c), 1e-300)
+    if abs(a) <= 1e-12 * scale:
+        if abs(b) <= 1e-12 * scale:
+            return []
+        return [-c / b]
+
+    disc = b * b - 4 * a * c
+    if disc < 0:
+        if disc > -1e-12 * scale * scale:
+            return [-b / (2 * a)]
+        return []
+    sqrt_disc = math.sqrt(disc)
+    # Numerically stable form (avoids cancellation)
+    q = -0.5 * (b + math.copysign(sqrt_disc, b))
+    roots = [q / a]
+    if q != 0:
+        roots.append(c / q)
+    return roots
+
+
+def solve_cubic(a: float, b: float, c: float, d: float) -> List[float]:
+    """
+    Real roots of a*t^3 + b*t^2 + c*t + d in closed form.
+
+    Uses Cardano's formula for one real root and the trigonometric form for
+    three real roots. Degenerates to the quadratic/linear case when the
+    leading coefficient vanishes. Each root is polished with one Newton step.
+    """
+    scale = max(abs(a), abs(b), abs(c), abs(d), 1e-300)
+    if abs(a) <= 1e-12 * scale:
+        return _solve_quadratic(b, c, d)
+
+    b, c, d = b / a, c / a, d / a
+    shift = -b / 3.0
+    p = c - b * b / 3.0
+    q = 2.0 * b ** 3 / 27.0 - b * c / 3.0 + d
+    disc = (q / 2.0) ** 2 + (p / 3.0) ** 3
+
+    if disc > 0:
+        sqrt_disc = math.sqrt(disc)
+        u = _cbrt(-q / 2.0 + sqrt_disc)
+        v = _cbrt(-q / 2.0 - sqrt_disc)
+        roots = [u + v + shift]
+    elif p == 0:
+        roots = [shift]
+    else:
+        r = 2.0 * math.sqrt(-p / 3.0)
+        cos_arg = max(-1.0, min(1.0, (3.0 * q / (2.0 * p)) * math.sqrt(-3.0 / p)))
+        phi = math.acos(cos_arg)
+        roots = [r * math.cos((phi - 2.0 * math.pi * k) / 3.0) + shift for k in range(3)]
+
+    polished = []
+    for t in roots:
+        f = ((t + b) * t + c) * t + d
+        df = (3.0 * t + 2.0 * b) * t + c
+        if df != 0:
+            t -= f / df
+        polished.append(t)
+    return polished
+
+
+def _cbrt(x: float) -> float:
+    return math.copysign(abs(x) ** (1.0 / 3.0), x)
+
+
+def _roots_in_unit_interval(roots: List[float]) -> List[float]:
+    """Roots in [0, 1] (within T_TOLERANCE), clamped and sorted."""
+    return sorted(min(max(t, 0.0), 1.0) for t in roots
+                  if -T_TOLERANCE <= t <= 1.0 + T_TOLERANCE)
+
+
+def find_t_for_coordinate(p0: Point2D, cp1: Point2D, cp2: Point2D, p3: Point2D,
+                          target: float, axis: int = 1) -> float:
+    """
+    Parameter t where the curve's coordinate on axis equals target.
+
+    Solves the cubic in closed form. Curves need not be monotonic: when the
+    curve crosses target several times the first crossing (smallest t) is
+    returned. If it never reaches target, the closer endpoint's t is returned.
+    """
+    a, b, c, d = cubic_coefficients(p0[axis], cp1[axis], cp2[axis], p3[axis])
+    roots = _roots_in_unit_interval(solve_cubic(a, b, c, d - target))
+    if roots:
+        return roots[0]
+    return 0.0 if abs(p0[axis] - target) <= abs(p3[axis] - target) else 1.0
+
+
+# ============================================================================
+# Exact Bounds
+# ============================================================================
+
+def cubic_extrema_t(a0: float, a1: float, a2: float, a3: float) -> List[float]:
+    """Parameters in (0, 1) where one cubic Bezier coordinate has an extremum."""
+    a, b, c, _ = cubic_coefficients(a0, a1, a2, a3)
+    # Derivative: 3a*t^2 + 2b*t + c
+    return [t for t in _solve_quadratic(3 * a, 2 * b, c) if 0.0 < t < 1.0]
+
+
+def cubic_bounds(p0: Point2D, cp1: Point2D, cp2: Point2D, p3: Point2D) -> Tuple[float, float, float, float]:
+    """Exact (min_x, min_y, max_x, max_y) of a cubic Bezier curve."""
+    ts = [0.0, 1.0]
+    ts += cubic_extrema_t(p0[0], cp1[0], cp2[0], p3[0])
+    ts += cubic_extrema_t(p0[1], cp1[1], cp2[1], p3[1])
+    points = [evaluate_cubic_bezier(p0, cp1, cp2, p3, t) for t in ts]
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def quadratic_bounds(p0: Point2D, cp: Point2D, p2: Point2D) -> Tuple[float, float, float, float]:
+    """Exact (min_x, min_y, max_x, max_y) of a quadratic Bezier curve."""
+    xs = [p0[0], p2[0]]
+    ys = [p0[1], p2[1]]
+    for axis, values in ((0, xs), (1, ys)):
+        denom = p0[axis] - 2 * cp[axis] + p2[axis]
+        if denom != 0:
+            t = (p0[axis] - cp[axis]) / denom
+            if 0.0 < t < 1.0:
+                mt = 1 - t
+                values.append(mt * mt * p0[axis] + 2 * mt * t * cp[axis] + t * t * p2[axis])
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# ============================================================================
+# Batched Evaluation (NumPy)
+# ============================================================================
+
+def evaluate_cubic_bezier_batch(p0, cp1, cp2, p3, t) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate cubic Bezier curves over an array of t.
+
+    Control points may be scalars or arrays (one curve per row); everything
+    broadcasts with t.
+    """
+    t = np.asarray(t, dtype=float)
+    mt = 1 - t
+    mt2 = mt * mt
+    mt3 = mt2 * mt
+    t2 = t * t
+    t3 = t2 * t
+
+    x = mt3 * p0[0] + 3*mt2*t * cp1[0] + 3*mt*t2 * cp2[0] + t3 * p3[0]
+    y = mt3 * p0[1] + 3*mt2*t * cp1[1] + 3*mt*t2 * cp2[1] + t3 * p3[1]
+    return x, y
+
+
+def solve_cubic_batch(a, b, c, d) -> np.ndarray:
+    """
+    Vectorized closed-form roots of a*t^3 + b*t^2 + c*t + d.
+
+    Returns an (n, 3) array of real roots, NaN where a root is complex (or
+    absent for rows that degenerate to quadratic/linear).
+    """
+    a, b, c, d = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c, d)))
+    a, b, c, d = (v.ravel() for v in (a, b, c, d))
+    n = a.shape[0]
+    roots = np.full((n, 3), np.nan)
+
+    scale = np.maximum.reduce([np.abs(a), np.abs(b), np.abs(c), np.abs(d), np.full(n, 1e-300)])
+    cubic = np.abs(a) > 1e-12 * scale
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Cubic rows: Cardano in complex arithmetic gives all three roots
+        safe_a = np.where(cubic, a, 1.0)
+        bn, cn, dn = b / safe_a, c / safe_a, d / safe_a
+        shift = -bn / 3.0
+        p = cn - bn * bn / 3.0
+        q = 2.0 * bn ** 3 / 27.0 - bn * cn / 3.0 + dn
+        disc = (q / 2.0) ** 2 + (p / 3.0) ** 3
+        sqrt_disc = np.sqrt(disc.astype(complex))
+        w = -q / 2.0 + sqrt_disc
+        # Pick the larger-magnitude branch to avoid cancellation
+        w = np.where(np.abs(w) < np.abs(-q / 2.0 - sqrt_disc), -q / 2.0 - sqrt_disc, w)
+        u = w ** (1.0 / 3.0)
+        omega = np.exp(2j * np.pi / 3.0)
+        for k in range(3):
+            uk = u * omega ** k
+            zk = np.where(np.abs(uk) > 0, uk - p / (3.0 * np.where(np.abs(uk) > 0, uk, 1.0)), 0.0)
+            tk = zk + shift
+            real = np.abs(tk.imag) <= 1e-7 * np.maximum(1.0, np.abs(tk.real))
+            roots[:, k] = np.where(cubic & real, tk.real, np.nan)
+
+        # Polish cubic roots with one Newton step
+        f = ((roots + bn[:, None]) * roots + cn[:, None]) * roots + dn[:, None]
+        df = (3.0 * roots + 2.0 * bn[:, None]) * roots + cn[:, None]
+        roots = np.where(df != 0, roots - f / df, roots)
+
+        # Quadratic/linear rows
+        qa, qb, qc = b, c, d
+        quad = ~cubic & (np.abs(qa) > 1e-12 * scale)
+        linear = ~cubic & ~quad & (np.abs(qb) > 1e-12 * scale)
+        qdisc = qb * qb - 4 * qa * qc
+        sq = np.sqrt(np.maximum(qdisc, 0.0))
+        qq = -0.5 * (qb + np.copysign(sq, qb))
+        has_real = qdisc >= 0
+        roots[:, 0] = np.where(quad & has_real, qq / np.where(quad, qa, 1.0), roots[:, 0])
+        roots[:, 1] = np.where(quad & has_real & (qq != 0), qc / np.where(qq != 0, qq, 1.0), roots[:, 1])
+        roots[:, 0] = np.where(linear, -qc / np.where(linear, qb, 1.0), roots[:, 0])
+
+    return roots
+
+
+def find_t_for_coordinate_batch(p0, cp1, cp2, p3, target, axis: int = 1) -> np.ndarray:
+    """
+    Vectorized find_t_for_coordinate: one curve and target per row.
+
+    Returns the smallest root in [0, 1] per row, or the closer endpoint's t
+    where the curve never reaches the target.
+    """
+    a0, a1, a2, a3 = (np.asarray(pt[axis], dtype=float) for pt in (p0, cp1, cp2, p3))
+    target = np.asarray(target, dtype=float)
+    a, b, c, d = cubic_coefficients(a0, a1, a2, a3)
+    roots = solve_cubic_batch(a, b, c, d - target)
+
+    in_range = (roots >= -T_TOLERANCE) & (roots <= 1.0 + T_TOLERANCE)
+    candidates = np.where(in_range, np.clip(roots, 0.0, 1.0), np.inf)
+    first = candidates.min(axis=1)
+
+    a0, a3, target = np.broadcast_arrays(a0, a3, target)
+    fallback = np.where(np.abs(a0.ravel() - target.ravel()) <= np.abs(a3.ravel() - target.ravel()), 0.0, 1.0)
+    return np.where(np.isfinite(first), first, fallback)
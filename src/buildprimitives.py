@@ -6,8 +6,12 @@ needed for generating SVG diagrams without requiring the full OCP/build123d stac
 """
 
 import math
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
 from enum import Enum
-from typing import Tuple, Optional, List, Dict, Any
+from typing import Tuple, Optional, List, Dict, Any, Iterable, Iterator
+from bezier import cubic_bounds, quadratic_bounds
 
 
 # ============================================================================
@@ -28,11 +32,134 @@ FOOTER_FONT_SIZE = 6 * PTS_MM      # ≈ 2.12 mm for generator URL
 
 class Point:
     """Simple 2D point with X, Y properties"""
+
+    __slots__ = ('X', 'Y')
+
     def __init__(self, x: float, y: float):
         self.X = x
         self.Y = y
 
 
+Bounds = Tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+
+_UNSET = object()
+
+
+class Shape(ABC):
+    """Base for drawable primitives: caches the bounding box on first use"""
+
+    # Primitives use __slots__ (no per-instance __dict__); subclasses list their own
+    __slots__ = ('_bounds',)
+
+    def bounds(self) -> Optional[Bounds]:
+        """(min_x, min_y, max_x, max_y), or None for an empty shape"""
+        cached = getattr(self, '_bounds', _UNSET)
+        if cached is _UNSET:
+            cached = self._compute_bounds()
+            self._bounds = cached
+        return cached
+
+    @abstractmethod
+    def _compute_bounds(self) -> Optional[Bounds]:
+        """Bounding box of the shape, computed once by bounds()"""
+
+
+# ============================================================================
+# Compact Number and Path Encoding
+# ============================================================================
+
+_NUMBER_FORMATS: Dict[int, str] = {}
+
+
+def format_number(value: float, precision: int) -> str:
+    """
+    Shortest decimal form of value rounded to precision places: no trailing
+    zeros, no leading zero ('0.5' -> '.5', '-0.25' -> '-.25'), and '0'
+    rather than '-0'.
+    """
+    fmt = _NUMBER_FORMATS.get(precision)
+    if fmt is None:
+        fmt = _NUMBER_FORMATS[precision] = f'%.{precision}f'
+    text = fmt % value
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text.startswith('0.'):
+        return text[1:]
+    if text.startswith('-0.'):
+        return '-' + text[2:]
+    return '0' if text == '-0' else text
+
+
+def _join_numbers(parts: List[str], numbers: List[str], previous: Optional[str] = None) -> Optional[str]:
+    """
+    Append numbers with only the separators the SVG path grammar needs;
+    previous is the number just before them, if any. Returns the last one.
+    """
+    for number in numbers:
+        if previous is not None and not (number[0] == '-' or (number[0] == '.' and '.' in previous)):
+            parts.append(' ')
+        parts.append(number)
+        previous = number
+    return previous
+
+
+def encode_path(commands: List[Tuple[str, Tuple[float, ...]]], precision: int = 3,
+                relative: bool = True) -> str:
+    """
+    Compact SVG path data for absolute commands from Shape.path_commands().
+
+    Coordinates are rounded to precision places before any relative offset
+    is taken, so relative paths land exactly on the rounded absolute points
+    (no accumulated drift). Relative mode uses l/h/v/q/c/a/z after an
+    absolute M, and repeated commands are written once.
+    """
+    parts: List[str] = []
+    last_command = last_number = None
+    current_x = current_y = start_x = start_y = 0.0
+
+    def r(value: float) -> float:
+        return round(value, precision)
+
+    for command, args in commands:
+        if command == 'Z':
+            parts.append('z' if relative else 'Z')
+            current_x, current_y = start_x, start_y
+            last_command = None
+            continue
+
+        if command == 'A':
+            rx, ry, rotation, large_arc, sweep, x, y = args
+            x, y = r(x), r(y)
+            values = [r(rx), r(ry), rotation, large_arc, sweep]
+            values += [x - current_x, y - current_y] if relative else [x, y]
+        else:
+            points = [r(value) for value in args]
+            x, y = points[-2], points[-1]
+            if relative and command != 'M':
+                values = [value - (current_y if i % 2 else current_x) for i, value in enumerate(points)]
+            else:
+                values = points
+
+        letter = command
+        if relative and command != 'M':
+            letter = command.lower()
+            if command == 'L' and values[1] == 0:
+                letter, values = 'h', values[:1]
+            elif command == 'L' and values[0] == 0:
+                letter, values = 'v', values[1:]
+
+        if letter != last_command or letter == 'M':
+            parts.append(letter)
+            last_number = None
+        last_number = _join_numbers(parts, [format_number(value, precision) for value in values], last_number)
+        last_command = letter
+        current_x, current_y = x, y
+        if command == 'M':
+            start_x, start_y = x, y
+
+    return ''.join(parts)
+
+
 class LineType(Enum):
     """SVG line types"""
     CONTINUOUS = "continuous"
@@ -46,9 +173,11 @@ class Unit(Enum):
     MM = "mm"
 
 
-class Edge:
+class Edge(Shape):
     """Represents a line segment"""
 
+    __slots__ = ('p1', 'p2')
+
     def __init__(self, p1: Tuple[float, float], p2: Tuple[float, float]):
         self.p1 = p1
         self.p2 = p2
@@ -65,14 +194,24 @@ class Edge:
         else:
             return Point(self.p2[0], self.p2[1])
 
+    def _compute_bounds(self) -> Bounds:
+        (x1, y1), (x2, y2) = self.p1[:2], self.p2[:2]
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        """Absolute path commands (see encode_path)"""
+        return [('M', tuple(self.p1[:2])), ('L', tuple(self.p2[:2]))]
+
     def to_svg_path(self) -> str:
         """Convert edge to SVG path data"""
         return f"M {self.p1[0]},{self.p1[1]} L {self.p2[0]},{self.p2[1]}"
 
 
-class Arc:
+class Arc(Shape):
     """Represents a circular arc segment"""
 
+    __slots__ = ('center', 'radius', 'start_angle', 'end_angle')
+
     def __init__(self, center: Tuple[float, float], radius: float,
                  start_angle: float, end_angle: float):
         """
@@ -102,8 +241,24 @@ class Arc:
         y = self.center[1] + self.radius * math.sin(angle)
         return Point(x, y)
 
-    def to_svg_path(self) -> str:
-        """Convert arc to SVG path data using arc command"""
+    def _compute_bounds(self) -> Bounds:
+        # Start and end points, plus every axis extreme (0°, 90°, 180°, 270°) the arc crosses
+        angles = [self.start_angle, self.end_angle]
+        start = self.start_angle % (2*math.pi)
+        end = self.end_angle % (2*math.pi)
+        for critical_angle in (0, math.pi/2, math.pi, 3*math.pi/2):
+            if start <= end:
+                inside = start <= critical_angle <= end
+            else:  # Arc wraps around 0
+                inside = critical_angle >= start or critical_angle <= end
+            if inside:
+                angles.append(critical_angle)
+        xs = [self.center[0] + self.radius * math.cos(angle) for angle in angles]
+        ys = [self.center[1] + self.radius * math.sin(angle) for angle in angles]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _arc_path(self) -> Tuple[float, float, int, int, float, float]:
+        """Start point, large-arc and sweep flags, and end point"""
         # Calculate start and end points
         start_x = self.center[0] + self.radius * math.cos(self.start_angle)
         start_y = self.center[1] + self.radius * math.sin(self.start_angle)
@@ -120,14 +275,27 @@ class Arc:
 
         large_arc_flag = 1 if angle_diff > math.pi else 0
         sweep_flag = 1  # Always sweep in positive angle direction
+        return start_x, start_y, large_arc_flag, sweep_flag, end_x, end_y
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        """Absolute path commands (see encode_path)"""
+        start_x, start_y, large_arc_flag, sweep_flag, end_x, end_y = self._arc_path()
+        return [('M', (start_x, start_y)),
+                ('A', (self.radius, self.radius, 0, large_arc_flag, sweep_flag, end_x, end_y))]
+
+    def to_svg_path(self) -> str:
+        """Convert arc to SVG path data using arc command"""
+        start_x, start_y, large_arc_flag, sweep_flag, end_x, end_y = self._arc_path()
 
         # SVG arc command: A rx ry x-axis-rotation large-arc-flag sweep-flag x y
         return f"M {start_x},{start_y} A {self.radius},{self.radius} 0 {large_arc_flag} {sweep_flag} {end_x},{end_y}"
 
 
-class Rectangle:
+class Rectangle(Shape):
     """Represents a rectangle (centered by default)"""
 
+    __slots__ = ('width', 'height', 'x', 'y')
+
     def __init__(self, width: float, height: float):
         self.width = width
         self.height = height
@@ -141,6 +309,17 @@ class Rectangle:
         new_rect.y = location.y
         return new_rect
 
+    def _compute_bounds(self) -> Bounds:
+        half_width = abs(self.width) / 2
+        half_height = abs(self.height) / 2
+        return self.x - half_width, self.y - half_height, self.x + half_width, self.y + half_height
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        """Absolute path commands (see encode_path)"""
+        x1, y1 = self.x - self.width / 2, self.y - self.height / 2
+        x2, y2 = self.x + self.width / 2, self.y + self.height / 2
+        return [('M', (x1, y1)), ('L', (x2, y1)), ('L', (x2, y2)), ('L', (x1, y2)), ('Z', ())]
+
     def to_svg_path(self) -> str:
         """Convert rectangle to SVG path data"""
         # Rectangle is centered at (x, y)
@@ -151,9 +330,11 @@ class Rectangle:
         return f"M {x1},{y1} L {x2},{y1} L {x2},{y2} L {x1},{y2} Z"
 
 
-class Spline:
+class Spline(Shape):
     """Represents a smooth curve through points"""
 
+    __slots__ = ('points', '_is_cubic')
+
     def __init__(self, *points: Tuple[float, float]):
         self.points = points
         self._is_cubic = False  # Track if this is a cubic Bezier
@@ -208,6 +389,38 @@ class Spline:
         spline._is_cubic = True
         return spline
 
+    def _compute_bounds(self) -> Optional[Bounds]:
+        points = self.points
+        if not points:
+            return None
+        if len(points) == 4 and self._is_cubic:
+            # Exact cubic Bezier bounds (derivative roots)
+            return cubic_bounds(*points)
+        if len(points) == 3:
+            # Exact quadratic Bezier bounds
+            return quadratic_bounds(*points)
+        # Lines and multi-segment splines - use control points
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        """Absolute path commands (see encode_path), segmented as in to_svg_path"""
+        points = self.points
+        if len(points) < 2:
+            return []
+        commands = [('M', tuple(points[0]))]
+        if len(points) == 2:
+            commands.append(('L', tuple(points[1])))
+        elif len(points) == 3:
+            commands.append(('Q', (*points[1], *points[2])))
+        elif len(points) == 4 and self._is_cubic:
+            commands.append(('C', (*points[1], *points[2], *points[3])))
+        else:
+            for i in range(1, len(points) - 1):
+                commands.append(('Q', (*points[i], *points[i + 1])))
+        return commands
+
     def to_svg_path(self) -> str:
         """Convert spline to SVG path using quadratic or cubic bezier curves"""
         if len(self.points) < 2:
@@ -234,9 +447,11 @@ class Spline:
         return path
 
 
-class Polygon:
+class Polygon(Shape):
     """Represents a closed polygon"""
 
+    __slots__ = ('vertices', 'x', 'y', 'filled', 'fill_pattern')
+
     def __init__(self, points, filled: bool = False, fill_pattern: str = None):
         # Support both list of points and varargs for backwards compatibility
         if isinstance(points, (list, tuple)) and len(points) > 0 and isinstance(points[0], (tuple, list)):
@@ -256,6 +471,22 @@ class Polygon:
         new_poly.y = location.y
         return new_poly
 
+    def _compute_bounds(self) -> Optional[Bounds]:
+        if not self.vertices:
+            return None
+        xs = [p[0] for p in self.vertices]
+        ys = [p[1] for p in self.vertices]
+        return min(xs) + self.x, min(ys) + self.y, max(xs) + self.x, max(ys) + self.y
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        """Absolute path commands (see encode_path)"""
+        if len(self.vertices) < 3:
+            return []
+        commands = [('M', (self.vertices[0][0] + self.x, self.vertices[0][1] + self.y))]
+        commands += [('L', (v[0] + self.x, v[1] + self.y)) for v in self.vertices[1:]]
+        commands.append(('Z', ()))
+        return commands
+
     def to_svg_path(self) -> str:
         """Convert polygon to SVG path data"""
         if len(self.vertices) < 3:
@@ -269,6 +500,142 @@ class Polygon:
         return path
 
 
+class Polyline(Shape):
+    """Represents connected line segments through points, optionally closed"""
+
+    __slots__ = ('points', 'closed')
+
+    def __init__(self, points, closed: bool = False):
+        self.points = [tuple(p[:2]) for p in points]
+        self.closed = closed
+
+    def _compute_bounds(self) -> Optional[Bounds]:
+        if not self.points:
+            return None
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        """Absolute path commands (see encode_path)"""
+        if len(self.points) < 2:
+            return []
+        commands = [('M', self.points[0])] + [('L', p) for p in self.points[1:]]
+        if self.closed:
+            commands.append(('Z', ()))
+        return commands
+
+    def to_svg_path(self) -> str:
+        """Convert polyline to SVG path data"""
+        if len(self.points) < 2:
+            return ""
+        path = f"M {self.points[0][0]},{self.points[0][1]}"
+        for x, y in self.points[1:]:
+            path += f" L {x},{y}"
+        if self.closed:
+            path += " Z"
+        return path
+
+
+def _chain_segments(segments: List[Tuple[int, str, Tuple[float, ...], Tuple[float, ...]]],
+                    tolerance: float) -> Dict[int, Optional[Polyline]]:
+    """
+    Chain (index, layer, p1, p2) line segments (see chain_edges).
+
+    Returns {index: Polyline or None}: each chain's last index maps to its
+    Polyline and its other indices to None (dropped).
+    """
+    scale = 1.0 / tolerance
+
+    def key(point):
+        return round(point[0] * scale), round(point[1] * scale)
+
+    endpoints: Dict[int, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {}
+    by_layer: Dict[str, List[int]] = {}
+    for i, layer, p1, p2 in segments:
+        if key(p1) != key(p2):
+            endpoints[i] = tuple(p1[:2]), tuple(p2[:2])
+            by_layer.setdefault(layer, []).append(i)
+
+    replacements: Dict[int, Optional[Polyline]] = {}
+    for indices in by_layer.values():
+        ends: Dict[Tuple[int, int], List[int]] = {}
+        for i in indices:
+            p1, p2 = endpoints[i]
+            ends.setdefault(key(p1), []).append(i)
+            ends.setdefault(key(p2), []).append(i)
+        used = set()
+
+        def take(point_key):
+            """Earliest unused segment at an endpoint, or None"""
+            candidates = ends.get(point_key)
+            while candidates and candidates[0] in used:
+                candidates.pop(0)
+            if not candidates:
+                return None
+            j = candidates.pop(0)
+            used.add(j)
+            return j
+
+        def other_end(j, point_key):
+            p1, p2 = endpoints[j]
+            return p2 if key(p1) == point_key else p1
+
+        for i in indices:
+            if i in used:
+                continue
+            used.add(i)
+            points = deque(endpoints[i])
+            members = [i]
+            closed = False
+            for extend_end in (True, False):
+                while not closed:
+                    point_key = key(points[-1] if extend_end else points[0])
+                    j = take(point_key)
+                    if j is None:
+                        break
+                    members.append(j)
+                    if extend_end:
+                        points.append(other_end(j, point_key))
+                    else:
+                        points.appendleft(other_end(j, point_key))
+                    if len(points) > 3 and key(points[0]) == key(points[-1]):
+                        points.pop()
+                        closed = True
+
+            if len(members) > 1:
+                last = max(members)
+                for j in members:
+                    replacements[j] = None
+                replacements[last] = Polyline(points, closed=closed)
+    return replacements
+
+
+def chain_edges(shapes: List[Tuple[Any, str]], tolerance: float = 1e-6) -> List[Tuple[Any, str]]:
+    """
+    Join Edges of the same layer that share endpoints into Polylines.
+
+    Endpoints are matched on a grid of the given tolerance. Each chain is
+    extended from both ends (at junctions the earliest-added edge is taken)
+    and closed when it returns to its start. A chain takes the place of its
+    last edge in the shape list, so edges only ever move later in painting
+    order (on top of what they were already above). Other shapes, lone
+    edges and zero-length edges are kept as they are.
+    """
+    replacements = _chain_segments([(i, layer, shape.p1, shape.p2) for i, (shape, layer) in enumerate(shapes)
+                                    if type(shape) is Edge], tolerance)
+    if not replacements:
+        return list(shapes)
+    result = []
+    for i, (shape, layer) in enumerate(shapes):
+        if i in replacements:
+            if replacements[i] is not None:
+                result.append((replacements[i], layer))
+        else:
+            result.append((shape, layer))
+    return result
+
+
 def make_face(shape):
     """Convert a shape to a filled face"""
     if isinstance(shape, Polygon):
@@ -280,9 +647,11 @@ def make_face(shape):
     return shape
 
 
-class Text:
+class Text(Shape):
     """Represents text with position and rotation"""
 
+    __slots__ = ('text', 'font_size', 'font', 'x', 'y', 'rotation', 'rotation_center')
+
     def __init__(self, text: str, font_size: float, font: str = FONT_NAME):
         self.text = text
         self.font_size = font_size
@@ -310,40 +679,55 @@ class Text:
         new_text.rotation_center = (axis.position[0], axis.position[1])
         return new_text
 
-    def to_svg(self, fill_color: Optional[Tuple[int, int, int]] = None, y_flipped: bool = False) -> str:
-        """Convert text to SVG element"""
+    def _compute_bounds(self) -> Bounds:
+        # Rough text bounds estimation
+        half_width = len(self.text) * self.font_size * 0.6 / 2
+        half_height = self.font_size / 2
+        return self.x - half_width, self.y - half_height, self.x + half_width, self.y + half_height
+
+    def to_svg(self, fill_color: Optional[Tuple[int, int, int]] = None, y_flipped: bool = False,
+               no_stroke: bool = False, precision: Optional[int] = None) -> str:
+        """
+        Convert text to SVG element (no_stroke when inside a stroked group;
+        precision rounds numbers with format_number)
+        """
         color = f"rgb({fill_color[0]},{fill_color[1]},{fill_color[2]})" if fill_color else "black"
+        stroke = ' stroke="none"' if no_stroke else ''
+        num = str if precision is None else (lambda value: format_number(value, precision))
 
         transforms = []
 
         # If the coordinate system is Y-flipped, flip text back to be readable
         if y_flipped:
-            transforms.append(f"translate({self.x} {self.y})")
+            transforms.append(f"translate({num(self.x)} {num(self.y)})")
             transforms.append("scale(1 -1)")
             if self.rotation != 0:
-                transforms.append(f"rotate({self.rotation})")
+                transforms.append(f"rotate({num(self.rotation)})")
             transform_str = f' transform="{" ".join(transforms)}"'
             # When using transform with translate, position at origin
             return (f'<text x="0" y="0" '
-                    f'font-family="{self.font}, Arial, sans-serif" font-size="{self.font_size}" '
-                    f'fill="{color}" text-anchor="middle" dominant-baseline="middle"'
+                    f'font-family="{self.font}, Arial, sans-serif" font-size="{num(self.font_size)}" '
+                    f'fill="{color}"{stroke} text-anchor="middle" dominant-baseline="middle"'
                     f'{transform_str}>{self.text}</text>')
         else:
             # Original behavior without Y-flip
             transform = ""
             if self.rotation != 0:
                 # Rotate around the text position
-                transform = f' transform="rotate({self.rotation} {self.rotation_center[0]} {self.rotation_center[1]})"'
+                transform = (f' transform="rotate({num(self.rotation)} '
+                             f'{num(self.rotation_center[0])} {num(self.rotation_center[1])})"')
 
-            return (f'<text x="{self.x}" y="{self.y}" '
-                    f'font-family="{self.font}, Arial, sans-serif" font-size="{self.font_size}" '
-                    f'fill="{color}" text-anchor="middle" dominant-baseline="middle"'
+            return (f'<text x="{num(self.x)}" y="{num(self.y)}" '
+                    f'font-family="{self.font}, Arial, sans-serif" font-size="{num(self.font_size)}" '
+                    f'fill="{color}"{stroke} text-anchor="middle" dominant-baseline="middle"'
                     f'{transform}>{self.text}</text>')
 
 
 class Location:
     """Represents a position in 2D space"""
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, position: Tuple[float, float]):
         self.x = position[0]
         self.y = position[1]
@@ -352,20 +736,291 @@ class Location:
 class Axis:
     """Represents a rotation axis (simplified for 2D)"""
 
+    __slots__ = ('position', 'direction')
+
     def __init__(self, position: Tuple[float, float, float], direction: Tuple[float, float, float]):
         self.position = position
         self.direction = direction
 
 
+# ============================================================================
+# Compact Shape Storage
+# ============================================================================
+
+# Record opcodes. Coordinates per record in the layer's array('d'):
+#   EDGE                 x1 y1 x2 y2
+#   ARC                  cx cy radius start_angle end_angle
+#   RECTANGLE            x y width height
+#   SPLINE, CUBIC        n, then n points
+#   POLYGON, FILLED      x y n, then n vertices     (extras: fill_pattern)
+#   POLYLINE, CLOSED     n, then n points
+#   TEXT                 font_size x y rotation rotation_center  (extras: text, font)
+#   OBJECT               -                          (extras: the object itself)
+_EDGE, _ARC, _RECTANGLE, _SPLINE, _CUBIC, _POLYGON, _FILLED_POLYGON, \
+    _POLYLINE, _CLOSED_POLYLINE, _TEXT, _OBJECT = range(11)
+
+_FIXED_SIZES = {_EDGE: (4, 0), _ARC: (5, 0), _RECTANGLE: (4, 0), _TEXT: (6, 2), _OBJECT: (0, 1)}
+
+
+def _flatten(points) -> List[float]:
+    return [value for point in points for value in (point[0], point[1])]
+
+
+def _unflatten(coords: array, start: int, count: int) -> List[Tuple[float, float]]:
+    return [(coords[i], coords[i + 1]) for i in range(start, start + 2 * count, 2)]
+
+
+def _encode(shape: Any) -> Tuple[int, List[float], List[Any]]:
+    """(opcode, coordinates, extras) of a shape; exact primitive types only"""
+    kind = type(shape)
+    if kind is Edge:
+        return _EDGE, [shape.p1[0], shape.p1[1], shape.p2[0], shape.p2[1]], []
+    if kind is Arc:
+        return _ARC, [shape.center[0], shape.center[1], shape.radius, shape.start_angle, shape.end_angle], []
+    if kind is Rectangle:
+        return _RECTANGLE, [shape.x, shape.y, shape.width, shape.height], []
+    if kind is Spline:
+        opcode = _CUBIC if shape._is_cubic else _SPLINE
+        return opcode, [len(shape.points)] + _flatten(shape.points), []
+    if kind is Polygon:
+        opcode = _FILLED_POLYGON if shape.filled else _POLYGON
+        return opcode, [shape.x, shape.y, len(shape.vertices)] + _flatten(shape.vertices), [shape.fill_pattern]
+    if kind is Polyline:
+        opcode = _CLOSED_POLYLINE if shape.closed else _POLYLINE
+        return opcode, [len(shape.points)] + _flatten(shape.points), []
+    if kind is Text:
+        return _TEXT, [shape.font_size, shape.x, shape.y, shape.rotation,
+                       shape.rotation_center[0], shape.rotation_center[1]], [shape.text, shape.font]
+    return _OBJECT, [], [shape]
+
+
+def _record_size(opcode: int, coords: array, c: int) -> Tuple[int, int]:
+    """Coordinates and extras taken by the record starting at coords[c]"""
+    if opcode in _FIXED_SIZES:
+        return _FIXED_SIZES[opcode]
+    if opcode in (_POLYGON, _FILLED_POLYGON):
+        return 3 + 2 * int(coords[c + 2]), 1
+    return 1 + 2 * int(coords[c]), 0
+
+
+def _decode(opcode: int, coords: array, c: int, extras: List[Any], e: int) -> Any:
+    """Rebuild the shape of a record"""
+    if opcode == _EDGE:
+        return Edge((coords[c], coords[c + 1]), (coords[c + 2], coords[c + 3]))
+    if opcode == _ARC:
+        return Arc((coords[c], coords[c + 1]), coords[c + 2], coords[c + 3], coords[c + 4])
+    if opcode == _RECTANGLE:
+        rectangle = Rectangle(coords[c + 2], coords[c + 3])
+        rectangle.x, rectangle.y = coords[c], coords[c + 1]
+        return rectangle
+    if opcode in (_SPLINE, _CUBIC):
+        spline = Spline(*_unflatten(coords, c + 1, int(coords[c])))
+        spline._is_cubic = opcode == _CUBIC
+        return spline
+    if opcode in (_POLYGON, _FILLED_POLYGON):
+        polygon = Polygon(_unflatten(coords, c + 3, int(coords[c + 2])),
+                          filled=opcode == _FILLED_POLYGON, fill_pattern=extras[e])
+        polygon.x, polygon.y = coords[c], coords[c + 1]
+        return polygon
+    if opcode in (_POLYLINE, _CLOSED_POLYLINE):
+        return Polyline(_unflatten(coords, c + 1, int(coords[c])), closed=opcode == _CLOSED_POLYLINE)
+    if opcode == _TEXT:
+        text = Text(extras[e], coords[c], extras[e + 1])
+        text.x, text.y, text.rotation = coords[c + 1], coords[c + 2], coords[c + 3]
+        text.rotation_center = (coords[c + 4], coords[c + 5])
+        return text
+    return extras[e]
+
+
+class _StoredPath:
+    """Path commands read straight from a ShapeStore record, for writing"""
+
+    __slots__ = ('commands', 'filled', 'fill_pattern')
+
+    def __init__(self, commands: List[Tuple[str, Tuple[float, ...]]], filled: bool = False,
+                 fill_pattern: Optional[str] = None):
+        self.commands = commands
+        self.filled = filled
+        self.fill_pattern = fill_pattern
+
+    def path_commands(self) -> List[Tuple[str, Tuple[float, ...]]]:
+        return self.commands
+
+
+def _stored_path(opcode: int, coords: array, c: int, extras: List[Any], e: int) -> Optional[_StoredPath]:
+    """Edges, polygons and polylines as path commands, without building the shape"""
+    if opcode == _EDGE:
+        return _StoredPath([('M', (coords[c], coords[c + 1])), ('L', (coords[c + 2], coords[c + 3]))])
+    if opcode in (_POLYGON, _FILLED_POLYGON):
+        x, y, count = coords[c], coords[c + 1], int(coords[c + 2])
+        commands = []
+        if count >= 3:
+            start = c + 3
+            commands = [('M', (coords[start] + x, coords[start + 1] + y))]
+            commands += [('L', (coords[i] + x, coords[i + 1] + y)) for i in range(start + 2, start + 2 * count, 2)]
+            commands.append(('Z', ()))
+        return _StoredPath(commands, opcode == _FILLED_POLYGON, extras[e])
+    if opcode in (_POLYLINE, _CLOSED_POLYLINE):
+        count = int(coords[c])
+        commands = []
+        if count >= 2:
+            commands = [('M', (coords[c + 1], coords[c + 2]))]
+            commands += [('L', (coords[i], coords[i + 1])) for i in range(c + 3, c + 1 + 2 * count, 2)]
+            if opcode == _CLOSED_POLYLINE:
+                commands.append(('Z', ()))
+        return _StoredPath(commands)
+    return None
+
+
+class _LayerRecords:
+    """Opcode stream, coordinates and extras of one layer"""
+
+    __slots__ = ('name', 'opcodes', 'coords', 'extras')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.opcodes = array('B')
+        self.coords = array('d')
+        self.extras: List[Any] = []
+
+
+class ShapeStore:
+    """
+    Compact (shape, layer) sequence for ExportSVG(compact=True).
+
+    Each layer keeps an opcode stream (array('B')) and its coordinates as
+    doubles (array('d')); strings and unknown objects go to a side list.
+    An array of layer indices records the order shapes were added, so
+    ungrouped output keeps painting order across layers. Shapes are encoded
+    when added: later changes to the object are not seen, and iterating or
+    indexing returns rebuilt copies. Coordinates come back as floats, so
+    ints are not preserved (hence compact output requires a precision).
+
+    Supports append, len, iteration and indexing like the list it replaces.
+    """
+
+    __slots__ = ('_layers', '_index', '_order')
+
+    def __init__(self):
+        self._layers: List[_LayerRecords] = []
+        self._index: Dict[str, int] = {}
+        self._order = array('I')
+
+    def append(self, item: Tuple[Any, str]) -> None:
+        """Add a (shape, layer) pair"""
+        shape, layer = item
+        index = self._index.get(layer)
+        if index is None:
+            index = self._index[layer] = len(self._layers)
+            self._layers.append(_LayerRecords(layer))
+        records = self._layers[index]
+        try:
+            opcode, coords, extras = _encode(shape)
+            values = array('d', coords)
+        except (TypeError, IndexError):
+            # Malformed points (e.g. a Polygon of bare numbers): keep the object
+            opcode, values, extras = _OBJECT, array('d'), [shape]
+        records.opcodes.append(opcode)
+        records.coords.extend(values)
+        records.extras.extend(extras)
+        self._order.append(index)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _records(self) -> Iterator[Tuple[str, int, array, int, List[Any], int]]:
+        """(layer, opcode, coords, coord offset, extras, extra offset) in the order added"""
+        cursors = [[0, 0, 0] for _ in self._layers]
+        for index in self._order:
+            records = self._layers[index]
+            cursor = cursors[index]
+            opcode = records.opcodes[cursor[0]]
+            c, e = cursor[1], cursor[2]
+            coord_count, extra_count = _record_size(opcode, records.coords, c)
+            cursor[0] += 1
+            cursor[1] += coord_count
+            cursor[2] += extra_count
+            yield records.name, opcode, records.coords, c, records.extras, e
+
+    def __iter__(self) -> Iterator[Tuple[Any, str]]:
+        for layer, opcode, coords, c, extras, e in self._records():
+            yield _decode(opcode, coords, c, extras, e), layer
+
+    def __getitem__(self, index: int) -> Tuple[Any, str]:
+        """Rebuild the pair at index; walks the records up to it, so prefer iteration for loops"""
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError('ShapeStore index out of range')
+        for i, (layer, opcode, coords, c, extras, e) in enumerate(self._records()):
+            if i == position:
+                return _decode(opcode, coords, c, extras, e), layer
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes in the opcode, coordinate and order arrays"""
+        arrays = [self._order] + [a for records in self._layers for a in (records.opcodes, records.coords)]
+        return sum(len(a) * a.itemsize for a in arrays)
+
+    def drawables(self, join_tolerance: Optional[float] = None) -> Iterator[Tuple[Any, str]]:
+        """
+        (shape, layer) pairs for ExportSVG.write: edges, polygons and
+        polylines as path commands read from the arrays, other records
+        rebuilt. With join_tolerance, edges are chained as by chain_edges.
+        """
+        replacements: Dict[int, Optional[Polyline]] = {}
+        if join_tolerance is not None:
+            segments = [(i, layer, (coords[c], coords[c + 1]), (coords[c + 2], coords[c + 3]))
+                        for i, (layer, opcode, coords, c, _, _) in enumerate(self._records())
+                        if opcode == _EDGE]
+            replacements = _chain_segments(segments, join_tolerance)
+
+        for i, (layer, opcode, coords, c, extras, e) in enumerate(self._records()):
+            if i in replacements:
+                if replacements[i] is not None:
+                    yield replacements[i], layer
+                continue
+            shape = _stored_path(opcode, coords, c, extras, e)
+            yield (shape if shape is not None else _decode(opcode, coords, c, extras, e)), layer
+
+
 class ExportSVG:
     """SVG exporter that collects shapes and generates SVG"""
 
-    def __init__(self, scale: float = 1.0, unit: Unit = Unit.MM, line_weight: float = 0.5):
+    def __init__(self, scale: float = 1.0, unit: Unit = Unit.MM, line_weight: float = 0.5,
+                 group_layers: bool = False, precision: Optional[int] = None,
+                 relative_paths: bool = True, coalesce_edges: bool = False,
+                 join_tolerance: float = 1e-6, compact: bool = False):
+        """
+        Args:
+            group_layers: Emit one <g> per layer carrying the layer's style
+                (in add_layer order, then unregistered layers by first use)
+                instead of repeating the style on every path. Shapes keep
+                their order within a layer, but not across layers.
+            precision: Decimal places for every coordinate, size and path
+                number (see format_number and encode_path); None writes
+                full-precision floats and absolute paths
+            relative_paths: With precision set, write relative path
+                commands (l/h/v/q/c/a/z)
+            coalesce_edges: Write connected Edges of a layer as single
+                polyline paths (see chain_edges)
+            join_tolerance: Distance within which edge endpoints coincide
+            compact: Keep shapes in a ShapeStore (typed arrays) instead of
+                a list of objects; requires precision
+        """
+        if compact and precision is None:
+            raise ValueError("compact shape storage requires a precision")
         self.scale = scale
         self.unit = unit
         self.line_weight = line_weight
+        self.group_layers = group_layers
+        self.precision = precision
+        self.relative_paths = relative_paths
+        self.coalesce_edges = coalesce_edges
+        self.join_tolerance = join_tolerance
         self.layers: Dict[str, Dict[str, Any]] = {}
-        self.shapes: List[Tuple[Any, str]] = []  # (shape, layer_name)
+        # (shape, layer_name) pairs
+        self.shapes: Any = ShapeStore() if compact else []
+        self._extent: Optional[List[float]] = None  # Running [min_x, min_y, max_x, max_y]
         self.view_box = None
         self.margin = 20  # mm
 
@@ -383,6 +1038,25 @@ class ExportSVG:
     def add_shape(self, shape: Any, layer: str = "default"):
         """Add a shape to a specific layer"""
         self.shapes.append((shape, layer))
+        bounds = shape.bounds() if isinstance(shape, Shape) else None
+        if bounds is None:
+            return
+        extent = self._extent
+        if extent is None:
+            self._extent = list(bounds)
+        else:
+            if bounds[0] < extent[0]:
+                extent[0] = bounds[0]
+            if bounds[1] < extent[1]:
+                extent[1] = bounds[1]
+            if bounds[2] > extent[2]:
+                extent[2] = bounds[2]
+            if bounds[3] > extent[3]:
+                extent[3] = bounds[3]
+
+    def extent(self) -> Optional[Bounds]:
+        """Bounding box of the shapes added so far (without margin), or None"""
+        return tuple(self._extent) if self._extent is not None else None
 
     def _get_stroke_style(self, layer_name: str) -> str:
         """Get SVG stroke style for a layer"""
@@ -409,96 +1083,12 @@ class ExportSVG:
         return f'stroke="{color}" stroke-width="{self.line_weight}" fill="none"{stroke_dasharray}'
 
     def _calculate_bounds(self) -> Tuple[float, float, float, float]:
-        """Calculate bounding box of all shapes"""
-        min_x, min_y = float('inf'), float('inf')
-        max_x, max_y = float('-inf'), float('-inf')
-
-        for shape, layer in self.shapes:
-            if isinstance(shape, Edge):
-                min_x = min(min_x, shape.p1[0], shape.p2[0])
-                max_x = max(max_x, shape.p1[0], shape.p2[0])
-                min_y = min(min_y, shape.p1[1], shape.p2[1])
-                max_y = max(max_y, shape.p1[1], shape.p2[1])
-            elif isinstance(shape, Rectangle):
-                x1 = shape.x - shape.width / 2
-                x2 = shape.x + shape.width / 2
-                y1 = shape.y - shape.height / 2
-                y2 = shape.y + shape.height / 2
-                min_x = min(min_x, x1, x2)
-                max_x = max(max_x, x1, x2)
-                min_y = min(min_y, y1, y2)
-                max_y = max(max_y, y1, y2)
-            elif isinstance(shape, Spline):
-                points = shape.points
-                if len(points) == 4 and hasattr(shape, '_is_cubic') and shape._is_cubic:
-                    # Sample cubic Bezier curve for bounds
-                    for t in [0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]:
-                        # De Casteljau's algorithm for cubic Bezier
-                        mt = 1 - t
-                        mt2 = mt * mt
-                        mt3 = mt2 * mt
-                        t2 = t * t
-                        t3 = t2 * t
-                        px = mt3 * points[0][0] + 3*mt2*t * points[1][0] + 3*mt*t2 * points[2][0] + t3 * points[3][0]
-                        py = mt3 * points[0][1] + 3*mt2*t * points[1][1] + 3*mt*t2 * points[2][1] + t3 * points[3][1]
-                        min_x = min(min_x, px)
-                        max_x = max(max_x, px)
-                        min_y = min(min_y, py)
-                        max_y = max(max_y, py)
-                else:
-                    # Quadratic or other splines - use control points
-                    for p in points:
-                        min_x = min(min_x, p[0])
-                        max_x = max(max_x, p[0])
-                        min_y = min(min_y, p[1])
-                        max_y = max(max_y, p[1])
-            elif isinstance(shape, Polygon):
-                for p in shape.vertices:
-                    px = p[0] + shape.x
-                    py = p[1] + shape.y
-                    min_x = min(min_x, px)
-                    max_x = max(max_x, px)
-                    min_y = min(min_y, py)
-                    max_y = max(max_y, py)
-            elif isinstance(shape, Arc):
-                # Calculate bounds of arc by checking start, end, and potential extrema
-                points = []
-                # Start and end points
-                points.append((shape.center[0] + shape.radius * math.cos(shape.start_angle),
-                               shape.center[1] + shape.radius * math.sin(shape.start_angle)))
-                points.append((shape.center[0] + shape.radius * math.cos(shape.end_angle),
-                               shape.center[1] + shape.radius * math.sin(shape.end_angle)))
-
-                # Check if arc crosses 0°, 90°, 180°, or 270° (extrema points)
-                for critical_angle in [0, math.pi/2, math.pi, 3*math.pi/2]:
-                    # Normalize angles to same range
-                    start = shape.start_angle % (2*math.pi)
-                    end = shape.end_angle % (2*math.pi)
-                    crit = critical_angle % (2*math.pi)
-
-                    # Check if critical angle is within arc range
-                    if start <= end:
-                        if start <= crit <= end:
-                            points.append((shape.center[0] + shape.radius * math.cos(critical_angle),
-                                          shape.center[1] + shape.radius * math.sin(critical_angle)))
-                    else:  # Arc wraps around 0
-                        if crit >= start or crit <= end:
-                            points.append((shape.center[0] + shape.radius * math.cos(critical_angle),
-                                          shape.center[1] + shape.radius * math.sin(critical_angle)))
-
-                for px, py in points:
-                    min_x = min(min_x, px)
-                    max_x = max(max_x, px)
-                    min_y = min(min_y, py)
-                    max_y = max(max_y, py)
-            elif isinstance(shape, Text):
-                # Rough text bounds estimation
-                text_width = len(shape.text) * shape.font_size * 0.6
-                text_height = shape.font_size
-                min_x = min(min_x, shape.x - text_width/2)
-                max_x = max(max_x, shape.x + text_width/2)
-                min_y = min(min_y, shape.y - text_height/2)
-                max_y = max(max_y, shape.y + text_height/2)
+        """Calculate bounding box of all shapes (plus margin)"""
+        if self._extent is None:
+            min_x, min_y = float('inf'), float('inf')
+            max_x, max_y = float('-inf'), float('-inf')
+        else:
+            min_x, min_y, max_x, max_y = self._extent
 
         # Add margin
         min_x -= self.margin
@@ -516,65 +1106,103 @@ class ExportSVG:
     </pattern>
 </defs>'''
 
+    def _is_invisible(self, layer_name: str) -> bool:
+        """Layers with neither fill nor line color are not drawn"""
+        layer = self.layers.get(layer_name)
+        return layer is not None and layer.get('fill_color') is None and layer.get('line_color') is None
+
+    def _polygon_fill(self, shape: 'Polygon', layer_name: str) -> str:
+        """Fill of a filled polygon: its pattern, else the layer's fill color"""
+        if shape.fill_pattern:
+            return f'url(#{shape.fill_pattern})'
+        layer_fill_color = self.layers.get(layer_name, {}).get('fill_color')
+        if layer_fill_color:
+            return f'rgb({layer_fill_color[0]},{layer_fill_color[1]},{layer_fill_color[2]})'
+        return 'black'
+
+    def _text_color(self, layer_name: str) -> Optional[Tuple[int, int, int]]:
+        """Text uses the layer's fill color, else its line color"""
+        layer = self.layers.get(layer_name)
+        if layer is None:
+            return None
+        return layer.get('fill_color') or layer.get('line_color')
+
+    def _path_data(self, shape: Shape) -> str:
+        if self.precision is None:
+            return shape.to_svg_path()
+        return encode_path(shape.path_commands(), self.precision, self.relative_paths)
+
+    def _shape_element(self, shape: Any, layer_name: str, grouped: bool = False) -> Optional[str]:
+        """SVG element for one shape; grouped shapes inherit the layer style"""
+        if isinstance(shape, (Edge, Arc, Rectangle, Spline, Polygon, Polyline, _StoredPath)):
+            filled = isinstance(shape, (Polygon, _StoredPath)) and shape.filled
+            if grouped:
+                fill = f' fill="{self._polygon_fill(shape, layer_name)}"' if filled else ''
+                return f'<path d="{self._path_data(shape)}"{fill}/>'
+            style = self._get_stroke_style(layer_name)
+            if filled:
+                style = style.replace('fill="none"', f'fill="{self._polygon_fill(shape, layer_name)}"')
+            return f'<path d="{self._path_data(shape)}" {style}/>'
+        if isinstance(shape, Text):
+            # Render text with layer's color
+            return shape.to_svg(self._text_color(layer_name), y_flipped=True, no_stroke=grouped,
+                                precision=self.precision)
+        return None
+
+    def _drawable_shapes(self) -> Iterable[Tuple[Any, str]]:
+        """Shapes to write, with connected edges chained if coalesce_edges is set"""
+        if isinstance(self.shapes, ShapeStore):
+            return self.shapes.drawables(self.join_tolerance if self.coalesce_edges else None)
+        if self.coalesce_edges:
+            return chain_edges(self.shapes, self.join_tolerance)
+        return self.shapes
+
+    def _layer_groups(self, shapes: Iterable[Tuple[Any, str]]) -> List[str]:
+        """One <g> per visible layer with its style stated once"""
+        by_layer: Dict[str, List[Any]] = {name: [] for name in self.layers}
+        for shape, layer_name in shapes:
+            by_layer.setdefault(layer_name, []).append(shape)
+
+        parts = []
+        for layer_name, shapes in by_layer.items():
+            if not shapes or self._is_invisible(layer_name):
+                continue
+            parts.append(f'<g class="layer-{layer_name}" {self._get_stroke_style(layer_name)}>')
+            for shape in shapes:
+                element = self._shape_element(shape, layer_name, grouped=True)
+                if element:
+                    parts.append(element)
+            parts.append('</g>')
+        return parts
+
     def write(self, filename: Optional[str] = None) -> str:
         """Generate SVG string"""
         min_x, min_y, max_x, max_y = self._calculate_bounds()
         width = max_x - min_x
         height = max_y - min_y
+        precision = self.precision
+        num = str if precision is None else (lambda value: format_number(value, precision))
 
         # Start SVG with viewBox
         # Note: We flip the Y-axis to match standard mathematical coordinates (Y up)
         svg_parts = [
             f'<svg xmlns="http://www.w3.org/2000/svg" '
-            f'viewBox="{min_x} {-max_y} {width} {height}" '
-            f'width="{width}{self.unit.value}" height="{height}{self.unit.value}">',
+            f'viewBox="{num(min_x)} {num(-max_y)} {num(width)} {num(height)}" '
+            f'width="{num(width)}{self.unit.value}" height="{num(height)}{self.unit.value}">',
             self._get_pattern_defs(),
             f'<g transform="scale(1,-1)">'
         ]
 
-        # Add shapes grouped by layer
-        for shape, layer_name in self.shapes:
-            # Check if layer is invisible (skip all shapes on invisible layers)
-            if layer_name in self.layers:
-                layer = self.layers[layer_name]
-                fill_color = layer.get('fill_color')
-                line_color = layer.get('line_color')
-
-                # Skip entire shape if layer is invisible (both colors are None)
-                if fill_color is None and line_color is None:
+        shapes = self._drawable_shapes()
+        if self.group_layers:
+            svg_parts.extend(self._layer_groups(shapes))
+        else:
+            for shape, layer_name in shapes:
+                if self._is_invisible(layer_name):
                     continue
-
-            if isinstance(shape, (Edge, Arc, Rectangle, Spline, Polygon)):
-                style = self._get_stroke_style(layer_name)
-                # Check if shape should be filled (Polygon with filled=True)
-                if isinstance(shape, Polygon) and shape.filled:
-                    # Check for fill pattern first
-                    if hasattr(shape, 'fill_pattern') and shape.fill_pattern:
-                        fill = f'url(#{shape.fill_pattern})'
-                    else:
-                        # Get fill color from layer
-                        if layer_name in self.layers:
-                            layer_fill_color = self.layers[layer_name].get('fill_color')
-                            if layer_fill_color:
-                                fill = f'rgb({layer_fill_color[0]},{layer_fill_color[1]},{layer_fill_color[2]})'
-                            else:
-                                fill = 'black'
-                        else:
-                            fill = 'black'
-                    style = style.replace('fill="none"', f'fill="{fill}"')
-                svg_parts.append(f'<path d="{shape.to_svg_path()}" {style}/>')
-
-            elif isinstance(shape, Text):
-                # Render text with layer's color
-                if layer_name in self.layers:
-                    layer = self.layers[layer_name]
-                    fill_color = layer.get('fill_color')
-                    line_color = layer.get('line_color')
-                    # Use fill_color if available, otherwise line_color
-                    text_color = fill_color if fill_color else line_color
-                    svg_parts.append(shape.to_svg(text_color, y_flipped=True))
-                else:
-                    svg_parts.append(shape.to_svg(y_flipped=True))
+                element = self._shape_element(shape, layer_name)
+                if element:
+                    svg_parts.append(element)
 
         svg_parts.append('</g>')  # Close the transform group
         svg_parts.append('</svg>')
@@ -595,6 +1223,7 @@ __all__ = [
     'Rectangle',
     'Spline',
     'Polygon',
+    'Polyline',
     'Text',
     'Location',
     'Axis',
@@ -602,5 +1231,10 @@ __all__ = [
     'LineType',
     'Unit',
     'Point',
-    'make_face'
+    'Shape',
+    'ShapeStore',
+    'make_face',
+    'chain_edges',
+    'format_number',
+    'encode_path'
 ]
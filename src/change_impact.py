@@ -0,0 +1,276 @@
+"""
+Overstand - Change Impact
+
+Which derived outputs and views an edit to a set of input keys can change,
+so callers can skip regenerating the rest (the radius template does not
+depend on instrument_name, the side view does not depend on
+fb_blend_percent).
+
+The dependency map is built once, over the default design of every family
+and every catalogued preset (see preset_index.load_catalogue):
+
+- Views are traced. Each generation component (fret positions,
+  cross-section geometry, derived geometry) runs on a parameter set that
+  records every key read, and so does each view renderer given a prebuilt
+  context. A view depends on its own reads plus the reads of the components
+  it consumes (VIEW_COMPONENTS). Stage caches are disabled while tracing
+  so that cache lookups do not add keys.
+- Derived outputs are found by perturbation: every numeric input of every
+  design is moved up and down by PERTURBATION of its registry range in one
+  batch-engine call, and an output depends on the input if it changes.
+- instrument_family switches every formula, so it is declared to affect
+  everything. Keys the map has never seen are treated the same way.
+"""
+
+import dataclasses
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import geometry_engine
+import stage_cache
+from batch_engine import calculate_derived_values_batch, columns_from_params
+from instrument_geometry import (
+    build_generation_context,
+    calculate_derived_geometry,
+    generate_cross_section_svg,
+    generate_side_view_svg
+)
+from parameter_registry import InstrumentFamily
+from parameter_set import ParameterSet, numeric_inputs, input_range, is_integer_input
+from radius_template import generate_radius_template_svg
+from view_generator import generate_fret_positions_view
+
+VIEWS = ('side', 'cross_section', 'radius_template', 'fret_positions')
+
+# Context components each view consumes besides the params it reads itself.
+# Derived geometry takes only neck_block_max_width from the cross-section,
+# and no view draws it, so 'geometry' excludes the cross-section.
+VIEW_COMPONENTS = {
+    'side': ('geometry',),
+    'cross_section': ('cross_section',),
+    'radius_template': (),
+    'fret_positions': ('fret_positions',)
+}
+
+# Perturbation step as a fraction of each input's registry range
+PERTURBATION = 0.01
+
+# Inputs that change every output and view
+GLOBAL_KEYS = ('instrument_family',)
+
+_MAP: Optional[Dict[str, Dict[str, List[str]]]] = None
+
+
+class _TracedParameterSet(ParameterSet):
+    """ParameterSet that records the keys read through it."""
+
+    __slots__ = ('reads', 'read_all')
+
+    def __init__(self, params: ParameterSet):
+        super().__init__(params.to_dict())
+        object.__setattr__(self, 'reads', set())
+        object.__setattr__(self, 'read_all', False)
+
+    def __getitem__(self, key: str) -> Any:
+        self.reads.add(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.reads.add(key)
+        return super().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        self.reads.add(key)
+        return super().__contains__(key)
+
+    def __getattr__(self, name: str) -> Any:
+        self.reads.add(name)
+        return super().__getattr__(name)
+
+    # Anything that sees every value depends on every key
+
+    def __iter__(self):
+        object.__setattr__(self, 'read_all', True)
+        return super().__iter__()
+
+    def __hash__(self) -> int:
+        object.__setattr__(self, 'read_all', True)
+        return super().__hash__()
+
+    def __eq__(self, other: object) -> bool:
+        object.__setattr__(self, 'read_all', True)
+        return super().__eq__(other)
+
+    def to_dict(self) -> Dict[str, Any]:
+        object.__setattr__(self, 'read_all', True)
+        return super().to_dict()
+
+
+def _trace(func: Callable[[ParameterSet], Any], params: ParameterSet) -> Set[str]:
+    """Keys of params that func reads."""
+    traced = _TracedParameterSet(params)
+    func(traced)
+    return set(params) if traced.read_all else traced.reads & set(params)
+
+
+def _trace_views(params: ParameterSet) -> Dict[str, Set[str]]:
+    """Keys each view depends on for one design."""
+    context = build_generation_context(params)
+
+    def fret_positions(p):
+        geometry_engine.calculate_fret_positions(p.get('vsl') or 0, geometry_engine.resolve_fret_count(p))
+
+    components = {
+        'fret_positions': _trace(fret_positions, params),
+        'cross_section': _trace(geometry_engine.calculate_cross_section_geometry, params),
+    }
+    components['geometry'] = components['fret_positions'] | _trace(
+        lambda p: calculate_derived_geometry(p, fret_positions=context.fret_positions,
+                                             cross_section=context.cross_section), params)
+
+    def with_context(render):
+        return lambda p: render(p, context=dataclasses.replace(context, params=p))
+
+    renderers = {
+        'side': with_context(generate_side_view_svg),
+        'cross_section': with_context(generate_cross_section_svg),
+        'radius_template': generate_radius_template_svg,
+        'fret_positions': lambda p: generate_fret_positions_view(p, fret_positions=context.fret_positions)
+    }
+    reads = {}
+    for view, render in renderers.items():
+        keys = _trace(render, params)
+        for component in VIEW_COMPONENTS[view]:
+            keys |= components[component]
+        reads[view] = keys
+    return reads
+
+
+def _perturbed_outputs(designs: List[ParameterSet]) -> Dict[str, Set[str]]:
+    """Outputs that change when each numeric input is perturbed, over designs of one family."""
+    keys = numeric_inputs(designs[0].instrument_family)
+    rows: List[Dict[str, Any]] = []
+    bases: List[int] = []
+    perturbed: List[int] = []
+    labels: List[str] = []
+    for params in designs:
+        base = len(rows)
+        rows.append(dict(params))
+        for key in keys:
+            lo, hi = input_range(key)
+            step = 1.0 if is_integer_input(key) else (hi - lo) * PERTURBATION
+            for value in (params[key] - step, params[key] + step):
+                if lo <= value <= hi:
+                    perturbed.append(len(rows))
+                    rows.append({**params, key: value})
+                    bases.append(base)
+                    labels.append(key)
+
+    derived = calculate_derived_values_batch(columns_from_params(rows), size=len(rows))
+    labels_array = np.array(labels)
+
+    affected: Dict[str, Set[str]] = {key: set() for key in keys}
+    for output, values in derived.items():
+        before, after = values[bases], values[perturbed]
+        changed = ~np.isclose(before, after, rtol=1e-12, atol=1e-12, equal_nan=True)
+        for key in np.unique(labels_array[changed]):
+            affected[str(key)].add(output)
+    return affected
+
+
+def _representative_designs() -> List[ParameterSet]:
+    """Default design of every family plus every catalogued preset."""
+    from preset_index import load_catalogue
+
+    designs = [ParameterSet.resolve({'instrument_family': family.name}) for family in InstrumentFamily]
+    for entry in load_catalogue():
+        try:
+            designs.append(ParameterSet.resolve(entry['parameters']))
+        except ValueError:
+            continue
+    return designs
+
+
+def build_dependency_map(designs: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Trace which outputs and views depend on each input.
+
+    Args:
+        designs: Designs to trace (default: family defaults and presets);
+                 the map is the union over all of them
+
+    Returns:
+        {'outputs': {input: [outputs]}, 'views': {input: [views]}} with
+        an entry for every input key
+    """
+    designs = [ParameterSet.resolve(params) for params in designs] if designs is not None \
+        else _representative_designs()
+
+    outputs: Dict[str, Set[str]] = {}
+    views: Dict[str, Set[str]] = {}
+    for params in designs:
+        for key in params:
+            outputs.setdefault(key, set())
+            views.setdefault(key, set())
+
+    previous = stage_cache.is_cache_enabled()
+    stage_cache.set_cache_enabled(False)
+    try:
+        for params in designs:
+            for view, keys in _trace_views(params).items():
+                for key in keys:
+                    views[key].add(view)
+    finally:
+        stage_cache.set_cache_enabled(previous)
+
+    by_family: Dict[str, List[ParameterSet]] = {}
+    for params in designs:
+        by_family.setdefault(params.instrument_family, []).append(params)
+    all_outputs: Set[str] = set()
+    for family_designs in by_family.values():
+        for key, changed in _perturbed_outputs(family_designs).items():
+            outputs.setdefault(key, set()).update(changed)
+            all_outputs |= changed
+
+    for key in GLOBAL_KEYS:
+        outputs[key] = set(all_outputs)
+        views[key] = set(VIEWS)
+
+    return {
+        'outputs': {key: sorted(values) for key, values in outputs.items()},
+        'views': {key: [view for view in VIEWS if view in values] for key, values in views.items()}
+    }
+
+
+def get_dependency_map() -> Dict[str, Dict[str, List[str]]]:
+    """The dependency map over the default designs (built on first use)."""
+    global _MAP
+    if _MAP is None:
+        _MAP = build_dependency_map()
+    return _MAP
+
+
+def affected_by(changed_keys: Iterable[str],
+                dependency_map: Optional[Dict[str, Dict[str, List[str]]]] = None) -> Dict[str, List[str]]:
+    """
+    Outputs and views that may change when the given inputs change.
+
+    Args:
+        changed_keys: Input keys whose values changed
+        dependency_map: Map to use (default: get_dependency_map())
+
+    Returns:
+        {'outputs': [output, ...], 'views': [view, ...]}; an unknown key
+        affects everything
+    """
+    dependency_map = dependency_map or get_dependency_map()
+    outputs: Set[str] = set()
+    views: Set[str] = set()
+    for key in changed_keys:
+        if key not in dependency_map['views']:
+            key = GLOBAL_KEYS[0]
+        outputs.update(dependency_map['outputs'][key])
+        views.update(dependency_map['views'][key])
+    return {
+        'outputs': sorted(outputs),
+        'views': [view for view in VIEWS if view in views]
+    }
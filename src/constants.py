@@ -17,6 +17,7 @@ TEXT_MARGIN_FRACTION = 0.3  # Margin as fraction of text height
 
 # SVG rendering
 SVG_MARGIN = 2.0  # Margin around SVG viewBox (mm)
+SVG_PRECISION = 3  # Decimal places in generated SVG numbers (0.001 mm)
 
 # Default instrument parameters
 DEFAULT_FINGERBOARD_RADIUS = 41.0  # mm, typical for violin
@@ -30,5 +31,9 @@ DEFAULT_FRETS_VIOL = 7
 DEFAULT_FRETS_GUITAR = 20
 DEFAULT_FRETS_VIOLIN = 0  # No frets
 
+# Derived-value engine version. Bump whenever a derived-value formula
+# changes so stored results (see design_catalogue) are recomputed.
+ENGINE_VERSION = 1
+
 # Numerical precision
 EPSILON = 1e-10  # Threshold for detecting parallel lines
@@ -0,0 +1,304 @@
+"""
+Overstand - Design Catalogue
+
+Local SQLite catalogue of design files and their derived values, for range
+queries across thousands of designs such as "all cellos with a neck angle
+between 84 and 86".
+
+Each file is one row of the designs table:
+- path (unique), name, instrument_family, content_hash and the resolved
+  parameters as JSON
+- one REAL column per numeric input and per batch-engine output (an
+  output replaces the input of the same name, e.g. body_stop)
+- feasible (see feasibility.batch_feasible_mask) and engine_version
+
+INDEXED_OUTPUTS get a composite (instrument_family, output) index, so a
+range query within one family is an index range scan.
+
+Ingest is batched: files are parsed and resolved, the derived values of a
+whole batch come from one batch-engine call per family, and rows are
+upserted with executemany in a single transaction. Files whose content and
+engine version are unchanged are skipped.
+
+When constants.ENGINE_VERSION changes, recompute() re-evaluates only the
+rows stored with another version, from their stored parameters; columns for
+new outputs are added when the catalogue is opened.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from batch_engine import calculate_derived_values_batch, columns_from_params
+from constants import ENGINE_VERSION
+from feasibility import batch_feasible_mask
+from parameter_registry import PARAMETER_REGISTRY, ParameterType
+from parameter_set import ParameterSet
+
+INDEXED_OUTPUTS = ('neck_angle', 'neck_stop', 'body_stop')
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns stored for every design besides the value columns
+BASE_COLUMNS = ('id', 'path', 'name', 'instrument_family', 'content_hash',
+                'parameters', 'feasible', 'engine_version')
+
+_DERIVED_KEYS: Optional[List[str]] = None
+
+
+def derived_keys() -> List[str]:
+    """Outputs of the batch engine (computed once)."""
+    global _DERIVED_KEYS
+    if _DERIVED_KEYS is None:
+        _DERIVED_KEYS = list(calculate_derived_values_batch(dict(ParameterSet.resolve({})), size=1))
+    return _DERIVED_KEYS
+
+
+def value_columns() -> List[str]:
+    """Numeric inputs of every family followed by the remaining derived outputs."""
+    inputs = [key for key, param in PARAMETER_REGISTRY.items()
+              if param.param_type == ParameterType.NUMERIC and param.input_config is not None]
+    return inputs + [key for key in derived_keys() if key not in inputs]
+
+
+def _design_files(paths: Iterable[str]) -> List[str]:
+    """Expand directories into the .json files below them."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                files.extend(os.path.join(directory, name) for name in sorted(names) if name.endswith('.json'))
+        else:
+            files.append(path)
+    return files
+
+
+def _parse_design(content: bytes) -> ParameterSet:
+    """Resolved parameters of a design file (wrapped or bare parameters)."""
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("Design file must contain a JSON object")
+    params = data.get('parameters', data)
+    if not isinstance(params, dict) or not any(key in PARAMETER_REGISTRY for key in params):
+        raise ValueError("No design parameters found")
+    return ParameterSet.resolve(params)
+
+
+class DesignCatalogue:
+    """SQLite catalogue of designs with indexed derived values."""
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Open (or create) a catalogue.
+
+        Args:
+            path: SQLite database file, or ':memory:'
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.columns = value_columns()
+        self._create_schema()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'DesignCatalogue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM designs').fetchone()[0]
+
+    def _create_schema(self) -> None:
+        value_sql = ''.join(f', "{key}" REAL' for key in self.columns)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS designs ('
+                'id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, name TEXT, '
+                'instrument_family TEXT NOT NULL, content_hash TEXT, parameters TEXT NOT NULL, '
+                f'feasible INTEGER NOT NULL, engine_version INTEGER NOT NULL{value_sql})'
+            )
+            # Outputs added by a newer engine
+            existing = {row['name'] for row in self.connection.execute('PRAGMA table_info(designs)')}
+            for key in self.columns:
+                if key not in existing:
+                    self.connection.execute(f'ALTER TABLE designs ADD COLUMN "{key}" REAL')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS idx_designs_engine_version ON designs (engine_version)')
+            for key in INDEXED_OUTPUTS:
+                self.connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_designs_{key}" ON designs (instrument_family, "{key}")')
+
+    def _values(self, designs: List[ParameterSet]) -> List[List[Any]]:
+        """[feasible, value columns...] per design; designs must share one family."""
+        columns = columns_from_params([dict(params) for params in designs])
+        derived = calculate_derived_values_batch(columns, size=len(designs))
+        feasible = batch_feasible_mask(columns, derived)
+
+        # Column-wise: derived value where finite, else the input of that name
+        missing = np.full(len(designs), np.nan)
+        matrix = np.empty((len(designs), len(self.columns) + 1))
+        matrix[:, 0] = feasible
+        for j, key in enumerate(self.columns, start=1):
+            value = derived.get(key, missing)
+            given = columns.get(key)
+            if isinstance(given, np.ndarray) and given.dtype == float:
+                value = np.where(np.isfinite(value), value, given)
+            matrix[:, j] = value
+        # NaN is stored as NULL
+        return np.where(np.isfinite(matrix), matrix, None).tolist()
+
+    def _by_family(self, items: List[Tuple[Any, ParameterSet]],
+                   batch_size: int) -> Iterable[List[Tuple[Any, ParameterSet]]]:
+        """Batches of (key, params) with one family each."""
+        groups: Dict[str, List[Tuple[Any, ParameterSet]]] = {}
+        for item in items:
+            groups.setdefault(item[1].instrument_family, []).append(item)
+        for group in groups.values():
+            for start in range(0, len(group), batch_size):
+                yield group[start:start + batch_size]
+
+    def ingest(self, paths: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Add or update design files.
+
+        Args:
+            paths: JSON design files (the CLI's input format) or directories
+                   searched recursively for them
+            batch_size: Designs per batch-engine call and executemany
+
+        Returns:
+            Dictionary with:
+                - ingested: number of rows inserted or updated
+                - skipped: files unchanged since the last ingest
+                - errors: list of {path, error} for files that could not be read
+        """
+        stored = {row['path']: (row['content_hash'], row['engine_version'])
+                  for row in self.connection.execute('SELECT path, content_hash, engine_version FROM designs')}
+        pending: List[Tuple[Any, ParameterSet]] = []
+        skipped = 0
+        errors = []
+        for path in _design_files(paths):
+            key = os.path.abspath(path)
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+                content_hash = hashlib.sha256(content).hexdigest()
+                if stored.get(key) == (content_hash, ENGINE_VERSION):
+                    skipped += 1
+                    continue
+                params = _parse_design(content)
+            except (OSError, ValueError) as e:
+                errors.append({'path': path, 'error': str(e)})
+                continue
+            name = params.get('instrument_name') or os.path.splitext(os.path.basename(path))[0]
+            pending.append(((key, name, content_hash), params))
+
+        names = ['path', 'name', 'instrument_family', 'content_hash', 'parameters',
+                 'feasible', 'engine_version'] + self.columns
+        quoted = ', '.join(f'"{name}"' for name in names)
+        updates = ', '.join(f'"{name}" = excluded."{name}"' for name in names[1:])
+        sql = (f'INSERT INTO designs ({quoted}) VALUES ({", ".join("?" * len(names))}) '
+               f'ON CONFLICT(path) DO UPDATE SET {updates}')
+
+        with self.connection:
+            for batch in self._by_family(pending, batch_size):
+                values = self._values([params for _, params in batch])
+                self.connection.executemany(sql, [
+                    [path, name, params.instrument_family, content_hash, json.dumps(params.to_dict()),
+                     int(row[0]), ENGINE_VERSION] + row[1:]
+                    for ((path, name, content_hash), params), row in zip(batch, values)
+                ])
+        return {'ingested': len(pending), 'skipped': skipped, 'errors': errors}
+
+    def stale_count(self) -> int:
+        """Rows computed by another engine version."""
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM designs WHERE engine_version != ?', (ENGINE_VERSION,)).fetchone()[0]
+
+    def recompute(self, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Recompute derived columns of rows stored with another engine version.
+
+        Returns:
+            Number of rows recomputed
+        """
+        rows = self.connection.execute(
+            'SELECT id, parameters FROM designs WHERE engine_version != ?', (ENGINE_VERSION,)).fetchall()
+        items = [(row['id'], ParameterSet.resolve(json.loads(row['parameters']))) for row in rows]
+
+        assignments = ', '.join(f'"{key}" = ?' for key in ['feasible', 'engine_version'] + self.columns)
+        sql = f'UPDATE designs SET {assignments} WHERE id = ?'
+        with self.connection:
+            for batch in self._by_family(items, batch_size):
+                values = self._values([params for _, params in batch])
+                self.connection.executemany(sql, [
+                    [int(row[0]), ENGINE_VERSION] + row[1:] + [design_id]
+                    for (design_id, _), row in zip(batch, values)
+                ])
+        return len(items)
+
+    def _check_column(self, key: str) -> str:
+        if key not in self.columns and key not in BASE_COLUMNS:
+            raise ValueError(f"Unknown catalogue column '{key}'")
+        return f'"{key}"'
+
+    def query(self, family: Optional[str] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              name_like: Optional[str] = None, feasible_only: bool = True,
+              columns: Optional[Sequence[str]] = None, order_by: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Designs matching every given condition.
+
+        Args:
+            family: Instrument family name (e.g. 'VIOLIN')
+            ranges: {column: (min, max)}, inclusive; either bound may be None
+            name_like: SQL LIKE pattern on the design name (e.g. '%cello%')
+            feasible_only: Skip designs that cannot be generated
+            columns: Value columns to return (default: all)
+            order_by: Column to sort by (ascending)
+            limit: Maximum number of rows
+
+        Returns:
+            List of {path, name, instrument_family, feasible, engine_version,
+            column: value, ...}
+        """
+        conditions, args = [], []
+        if family is not None:
+            conditions.append('instrument_family = ?')
+            args.append(family)
+        for key, (lo, hi) in (ranges or {}).items():
+            column = self._check_column(key)
+            if lo is not None:
+                conditions.append(f'{column} >= ?')
+                args.append(lo)
+            if hi is not None:
+                conditions.append(f'{column} <= ?')
+                args.append(hi)
+        if name_like is not None:
+            conditions.append('name LIKE ?')
+            args.append(name_like)
+        if feasible_only:
+            conditions.append('feasible = 1')
+
+        selected = ['path', 'name', 'instrument_family', 'feasible', 'engine_version']
+        selected += list(columns) if columns is not None else self.columns
+        sql = f'SELECT {", ".join(self._check_column(key) for key in selected)} FROM designs'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        if order_by is not None:
+            sql += f' ORDER BY {self._check_column(order_by)}'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            args.append(int(limit))
+        return [dict(row) for row in self.connection.execute(sql, args)]
+
+    def load_design(self, path: str) -> Optional[ParameterSet]:
+        """Stored parameters of a design file (None if not catalogued)."""
+        row = self.connection.execute(
+            'SELECT parameters FROM designs WHERE path = ?', (os.path.abspath(path),)).fetchone()
+        return None if row is None else ParameterSet.resolve(json.loads(row['parameters']))
@@ -0,0 +1,202 @@
+"""
+Overstand - Design History
+
+Bounded undo/redo buffer for a DesignSession. Each entry is a parameter
+snapshot plus, while memory allows, the derived values and views computed
+for it, so undo and redo can restore a design without regenerating it.
+
+Memory is bounded two ways:
+- at most max_entries snapshots are kept; the oldest is dropped first
+- cached results are accounted in bytes (UTF-8 size of each view and of the
+  JSON derived values). View content is stored once per content hash and
+  shared between snapshots, so an undo history of edits that leave the
+  radius template alone holds one copy of it. When the total exceeds
+  max_bytes, the cached results of the least recently used snapshots are
+  dropped (never the current one); their parameters stay, and restoring
+  them regenerates.
+"""
+
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from parameter_set import ParameterSet
+
+DEFAULT_MAX_ENTRIES = 100
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _size(content: Any) -> int:
+    text = content if isinstance(content, str) else json.dumps(content, sort_keys=True)
+    return len(text.encode('utf-8'))
+
+
+class HistoryEntry:
+    """One snapshot: parameters and, unless evicted, its derived values and view hashes."""
+
+    __slots__ = ('params', 'derived', 'view_hashes', 'derived_size', 'last_used')
+
+    def __init__(self, params: ParameterSet, last_used: int):
+        self.params = params
+        self.derived: Optional[Dict[str, Any]] = None
+        self.view_hashes: Optional[Dict[str, str]] = None
+        self.derived_size = 0
+        self.last_used = last_used
+
+    @property
+    def cached(self) -> bool:
+        return self.derived is not None
+
+
+class DesignHistory:
+    """Undo/redo snapshots with byte-bounded, LRU-evicted cached results."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Snapshots kept (oldest dropped first)
+            max_bytes: Budget for cached derived values and views
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: Deque[HistoryEntry] = deque()
+        self._position = -1
+        # content hash -> [content, size, references]
+        self._blobs: Dict[str, list] = {}
+        self._bytes = 0
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes held by cached results."""
+        return self._bytes
+
+    @property
+    def can_undo(self) -> bool:
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._position < len(self._entries) - 1
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _cache(self, entry: HistoryEntry, derived: Dict[str, Any],
+               views: Dict[str, Any], view_hashes: Dict[str, str]) -> None:
+        """Attach results to an entry, sharing view content by hash."""
+        for view, digest in view_hashes.items():
+            blob = self._blobs.get(digest)
+            if blob is None:
+                size = _size(views[view])
+                self._blobs[digest] = [views[view], size, 1]
+                self._bytes += size
+            else:
+                blob[2] += 1
+        entry.derived = dict(derived)
+        entry.view_hashes = dict(view_hashes)
+        entry.derived_size = _size(derived)
+        self._bytes += entry.derived_size
+
+    def _release(self, entry: HistoryEntry) -> None:
+        """Drop an entry's cached results."""
+        if not entry.cached:
+            return
+        for digest in entry.view_hashes.values():
+            blob = self._blobs[digest]
+            blob[2] -= 1
+            if blob[2] == 0:
+                self._bytes -= blob[1]
+                del self._blobs[digest]
+        self._bytes -= entry.derived_size
+        entry.derived = None
+        entry.view_hashes = None
+
+    def _evict(self) -> None:
+        """Drop least recently used cached results until within max_bytes."""
+        if self._bytes <= self.max_bytes:
+            return
+        current = self._entries[self._position] if self._position >= 0 else None
+        for entry in sorted(self._entries, key=lambda entry: entry.last_used):
+            if self._bytes <= self.max_bytes:
+                break
+            if entry is not current:
+                self._release(entry)
+
+    def push(self, params: ParameterSet, derived: Dict[str, Any],
+             views: Dict[str, Any], view_hashes: Dict[str, str]) -> None:
+        """
+        Record a newly rendered design after the current one (discarding redo).
+
+        Args:
+            params: Rendered parameters
+            derived: Its derived values
+            views: {view: content} of every view named in view_hashes
+            view_hashes: {view: content hash}
+        """
+        while len(self._entries) > self._position + 1:
+            self._release(self._entries.pop())
+        if len(self._entries) == self.max_entries:
+            self._release(self._entries.popleft())
+            self._position -= 1
+
+        entry = HistoryEntry(params, self._tick())
+        self._cache(entry, derived, views, view_hashes)
+        self._entries.append(entry)
+        self._position = len(self._entries) - 1
+        self._evict()
+
+    def _move(self, offset: int) -> Optional[Dict[str, Any]]:
+        position = self._position + offset
+        if not 0 <= position < len(self._entries):
+            return None
+        self._position = position
+        entry = self._entries[position]
+        entry.last_used = self._tick()
+        if not entry.cached:
+            return {'params': entry.params, 'derived': None, 'views': None, 'view_hashes': None}
+        return {
+            'params': entry.params,
+            'derived': dict(entry.derived),
+            'views': {view: self._blobs[digest][0] for view, digest in entry.view_hashes.items()},
+            'view_hashes': dict(entry.view_hashes)
+        }
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """
+        Step back one snapshot.
+
+        Returns:
+            {params, derived, views, view_hashes} of the restored snapshot
+            (derived, views and view_hashes are None if its results were
+            evicted), or None if there is nothing to undo
+        """
+        return self._move(-1)
+
+    def redo(self) -> Optional[Dict[str, Any]]:
+        """Step forward one snapshot (see undo)."""
+        return self._move(1)
+
+    def replace_current(self, derived: Dict[str, Any], views: Dict[str, Any],
+                        view_hashes: Dict[str, str]) -> None:
+        """Re-cache the results of the current snapshot after it was regenerated."""
+        entry = self._entries[self._position]
+        self._release(entry)
+        self._cache(entry, derived, views, view_hashes)
+        self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, position, cached entries and bytes in use."""
+        return {
+            'entries': len(self._entries),
+            'position': self._position,
+            'cached_entries': sum(1 for entry in self._entries if entry.cached),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'max_entries': self.max_entries
+        }
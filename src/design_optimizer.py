@@ -0,0 +1,251 @@
+"""
+Overstand - Design Optimizer
+
+Multi-objective search over chosen inputs, returning the Pareto front of
+designs that trade off derived outputs such as string_break_angle,
+downward_force_percent, neck_angle and string_height_at_fb_end.
+
+Each objective is 'min', 'max' or a numeric target (minimise the distance
+to it). The search runs entirely on the batch engine:
+1. A Latin-hypercube sample over the inputs' bounds (registry min/max by
+   default) is evaluated in one call.
+2. For a few refinement rounds, new candidates are drawn around the current
+   front with a shrinking spread, evaluated in one call, and merged.
+3. Infeasible rows (see feasibility.batch_feasible_mask) and rows with an
+   output outside its bounds are discarded, and the non-dominated designs
+   form the front.
+
+Feasible only means the geometry computes. By default, rows are also
+required to be physically meaningful (DEFAULT_OUTPUT_BOUNDS): the string
+breaks over the bridge at an angle within 0-180 degrees, presses down on it
+(downward force 0-100%), and clears the fingerboard end. Callers can
+tighten or replace these bounds with output_bounds.
+
+Side-view SVGs are rendered only for a handful of points spread along the
+front.
+"""
+
+import csv
+import io
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from batch_engine import calculate_derived_values_batch
+from feasibility import batch_feasible_mask
+from instrument_geometry import generate_side_view_svg
+from parameter_set import ParameterSet, numeric_inputs, input_range, is_integer_input
+from sampling import latin_hypercube_columns
+
+DEFAULT_SAMPLES = 4000
+DEFAULT_ROUNDS = 3
+REFINE_SAMPLES = 2000
+
+# Spread of refinement samples, as a fraction of each input's range, in the
+# first round; halved every round
+INITIAL_SPREAD = 0.1
+
+DEFAULT_VIEW_POINTS = 5
+
+# {output: (min, max)}; None leaves a side open
+OutputBounds = Dict[str, Tuple[Optional[float], Optional[float]]]
+
+DEFAULT_OUTPUT_BOUNDS: OutputBounds = {
+    'string_break_angle': (0.0, 180.0),
+    'downward_force_percent': (0.0, 100.0),
+    'string_height_at_fb_end': (0.0, None),
+    'neck_angle': (0.0, 180.0)
+}
+
+Objective = Union[str, float]
+
+
+def _costs(derived: Dict[str, np.ndarray], objectives: Dict[str, Objective]) -> np.ndarray:
+    """(n, n_objectives) cost matrix; lower is better in every column."""
+    columns = []
+    for key, goal in objectives.items():
+        values = derived[key]
+        if goal == 'min':
+            columns.append(values)
+        elif goal == 'max':
+            columns.append(-values)
+        else:
+            columns.append(np.abs(values - float(goal)))
+    return np.column_stack(columns)
+
+
+def within_bounds(derived: Dict[str, np.ndarray], output_bounds: OutputBounds) -> np.ndarray:
+    """Rows whose outputs all lie within their (inclusive) bounds."""
+    mask = np.ones(len(next(iter(derived.values()))), dtype=bool)
+    for key, (lo, hi) in output_bounds.items():
+        values = derived[key]
+        if lo is not None:
+            mask &= values >= lo
+        if hi is not None:
+            mask &= values <= hi
+    return mask
+
+
+def pareto_front(costs: np.ndarray) -> np.ndarray:
+    """
+    Indices of the non-dominated rows of a cost matrix (lower is better).
+
+    A row is dominated if another row is no worse in every column and
+    better in at least one. Duplicate rows are kept once.
+    """
+    candidates = np.arange(len(costs))
+    remaining = costs
+    i = 0
+    while i < len(remaining):
+        row = remaining[i]
+        # Keep rows better than row in some column; drop duplicates of row
+        keep = np.any(remaining < row, axis=1)
+        keep[i] = True
+        candidates = candidates[keep]
+        remaining = remaining[keep]
+        i = int(np.sum(keep[:i])) + 1
+    return candidates
+
+
+def _spread_indices(costs: np.ndarray, count: int) -> List[int]:
+    """Up to count front rows evenly spread along the first objective."""
+    order = np.argsort(costs[:, 0], kind='stable')
+    if len(order) <= count:
+        return [int(i) for i in order]
+    picks = np.linspace(0, len(order) - 1, count).round().astype(int)
+    return [int(order[p]) for p in picks]
+
+
+def optimize_design(params: Dict[str, Any], inputs: Sequence[str],
+                    objectives: Dict[str, Objective],
+                    bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+                    samples: int = DEFAULT_SAMPLES, rounds: int = DEFAULT_ROUNDS,
+                    seed: Optional[int] = None,
+                    view_points: int = DEFAULT_VIEW_POINTS,
+                    output_bounds: Optional[OutputBounds] = None) -> Dict[str, Any]:
+    """
+    Search for the Pareto front of a design over the given inputs.
+
+    Args:
+        params: Base design; inputs not searched keep these values
+        inputs: Numeric inputs to vary
+        objectives: {output: 'min' | 'max' | target value}
+        bounds: Optional {input: (min, max)} narrowing registry ranges
+        samples: Initial Latin-hypercube sample size
+        rounds: Refinement rounds around the front
+        seed: Random seed for reproducible searches
+        view_points: Number of front points to render side views for
+        output_bounds: {output: (min, max)} a design must satisfy, merged
+                       over DEFAULT_OUTPUT_BOUNDS (give (None, None) to lift
+                       a default)
+
+    Returns:
+        Dictionary with:
+            - inputs, objectives
+            - front: list of rows {input: value, ..., output: value, ...}
+              sorted by the first objective
+            - views: list of {index, svg} for the rendered front rows
+            - evaluations: number of designs evaluated
+            - feasible: how many of them were feasible
+            - within_bounds: how many feasible ones met the output bounds
+            - output_bounds: the bounds applied
+    """
+    params = ParameterSet.resolve(params)
+    inputs = list(inputs)
+    if not inputs:
+        raise ValueError("At least one input is required")
+    if not objectives:
+        raise ValueError("At least one objective is required")
+
+    allowed = numeric_inputs(params.instrument_family)
+    for key in inputs:
+        if key not in allowed:
+            raise ValueError(f"'{key}' is not a numeric input for {params.instrument_family}")
+    outputs = calculate_derived_values_batch(dict(params), size=1)
+    for key, goal in objectives.items():
+        if key not in outputs:
+            raise ValueError(f"Unknown derived output '{key}'")
+        if isinstance(goal, str) and goal not in ('min', 'max'):
+            raise ValueError(f"Objective for {key} must be 'min', 'max' or a target value")
+    output_bounds = {**DEFAULT_OUTPUT_BOUNDS, **(output_bounds or {})}
+    for key in output_bounds:
+        if key not in outputs:
+            raise ValueError(f"Unknown derived output '{key}'")
+
+    bounds = {key: (bounds or {}).get(key) or input_range(key) for key in inputs}
+    lo = np.array([bounds[key][0] for key in inputs])
+    hi = np.array([bounds[key][1] for key in inputs])
+    integer = np.array([is_integer_input(key) for key in inputs])
+
+    rng = np.random.default_rng(seed)
+    candidates = latin_hypercube_columns(bounds, samples, seed=rng.integers(2 ** 32))
+    x = np.column_stack([candidates[key] for key in inputs])
+
+    evaluations = 0
+    feasible_count = 0
+    bounded_count = 0
+    kept_x = np.empty((0, len(inputs)))
+    kept_costs = np.empty((0, len(objectives)))
+    kept_derived: Dict[str, np.ndarray] = {}
+
+    for round_index in range(rounds + 1):
+        columns = {**params, **{key: x[:, i] for i, key in enumerate(inputs)}}
+        derived = calculate_derived_values_batch(columns, size=len(x))
+        mask = batch_feasible_mask(columns, derived)
+        evaluations += len(x)
+        feasible_count += int(mask.sum())
+        mask &= within_bounds(derived, output_bounds)
+        bounded_count += int(mask.sum())
+
+        # Merge accepted candidates with the previous front and re-rank
+        costs = _costs(derived, objectives)[mask]
+        pool_x = np.vstack([kept_x, x[mask]])
+        pool_costs = np.vstack([kept_costs, costs])
+        pool_derived = {
+            key: np.concatenate([kept_derived.get(key, np.empty(0)), values[mask]])
+            for key, values in derived.items()
+        }
+        front = pareto_front(pool_costs)
+        kept_x, kept_costs = pool_x[front], pool_costs[front]
+        kept_derived = {key: values[front] for key, values in pool_derived.items()}
+
+        if round_index == rounds or len(kept_x) == 0:
+            break
+
+        # Next round: perturb random front points with a shrinking spread
+        spread = INITIAL_SPREAD / (2 ** round_index) * (hi - lo)
+        parents = kept_x[rng.integers(len(kept_x), size=REFINE_SAMPLES)]
+        x = np.clip(parents + rng.normal(0.0, 1.0, parents.shape) * spread, lo, hi)
+        x[:, integer] = np.round(x[:, integer])
+
+    order = np.argsort(kept_costs[:, 0], kind='stable')
+    front_rows = []
+    for i in order:
+        row = {key: float(kept_x[i, j]) for j, key in enumerate(inputs)}
+        row.update({key: float(kept_derived[key][i]) for key in objectives})
+        front_rows.append(row)
+
+    views = []
+    for index in _spread_indices(kept_costs[order], view_points) if len(order) else []:
+        design = params.replace(**{key: front_rows[index][key] for key in inputs})
+        views.append({'index': index, 'svg': generate_side_view_svg(design)})
+
+    return {
+        'inputs': inputs,
+        'objectives': dict(objectives),
+        'front': front_rows,
+        'views': views,
+        'evaluations': evaluations,
+        'feasible': feasible_count,
+        'within_bounds': bounded_count,
+        'output_bounds': output_bounds
+    }
+
+
+def front_to_csv(result: Dict[str, Any]) -> str:
+    """The Pareto front as CSV text, one row per design."""
+    columns = result['inputs'] + list(result['objectives'])
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator='\n')
+    writer.writeheader()
+    for row in result['front']:
+        writer.writerow({key: row[key] for key in columns})
+    return buffer.getvalue()
@@ -0,0 +1,216 @@
+"""
+Overstand - Design Session
+
+Stateful counterpart of instrument_generator.generate_violin_neck for
+interactive editing. A DesignSession holds the current parameters and the
+last generated derived values and views; update() takes a patch of changed
+keys and returns only what actually changed.
+
+An update:
+- applies the patch with ParameterSet.replace (None resets a key)
+- validates and pre-checks it like generate_violin_neck
+- rebuilds the generation context (stage caches make unchanged stages free)
+- renders only the views change_impact.affected_by says the changed keys
+  can reach
+- returns the derived values that differ and the views whose content hash
+  differs, plus the hash of every view so the front end can skip DOM
+  updates for unchanged ones
+
+A rejected patch still becomes the current parameters, but the rendered
+state stays that of the last accepted design, and the next update diffs
+against it, so no view is left stale.
+
+Every accepted design is recorded in a DesignHistory; undo() and redo()
+restore a snapshot from its cached results when they are still held and
+regenerate it otherwise, returning the same delta as update().
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from change_impact import VIEWS, affected_by
+from design_history import DesignHistory
+from feasibility import check_feasibility
+from instrument_geometry import build_generation_context, generate_multi_view_svg
+from parameter_registry import validate_parameters
+from parameter_set import ParameterSet
+from view_generator import generate_fret_positions_view
+
+_MISSING = object()
+
+
+def content_hash(content: Any) -> str:
+    """SHA-256 of a view (SVG text, or JSON-serialisable data such as the fret table)."""
+    text = content if isinstance(content, str) else json.dumps(content, sort_keys=True)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _changed_keys(params: ParameterSet, previous: ParameterSet) -> List[str]:
+    return sorted(key for key in set(params) | set(previous)
+                  if params.get(key, _MISSING) != previous.get(key, _MISSING))
+
+
+class DesignSession:
+    """Current design plus its last rendered derived values and views."""
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None, history: Optional[DesignHistory] = None):
+        """
+        Args:
+            params: Initial parameters (resolved against the registry);
+                    nothing is rendered until start() or update()
+            history: Undo/redo buffer (default: a DesignHistory with its
+                     default bounds)
+        """
+        self.params = ParameterSet.resolve(params)
+        self.history = history if history is not None else DesignHistory()
+        self.rendered_params: Optional[ParameterSet] = None
+        self.derived: Dict[str, Any] = {}
+        self.views: Dict[str, Any] = {}
+        self.view_hashes: Dict[str, str] = {}
+
+    def start(self) -> Dict[str, Any]:
+        """Render everything for the current parameters (see update for the result)."""
+        self.rendered_params = None
+        self.derived = {}
+        self.views = {}
+        self.view_hashes = {}
+        return self._render(None)
+
+    def update(self, patch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a patch and render what it changes.
+
+        Args:
+            patch: {key: new value}; None resets a key to its default
+
+        Returns:
+            Dictionary with:
+                - success: whether the patched design could be generated
+                - changed_keys: inputs that differ from the last rendered design
+                - derived_values: derived values that changed
+                - removed_values: derived keys that no longer exist
+                - views: {view: content} for views whose content changed
+                  ('fret_positions' is the fret table data)
+                - view_hashes: content hash of every rendered view
+                - can_undo, can_redo
+                - errors (and failures from the feasibility pre-check)
+        """
+        self.params = self.params.replace(**patch)
+        if self.rendered_params is None:
+            return self._render(None)
+        return self._render(_changed_keys(self.params, self.rendered_params))
+
+    def undo(self) -> Dict[str, Any]:
+        """
+        Return to the previous accepted design.
+
+        Returns:
+            The delta from the current design (see update), plus params:
+            the restored parameters
+        """
+        return self._restore(self.history.undo(), "Nothing to undo")
+
+    def redo(self) -> Dict[str, Any]:
+        """Return to the next design after an undo (see undo)."""
+        return self._restore(self.history.redo(), "Nothing to redo")
+
+    def _restore(self, snapshot: Optional[Dict[str, Any]], empty_message: str) -> Dict[str, Any]:
+        if snapshot is None:
+            return self._result(False, [], [empty_message])
+
+        params = snapshot['params']
+        changed = _changed_keys(params, self.rendered_params)
+        self.params = params
+        if snapshot['derived'] is None:
+            # Results were evicted: regenerate and cache them again
+            result = self._render(changed, record=False)
+            if result['success']:
+                self.history.replace_current(self.derived, self.views, self.view_hashes)
+        else:
+            result = self._result(True, changed)
+            for view, digest in snapshot['view_hashes'].items():
+                if self.view_hashes.get(view) != digest:
+                    result['views'][view] = snapshot['views'][view]
+            self._apply(params, snapshot['derived'], snapshot['views'], snapshot['view_hashes'], result)
+        result['params'] = params.to_dict()
+        return result
+
+    def _result(self, success: bool, changed: List[str], errors: Optional[List[str]] = None) -> Dict[str, Any]:
+        return {
+            'success': success,
+            'changed_keys': changed,
+            'derived_values': {},
+            'removed_values': [],
+            'views': {},
+            'view_hashes': dict(self.view_hashes),
+            'can_undo': self.history.can_undo,
+            'can_redo': self.history.can_redo,
+            'errors': errors or []
+        }
+
+    def _apply(self, params: ParameterSet, derived: Dict[str, Any], views: Dict[str, Any],
+               view_hashes: Dict[str, str], result: Dict[str, Any]) -> None:
+        """Make a rendered design current and fill in the derived-value delta."""
+        result['derived_values'] = {key: value for key, value in derived.items()
+                                    if self.derived.get(key, _MISSING) != value}
+        result['removed_values'] = sorted(key for key in self.derived if key not in derived)
+        self.derived = dict(derived)
+        self.views.update(views)
+        self.view_hashes.update(view_hashes)
+        self.rendered_params = params
+        result['view_hashes'] = dict(self.view_hashes)
+        result['can_undo'] = self.history.can_undo
+        result['can_redo'] = self.history.can_redo
+
+    def _render(self, changed: Optional[List[str]], record: bool = True) -> Dict[str, Any]:
+        params = self.params
+        result = self._result(False, changed if changed is not None else sorted(params))
+
+        is_valid, errors = validate_parameters(params)
+        if not is_valid:
+            result['errors'] = errors
+            return result
+        feasibility = check_feasibility(params)
+        if not feasibility['feasible']:
+            result['errors'] = [failure['message'] for failure in feasibility['failures']]
+            result['failures'] = feasibility['failures']
+            return result
+
+        try:
+            context = build_generation_context(params)
+            views = list(VIEWS) if changed is None else affected_by(changed)['views']
+            rendered = generate_multi_view_svg(params, context=context, views=views)
+            rendered.pop('top', None)
+            if 'fret_positions' in views:
+                rendered['fret_positions'] = generate_fret_positions_view(params, fret_positions=context.fret_positions)
+        except ValueError as e:
+            # Math domain errors or invalid geometric constraints
+            result['errors'] = [str(e)]
+            return result
+
+        hashes = {view: content_hash(content) for view, content in rendered.items()}
+        result['views'] = {view: content for view, content in rendered.items()
+                           if self.view_hashes.get(view) != hashes[view]}
+        if record and (changed is None or changed):
+            # Record first so can_undo in the result includes this design
+            self.history.push(params, context.derived, {**self.views, **rendered}, {**self.view_hashes, **hashes})
+        self._apply(params, context.derived, rendered, hashes, result)
+        result['success'] = True
+        return result
+
+
+_SESSION: Optional[DesignSession] = None
+
+
+def start_session(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Replace the current session with one for params and render it."""
+    global _SESSION
+    _SESSION = DesignSession(params)
+    return _SESSION.start()
+
+
+def get_session() -> DesignSession:
+    """The current session (raises ValueError before start_session)."""
+    if _SESSION is None:
+        raise ValueError("No design session; start one first")
+    return _SESSION
@@ -0,0 +1,217 @@
+"""
+Overstand - Feasibility Pre-check
+
+Closed-form checks of every known domain constraint of the geometry
+pipeline, evaluated before any fret, geometry or SVG work.
+
+Each check mirrors a place where generation would otherwise fail part-way:
+
+- RADIUS_TOO_SMALL: the radius template needs a fingerboard radius larger
+  than half the template width (fingerboard_width_at_end + margin)
+- BODY_STOP_ZERO, FINGERBOARD_LENGTH_ZERO: divisions in the violin/viol
+  string angles
+- FRET_JOIN_BEYOND_FRETS, TOO_FEW_FRETS: guitar/mandolin geometry indexes
+  the fret at the body join and the 12th fret
+- SCALE_LENGTH_ZERO: guitar/mandolin fret positions collapse to the nut
+- STRING_ANGLE_IMPOSSIBLE: the guitar/mandolin string angle is asin of a
+  value outside [-1, 1]
+- NECK_STOP_ZERO: the string meets the body join at the nut, so the neck
+  angle divides by zero
+
+Only conditions that make generation fail are reported; a design that
+passes will build (fingerboard sagitta, for example, already falls back to
+an approximation when the radius is smaller than the half-width).
+"""
+
+import math
+import numpy as np
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+from constants import (
+    DEFAULT_FINGERBOARD_RADIUS,
+    DEFAULT_FB_VISIBLE_HEIGHT_AT_JOIN,
+    DEFAULT_FB_WIDTH_AT_END,
+    TEMPLATE_WIDTH_MARGIN
+)
+from parameter_registry import InstrumentFamily
+from parameter_set import ParameterSet
+from geometry_engine import calculate_sagitta, resolve_fret_count
+import fret_kernel
+
+
+class FailureCode(Enum):
+    """Why a design cannot be generated"""
+    RADIUS_TOO_SMALL = "radius_too_small"
+    BODY_STOP_ZERO = "body_stop_zero"
+    FINGERBOARD_LENGTH_ZERO = "fingerboard_length_zero"
+    FRET_JOIN_BEYOND_FRETS = "fret_join_beyond_frets"
+    TOO_FEW_FRETS = "too_few_frets"
+    SCALE_LENGTH_ZERO = "scale_length_zero"
+    STRING_ANGLE_IMPOSSIBLE = "string_angle_impossible"
+    NECK_STOP_ZERO = "neck_stop_zero"
+
+
+def _failure(code: FailureCode, message: str, parameters: List[str]) -> Dict[str, Any]:
+    return {'code': code.name, 'message': message, 'parameters': parameters}
+
+
+def radius_template_fits(fingerboard_radius, fb_width_at_end):
+    """
+    Whether the radius template can be drawn. Works on floats or NumPy arrays.
+    """
+    return fingerboard_radius > (fb_width_at_end + TEMPLATE_WIDTH_MARGIN) / 2.0
+
+
+def defined_outputs(derived: Dict[str, np.ndarray]) -> List[str]:
+    """Outputs of a batch result that are finite in at least one row (those of the rows' family)."""
+    return [key for key, values in derived.items() if np.isfinite(values).any()] or ['neck_angle']
+
+
+def batch_feasible_mask(columns: Dict[str, Any], derived: Dict[str, np.ndarray],
+                        outputs: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Rows of a batch-engine evaluation that pass every feasibility check.
+
+    The batch engine already returns NaN for rows that fail the
+    derived-value constraints; this adds the ones it does not see.
+
+    Args:
+        columns: Input columns passed to calculate_derived_values_batch
+        derived: Its result
+        outputs: Outputs that must be finite (default: defined_outputs(derived))
+    """
+    if outputs is None:
+        outputs = defined_outputs(derived)
+    mask = np.ones(len(derived[outputs[0]]), dtype=bool)
+    for key in outputs:
+        mask &= np.isfinite(derived[key])
+    fingerboard_radius = columns.get('fingerboard_radius')
+    fb_width_at_end = columns.get('fingerboard_width_at_end')
+    return mask & radius_template_fits(DEFAULT_FINGERBOARD_RADIUS if fingerboard_radius is None else fingerboard_radius,
+                                       DEFAULT_FB_WIDTH_AT_END if fb_width_at_end is None else fb_width_at_end)
+
+
+def _check_bowed(params: Dict[str, Any], vsl: float, fb_thickness_at_join: float) -> List[Dict[str, Any]]:
+    body_stop = params.get('body_stop') or 0
+    fingerboard_length = params.get('fingerboard_length') or 0
+
+    failures = []
+    if body_stop == 0:
+        failures.append(_failure(FailureCode.BODY_STOP_ZERO,
+                                 "Body stop must be greater than zero.", ['body_stop']))
+    if fingerboard_length == 0:
+        failures.append(_failure(FailureCode.FINGERBOARD_LENGTH_ZERO,
+                                 "Fingerboard length must be greater than zero.", ['fingerboard_length']))
+    if failures:
+        return failures
+
+    # Same expressions as geometry_engine.calculate_string_angles_violin
+    string_height_nut = params.get('string_height_nut') or 0
+    string_height_eof = params.get('string_height_eof') or 0
+    string_height_at_join = (string_height_eof - string_height_nut) * ((vsl - body_stop) / fingerboard_length) + string_height_nut
+    opposite = ((params.get('arching_height') or 0) + (params.get('bridge_height') or 0)
+                - (params.get('overstand') or 0) - fb_thickness_at_join - string_height_at_join)
+    string_to_join = math.sqrt(opposite ** 2 + body_stop ** 2)
+    neck_stop = math.cos(math.atan(opposite / body_stop)) * (vsl - string_to_join)
+
+    if neck_stop == 0:
+        failures.append(_failure(
+            FailureCode.NECK_STOP_ZERO,
+            f"The string from the bridge reaches the body join exactly at the nut ({string_to_join:.1f}mm "
+            f"of a {vsl:.1f}mm string length). Adjust vsl or body_stop.",
+            ['vsl', 'body_stop']))
+    return failures
+
+
+def _check_guitar(params: Dict[str, Any], vsl: float, fb_thickness_at_join: float) -> List[Dict[str, Any]]:
+    fret_join = params.get('fret_join') or 12
+    no_frets = resolve_fret_count(params)
+
+    failures = []
+    if fret_join >= no_frets:
+        failures.append(_failure(
+            FailureCode.FRET_JOIN_BEYOND_FRETS,
+            f"The neck joins the body at fret {fret_join}, but only {no_frets} frets are calculated. "
+            f"Increase no_frets or decrease fret_join.",
+            ['fret_join', 'no_frets']))
+    if no_frets <= 12:
+        failures.append(_failure(
+            FailureCode.TOO_FEW_FRETS,
+            f"Guitar/mandolin geometry needs at least 13 frets (string height is set at the 12th fret), "
+            f"but no_frets is {no_frets}.",
+            ['no_frets']))
+    if vsl == 0:
+        failures.append(_failure(FailureCode.SCALE_LENGTH_ZERO,
+                                 "String length (vsl) must be greater than zero.", ['vsl']))
+    if failures:
+        return failures
+
+    # Same expressions as geometry_engine.calculate_string_angles_guitar
+    string_height_nut = params.get('string_height_nut') or 0
+    string_height_12th_fret = params.get('string_height_12th_fret') or 0
+    arching_height = params.get('arching_height') or 0
+    bridge_height = params.get('bridge_height') or 0
+    overstand = params.get('overstand') or 0
+
+    fret_positions = fret_kernel.fret_positions(vsl, max(fret_join, 12) + 1)
+    fret_at_join = fret_positions[fret_join]
+    fret_12 = fret_positions[12]
+    string_height_at_join = (string_height_12th_fret - string_height_nut) * (fret_at_join / fret_12) + string_height_nut
+    hypotenuse = vsl - fret_at_join
+    opposite = arching_height + bridge_height - overstand - fb_thickness_at_join - string_height_at_join
+    sin_value = opposite / hypotenuse
+
+    if abs(sin_value) > 1.0:
+        failures.append(_failure(
+            FailureCode.STRING_ANGLE_IMPOSSIBLE,
+            f"Geometric constraints are impossible: string angle calculation requires sin({sin_value:.3f}). "
+            f"Try adjusting: bridge_height ({bridge_height:.1f}mm), arching_height ({arching_height:.1f}mm), "
+            f"overstand ({overstand:.1f}mm), or neck angle to make the geometry work.",
+            ['bridge_height', 'arching_height', 'overstand', 'vsl', 'fret_join']))
+    elif abs(sin_value) == 1.0:
+        failures.append(_failure(
+            FailureCode.NECK_STOP_ZERO,
+            "The string would run perpendicular to the ribs, leaving no neck. "
+            "Adjust bridge_height, arching_height or overstand.",
+            ['bridge_height', 'arching_height', 'overstand']))
+    return failures
+
+
+def check_feasibility(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check every known domain constraint of the design in closed form.
+
+    Args:
+        params: Design parameters (resolved against the registry)
+
+    Returns:
+        Dictionary with:
+            - feasible: True if generation will not hit a domain error
+            - failures: list of {code, message, parameters}, where code is a
+              FailureCode name and parameters lists the inputs involved
+    """
+    params = ParameterSet.resolve(params)
+    failures = []
+
+    fingerboard_radius = params['fingerboard_radius']
+    fb_width_at_end = params['fingerboard_width_at_end']
+    if not radius_template_fits(fingerboard_radius, fb_width_at_end):
+        failures.append(_failure(
+            FailureCode.RADIUS_TOO_SMALL,
+            f"Fingerboard radius ({fingerboard_radius:.1f}mm) must be larger than half the template width "
+            f"({(fb_width_at_end + TEMPLATE_WIDTH_MARGIN) / 2.0:.1f}mm). "
+            f"Increase fingerboard_radius or decrease fb_width_at_end.",
+            ['fingerboard_radius', 'fingerboard_width_at_end']))
+
+    vsl = params.get('vsl') or 0
+    sagitta_at_join = calculate_sagitta(params.get('fingerboard_radius') or DEFAULT_FINGERBOARD_RADIUS,
+                                        params.get('fingerboard_width_at_end') or DEFAULT_FB_WIDTH_AT_END)
+    fb_thickness_at_join = (params.get('fb_visible_height_at_join') or DEFAULT_FB_VISIBLE_HEIGHT_AT_JOIN) + sagitta_at_join
+
+    instrument_family = params.get('instrument_family') or InstrumentFamily.VIOLIN.name
+    if instrument_family == InstrumentFamily.GUITAR_MANDOLIN.name:
+        failures.extend(_check_guitar(params, vsl, fb_thickness_at_join))
+    else:
+        failures.extend(_check_bowed(params, vsl, fb_thickness_at_join))
+
+    return {'feasible': not failures, 'failures': failures}
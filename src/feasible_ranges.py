@@ -0,0 +1,181 @@
+"""
+Overstand - Feasible Ranges
+
+For the current design, the interval of each numeric input (the others held
+fixed) over which the geometry can be built, so the UI can clamp sliders
+instead of firing generations that fail.
+
+A design is feasible when the batch engine produces finite values for every
+derived output of its family (impossible guitar string angles, division by
+zero and similar failures show up there as NaN rows) and it passes the
+feasibility pre-check constraints the derived values do not cover, such as
+the radius template fitting the fingerboard.
+
+The search is batched across all inputs at once:
+1. Every input's registry range is sampled on a grid; all grids are stacked
+   into one batch-engine call.
+2. For each input, the run of feasible grid points containing the current
+   value (or the run closest to it) is taken as the feasible interval.
+3. Each boundary between a feasible and an infeasible grid point is refined
+   by sampling between them, again with all boundaries in one call per round.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from batch_engine import calculate_derived_values_batch
+from parameter_set import ParameterSet, numeric_inputs, input_range, is_integer_input
+from feasibility import batch_feasible_mask, defined_outputs
+
+# Grid points per input across its registry range
+GRID_POINTS = 65
+
+# Each refinement round samples this many points inside every boundary bracket
+REFINE_POINTS = 17
+REFINE_ROUNDS = 3
+
+
+def _stack(params: ParameterSet, blocks: List[Tuple[str, np.ndarray]]) -> Tuple[Dict[str, Any], int]:
+    """Columns for stacked blocks; block i varies only its input."""
+    total = sum(len(values) for _, values in blocks)
+    columns: Dict[str, Any] = dict(params)
+    offset = 0
+    for key, values in blocks:
+        if not isinstance(columns[key], np.ndarray):
+            columns[key] = np.full(total, float(params[key]))
+        columns[key][offset:offset + len(values)] = values
+        offset += len(values)
+    return columns, total
+
+
+def _run_around(mask: np.ndarray, grid: np.ndarray, current: float) -> Optional[Tuple[int, int]]:
+    """Index range [i, j] of the feasible run containing, or nearest to, current."""
+    runs = []
+    start = None
+    for i, ok in enumerate(mask):
+        if ok and start is None:
+            start = i
+        elif not ok and start is not None:
+            runs.append((start, i - 1))
+            start = None
+    if start is not None:
+        runs.append((start, len(mask) - 1))
+    if not runs:
+        return None
+
+    def distance(run: Tuple[int, int]) -> float:
+        lo, hi = grid[run[0]], grid[run[1]]
+        return 0.0 if lo <= current <= hi else min(abs(current - lo), abs(current - hi))
+
+    return min(runs, key=distance)
+
+
+def _grid(key: str, grid_points: int) -> np.ndarray:
+    lo, hi = input_range(key)
+    if is_integer_input(key):
+        return np.arange(lo, hi + 1)
+    return np.linspace(lo, hi, grid_points)
+
+
+def feasible_ranges(params: Dict[str, Any], inputs: Optional[Sequence[str]] = None,
+                    grid_points: int = GRID_POINTS,
+                    refine_rounds: int = REFINE_ROUNDS) -> Dict[str, Dict[str, Any]]:
+    """
+    Feasible interval of each numeric input, the others held at their values.
+
+    Args:
+        params: Current design
+        inputs: Inputs to analyse (default: every numeric input of the family)
+        grid_points: Grid points across each registry range
+        refine_rounds: Boundary refinement rounds (integer inputs are exact
+                       on the grid and not refined)
+
+    Returns:
+        {input: {
+            min, max: feasible interval (None if nothing in range is feasible),
+            registry_min, registry_max: the registry range,
+            current: current value,
+            current_feasible: whether the current design is feasible,
+            limited: True if the feasible interval is narrower than the
+                     registry range
+        }}
+    """
+    params = ParameterSet.resolve(params)
+    if inputs is None:
+        inputs = numeric_inputs(params.instrument_family)
+    inputs = list(inputs)
+    if not inputs:
+        return {}
+
+    grids = {key: _grid(key, grid_points) for key in inputs}
+    # Block 0 is the unperturbed design
+    first = inputs[0]
+    blocks = [(first, np.array([float(params[first])]))] + [(key, grids[key]) for key in inputs]
+    columns, total = _stack(params, blocks)
+    batch = calculate_derived_values_batch(columns, size=total)
+
+    # Refinement rounds must judge feasibility by the same outputs
+    outputs = defined_outputs(batch)
+    mask = batch_feasible_mask(columns, batch, outputs)
+    current_feasible = bool(mask[0])
+
+    results = {}
+    # Open brackets: [key, side, feasible value, infeasible value]
+    brackets: List[List[Any]] = []
+    offset = 1
+    for key in inputs:
+        grid = grids[key]
+        block_mask = mask[offset:offset + len(grid)]
+        offset += len(grid)
+        lo, hi = input_range(key)
+        current = float(params[key])
+        run = _run_around(block_mask, grid, current)
+
+        result = {
+            'min': None, 'max': None,
+            'registry_min': lo, 'registry_max': hi,
+            'current': current,
+            'current_feasible': current_feasible
+        }
+        if run is not None:
+            i, j = run
+            result['min'], result['max'] = float(grid[i]), float(grid[j])
+            if not is_integer_input(key):
+                if i > 0:
+                    brackets.append([key, 'min', grid[i], grid[i - 1]])
+                if j < len(grid) - 1:
+                    brackets.append([key, 'max', grid[j], grid[j + 1]])
+        results[key] = result
+
+    for _ in range(refine_rounds):
+        if not brackets:
+            break
+        samples = [np.linspace(good, bad, REFINE_POINTS)[1:-1] for _, _, good, bad in brackets]
+        columns, total = _stack(params, [(b[0], s) for b, s in zip(brackets, samples)])
+        refined = batch_feasible_mask(columns, calculate_derived_values_batch(columns, size=total), outputs)
+        offset = 0
+        for bracket, points in zip(brackets, samples):
+            ok = refined[offset:offset + len(points)]
+            offset += len(points)
+            # Walk out from the feasible end to the first failure
+            failures = np.flatnonzero(~ok)
+            first_bad = failures[0] if failures.size else len(points)
+            if first_bad > 0:
+                bracket[2] = points[first_bad - 1]
+            if first_bad < len(points):
+                bracket[3] = points[first_bad]
+
+    for key, side, good, _ in brackets:
+        results[key][side] = float(good)
+
+    for result in results.values():
+        result['limited'] = (result['min'] is None
+                             or result['min'] > result['registry_min']
+                             or result['max'] < result['registry_max'])
+    return results
+
+
+def clamp_to_feasible(value: float, feasible: Dict[str, Any]) -> Optional[float]:
+    """Clamp a slider value into one feasible_ranges() entry (None if infeasible everywhere)."""
+    if feasible['min'] is None:
+        return None
+    return min(max(value, feasible['min']), feasible['max'])
@@ -0,0 +1,134 @@
+"""
+Overstand - Fret Kernel
+
+Equal-temperament fret positions from a precomputed ratio table.
+
+Fret n sits at  vsl - vsl / 2**(n/12)  from the nut. The divisors 2**(n/12)
+are computed once (and the table grows on demand), so a position is a single
+multiply-subtract. Four entry points:
+
+- fret_positions(vsl, no_frets): one scale, list of floats (scalar path)
+- fret_positions_batch(vsls, no_frets): many scales at once, as an
+  (n_scales, no_frets) array, e.g. for printing fret templates in bulk
+- fret_position_batch(vsls, frets): one fret per scale, where the fret
+  number varies by row (the batch engine's fret at the body join)
+- multiscale_frets(...): fanned-fret fingerboards where each string has its
+  own scale, with per-string positions and the slot angle of every fret
+"""
+
+import numpy as np
+from typing import Dict, Any, List
+
+# Frets covered by the initial table; longer requests extend it
+DEFAULT_TABLE_FRETS = 36
+
+# _DIVISORS[n] = 2 ** (n / 12); index 0 is the nut
+_DIVISORS: List[float] = [2 ** (n / 12) for n in range(DEFAULT_TABLE_FRETS + 1)]
+_DIVISOR_ARRAY = np.array(_DIVISORS)
+
+
+def _ensure_table(no_frets: int) -> None:
+    global _DIVISOR_ARRAY
+    if no_frets >= len(_DIVISORS):
+        _DIVISORS.extend(2 ** (n / 12) for n in range(len(_DIVISORS), no_frets + 1))
+        _DIVISOR_ARRAY = np.array(_DIVISORS)
+
+
+def fret_ratio(fret: int) -> float:
+    """Fraction of the scale length from nut to fret (0 at the nut, 0.5 at fret 12)."""
+    _ensure_table(fret)
+    return 1.0 - 1.0 / _DIVISORS[fret]
+
+
+def fret_positions(vsl: float, no_frets: int) -> List[float]:
+    """Distances from the nut of frets 1..no_frets."""
+    _ensure_table(no_frets)
+    return [vsl - vsl / d for d in _DIVISORS[1:no_frets + 1]]
+
+
+def fret_positions_batch(vsls, no_frets: int) -> np.ndarray:
+    """
+    Fret positions for many scale lengths at once.
+
+    Args:
+        vsls: Array-like of scale lengths (n_scales,)
+        no_frets: Number of frets
+
+    Returns:
+        (n_scales, no_frets) array; row i is fret_positions(vsls[i], no_frets)
+    """
+    _ensure_table(no_frets)
+    vsls = np.asarray(vsls, dtype=float).reshape(-1, 1)
+    return vsls - vsls / _DIVISOR_ARRAY[1:no_frets + 1]
+
+
+def fret_position_batch(vsls, frets) -> np.ndarray:
+    """
+    Position of one fret per scale length.
+
+    Args:
+        vsls: Array-like of scale lengths (n,)
+        frets: Array-like of fret numbers (n,), rounded to whole frets;
+               0 is the nut
+
+    Returns:
+        (n,) array of distances from the nut; NaN where a fret number is
+        NaN or negative
+    """
+    vsls, frets = np.broadcast_arrays(np.asarray(vsls, dtype=float), np.asarray(frets, dtype=float))
+    valid = np.isfinite(frets) & (frets >= 0)
+    index = np.where(valid, np.round(frets), 0).astype(int)
+    _ensure_table(int(index.max()) if index.size else 0)
+    return np.where(valid, vsls - vsls / _DIVISOR_ARRAY[index], np.nan)
+
+
+def multiscale_frets(bass_scale: float, treble_scale: float, n_strings: int,
+                     no_frets: int, string_span: float,
+                     perpendicular_fret: int = 0) -> Dict[str, Any]:
+    """
+    Fret layout for a fanned (multiscale) fingerboard.
+
+    Scales are interpolated linearly from the bass string (string 0) to the
+    treble string. Strings are treated as parallel, string_span apart between
+    the outer two, and every string is positioned so that perpendicular_fret
+    (0 = nut) lies on a line square to the strings.
+
+    Args:
+        bass_scale: Scale length of the lowest string
+        treble_scale: Scale length of the highest string
+        n_strings: Number of strings (>= 2)
+        no_frets: Number of frets
+        string_span: Distance between the outer strings
+        perpendicular_fret: Fret that is square to the strings
+
+    Returns:
+        Dictionary with:
+            - scales: (n_strings,) scale length per string
+            - positions: (n_strings, no_frets) fret distances from each string's nut
+            - offsets: (n_strings, no_frets + 1) position of the nut and every fret
+              along the strings, measured from the perpendicular fret
+            - slot_angles: (no_frets + 1,) angle of the nut and every fret slot
+              from square, in degrees (positive when the bass end of the slot
+              lies further toward the bridge than the treble end)
+    """
+    if n_strings < 2:
+        raise ValueError("A multiscale layout needs at least two strings")
+    if not 0 <= perpendicular_fret <= no_frets:
+        raise ValueError(f"Perpendicular fret must be between 0 and {no_frets}")
+
+    _ensure_table(no_frets)
+    scales = np.linspace(bass_scale, treble_scale, n_strings)
+    positions = fret_positions_batch(scales, no_frets)
+
+    ratios = 1.0 - 1.0 / _DIVISOR_ARRAY[:no_frets + 1]
+    offsets = scales[:, None] * (ratios - ratios[perpendicular_fret])
+
+    # Each slot is straight because scale varies linearly across the strings
+    slot_angles = np.degrees(np.arctan2(offsets[0] - offsets[-1], string_span))
+
+    return {
+        'scales': scales,
+        'positions': positions,
+        'offsets': offsets,
+        'slot_angles': slot_angles
+    }
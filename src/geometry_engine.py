@@ -19,6 +19,17 @@ from constants import (
     EPSILON
 )
 from parameter_registry import InstrumentFamily
+from stage_cache import memoized_stage
+from bezier import evaluate_cubic_bezier, find_t_for_coordinate
+import fret_kernel
+from geometry_records import (
+    FingerboardThickness,
+    StringAngles,
+    NeckGeometry,
+    FingerboardGeometry,
+    StringHeightDimensions,
+    ViolBackBreak
+)
 
 def calculate_sagitta(radius: float, width: float) -> float:
     """
@@ -38,64 +49,22 @@ def calculate_sagitta(radius: float, width: float) -> float:
 # Cubic Bezier Helper Functions
 # ============================================================================
 
-def evaluate_cubic_bezier(p0: tuple, cp1: tuple, cp2: tuple, p3: tuple,
-                          t: float) -> tuple:
-    """
-    Evaluate a cubic Bezier curve at parameter t.
-
-    Args:
-        p0: Start point (x, y)
-        cp1: First control point
-        cp2: Second control point
-        p3: End point
-        t: Parameter value (0 to 1)
-
-    Returns:
-        (x, y) coordinates at parameter t
-    """
-    mt = 1 - t
-    mt2 = mt * mt
-    mt3 = mt2 * mt
-    t2 = t * t
-    t3 = t2 * t
-
-    x = mt3 * p0[0] + 3*mt2*t * cp1[0] + 3*mt*t2 * cp2[0] + t3 * p3[0]
-    y = mt3 * p0[1] + 3*mt2*t * cp1[1] + 3*mt*t2 * cp2[1] + t3 * p3[1]
-
-    return (x, y)
-
-
 def find_bezier_t_for_y(p0: tuple, cp1: tuple, cp2: tuple, p3: tuple,
-                        target_y: float, tolerance: float = 0.0001) -> float:
+                        target_y: float) -> float:
     """
     Find parameter t where Bezier curve has the given y coordinate.
 
-    Uses bisection method for robustness. Assumes y increases monotonically with t.
+    Solves the cubic in closed form (see bezier.find_t_for_coordinate). The
+    curve need not be monotonic; the first crossing is returned.
 
     Args:
         p0, cp1, cp2, p3: Bezier control points
         target_y: Target Y coordinate
-        tolerance: Convergence tolerance
 
     Returns:
         Parameter t (0 to 1) where curve Y equals target_y
     """
-    t_low, t_high = 0.0, 1.0
-
-    for _ in range(50):  # Max iterations
-        t_mid = (t_low + t_high) / 2
-        _, y_mid = evaluate_cubic_bezier(p0, cp1, cp2, p3, t_mid)
-
-        if abs(y_mid - target_y) < tolerance:
-            return t_mid
-
-        # Assuming y increases with t (monotonic curve)
-        if y_mid < target_y:
-            t_low = t_mid
-        else:
-            t_high = t_mid
-
-    return (t_low + t_high) / 2
+    return find_t_for_coordinate(p0, cp1, cp2, p3, target_y, axis=1)
 
 
 def calculate_blend_curve(half_neck_width_at_ribs: float,
@@ -194,12 +163,11 @@ def calculate_blend_curve(half_neck_width_at_ribs: float,
     return result
 
 
-def calculate_fingerboard_thickness(params: Dict[str, Any]) -> Dict[str, Any]:
+@memoized_stage
+def calculate_fingerboard_thickness(params: Dict[str, Any]) -> FingerboardThickness:
     """
     Calculate fingerboard thickness including sagitta for radiused fingerboard.
     """
-    result = {}
-
     fingerboard_radius = params.get('fingerboard_radius') or DEFAULT_FINGERBOARD_RADIUS
     fb_visible_height_at_nut = params.get('fb_visible_height_at_nut') or DEFAULT_FB_VISIBLE_HEIGHT_AT_NUT
     fb_visible_height_at_join = params.get('fb_visible_height_at_join') or DEFAULT_FB_VISIBLE_HEIGHT_AT_JOIN
@@ -212,19 +180,18 @@ def calculate_fingerboard_thickness(params: Dict[str, Any]) -> Dict[str, Any]:
     fb_thickness_at_nut = fb_visible_height_at_nut + sagitta_at_nut
     fb_thickness_at_join = fb_visible_height_at_join + sagitta_at_join
 
-    result['sagitta_at_nut'] = sagitta_at_nut
-    result['sagitta_at_join'] = sagitta_at_join
-    result['fb_thickness_at_nut'] = fb_thickness_at_nut
-    result['fb_thickness_at_join'] = fb_thickness_at_join
+    return FingerboardThickness(
+        sagitta_at_nut=sagitta_at_nut,
+        sagitta_at_join=sagitta_at_join,
+        fb_thickness_at_nut=fb_thickness_at_nut,
+        fb_thickness_at_join=fb_thickness_at_join
+    )
 
-    return result
-
-def calculate_string_angles_violin(params: Dict[str, Any], vsl: float, fb_thickness_at_join: float) -> Dict[str, Any]:
+@memoized_stage
+def calculate_string_angles_violin(params: Dict[str, Any], vsl: float, fb_thickness_at_join: float) -> StringAngles:
     """
     Calculate string angles for violin/viol family instruments.
     """
-    result = {}
-
     body_stop = params.get('body_stop') or 0
     arching_height = params.get('arching_height') or 0
     bridge_height = params.get('bridge_height') or 0
@@ -243,21 +210,20 @@ def calculate_string_angles_violin(params: Dict[str, Any], vsl: float, fb_thickn
     opposite_string_to_fb = string_height_eof - string_height_nut
     string_angle_to_fb = math.atan(opposite_string_to_fb / fingerboard_length) * 180 / math.pi
 
-    result['body_stop'] = body_stop
-    result['neck_stop'] = neck_stop
-    result['string_angle_to_ribs_rad'] = string_angle_to_ribs_rad
-    result['string_angle_to_fb'] = string_angle_to_fb
-    result['string_angle_to_ribs'] = string_angle_to_ribs
-    result['string_angle_to_fingerboard'] = string_angle_to_fb
-
-    return result
-
-def calculate_string_angles_guitar(params: Dict[str, Any], vsl: float, fret_positions: List[float], fb_thickness_at_join: float) -> Dict[str, Any]:
+    return StringAngles(
+        body_stop=body_stop,
+        neck_stop=neck_stop,
+        string_angle_to_ribs_rad=string_angle_to_ribs_rad,
+        string_angle_to_fb=string_angle_to_fb,
+        string_angle_to_ribs=string_angle_to_ribs,
+        string_angle_to_fingerboard=string_angle_to_fb
+    )
+
+@memoized_stage
+def calculate_string_angles_guitar(params: Dict[str, Any], vsl: float, fret_positions: List[float], fb_thickness_at_join: float) -> StringAngles:
     """
     Calculate string angles for guitar/mandolin family instruments.
     """
-    result = {}
-
     fret_join = params.get('fret_join') or 12
     string_height_nut = params.get('string_height_nut') or 0
     string_height_12th_fret = params.get('string_height_12th_fret') or 0
@@ -286,18 +252,19 @@ def calculate_string_angles_guitar(params: Dict[str, Any], vsl: float, fret_posi
     opposite_string_to_join = string_height_at_join - string_height_nut
     string_angle_to_fb = math.atan(opposite_string_to_join / fret_positions[fret_join]) * 180 / math.pi
 
-    result['body_stop'] = body_stop
-    result['neck_stop'] = neck_stop
-    result['string_angle_to_ribs_rad'] = string_angle_to_ribs_rad
-    result['string_angle_to_fb'] = string_angle_to_fb
-    result['string_angle_to_ribs'] = string_angle_to_ribs
-    result['string_angle_to_fingerboard'] = string_angle_to_fb
-
-    return result
+    return StringAngles(
+        body_stop=body_stop,
+        neck_stop=neck_stop,
+        string_angle_to_ribs_rad=string_angle_to_ribs_rad,
+        string_angle_to_fb=string_angle_to_fb,
+        string_angle_to_ribs=string_angle_to_ribs,
+        string_angle_to_fingerboard=string_angle_to_fb
+    )
 
+@memoized_stage
 def calculate_neck_geometry(params: Dict[str, Any], vsl: float, neck_stop: float, string_angle_to_ribs_rad: float,
                           string_angle_to_fb: float, fb_thickness_at_nut: float, fb_thickness_at_join: float,
-                          body_stop: float = None) -> Dict[str, Any]:
+                          body_stop: float = None) -> NeckGeometry:
     """
     Calculate neck angle and nut position.
 
@@ -305,8 +272,6 @@ def calculate_neck_geometry(params: Dict[str, Any], vsl: float, neck_stop: float
         body_stop: The body stop position. For GUITAR_MANDOLIN this is derived from fret
                    positions, so must be passed explicitly. Falls back to params if not provided.
     """
-    result = {}
-
     arching_height = params.get('arching_height') or 0
     bridge_height = params.get('bridge_height') or 0
     overstand = params.get('overstand') or 0
@@ -328,31 +293,30 @@ def calculate_neck_geometry(params: Dict[str, Any], vsl: float, neck_stop: float
     nut_draw_radius = fb_thickness_at_nut + string_height_nut
     neck_line_angle = math.atan2(neck_end_y - overstand, neck_end_x - 0)
 
-    result['neck_angle'] = neck_angle
-    result['neck_stop'] = neck_stop
-    result['neck_angle_rad'] = neck_angle_rad
-    result['neck_end_x'] = neck_end_x
-    result['neck_end_y'] = neck_end_y
-    result['nut_draw_radius'] = nut_draw_radius
-    result['neck_line_angle'] = neck_line_angle
-    result['nut_top_x'] = nut_top_x
-    result['nut_top_y'] = nut_top_y
-    result['bridge_top_x'] = bridge_top_x
-    result['bridge_top_y'] = bridge_top_y
-
     string_length = math.sqrt((bridge_top_x - nut_top_x)**2 + (bridge_top_y - nut_top_y)**2)
-    result['string_length'] = string_length
-    result['nut_relative_to_ribs'] = nut_top_y
-
-    return result
 
+    return NeckGeometry(
+        neck_angle=neck_angle,
+        neck_stop=neck_stop,
+        neck_angle_rad=neck_angle_rad,
+        neck_end_x=neck_end_x,
+        neck_end_y=neck_end_y,
+        nut_draw_radius=nut_draw_radius,
+        neck_line_angle=neck_line_angle,
+        nut_top_x=nut_top_x,
+        nut_top_y=nut_top_y,
+        bridge_top_x=bridge_top_x,
+        bridge_top_y=bridge_top_y,
+        string_length=string_length,
+        nut_relative_to_ribs=nut_top_y
+    )
+
+@memoized_stage
 def calculate_fingerboard_geometry(params: Dict[str, Any], neck_stop: float, neck_end_x: float, neck_end_y: float,
-                                 neck_line_angle: float, fb_thickness_at_nut: float, fb_thickness_at_join: float) -> Dict[str, Any]:
+                                 neck_line_angle: float, fb_thickness_at_nut: float, fb_thickness_at_join: float) -> FingerboardGeometry:
     """
     Calculate fingerboard geometry including direction angle and end position.
     """
-    result = {}
-
     fingerboard_length = params.get('fingerboard_length') or 0
 
     fb_direction_angle = neck_line_angle + math.pi
@@ -360,22 +324,21 @@ def calculate_fingerboard_geometry(params: Dict[str, Any], neck_stop: float, nec
     fb_bottom_end_y = neck_end_y + fingerboard_length * math.sin(fb_direction_angle)
     fb_thickness_at_end = fb_thickness_at_nut + (fb_thickness_at_join - fb_thickness_at_nut) * (fingerboard_length / neck_stop)
 
-    result['fb_direction_angle'] = fb_direction_angle
-    result['fb_bottom_end_x'] = fb_bottom_end_x
-    result['fb_bottom_end_y'] = fb_bottom_end_y
-    result['fb_thickness_at_end'] = fb_thickness_at_end
-
-    return result
+    return FingerboardGeometry(
+        fb_direction_angle=fb_direction_angle,
+        fb_bottom_end_x=fb_bottom_end_x,
+        fb_bottom_end_y=fb_bottom_end_y,
+        fb_thickness_at_end=fb_thickness_at_end
+    )
 
+@memoized_stage
 def calculate_string_height_and_dimensions(params: Dict[str, Any], neck_end_x: float, neck_end_y: float,
                                          nut_top_x: float, nut_top_y: float, bridge_top_x: float, bridge_top_y: float,
                                          fb_bottom_end_x: float, fb_bottom_end_y: float, fb_direction_angle: float,
-                                         fb_thickness_at_end: float) -> Dict[str, Any]:
+                                         fb_thickness_at_end: float) -> StringHeightDimensions:
     """
     Calculate string height at fingerboard end and dimension points.
     """
-    result = {}
-
     overstand = params.get('overstand') or 0
 
     perp_angle = fb_direction_angle + math.pi / 2
@@ -402,10 +365,6 @@ def calculate_string_height_and_dimensions(params: Dict[str, Any], neck_end_x: f
         intersect_y = 0.0
         nut_to_perp_distance = 0.0
 
-    result['nut_perpendicular_intersection_x'] = intersect_x
-    result['nut_perpendicular_intersection_y'] = intersect_y
-    result['nut_to_perpendicular_distance'] = nut_to_perp_distance
-
     fb_dx = fb_bottom_end_x - neck_end_x
     fb_dy = fb_bottom_end_y - neck_end_y
 
@@ -428,23 +387,39 @@ def calculate_string_height_and_dimensions(params: Dict[str, Any], neck_end_x: f
     fb_surface_point_x = string_x_at_fb_end - string_height_at_fb_end * perp_dx
     fb_surface_point_y = string_y_at_fb_end - string_height_at_fb_end * perp_dy
 
-    result['string_x_at_fb_end'] = string_x_at_fb_end
-    result['string_y_at_fb_end'] = string_y_at_fb_end
-    result['fb_surface_point_x'] = fb_surface_point_x
-    result['fb_surface_point_y'] = fb_surface_point_y
-    result['string_height_at_fb_end'] = string_height_at_fb_end
+    return StringHeightDimensions(
+        nut_perpendicular_intersection_x=intersect_x,
+        nut_perpendicular_intersection_y=intersect_y,
+        nut_to_perpendicular_distance=nut_to_perp_distance,
+        string_x_at_fb_end=string_x_at_fb_end,
+        string_y_at_fb_end=string_y_at_fb_end,
+        fb_surface_point_x=fb_surface_point_x,
+        fb_surface_point_y=fb_surface_point_y,
+        string_height_at_fb_end=string_height_at_fb_end
+    )
+
+def resolve_fret_count(params: Dict[str, Any]) -> int:
+    """
+    Number of frets to calculate, defaulting by instrument family.
+    """
+    if params.get('no_frets') is not None:
+        return params.get('no_frets')
+
+    instrument_family = params.get('instrument_family') or InstrumentFamily.VIOLIN.name
+    if instrument_family == InstrumentFamily.VIOL.name:
+        return DEFAULT_FRETS_VIOL
+    elif instrument_family == InstrumentFamily.GUITAR_MANDOLIN.name:
+        return DEFAULT_FRETS_GUITAR
+    return DEFAULT_FRETS_VIOLIN
 
-    return result
 
 def calculate_fret_positions(vsl: float, no_frets: int) -> List[float]:
-    """Calculate fret positions from nut."""
-    fret_positions = []
-    for i in range(1, no_frets + 1):
-        fret_positions.append(vsl - (vsl / (2 ** (i / 12))))
-    return fret_positions
+    """Calculate fret positions from nut (see fret_kernel for batch/multiscale)."""
+    return fret_kernel.fret_positions(vsl, no_frets)
 
 
-def calculate_viol_back_break(params: Dict[str, Any]) -> Dict[str, Any]:
+@memoized_stage
+def calculate_viol_back_break(params: Dict[str, Any]) -> ViolBackBreak:
     """
     Calculate viol back break geometry.
 
@@ -463,13 +438,11 @@ def calculate_viol_back_break(params: Dict[str, Any]) -> Dict[str, Any]:
             - belly_edge_thickness: Thickness of belly edge
 
     Returns:
-        Dictionary with:
+        ViolBackBreak with:
             - back_break_length: Distance from tail to break point
             - break_start_x/y: Start of break line (bottom of vertical section)
             - break_end_x/y: End of break line (on back)
     """
-    result = {}
-
     break_angle_deg = params.get('break_angle', 15.0)
     top_block_height = params.get('top_block_height', 40.0)
     rib_height = params.get('rib_height', 100.0)
@@ -508,16 +481,17 @@ def calculate_viol_back_break(params: Dict[str, Any]) -> Dict[str, Any]:
     # Back break length is from tail to break point
     back_break_length = body_length - break_horizontal
 
-    result['back_break_length'] = back_break_length
-    result['break_start_x'] = break_start_x
-    result['break_start_y'] = break_start_y
-    result['break_end_x'] = break_end_x
-    result['break_end_y'] = break_end_y
-    result['break_angle_rad'] = break_angle_rad
-
-    return result
+    return ViolBackBreak(
+        back_break_length=back_break_length,
+        break_start_x=break_start_x,
+        break_start_y=break_start_y,
+        break_end_x=break_end_x,
+        break_end_y=break_end_y,
+        break_angle_rad=break_angle_rad
+    )
 
 
+@memoized_stage
 def calculate_cross_section_geometry(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate geometry for the neck cross-section view at the body join.
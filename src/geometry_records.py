@@ -0,0 +1,154 @@
+"""
+Overstand - Geometry Records
+
+Fixed-field result records for the geometry_engine stages and the combined
+DerivedGeometry produced by instrument_geometry.calculate_derived_geometry.
+
+Records are frozen, slotted dataclasses: fields are fixed per stage, so a
+typo or missing value fails when the record is built rather than as a late
+KeyError in the renderer, and memoized stage results can be shared safely.
+
+For the JSON boundary (and older callers that index results by key) every
+record supports to_dict(), record['key'] and 'key' in record.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+class StageRecord:
+    """Read-only mapping-style access shared by all geometry records."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def keys(self):
+        return self.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Field values as a plain dict, in declaration order."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(frozen=True, slots=True)
+class FingerboardThickness(StageRecord):
+    """Result of calculate_fingerboard_thickness."""
+    sagitta_at_nut: float
+    sagitta_at_join: float
+    fb_thickness_at_nut: float
+    fb_thickness_at_join: float
+
+
+@dataclass(frozen=True, slots=True)
+class StringAngles(StageRecord):
+    """Result of calculate_string_angles_violin / calculate_string_angles_guitar."""
+    body_stop: float
+    neck_stop: float
+    string_angle_to_ribs_rad: float
+    string_angle_to_fb: float
+    string_angle_to_ribs: float
+    string_angle_to_fingerboard: float
+
+
+@dataclass(frozen=True, slots=True)
+class NeckGeometry(StageRecord):
+    """Result of calculate_neck_geometry."""
+    neck_angle: float
+    neck_stop: float
+    neck_angle_rad: float
+    neck_end_x: float
+    neck_end_y: float
+    nut_draw_radius: float
+    neck_line_angle: float
+    nut_top_x: float
+    nut_top_y: float
+    bridge_top_x: float
+    bridge_top_y: float
+    string_length: float
+    nut_relative_to_ribs: float
+
+
+@dataclass(frozen=True, slots=True)
+class FingerboardGeometry(StageRecord):
+    """Result of calculate_fingerboard_geometry."""
+    fb_direction_angle: float
+    fb_bottom_end_x: float
+    fb_bottom_end_y: float
+    fb_thickness_at_end: float
+
+
+@dataclass(frozen=True, slots=True)
+class StringHeightDimensions(StageRecord):
+    """Result of calculate_string_height_and_dimensions."""
+    nut_perpendicular_intersection_x: float
+    nut_perpendicular_intersection_y: float
+    nut_to_perpendicular_distance: float
+    string_x_at_fb_end: float
+    string_y_at_fb_end: float
+    fb_surface_point_x: float
+    fb_surface_point_y: float
+    string_height_at_fb_end: float
+
+
+@dataclass(frozen=True, slots=True)
+class ViolBackBreak(StageRecord):
+    """Result of calculate_viol_back_break."""
+    back_break_length: float
+    break_start_x: float
+    break_start_y: float
+    break_end_x: float
+    break_end_y: float
+    break_angle_rad: float
+
+
+@dataclass(frozen=True, slots=True)
+class DerivedGeometry(StageRecord):
+    """
+    All derived values of one design.
+
+    Stage results are kept as nested records; the remaining fields are the
+    values instrument_geometry computes from them. back_break is only set
+    for viols.
+    """
+    fingerboard: FingerboardThickness
+    angles: StringAngles
+    neck: NeckGeometry
+    fingerboard_geometry: FingerboardGeometry
+    string_height: StringHeightDimensions
+    back_break: Optional[ViolBackBreak]
+    neck_line_angle_deg: float
+    fb_direction_angle_deg: float
+    afterlength_angle: float
+    string_break_angle: float
+    downward_force_percent: float
+    back_break_length: float
+    neck_block_max_width: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Flat derived-values dict, as returned by calculate_derived_values.
+
+        Key order matches the order the stages run in.
+        """
+        derived = self.fingerboard.to_dict()
+        derived.update(self.angles.to_dict())
+        derived.update(self.neck.to_dict())
+        derived.update(self.fingerboard_geometry.to_dict())
+        derived.update(self.string_height.to_dict())
+        derived['neck_line_angle_deg'] = self.neck_line_angle_deg
+        derived['fb_direction_angle_deg'] = self.fb_direction_angle_deg
+        derived['afterlength_angle'] = self.afterlength_angle
+        derived['string_break_angle'] = self.string_break_angle
+        derived['downward_force_percent'] = self.downward_force_percent
+        if self.back_break is not None:
+            derived.update(self.back_break.to_dict())
+        derived['back_break_length'] = self.back_break_length
+        derived['neck_block_max_width'] = self.neck_block_max_width
+        return derived
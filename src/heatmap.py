@@ -0,0 +1,353 @@
+"""
+Overstand - Design-Space Heatmap
+
+A derived output evaluated over a 2D grid of two numeric inputs, rendered
+as an SVG heatmap with contour lines, for example neck_angle over
+overstand x bridge_height with the current design marked.
+
+The whole grid is one batch-engine call (see batch_engine), so a 100x100
+grid stays cheap enough to redraw after every edit. Cells where the design
+cannot be generated (see feasibility.batch_feasible_mask) are left grey.
+
+Rendering goes through buildprimitives.ExportSVG:
+- values are quantised into colour bands, one filled layer per band, and
+  runs of equal cells along each grid row are merged into one rectangle
+- contour lines at the band boundaries come from marching squares over the
+  cell centres
+- a frame with ticks, axis titles, a colour legend and a marker at the
+  current design complete the plot
+"""
+
+import math
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from buildprimitives import (
+    Arc, Edge, ExportSVG, LineType, Location, Polygon, Rectangle, Text, Axis, Unit,
+    DIMENSION_FONT_SIZE, FONT_NAME, TITLE_FONT_SIZE
+)
+from batch_engine import calculate_derived_values_batch
+from constants import SVG_PRECISION
+from feasibility import batch_feasible_mask
+from parameter_registry import PARAMETER_REGISTRY
+from parameter_set import ParameterSet, numeric_inputs, input_range, is_integer_input
+
+DEFAULT_X = 'overstand'
+DEFAULT_Y = 'bridge_height'
+DEFAULT_OUTPUT = 'neck_angle'
+DEFAULT_RESOLUTION = 100
+
+# Default axis range: current value +/- this fraction of it (or of the
+# registry range when the current value is zero), clipped to the registry
+DEFAULT_SPAN = 0.5
+
+# Plot area in mm
+PLOT_WIDTH = 160.0
+PLOT_HEIGHT = 120.0
+
+COLOR_BANDS = 10
+TICKS = 5
+
+# Colour ramp stops (low to high), interpolated into COLOR_BANDS colours
+COLOR_STOPS = [
+    (68, 1, 84),
+    (59, 82, 139),
+    (33, 145, 140),
+    (94, 201, 98),
+    (253, 231, 37)
+]
+INVALID_COLOR = (200, 200, 200)
+CONTOUR_COLOR = (40, 40, 40)
+MARKER_COLOR = (255, 0, 0)
+
+LEGEND_GAP = 8.0
+LEGEND_WIDTH = 6.0
+TICK_LENGTH = 2.0
+MARKER_RADIUS = 2.5
+
+
+def _label(key: str) -> str:
+    """Display name and unit of a parameter, e.g. 'Neck Angle (°)'."""
+    param = PARAMETER_REGISTRY.get(key)
+    if param is None:
+        return key
+    return f"{param.display_name} ({param.unit})" if param.unit else param.display_name
+
+
+def default_range(params: Dict[str, Any], key: str) -> Tuple[float, float]:
+    """Axis range around the current value of an input, within its registry range."""
+    lo, hi = input_range(key)
+    current = float(params[key])
+    half = abs(current) * DEFAULT_SPAN or (hi - lo) * DEFAULT_SPAN / 2
+    start, end = max(lo, current - half), min(hi, current + half)
+    if is_integer_input(key):
+        start, end = math.floor(start), math.ceil(end)
+    return start, end
+
+
+def _axis(params: Dict[str, Any], key: str, resolution: int,
+          value_range: Optional[Tuple[float, float]]) -> np.ndarray:
+    lo, hi = value_range if value_range is not None else default_range(params, key)
+    if hi <= lo:
+        raise ValueError(f"Empty range for {key}: {lo} to {hi}")
+    if is_integer_input(key):
+        return np.arange(math.ceil(lo), math.floor(hi) + 1, dtype=float)
+    return np.linspace(lo, hi, resolution)
+
+
+def calculate_heatmap_grid(params: Dict[str, Any], x_key: str = DEFAULT_X, y_key: str = DEFAULT_Y,
+                           output_key: str = DEFAULT_OUTPUT, resolution: int = DEFAULT_RESOLUTION,
+                           x_range: Optional[Tuple[float, float]] = None,
+                           y_range: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+    """
+    Evaluate a derived output over a grid of two inputs in one batch call.
+
+    Args:
+        params: Current design; all other inputs keep its values
+        x_key, y_key: Numeric inputs on the horizontal and vertical axes
+        output_key: Derived output to evaluate
+        resolution: Grid points per axis (integer inputs use every whole value)
+        x_range, y_range: Optional (min, max) overriding default_range()
+
+    Returns:
+        Dictionary with:
+            - x_key, y_key, output_key
+            - x, y: grid values along each axis
+            - values: (len(y), len(x)) array, NaN where the design is infeasible
+            - current: (x, y) of the current design
+            - current_value: output of the current design (None if infeasible)
+    """
+    params = ParameterSet.resolve(params)
+    family = params.instrument_family
+    allowed = numeric_inputs(family)
+    for key in (x_key, y_key):
+        if key not in allowed:
+            raise ValueError(f"'{key}' is not a numeric input for {family}")
+    if x_key == y_key:
+        raise ValueError("The two heatmap axes must be different inputs")
+    if resolution < 2:
+        raise ValueError("Resolution must be at least 2")
+
+    current = calculate_derived_values_batch(dict(params), size=1)
+    if output_key not in current:
+        raise ValueError(f"Unknown derived output '{output_key}'")
+    current_value = float(current[output_key][0])
+
+    xs = _axis(params, x_key, resolution, x_range)
+    ys = _axis(params, y_key, resolution, y_range)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    columns = {**params, x_key: grid_x.ravel(), y_key: grid_y.ravel()}
+    derived = calculate_derived_values_batch(columns, size=grid_x.size)
+    mask = batch_feasible_mask(columns, derived)
+    values = np.where(mask, derived[output_key], np.nan).reshape(grid_x.shape)
+
+    return {
+        'x_key': x_key,
+        'y_key': y_key,
+        'output_key': output_key,
+        'x': xs,
+        'y': ys,
+        'values': values,
+        'current': (float(params[x_key]), float(params[y_key])),
+        'current_value': current_value if math.isfinite(current_value) else None
+    }
+
+
+def band_colors(count: int = COLOR_BANDS) -> List[Tuple[int, int, int]]:
+    """count colours interpolated along COLOR_STOPS."""
+    stops = np.array(COLOR_STOPS, dtype=float)
+    positions = np.linspace(0, len(stops) - 1, count)
+    lower = np.minimum(positions.astype(int), len(stops) - 2)
+    t = (positions - lower)[:, None]
+    colors = stops[lower] * (1 - t) + stops[lower + 1] * t
+    return [tuple(int(round(c)) for c in color) for color in colors]
+
+
+def contour_segments(values: np.ndarray, level: float) -> np.ndarray:
+    """
+    Marching-squares contour of a 2D array at one level.
+
+    Returns an (n, 4) array of segments [x1, y1, x2, y2] in index
+    coordinates (x = column, y = row). Squares with a NaN corner are skipped;
+    saddles are resolved by the mean of the four corners.
+    """
+    a = values[:-1, :-1]
+    b = values[:-1, 1:]
+    c = values[1:, 1:]
+    d = values[1:, :-1]
+    valid = np.isfinite(a) & np.isfinite(b) & np.isfinite(c) & np.isfinite(d)
+    rows, cols = np.indices(a.shape)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Edges in order bottom (a-b), right (b-c), top (d-c), left (a-d)
+        ends = ((a, b), (b, c), (d, c), (a, d))
+        crossing = np.stack([valid & ((p >= level) != (q >= level)) for p, q in ends], axis=-1)
+        t = [np.clip((level - p) / (q - p), 0.0, 1.0) for p, q in ends]
+    points = np.stack([
+        np.stack([cols + t[0], rows], axis=-1),
+        np.stack([cols + 1, rows + t[1]], axis=-1),
+        np.stack([cols + t[2], rows + 1], axis=-1),
+        np.stack([cols, rows + t[3]], axis=-1)
+    ], axis=-2)
+
+    count = crossing.sum(axis=-1)
+    segments = []
+
+    single = count == 2
+    if single.any():
+        # The two crossed edges, in edge order
+        edges = np.argsort(~crossing[single], axis=-1, kind='stable')[:, :2]
+        square_points = points[single]
+        index = np.arange(len(edges))
+        segments.append(np.hstack([square_points[index, edges[:, 0]], square_points[index, edges[:, 1]]]))
+
+    saddle = count == 4
+    if saddle.any():
+        square_points = points[saddle]
+        center_above = (a[saddle] + b[saddle] + c[saddle] + d[saddle]) / 4 >= level
+        # Center on the same side as corner a: cut off corners b and d,
+        # otherwise cut off corners a and c
+        joined = center_above == (a[saddle] >= level)
+        first = np.where(joined[:, None], [0, 1], [0, 3])
+        second = np.where(joined[:, None], [2, 3], [1, 2])
+        index = np.arange(len(square_points))
+        for pair in (first, second):
+            segments.append(np.hstack([square_points[index, pair[:, 0]], square_points[index, pair[:, 1]]]))
+
+    if not segments:
+        return np.empty((0, 4))
+    return np.vstack(segments)
+
+
+def _ticks(lo: float, hi: float, count: int = TICKS) -> np.ndarray:
+    """Evenly spaced tick values across [lo, hi]."""
+    return np.linspace(lo, hi, count)
+
+
+def _format(value: float) -> str:
+    return f"{value:.0f}" if abs(value) >= 100 else f"{value:.1f}"
+
+
+def render_heatmap_svg(grid: Dict[str, Any], bands: int = COLOR_BANDS) -> str:
+    """
+    Render a calculate_heatmap_grid() result as SVG.
+
+    Args:
+        grid: Result of calculate_heatmap_grid
+        bands: Number of colour bands (contours are drawn between them)
+
+    Returns:
+        SVG string
+    """
+    xs, ys, values = grid['x'], grid['y'], grid['values']
+    nx, ny = len(xs), len(ys)
+    cell_w, cell_h = PLOT_WIDTH / nx, PLOT_HEIGHT / ny
+
+    def plot_x(value: float) -> float:
+        return ((value - xs[0]) / (xs[-1] - xs[0]) * (nx - 1) + 0.5) * cell_w
+
+    def plot_y(value: float) -> float:
+        return ((value - ys[0]) / (ys[-1] - ys[0]) * (ny - 1) + 0.5) * cell_h
+
+    finite = values[np.isfinite(values)]
+    if finite.size:
+        vmin, vmax = float(finite.min()), float(finite.max())
+    else:
+        vmin, vmax = 0.0, 1.0
+    if vmax <= vmin:
+        vmax = vmin + 1.0
+    levels = np.linspace(vmin, vmax, bands + 1)
+    colors = band_colors(bands)
+
+    exporter = ExportSVG(scale=1.0, unit=Unit.MM, line_weight=0.3, precision=SVG_PRECISION,
+                         coalesce_edges=True, compact=True)
+    exporter.add_layer("heatmap_invalid", fill_color=INVALID_COLOR, line_color=None)
+    for band, color in enumerate(colors):
+        exporter.add_layer(f"heatmap_band_{band}", fill_color=color, line_color=None)
+    exporter.add_layer("contours", fill_color=None, line_color=CONTOUR_COLOR, line_type=LineType.CONTINUOUS)
+    exporter.add_layer("drawing", fill_color=None, line_color=(0, 0, 0), line_type=LineType.CONTINUOUS)
+    exporter.add_layer("marker", fill_color=None, line_color=MARKER_COLOR, line_type=LineType.CONTINUOUS)
+    exporter.add_layer("text", fill_color=(0, 0, 0), line_type=LineType.CONTINUOUS)
+
+    # Cells: band index per cell (-1 infeasible), runs merged along each row
+    band_index = np.full(values.shape, -1, dtype=int)
+    valid = np.isfinite(values)
+    band_index[valid] = np.clip(((values[valid] - vmin) / (vmax - vmin) * bands).astype(int), 0, bands - 1)
+    for row in range(ny):
+        line = band_index[row]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(line)) + 1])
+        stops = np.concatenate([starts[1:], [nx]])
+        y0, y1 = row * cell_h, (row + 1) * cell_h
+        for start, stop in zip(starts, stops):
+            x0, x1 = start * cell_w, stop * cell_w
+            band = line[start]
+            layer = "heatmap_invalid" if band < 0 else f"heatmap_band_{band}"
+            exporter.add_shape(Polygon([(x0, y0), (x1, y0), (x1, y1), (x0, y1)], filled=True), layer=layer)
+
+    # Contours at the band boundaries
+    for level in levels[1:-1]:
+        for x1, y1, x2, y2 in contour_segments(values, level):
+            exporter.add_shape(Edge.make_line(((x1 + 0.5) * cell_w, (y1 + 0.5) * cell_h),
+                                              ((x2 + 0.5) * cell_w, (y2 + 0.5) * cell_h)), layer="contours")
+
+    # Frame, ticks and tick labels
+    frame = Rectangle(width=PLOT_WIDTH, height=PLOT_HEIGHT).move(Location((PLOT_WIDTH / 2, PLOT_HEIGHT / 2)))
+    exporter.add_shape(frame, layer="drawing")
+    for value in _ticks(xs[0], xs[-1]):
+        px = plot_x(value)
+        exporter.add_shape(Edge.make_line((px, 0), (px, -TICK_LENGTH)), layer="drawing")
+        label = Text(_format(value), DIMENSION_FONT_SIZE, font=FONT_NAME)
+        exporter.add_shape(label.move(Location((px, -TICK_LENGTH - DIMENSION_FONT_SIZE))), layer="text")
+    for value in _ticks(ys[0], ys[-1]):
+        py = plot_y(value)
+        exporter.add_shape(Edge.make_line((0, py), (-TICK_LENGTH, py)), layer="drawing")
+        label = Text(_format(value), DIMENSION_FONT_SIZE, font=FONT_NAME)
+        exporter.add_shape(label.move(Location((-TICK_LENGTH - 2 * DIMENSION_FONT_SIZE, py))), layer="text")
+
+    # Axis titles and plot title
+    x_title = Text(_label(grid['x_key']), DIMENSION_FONT_SIZE, font=FONT_NAME)
+    exporter.add_shape(x_title.move(Location((PLOT_WIDTH / 2, -TICK_LENGTH - 3 * DIMENSION_FONT_SIZE))),
+                       layer="text")
+    y_title_x = -TICK_LENGTH - 5 * DIMENSION_FONT_SIZE
+    y_title = Text(_label(grid['y_key']), DIMENSION_FONT_SIZE, font=FONT_NAME)
+    y_title = y_title.move(Location((y_title_x, PLOT_HEIGHT / 2)))
+    exporter.add_shape(y_title.rotate(Axis((y_title_x, PLOT_HEIGHT / 2, 0), (0, 0, 1)), -90), layer="text")
+    title = Text(_label(grid['output_key']), TITLE_FONT_SIZE, font=FONT_NAME)
+    exporter.add_shape(title.move(Location((PLOT_WIDTH / 2, PLOT_HEIGHT + TITLE_FONT_SIZE * 1.5))), layer="text")
+
+    # Colour legend with the band boundaries
+    legend_x = PLOT_WIDTH + LEGEND_GAP
+    band_h = PLOT_HEIGHT / bands
+    for band in range(bands):
+        y0, y1 = band * band_h, (band + 1) * band_h
+        exporter.add_shape(Polygon([(legend_x, y0), (legend_x + LEGEND_WIDTH, y0),
+                                    (legend_x + LEGEND_WIDTH, y1), (legend_x, y1)], filled=True),
+                           layer=f"heatmap_band_{band}")
+    legend = Rectangle(width=LEGEND_WIDTH, height=PLOT_HEIGHT).move(
+        Location((legend_x + LEGEND_WIDTH / 2, PLOT_HEIGHT / 2)))
+    exporter.add_shape(legend, layer="drawing")
+    for band, level in enumerate(levels):
+        label = Text(_format(level), DIMENSION_FONT_SIZE, font=FONT_NAME)
+        exporter.add_shape(label.move(Location((legend_x + LEGEND_WIDTH + 2 * DIMENSION_FONT_SIZE, band * band_h))),
+                           layer="text")
+
+    # Current design
+    cx, cy = grid['current']
+    if xs[0] <= cx <= xs[-1] and ys[0] <= cy <= ys[-1]:
+        px, py = plot_x(cx), plot_y(cy)
+        exporter.add_shape(Arc((px, py), MARKER_RADIUS, 0, 2 * math.pi), layer="marker")
+        exporter.add_shape(Edge.make_line((px - 2 * MARKER_RADIUS, py), (px + 2 * MARKER_RADIUS, py)), layer="marker")
+        exporter.add_shape(Edge.make_line((px, py - 2 * MARKER_RADIUS), (px, py + 2 * MARKER_RADIUS)), layer="marker")
+        if grid['current_value'] is not None:
+            label = Text(_format(grid['current_value']), DIMENSION_FONT_SIZE, font=FONT_NAME)
+            exporter.add_shape(label.move(Location((px + 3 * MARKER_RADIUS, py + 2 * MARKER_RADIUS))), layer="marker")
+
+    return exporter.write()
+
+
+def generate_heatmap_svg(params: Dict[str, Any], x_key: str = DEFAULT_X, y_key: str = DEFAULT_Y,
+                         output_key: str = DEFAULT_OUTPUT, resolution: int = DEFAULT_RESOLUTION,
+                         x_range: Optional[Tuple[float, float]] = None,
+                         y_range: Optional[Tuple[float, float]] = None) -> str:
+    """Heatmap view of output_key over x_key x y_key (see calculate_heatmap_grid)."""
+    grid = calculate_heatmap_grid(params, x_key, y_key, output_key, resolution, x_range, y_range)
+    return render_heatmap_svg(grid)
@@ -10,12 +10,39 @@ import json
 from parameter_registry import get_all_output_parameters, get_derived_metadata_as_dict
 
 
-def generate_violin_neck(params_json: str) -> str:
+def format_derived_values(derived_values: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, dict]]:
+    """
+    Format derived values for display using the parameter registry.
+
+    Returns:
+        (formatted_values, metadata_dict) for every derived key that is a
+        registered output parameter.
+    """
+    output_params = get_all_output_parameters()
+    formatted_values = {}
+    metadata_dict = {}
+    for key, value in derived_values.items():
+        if key in output_params:
+            param = output_params[key]
+            decimals = param.output_config.decimals if param.output_config else 1
+            # Format value with unit
+            if param.unit:
+                formatted_values[key] = f"{value:.{decimals}f} {param.unit}"
+            else:
+                formatted_values[key] = f"{value:.{decimals}f}"
+            metadata_dict[key] = param.to_dict()
+    return formatted_values, metadata_dict
+
+
+def generate_violin_neck(params_json: str, changed_keys_json: str = None) -> str:
     """
     Main entry point called from JavaScript.
 
     Args:
         params_json: JSON string of parameter values
+        changed_keys_json: Optional JSON list of the keys changed since the
+            previous generation; only the views they affect are rendered
+            (see change_impact.affected_by)
 
     Returns:
         JSON string containing:
@@ -33,7 +60,11 @@ def generate_violin_neck(params_json: str) -> str:
                 "no_frets": int
             } | null,
             "derived_values": dict | null,
-            "errors": List[str]
+            "skipped_views": List[str] (views left out because the changed
+                             keys cannot affect them),
+            "errors": List[str],
+            "failures": [{"code", "message", "parameters"}] (only when the
+                        feasibility pre-check rejects the design)
         }
     """
     try:
@@ -42,7 +73,19 @@ def generate_violin_neck(params_json: str) -> str:
 
         # Import here to ensure modules are loaded
         from parameter_registry import validate_parameters
-        from instrument_geometry import generate_multi_view_svg, generate_fret_positions_view, calculate_derived_values
+        from parameter_set import ParameterSet
+        from instrument_geometry import generate_multi_view_svg, generate_fret_positions_view, build_generation_context
+        from feasibility import check_feasibility
+
+        # Resolve defaults, enum names and types once for the whole generation
+        try:
+            params = ParameterSet.resolve(params)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "views": None,
+                "errors": [str(e)]
+            })
 
         # Validate parameters
         is_valid, errors = validate_parameters(params)
@@ -54,26 +97,35 @@ def generate_violin_neck(params_json: str) -> str:
                 "errors": errors
             })
 
+        # Reject impossible geometry before any fret, geometry or SVG work
+        feasibility = check_feasibility(params)
+        if not feasibility['feasible']:
+            return json.dumps({
+                "success": False,
+                "views": None,
+                "errors": [failure['message'] for failure in feasibility['failures']],
+                "failures": feasibility['failures']
+            })
+
         # Generate geometry (all 3 views + fret positions + derived values)
         try:
-            views = generate_multi_view_svg(params)
-            fret_positions = generate_fret_positions_view(params)
-            derived_values = calculate_derived_values(params)
+            # Fret positions, derived values and cross-section are computed once
+            context = build_generation_context(params)
+            if changed_keys_json:
+                from change_impact import VIEWS, affected_by
+                affected = affected_by(json.loads(changed_keys_json))['views']
+            else:
+                affected = None
+            views = generate_multi_view_svg(params, context=context, views=affected)
+            if affected is None or 'fret_positions' in affected:
+                fret_positions = generate_fret_positions_view(params, fret_positions=context.fret_positions)
+            else:
+                fret_positions = None
+            skipped_views = [] if affected is None else [view for view in VIEWS if view not in affected]
+            derived_values = context.derived
 
             # Format derived values for display
-            output_params = get_all_output_parameters()
-            formatted_values = {}
-            metadata_dict = {}
-            for key, value in derived_values.items():
-                if key in output_params:
-                    param = output_params[key]
-                    decimals = param.output_config.decimals if param.output_config else 1
-                    # Format value with unit
-                    if param.unit:
-                        formatted_values[key] = f"{value:.{decimals}f} {param.unit}"
-                    else:
-                        formatted_values[key] = f"{value:.{decimals}f}"
-                    metadata_dict[key] = param.to_dict()
+            formatted_values, metadata_dict = format_derived_values(derived_values)
 
             return json.dumps({
                 "success": True,
@@ -82,6 +134,7 @@ def generate_violin_neck(params_json: str) -> str:
                 "derived_values": derived_values,
                 "derived_formatted": formatted_values,
                 "derived_metadata": metadata_dict,
+                "skipped_views": skipped_views,
                 "errors": []
             })
 
@@ -134,25 +187,13 @@ def get_derived_values(params_json: str) -> str:
     """
     try:
         from instrument_geometry import calculate_derived_values
+        from parameter_set import ParameterSet
 
-        params = json.loads(params_json)
+        params = ParameterSet.resolve(json.loads(params_json))
         derived_raw = calculate_derived_values(params)
 
         # Build enhanced response with metadata
-        output_params = get_all_output_parameters()
-        formatted_values = {}
-        metadata_dict = {}
-
-        for key, value in derived_raw.items():
-            if key in output_params:
-                param = output_params[key]
-                decimals = param.output_config.decimals if param.output_config else 1
-                # Format value with unit
-                if param.unit:
-                    formatted_values[key] = f"{value:.{decimals}f} {param.unit}"
-                else:
-                    formatted_values[key] = f"{value:.{decimals}f}"
-                metadata_dict[key] = param.to_dict()
+        formatted_values, metadata_dict = format_derived_values(derived_raw)
 
         return json.dumps({
             "success": True,
@@ -167,6 +208,359 @@ def get_derived_values(params_json: str) -> str:
         })
 
 
+def solve_for_target(params_json: str, target_key: str, target_value: float,
+                     free_inputs_json: str) -> str:
+    """
+    Find input values that make a derived output hit a target value.
+
+    Args:
+        params_json: JSON string of parameter values
+        target_key: Derived output to hit (e.g. "neck_angle")
+        target_value: Desired value of the output
+        free_inputs_json: JSON list of input keys the solver may change
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "solutions": {input: {"success", "value", "achieved", ...}},
+            "best": str | null,
+            "params": dict,
+            "errors": List[str]
+        }
+    """
+    try:
+        from inverse_solver import solve_for_target as solve
+
+        params = json.loads(params_json)
+        free_inputs = json.loads(free_inputs_json)
+        result = solve(params, target_key, float(target_value), free_inputs)
+        result['errors'] = [] if result['success'] else [
+            s['message'] for s in result['solutions'].values() if not s['success'] and 'message' in s
+        ]
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def optimize_design(params_json: str, inputs_json: str, objectives_json: str,
+                    output_bounds_json: str = None) -> str:
+    """
+    Find the Pareto front of designs over some inputs for several objectives.
+
+    Args:
+        params_json: JSON string of parameter values
+        inputs_json: JSON list of input keys to vary
+        objectives_json: JSON object {output: "min" | "max" | target value}
+        output_bounds_json: Optional JSON object {output: [min, max]} (null
+                            for an open side), merged over the optimizer's
+                            physical defaults
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "front": [{input: value, ..., output: value, ...}],
+            "views": [{"index": int, "svg": str}],
+            "evaluations": int,
+            "within_bounds": int,
+            "errors": List[str]
+        }
+    """
+    try:
+        from design_optimizer import optimize_design as optimize
+
+        params = json.loads(params_json)
+        output_bounds = json.loads(output_bounds_json) if output_bounds_json else None
+        result = optimize(params, json.loads(inputs_json), json.loads(objectives_json),
+                          output_bounds=output_bounds)
+        result['success'] = True
+        result['errors'] = []
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def get_sensitivities(params_json: str, output_key: str = None) -> str:
+    """
+    Get d(output)/d(input) for every derived output and continuous input.
+
+    Args:
+        params_json: JSON string of parameter values
+        output_key: Optional output to rank inputs for
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "inputs": List[str],
+            "outputs": List[str],
+            "jacobian": {output: {input: float | null}},
+            "ranking": [{"input", "derivative", "impact"}] (only with output_key),
+            "errors": List[str]
+        }
+    """
+    try:
+        from sensitivity import calculate_jacobian, jacobian_to_dict, rank_inputs
+
+        params = json.loads(params_json)
+        sensitivity = calculate_jacobian(params)
+        result = {
+            "success": True,
+            "inputs": sensitivity['inputs'],
+            "outputs": sensitivity['outputs'],
+            "jacobian": jacobian_to_dict(sensitivity),
+            "errors": []
+        }
+        if output_key:
+            result["ranking"] = rank_inputs(sensitivity, output_key)
+        return json.dumps(result)
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def get_feasible_ranges(params_json: str) -> str:
+    """
+    Get the feasible interval of every numeric input for the current design.
+
+    Args:
+        params_json: JSON string of parameter values
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "ranges": {input: {"min", "max", "registry_min", "registry_max",
+                               "current", "current_feasible", "limited"}},
+            "errors": List[str]
+        }
+    """
+    try:
+        from feasible_ranges import feasible_ranges
+
+        params = json.loads(params_json)
+        return json.dumps({
+            "success": True,
+            "ranges": feasible_ranges(params),
+            "errors": []
+        })
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def generate_heatmap(params_json: str, x_key: str = 'overstand', y_key: str = 'bridge_height',
+                     output_key: str = 'neck_angle', resolution: int = 100) -> str:
+    """
+    Generate the design-space heatmap view of one derived output over two inputs.
+
+    Args:
+        params_json: JSON string of parameter values
+        x_key: Numeric input on the horizontal axis
+        y_key: Numeric input on the vertical axis
+        output_key: Derived output to plot
+        resolution: Grid points per axis
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "svg": str,
+            "errors": List[str]
+        }
+    """
+    try:
+        from heatmap import generate_heatmap_svg
+
+        params = json.loads(params_json)
+        return json.dumps({
+            "success": True,
+            "svg": generate_heatmap_svg(params, x_key, y_key, output_key, int(resolution)),
+            "errors": []
+        })
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def find_similar_presets(params_json: str, k: int = 5) -> str:
+    """
+    Find the known instruments closest to the current design.
+
+    Args:
+        params_json: JSON string of parameter values
+        k: Number of presets to return
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "presets": [{"id", "display_name", "source", "distance", "deltas"}],
+            "errors": List[str]
+        }
+    """
+    try:
+        from preset_index import find_nearest_presets
+
+        params = json.loads(params_json)
+        return json.dumps({
+            "success": True,
+            "presets": find_nearest_presets(params, int(k)),
+            "errors": []
+        })
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def get_change_impact(changed_keys_json: str) -> str:
+    """
+    Derived outputs and views that a change to some input keys can affect.
+
+    Args:
+        changed_keys_json: JSON list of changed input keys
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "outputs": List[str],
+            "views": List[str],
+            "errors": List[str]
+        }
+    """
+    try:
+        from change_impact import affected_by
+
+        impact = affected_by(json.loads(changed_keys_json))
+        return json.dumps({
+            "success": True,
+            "outputs": impact['outputs'],
+            "views": impact['views'],
+            "errors": []
+        })
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def _session_response(result: Dict[str, Any]) -> str:
+    """JSON for a DesignSession result, with changed derived values formatted."""
+    formatted_values, metadata_dict = format_derived_values(result['derived_values'])
+    return json.dumps({**result, "derived_formatted": formatted_values, "derived_metadata": metadata_dict})
+
+
+def start_design_session(params_json: str) -> str:
+    """
+    Start an editing session and render the full design.
+
+    Args:
+        params_json: JSON string of parameter values
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "changed_keys": List[str],
+            "derived_values": dict,
+            "derived_formatted": dict,
+            "derived_metadata": dict,
+            "removed_values": List[str],
+            "views": {view: content},
+            "view_hashes": {view: str},
+            "can_undo": bool,
+            "can_redo": bool,
+            "errors": List[str],
+            "failures": [...] (only when the feasibility pre-check rejects the design)
+        }
+    """
+    try:
+        from design_session import start_session
+
+        return _session_response(start_session(json.loads(params_json)))
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def update_design_session(patch_json: str) -> str:
+    """
+    Apply a patch of changed parameters to the current session.
+
+    Args:
+        patch_json: JSON object of changed keys (null resets a key)
+
+    Returns:
+        JSON string in the form of start_design_session, where
+        derived_values and views hold only what changed
+    """
+    try:
+        from design_session import get_session
+
+        return _session_response(get_session().update(json.loads(patch_json)))
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def undo_design_session() -> str:
+    """
+    Return the current session to its previous design.
+
+    Returns:
+        JSON string in the form of update_design_session, plus "params":
+        the restored parameters
+    """
+    try:
+        from design_session import get_session
+
+        return _session_response(get_session().undo())
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
+def redo_design_session() -> str:
+    """
+    Return the current session to the design it left by undo.
+
+    Returns:
+        JSON string in the form of undo_design_session
+    """
+    try:
+        from design_session import get_session
+
+        return _session_response(get_session().redo())
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
 def get_derived_value_metadata() -> str:
     """
     Get metadata definitions for all derived values.
@@ -190,6 +584,30 @@ def get_derived_value_metadata() -> str:
         })
 
 
+def get_cache_stats() -> str:
+    """
+    Get hit/miss counters for the memoized geometry stages.
+
+    Returns:
+        JSON string containing:
+        {
+            "success": bool,
+            "stages": {stage_name: {"hits": int, "misses": int, "entries": int}}
+        }
+    """
+    try:
+        from stage_cache import get_cache_stats as get_stage_cache_stats
+        return json.dumps({
+            "success": True,
+            "stages": get_stage_cache_stats()
+        })
+    except Exception as e:
+        return json.dumps({
+            "success": False,
+            "errors": [str(e)]
+        })
+
+
 def get_parameter_definitions() -> str:
     """
     Get parameter definitions for UI generation.
@@ -16,82 +16,102 @@ from parameter_registry import InstrumentFamily
 from radius_template import generate_radius_template_svg
 from constants import (
     DEFAULT_FB_WIDTH_AT_NUT,
-    DEFAULT_FB_WIDTH_AT_END,
-    DEFAULT_FRETS_VIOL,
-    DEFAULT_FRETS_GUITAR,
-    DEFAULT_FRETS_VIOLIN
+    DEFAULT_FB_WIDTH_AT_END
 )
 import math
-from typing import Dict, Any, Tuple, List
+from dataclasses import dataclass
+from typing import Dict, Any, Tuple, List, Optional
+from geometry_records import DerivedGeometry
+from parameter_set import ParameterSet
 
 # Re-export key functions for backward compatibility
 from geometry_engine import calculate_sagitta, calculate_fret_positions
 from view_generator import generate_fret_positions_view
 
-def calculate_derived_values(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate derived values by orchestrating engine functions."""
-    derived = {}
+
+@dataclass
+class GenerationContext:
+    """
+    Geometry shared by every view of one generation.
+
+    Fret positions, derived values and cross-section geometry are computed
+    once and consumed by the side view, cross-section, radius template,
+    fret table and formatted output.
+    """
+    params: ParameterSet
+    no_frets: int
+    fret_positions: List[float]
+    cross_section: Dict[str, Any]
+    geometry: DerivedGeometry
+    derived: Dict[str, Any]
+
+
+def build_generation_context(params: Dict[str, Any]) -> GenerationContext:
+    """
+    Resolve params and compute fret positions, cross-section geometry and
+    derived values once.
+    """
+    params = ParameterSet.resolve(params)
+    no_frets = geometry_engine.resolve_fret_count(params)
+    fret_positions = geometry_engine.calculate_fret_positions(params.get('vsl') or 0, no_frets)
+    cross_section = geometry_engine.calculate_cross_section_geometry(params)
+    geometry = calculate_derived_geometry(params, fret_positions=fret_positions, cross_section=cross_section)
+    return GenerationContext(
+        params=params,
+        no_frets=no_frets,
+        fret_positions=fret_positions,
+        cross_section=cross_section,
+        geometry=geometry,
+        derived=geometry.to_dict()
+    )
+
+
+def calculate_derived_geometry(params: Dict[str, Any],
+                               fret_positions: Optional[List[float]] = None,
+                               cross_section: Optional[Dict[str, Any]] = None) -> DerivedGeometry:
+    """
+    Calculate derived geometry by orchestrating engine functions.
+
+    fret_positions and cross_section may be passed in when the caller has
+    already computed them (see build_generation_context).
+    """
     vsl = params.get('vsl') or 0
     instrument_family = params.get('instrument_family') or InstrumentFamily.VIOLIN.name
 
-    if params.get('no_frets') is not None:
-        no_frets = params.get('no_frets')
-    elif instrument_family == InstrumentFamily.VIOL.name:
-        no_frets = DEFAULT_FRETS_VIOL
-    elif instrument_family == InstrumentFamily.GUITAR_MANDOLIN.name:
-        no_frets = DEFAULT_FRETS_GUITAR
-    else:
-        no_frets = DEFAULT_FRETS_VIOLIN
-
-    fret_positions = geometry_engine.calculate_fret_positions(vsl, no_frets)
+    if fret_positions is None:
+        fret_positions = geometry_engine.calculate_fret_positions(vsl, geometry_engine.resolve_fret_count(params))
 
-    fb_result = geometry_engine.calculate_fingerboard_thickness(params)
-    derived.update(fb_result)
-    fb_thickness_at_nut = fb_result['fb_thickness_at_nut']
-    fb_thickness_at_join = fb_result['fb_thickness_at_join']
+    fb = geometry_engine.calculate_fingerboard_thickness(params)
 
     if instrument_family in (InstrumentFamily.VIOLIN.name, InstrumentFamily.VIOL.name):
-        angle_result = geometry_engine.calculate_string_angles_violin(params, vsl, fb_thickness_at_join)
+        angles = geometry_engine.calculate_string_angles_violin(params, vsl, fb.fb_thickness_at_join)
     elif instrument_family == InstrumentFamily.GUITAR_MANDOLIN.name:
-        angle_result = geometry_engine.calculate_string_angles_guitar(params, vsl, fret_positions, fb_thickness_at_join)
+        angles = geometry_engine.calculate_string_angles_guitar(params, vsl, fret_positions, fb.fb_thickness_at_join)
     else:
         raise ValueError("Invalid calculation mode")
 
-    derived.update(angle_result)
-    neck_stop = angle_result['neck_stop']
-    string_angle_to_ribs_rad = angle_result['string_angle_to_ribs_rad']
-    string_angle_to_fb = angle_result['string_angle_to_fb']
-
-    neck_result = geometry_engine.calculate_neck_geometry(
-        params, vsl, neck_stop, string_angle_to_ribs_rad, string_angle_to_fb,
-        fb_thickness_at_nut, fb_thickness_at_join,
-        body_stop=angle_result['body_stop']
+    neck = geometry_engine.calculate_neck_geometry(
+        params, vsl, angles.neck_stop, angles.string_angle_to_ribs_rad, angles.string_angle_to_fb,
+        fb.fb_thickness_at_nut, fb.fb_thickness_at_join,
+        body_stop=angles.body_stop
     )
-    neck_result['body_stop'] = angle_result['body_stop']
-    derived.update(neck_result)
-
-    fb_geom_result = geometry_engine.calculate_fingerboard_geometry(
-        params, neck_stop,
-        derived['neck_end_x'], derived['neck_end_y'],
-        derived['neck_line_angle'],
-        fb_thickness_at_nut, fb_thickness_at_join
+
+    fb_geom = geometry_engine.calculate_fingerboard_geometry(
+        params, angles.neck_stop,
+        neck.neck_end_x, neck.neck_end_y,
+        neck.neck_line_angle,
+        fb.fb_thickness_at_nut, fb.fb_thickness_at_join
     )
-    derived.update(fb_geom_result)
 
-    string_height_result = geometry_engine.calculate_string_height_and_dimensions(
+    string_height = geometry_engine.calculate_string_height_and_dimensions(
         params,
-        derived['neck_end_x'], derived['neck_end_y'],
-        derived['nut_top_x'], derived['nut_top_y'],
-        derived['bridge_top_x'], derived['bridge_top_y'],
-        derived['fb_bottom_end_x'], derived['fb_bottom_end_y'],
-        derived['fb_direction_angle'],
-        derived['fb_thickness_at_end']
+        neck.neck_end_x, neck.neck_end_y,
+        neck.nut_top_x, neck.nut_top_y,
+        neck.bridge_top_x, neck.bridge_top_y,
+        fb_geom.fb_bottom_end_x, fb_geom.fb_bottom_end_y,
+        fb_geom.fb_direction_angle,
+        fb_geom.fb_thickness_at_end
     )
-    derived.update(string_height_result)
-
-    # Add degree versions of internal angles for display
-    derived['neck_line_angle_deg'] = derived['neck_line_angle'] * 180 / math.pi
-    derived['fb_direction_angle_deg'] = derived['fb_direction_angle'] * 180 / math.pi
 
     # Calculate afterlength angle (angle of string from bridge to tailpiece relative to ribs)
     # Positive angle indicates downward slope from bridge to tailpiece
@@ -99,58 +119,98 @@ def calculate_derived_values(params: Dict[str, Any]) -> Dict[str, Any]:
     belly_edge_thickness = params.get('belly_edge_thickness', 0)
     tailpiece_height = params.get('tailpiece_height', 0)
 
-    dx = body_length - derived['bridge_top_x']
-    dy = derived['bridge_top_y'] - (belly_edge_thickness + tailpiece_height)
-    derived['afterlength_angle'] = math.atan2(dy, dx) * 180 / math.pi
+    dx = body_length - neck.bridge_top_x
+    dy = neck.bridge_top_y - (belly_edge_thickness + tailpiece_height)
+    afterlength_angle = math.atan2(dy, dx) * 180 / math.pi
 
     # Calculate string break angle at the bridge
-    derived['string_break_angle'] = 180 - derived['string_angle_to_ribs'] - derived['afterlength_angle']
+    string_break_angle = 180 - angles.string_angle_to_ribs - afterlength_angle
 
     # Calculate percentage of string tension pushing downward on the belly
     # Convert angles from degrees to radians for sin calculation
-    string_angle_rad = derived['string_angle_to_ribs'] * math.pi / 180
-    afterlength_angle_rad = derived['afterlength_angle'] * math.pi / 180
-    derived['downward_force_percent'] = (math.sin(string_angle_rad) + math.sin(afterlength_angle_rad)) * 100
+    string_angle_rad = angles.string_angle_to_ribs * math.pi / 180
+    afterlength_angle_rad = afterlength_angle * math.pi / 180
+    downward_force_percent = (math.sin(string_angle_rad) + math.sin(afterlength_angle_rad)) * 100
 
     # Calculate viol-specific back break geometry
     if instrument_family == InstrumentFamily.VIOL.name:
-        back_break_result = geometry_engine.calculate_viol_back_break(params)
-        derived.update(back_break_result)
+        back_break = geometry_engine.calculate_viol_back_break(params)
+        back_break_length = back_break.back_break_length
     else:
-        derived['back_break_length'] = 0
+        back_break = None
+        back_break_length = 0
 
     # Calculate cross-section geometry (for neck_block_max_width)
-    cs_geom = geometry_engine.calculate_cross_section_geometry(params)
-    derived['neck_block_max_width'] = cs_geom.get('neck_block_max_width', cs_geom.get('fb_width_at_body_join', 0))
+    cs_geom = cross_section if cross_section is not None else geometry_engine.calculate_cross_section_geometry(params)
+
+    return DerivedGeometry(
+        fingerboard=fb,
+        angles=angles,
+        neck=neck,
+        fingerboard_geometry=fb_geom,
+        string_height=string_height,
+        back_break=back_break,
+        # Degree versions of internal angles for display
+        neck_line_angle_deg=neck.neck_line_angle * 180 / math.pi,
+        fb_direction_angle_deg=fb_geom.fb_direction_angle * 180 / math.pi,
+        afterlength_angle=afterlength_angle,
+        string_break_angle=string_break_angle,
+        downward_force_percent=downward_force_percent,
+        back_break_length=back_break_length,
+        neck_block_max_width=cs_geom.get('neck_block_max_width', cs_geom.get('fb_width_at_body_join', 0))
+    )
+
 
-    return derived
+def calculate_derived_values(params: Dict[str, Any],
+                             fret_positions: Optional[List[float]] = None,
+                             cross_section: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Calculate derived values as a flat dict (the JSON-facing form of
+    calculate_derived_geometry).
+    """
+    return calculate_derived_geometry(params, fret_positions, cross_section).to_dict()
 
-def generate_multi_view_svg(params: Dict[str, Any]) -> Dict[str, str]:
+def generate_multi_view_svg(params: Dict[str, Any], context: Optional[GenerationContext] = None,
+                            views: Optional[List[str]] = None) -> Dict[str, str]:
     """
     Main entry point for generating all SVG views.
     Restored for backward compatibility with instrument_generator.py.
+
+    Pass views (e.g. from change_impact.affected_by) to render only those
+    of 'side', 'cross_section' and 'radius_template'.
     """
-    side_svg = generate_side_view_svg(params)
-    radius_template = generate_radius_template_svg(params)
-    cross_section_svg = generate_cross_section_svg(params)
-
-    return {
-        'side': side_svg,
-        'top': "Top View Placeholder",
-        'cross_section': cross_section_svg,
-        'radius_template': radius_template
+    if context is None:
+        context = build_generation_context(params)
+
+    if views is None:
+        return {
+            'side': generate_side_view_svg(context.params, context=context),
+            'top': "Top View Placeholder",
+            'cross_section': generate_cross_section_svg(context.params, context=context),
+            'radius_template': generate_radius_template_svg(context.params)
+        }
+
+    renderers = {
+        'side': lambda: generate_side_view_svg(context.params, context=context),
+        'cross_section': lambda: generate_cross_section_svg(context.params, context=context),
+        'radius_template': lambda: generate_radius_template_svg(context.params)
     }
+    return {view: render() for view, render in renderers.items() if view in views}
 
 
-def generate_cross_section_svg(params: Dict[str, Any], show_measurements: bool = True) -> str:
+def generate_cross_section_svg(params: Dict[str, Any], show_measurements: bool = True,
+                               context: Optional[GenerationContext] = None) -> str:
     """
     Generate the neck cross-section SVG at the body join.
 
     The cross-section shows the neck profile when viewed from the body toward the nut.
     It is symmetrical about the Y-axis (X=0 is centerline).
     """
-    # Calculate cross-section geometry
-    cs_geom = geometry_engine.calculate_cross_section_geometry(params)
+    # Calculate cross-section geometry (or reuse the generation context's)
+    if context is not None:
+        cs_geom = context.cross_section
+    else:
+        cs_geom = geometry_engine.calculate_cross_section_geometry(params)
 
     # Setup exporter
     exporter = svg_renderer.setup_exporter(show_measurements)
@@ -201,89 +261,97 @@ def generate_cross_section_svg(params: Dict[str, Any], show_measurements: bool =
 
     return exporter.write(filename=None)
 
-def generate_side_view_svg(params: Dict[str, Any], show_measurements: bool = True) -> str:
+def generate_side_view_svg(params: Dict[str, Any], show_measurements: bool = True,
+                           context: Optional[GenerationContext] = None) -> str:
     """Orchestrate full side view SVG generation."""
-    derived = calculate_derived_values(params)
+    if context is None:
+        context = build_generation_context(params)
+    params = context.params
+    geometry = context.geometry
+    neck = geometry.neck
+    fb_geom = geometry.fingerboard_geometry
+    string_height = geometry.string_height
+    back_break = geometry.back_break
 
     exporter = svg_renderer.setup_exporter(show_measurements)
 
     # Check instrument family for viol-specific drawing
-    instrument_family = params.get('instrument_family', InstrumentFamily.VIOLIN.name)
+    instrument_family = params.instrument_family
 
     # For viols, pass break coordinates to skip drawing rectangle below break
     if instrument_family == InstrumentFamily.VIOL.name:
         svg_renderer.draw_body(
-            exporter, params.get('body_length', 0), params.get('belly_edge_thickness', 0),
-            params.get('rib_height', 0), derived['body_stop'], params.get('arching_height', 0),
-            viol_break_end_x=derived['break_end_x'], viol_break_end_y=derived['break_end_y']
+            exporter, params.body_length, params.belly_edge_thickness,
+            params.rib_height, geometry.angles.body_stop, params.arching_height,
+            viol_break_end_x=back_break.break_end_x, viol_break_end_y=back_break.break_end_y
         )
     else:
         svg_renderer.draw_body(
-            exporter, params.get('body_length', 0), params.get('belly_edge_thickness', 0),
-            params.get('rib_height', 0), derived['body_stop'], params.get('arching_height', 0)
+            exporter, params.body_length, params.belly_edge_thickness,
+            params.rib_height, geometry.angles.body_stop, params.arching_height
         )
 
     # Draw viol-specific back break geometry
     if instrument_family == InstrumentFamily.VIOL.name:
         svg_renderer.draw_viol_back(
-            exporter, params.get('body_length', 0), params.get('belly_edge_thickness', 0),
-            params.get('rib_height', 0), params.get('top_block_height', 40),
-            derived['break_start_x'], derived['break_start_y'],
-            derived['break_end_x'], derived['break_end_y']
+            exporter, params.body_length, params.belly_edge_thickness,
+            params.rib_height, params.top_block_height,
+            back_break.break_start_x, back_break.break_start_y,
+            back_break.break_end_x, back_break.break_end_y
         )
 
     svg_renderer.draw_neck(
-        exporter, params.get('overstand', 0), derived['neck_end_x'], derived['neck_end_y'],
-        params.get('bridge_height', 0), derived['body_stop'], params.get('arching_height', 0),
-        derived['nut_draw_radius'], derived['neck_line_angle'], derived['neck_angle']
+        exporter, params.overstand, neck.neck_end_x, neck.neck_end_y,
+        params.bridge_height, geometry.angles.body_stop, params.arching_height,
+        neck.nut_draw_radius, neck.neck_line_angle, neck.neck_angle
     )
     
     svg_renderer.draw_fingerboard(
-        exporter, derived['neck_end_x'], derived['neck_end_y'],
-        derived['fb_bottom_end_x'], derived['fb_bottom_end_y'],
-        derived['fb_thickness_at_nut'], derived['fb_thickness_at_end'],
-        derived['fb_direction_angle'],
-        params.get('fb_visible_height_at_nut', 0) or 4.5,
-        params.get('fb_visible_height_at_join', 0) or 4.5
+        exporter, neck.neck_end_x, neck.neck_end_y,
+        fb_geom.fb_bottom_end_x, fb_geom.fb_bottom_end_y,
+        geometry.fingerboard.fb_thickness_at_nut, fb_geom.fb_thickness_at_end,
+        fb_geom.fb_direction_angle,
+        params.fb_visible_height_at_nut or 4.5,
+        params.fb_visible_height_at_join or 4.5
     )
     
     reference_line_end_x, string_line = svg_renderer.draw_string_and_references(
-        exporter, derived['nut_top_x'], derived['nut_top_y'],
-        derived['bridge_top_x'], derived['bridge_top_y']
+        exporter, neck.nut_top_x, neck.nut_top_y,
+        neck.bridge_top_x, neck.bridge_top_y
     )
     
     svg_renderer.add_document_text(
-        exporter, params.get('instrument_name', 'Instrument'), "https://github.com/pzfreo/diagram-creator",
-        params.get('body_length', 0), params.get('rib_height', 0), params.get('belly_edge_thickness', 0),
-        params.get('arching_height', 0), params.get('bridge_height', 0), derived['neck_end_x']
+        exporter, params.instrument_name, "https://github.com/pzfreo/diagram-creator",
+        params.body_length, params.rib_height, params.belly_edge_thickness,
+        params.arching_height, params.bridge_height, neck.neck_end_x
     )
     
     svg_renderer.add_dimensions(
         exporter, show_measurements,
-        reference_line_end_x, derived['nut_top_x'], derived['nut_top_y'],
-        derived['bridge_top_x'], derived['bridge_top_y'], string_line,
-        derived['string_length'], derived['neck_end_x'], derived['neck_end_y'],
-        params.get('overstand', 0), derived['body_stop'], params.get('arching_height', 0),
-        params.get('bridge_height', 0), params.get('body_length', 0), params.get('rib_height', 0),
-        params.get('belly_edge_thickness', 0), derived['fb_surface_point_x'],
-        derived['fb_surface_point_y'], derived['string_x_at_fb_end'],
-        derived['string_y_at_fb_end'], derived['string_height_at_fb_end'],
-        derived['nut_perpendicular_intersection_x'], derived['nut_perpendicular_intersection_y'],
-        derived['nut_to_perpendicular_distance'],
-        tailpiece_height=params.get('tailpiece_height', 0),
-        string_break_angle=derived['string_break_angle'],
-        downward_force_percent=derived['downward_force_percent']
+        reference_line_end_x, neck.nut_top_x, neck.nut_top_y,
+        neck.bridge_top_x, neck.bridge_top_y, string_line,
+        neck.string_length, neck.neck_end_x, neck.neck_end_y,
+        params.overstand, geometry.angles.body_stop, params.arching_height,
+        params.bridge_height, params.body_length, params.rib_height,
+        params.belly_edge_thickness, string_height.fb_surface_point_x,
+        string_height.fb_surface_point_y, string_height.string_x_at_fb_end,
+        string_height.string_y_at_fb_end, string_height.string_height_at_fb_end,
+        string_height.nut_perpendicular_intersection_x, string_height.nut_perpendicular_intersection_y,
+        string_height.nut_to_perpendicular_distance,
+        tailpiece_height=params.tailpiece_height,
+        string_break_angle=geometry.string_break_angle,
+        downward_force_percent=geometry.downward_force_percent
     )
 
     # Add viol-specific back break dimensions
     if instrument_family == InstrumentFamily.VIOL.name:
         svg_renderer.add_viol_back_dimensions(
             exporter, show_measurements,
-            params.get('body_length', 0), params.get('belly_edge_thickness', 0),
-            params.get('rib_height', 0), params.get('top_block_height', 40),
-            params.get('break_angle', 15), derived['back_break_length'],
-            derived['break_start_x'], derived['break_start_y'],
-            derived['break_end_x'], derived['break_end_y']
+            params.body_length, params.belly_edge_thickness,
+            params.rib_height, params.top_block_height,
+            params.break_angle, geometry.back_break_length,
+            back_break.break_start_x, back_break.break_start_y,
+            back_break.break_end_x, back_break.break_end_y
         )
 
     return exporter.write(filename=None)
@@ -0,0 +1,219 @@
+"""
+Overstand - Inverse Solver
+
+Find input values that make a derived output hit a target, e.g. the
+overstand that gives a neck_angle of 86 degrees.
+
+For each free input the solver:
+1. Evaluates a grid across the input's registry min/max in one call to the
+   batch engine, and picks the sign change of (output - target) closest to
+   the current value as the bracket.
+2. Refines the bracket with the Illinois variant of regula falsi on the
+   scalar derived-values path (no SVG rendering).
+
+With several free inputs, each is solved on its own (the others held at
+their current values) and the solution needing the smallest change,
+relative to the input's registry range, is reported as the best.
+"""
+
+import math
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from batch_engine import calculate_derived_values_batch
+from instrument_geometry import calculate_derived_values
+from parameter_set import ParameterSet, continuous_inputs, input_range
+
+# Grid points used to bracket the root across the input's range
+BRACKET_GRID_POINTS = 65
+
+# Refinement stops when |output - target| <= tolerance or after this many steps
+MAX_ITERATIONS = 100
+DEFAULT_TOLERANCE = 1e-9
+
+
+def _find_brackets(grid: np.ndarray, residual: np.ndarray) -> List[Tuple[float, float]]:
+    """Consecutive grid intervals where the residual changes sign."""
+    brackets = []
+    for i in range(len(grid) - 1):
+        f0, f1 = residual[i], residual[i + 1]
+        if np.isnan(f0) or np.isnan(f1):
+            continue
+        if f0 == 0:
+            brackets.append((grid[i], grid[i]))
+        elif f0 * f1 < 0:
+            brackets.append((grid[i], grid[i + 1]))
+    if not np.isnan(residual[-1]) and residual[-1] == 0:
+        brackets.append((grid[-1], grid[-1]))
+    return brackets
+
+
+def _illinois(f, a: float, b: float, fa: float, fb: float,
+              tolerance: float) -> Tuple[float, float, int]:
+    """
+    Illinois (modified regula falsi) root refinement on [a, b].
+
+    Returns (x, f(x), iterations).
+    """
+    side = 0
+    x, fx = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+    for iteration in range(1, MAX_ITERATIONS + 1):
+        if abs(fx) <= tolerance or a == b:
+            return x, fx, iteration - 1
+        x = (a * fb - b * fa) / (fb - fa)
+        # Guard against stagnation outside (a, b) from round-off
+        if not min(a, b) < x < max(a, b):
+            x = 0.5 * (a + b)
+        fx = f(x)
+        if fx * fb > 0:
+            b, fb = x, fx
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = x, fx
+            if side == 1:
+                fb /= 2
+            side = 1
+        if abs(b - a) <= 1e-15 * max(1.0, abs(a), abs(b)):
+            return x, fx, iteration
+    return x, fx, MAX_ITERATIONS
+
+
+def solve_single_input(params: Dict[str, Any], target_key: str, target_value: float,
+                       free_input: str, bounds: Optional[Tuple[float, float]] = None,
+                       tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+    """
+    Solve for one free input so that derived[target_key] == target_value.
+
+    Args:
+        params: Design parameters (resolved against the registry)
+        target_key: Derived output to hit
+        target_value: Desired value of the output
+        free_input: Input parameter to vary
+        bounds: (min, max) search range; defaults to the registry range
+        tolerance: Accepted |output - target|
+
+    Returns:
+        Dictionary with success, input, value, achieved, error, change,
+        iterations and evaluations. On failure, message explains why and
+        value is the grid point that came closest.
+    """
+    params = ParameterSet.resolve(params)
+    lo, hi = bounds if bounds is not None else input_range(free_input)
+    current = params.get(free_input)
+
+    grid = np.linspace(lo, hi, BRACKET_GRID_POINTS)
+    batch = calculate_derived_values_batch({**params, free_input: grid})
+    if target_key not in batch:
+        raise ValueError(f"Unknown derived output '{target_key}'")
+    residual = batch[target_key] - target_value
+
+    brackets = _find_brackets(grid, residual)
+    if not brackets:
+        result = {
+            'success': False,
+            'input': free_input,
+            'message': f"{target_key} = {target_value} is not reachable by varying {free_input} within [{lo}, {hi}]",
+            'evaluations': len(grid)
+        }
+        finite = ~np.isnan(residual)
+        if finite.any():
+            closest = int(np.argmin(np.where(finite, np.abs(residual), np.inf)))
+            result['value'] = float(grid[closest])
+            result['achieved'] = float(batch[target_key][closest])
+        return result
+
+    reference = current if current is not None else 0.5 * (lo + hi)
+    a, b = min(brackets, key=lambda ab: abs(0.5 * (ab[0] + ab[1]) - reference))
+
+    evaluations = [len(grid)]
+
+    def residual_at(x: float) -> float:
+        evaluations[0] += 1
+        return calculate_derived_values({**params, free_input: x})[target_key] - target_value
+
+    try:
+        fa = residual_at(a)
+        fb = fa if a == b else residual_at(b)
+        x, fx, iterations = _illinois(residual_at, a, b, fa, fb, tolerance)
+    except (ValueError, ZeroDivisionError) as e:
+        return {
+            'success': False,
+            'input': free_input,
+            'message': f"Geometry failed while refining {free_input}: {e}",
+            'evaluations': evaluations[0]
+        }
+
+    x = float(x)
+    return {
+        'success': abs(fx) <= max(tolerance, 1e-9 * max(1.0, abs(target_value))),
+        'input': free_input,
+        'value': x,
+        'achieved': float(fx + target_value),
+        'error': float(fx),
+        'change': None if current is None else x - current,
+        'iterations': iterations,
+        'evaluations': evaluations[0]
+    }
+
+
+def solve_for_target(params: Dict[str, Any], target_key: str, target_value: float,
+                     free_inputs: Union[str, Sequence[str]],
+                     bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+                     tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+    """
+    Find input values that make a derived output hit a target.
+
+    Args:
+        params: Design parameters
+        target_key: Derived output to hit (e.g. 'neck_angle')
+        target_value: Desired value of the output
+        free_inputs: Input key, or list of input keys, that may change
+        bounds: Optional {input: (min, max)} overriding registry ranges
+        tolerance: Accepted |output - target|
+
+    Returns:
+        Dictionary with:
+            - success: True if at least one free input reaches the target
+            - solutions: {input: solve_single_input result}
+            - best: input whose solution needs the smallest change relative
+              to its registry range (None if none succeeded)
+            - params: the input params with the best solution applied
+    """
+    params = ParameterSet.resolve(params)
+    if isinstance(free_inputs, str):
+        free_inputs = [free_inputs]
+    if not free_inputs:
+        raise ValueError("At least one free input is required")
+
+    allowed = continuous_inputs(params.instrument_family)
+    for key in free_inputs:
+        if key not in allowed:
+            raise ValueError(f"'{key}' is not a continuous input for {params.instrument_family}")
+
+    bounds = bounds or {}
+    solutions = {
+        key: solve_single_input(params, target_key, target_value, key,
+                                bounds=bounds.get(key), tolerance=tolerance)
+        for key in free_inputs
+    }
+
+    def relative_change(key: str) -> float:
+        lo, hi = input_range(key)
+        change = solutions[key].get('change') or 0.0
+        return abs(change) / (hi - lo) if hi > lo else math.inf
+
+    successful = [key for key, solution in solutions.items() if solution['success']]
+    best = min(successful, key=relative_change) if successful else None
+
+    result = {
+        'success': best is not None,
+        'target': target_key,
+        'target_value': target_value,
+        'solutions': solutions,
+        'best': best,
+        'params': params.to_dict()
+    }
+    if best is not None:
+        result['params'][best] = solutions[best]['value']
+    return result
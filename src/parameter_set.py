@@ -0,0 +1,254 @@
+"""
+Overstand - Parameter Set
+
+Immutable, hashable parameter mapping resolved once against the registry.
+
+ParameterSet.resolve(params) fills every missing input from the
+InputConfig defaults in PARAMETER_REGISTRY, converts enum values to their
+names, coerces numeric/boolean/string types and rounds floats to a stable
+precision. The result:
+
+- is a read-only Mapping, so geometry_engine stages (and stage_cache read
+  tracking) keep working with params.get(...)
+- exposes attribute access (params.overstand) for orchestration code
+- hashes and compares by value, so it can be used directly as a cache key
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from parameter_registry import PARAMETER_REGISTRY, ParameterRole, ParameterType, InstrumentFamily
+from constants import DEFAULT_FRETS_VIOLIN, DEFAULT_FRETS_VIOL, DEFAULT_FRETS_GUITAR
+
+# Significant digits kept for float parameters. Well beyond any physical
+# tolerance, but removes float noise such as 0.1 + 0.2 so that equal designs
+# hash equally.
+CANONICAL_DIGITS = 12
+
+# Inputs whose default depends on the instrument family rather than the
+# single InputConfig default (see geometry_engine.resolve_fret_count)
+FAMILY_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    'no_frets': {
+        InstrumentFamily.VIOLIN.name: DEFAULT_FRETS_VIOLIN,
+        InstrumentFamily.VIOL.name: DEFAULT_FRETS_VIOL,
+        InstrumentFamily.GUITAR_MANDOLIN.name: DEFAULT_FRETS_GUITAR,
+    }
+}
+
+_DEFAULTS: Optional[Dict[str, Any]] = None
+
+
+def canonical_float(value: float) -> float:
+    """Round a float to CANONICAL_DIGITS significant digits."""
+    return float(f"{value:.{CANONICAL_DIGITS}g}")
+
+
+def _is_integer_param(param) -> bool:
+    """Numeric parameters with integral range and step (e.g. fret counts)."""
+    config = param.input_config
+    return all(isinstance(v, int) for v in (config.min_val, config.max_val, config.step))
+
+
+def numeric_inputs(instrument_family: str) -> List[str]:
+    """Numeric inputs of a family, including integer-valued ones."""
+    return [
+        key for key, param in PARAMETER_REGISTRY.items()
+        if param.param_type == ParameterType.NUMERIC
+        and param.input_config is not None
+        and param.is_input_in_mode(instrument_family)
+    ]
+
+
+def continuous_inputs(instrument_family: str) -> List[str]:
+    """
+    Numeric, non-integer inputs of a family (the keys solvers and sweeps may vary).
+
+    Integer-valued inputs such as fret_join and no_frets are excluded.
+    """
+    return [
+        key for key in numeric_inputs(instrument_family)
+        if not _is_integer_param(PARAMETER_REGISTRY[key])
+    ]
+
+
+def input_range(key: str) -> Tuple[float, float]:
+    """Registry (min, max) of a numeric input."""
+    param = PARAMETER_REGISTRY.get(key)
+    if param is None or param.input_config is None or param.param_type != ParameterType.NUMERIC:
+        raise ValueError(f"'{key}' is not a numeric input parameter")
+    return float(param.input_config.min_val), float(param.input_config.max_val)
+
+
+def is_integer_input(key: str) -> bool:
+    """True for numeric inputs that only take whole values (e.g. no_frets)."""
+    input_range(key)
+    return _is_integer_param(PARAMETER_REGISTRY[key])
+
+
+def _coerce(key: str, value: Any) -> Any:
+    """Coerce one value to the registry type of key (unknown keys pass through)."""
+    param = PARAMETER_REGISTRY.get(key)
+    if param is None or param.input_config is None:
+        if isinstance(value, float):
+            return canonical_float(value)
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    if param.param_type == ParameterType.NUMERIC:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{param.display_name} must be a number, got {value!r}")
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"{param.display_name} must be a number, got {value!r}")
+        if _is_integer_param(param):
+            return int(round(number))
+        return canonical_float(number)
+
+    if param.param_type == ParameterType.ENUM:
+        enum_class = param.enum_class
+        if isinstance(value, enum_class):
+            return value.name
+        if value in enum_class.__members__:
+            return value
+        for member in enum_class:
+            if member.value == value:
+                return member.name
+        raise ValueError(f"{param.display_name} has unknown value {value!r}")
+
+    if param.param_type == ParameterType.BOOLEAN:
+        if isinstance(value, str):
+            return value.strip().lower() in ('true', '1', 'yes')
+        return bool(value)
+
+    return str(value)
+
+
+def _registry_defaults() -> Dict[str, Any]:
+    """Coerced defaults for every input parameter (computed once)."""
+    global _DEFAULTS
+    if _DEFAULTS is None:
+        _DEFAULTS = {
+            key: _coerce(key, param.input_config.default)
+            for key, param in PARAMETER_REGISTRY.items()
+            if param.role != ParameterRole.OUTPUT_ONLY and param.input_config is not None
+        }
+    return _DEFAULTS
+
+
+def _family_default(key: str, instrument_family: str) -> Any:
+    """Default of a registry input: the family default from FAMILY_DEFAULTS, else the registry's."""
+    return FAMILY_DEFAULTS.get(key, {}).get(instrument_family, _registry_defaults()[key])
+
+
+class ParameterSet(Mapping):
+    """Frozen, hashable, registry-resolved parameters."""
+
+    __slots__ = ('_values', '_hash')
+
+    def __init__(self, values: Dict[str, Any]):
+        # Use ParameterSet.resolve(); values here must already be resolved
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def resolve(cls, params: Optional[Mapping] = None) -> 'ParameterSet':
+        """
+        Resolve raw params against the registry.
+
+        Missing (or None) inputs take the registry default, or the family
+        default for keys in FAMILY_DEFAULTS. Keys that are not registry inputs
+        are kept as given. Raises ValueError for values that cannot be coerced.
+        """
+        if isinstance(params, ParameterSet):
+            return params
+        values = dict(_registry_defaults())
+        given = set()
+        for key, value in (params or {}).items():
+            if value is None:
+                continue
+            values[key] = _coerce(key, value)
+            given.add(key)
+        for key in FAMILY_DEFAULTS:
+            if key not in given:
+                values[key] = _family_default(key, values['instrument_family'])
+        return cls(values)
+
+    def replace(self, **changes: Any) -> 'ParameterSet':
+        """
+        New ParameterSet with some values changed (and re-resolved).
+
+        None resets a key to its default as resolve() would give it, for the
+        resulting instrument family; keys that are not registry inputs are
+        removed. When instrument_family changes, FAMILY_DEFAULTS keys that
+        are not in changes and still hold the old family's default take the
+        new family's default.
+        """
+        values = dict(self._values)
+        resets = []
+        for key, value in changes.items():
+            if value is None:
+                resets.append(key)
+            else:
+                values[key] = _coerce(key, value)
+        old_family, new_family = self._values['instrument_family'], values['instrument_family']
+        if new_family != old_family:
+            for key in FAMILY_DEFAULTS:
+                if key not in changes and values.get(key) == _family_default(key, old_family):
+                    resets.append(key)
+        for key in resets:
+            if key in _registry_defaults():
+                values[key] = _family_default(key, values['instrument_family'])
+            else:
+                values.pop(key, None)
+        return ParameterSet(values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy (for JSON)."""
+        return dict(self._values)
+
+    # Mapping interface
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    # Attribute access and immutability
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ParameterSet is immutable; use replace()")
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(frozenset(self._values.items())))
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ParameterSet):
+            return hash(self) == hash(other) and self._values == other._values
+        if isinstance(other, Mapping):
+            return self._values == dict(other)
+        return NotImplemented
+
+    def __reduce__(self):
+        return (ParameterSet, (self._values,))
+
+    def __repr__(self) -> str:
+        return f"ParameterSet({self._values!r})"
@@ -0,0 +1,198 @@
+"""
+Overstand - Preset Index
+
+Nearest-neighbour lookup of known instruments: given the current design,
+the k closest presets and how each of their numeric inputs differs.
+
+The catalogue is every preset in presets/ plus every row of
+instrument_presets_full.csv whose preset_id is not already a JSON preset.
+Each entry is resolved with ParameterSet.resolve (so missing values take
+the same defaults as generation) and indexed per instrument family over
+that family's numeric inputs.
+
+Vectors are normalised per family and input by the catalogue's standard
+deviation (the registry range where all entries agree), so a millimetre
+of overstand weighs more than a millimetre of string length. The
+normalised matrix is built once and cached; a query is one vectorised
+distance computation over it, which stays well under a millisecond for
+thousands of instruments. A space-partitioning tree would not help here:
+with 20+ inputs per family it degenerates to the same full scan.
+"""
+
+import csv
+import json
+import os
+import numpy as np
+from typing import Any, Dict, List, Optional
+from parameter_set import ParameterSet, numeric_inputs, input_range
+from preset_loader import discover_presets
+
+DEFAULT_K = 5
+CATALOGUE_CSV = 'instrument_presets_full.csv'
+
+# CSV columns describing the preset rather than the design
+CSV_METADATA_COLUMNS = ('preset_id', 'display_name', 'family', 'icon', 'description')
+
+_INDEX: Optional['PresetIndex'] = None
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_catalogue(presets_dir: str = 'presets', csv_path: Optional[str] = CATALOGUE_CSV) -> List[Dict[str, Any]]:
+    """
+    Known instruments as entries {id, display_name, source, parameters}.
+
+    Args:
+        presets_dir: Preset directory relative to the repository root
+        csv_path: Catalogue CSV relative to the repository root (None to skip)
+    """
+    root = _repo_root()
+    entries = []
+    for preset_id, metadata in discover_presets(presets_dir).items():
+        try:
+            with open(os.path.join(root, metadata.filepath), 'r') as f:
+                parameters = json.load(f).get('parameters', {})
+        except Exception as e:
+            print(f"Warning: Failed to load preset {metadata.filepath}: {e}")
+            continue
+        entries.append({
+            'id': preset_id,
+            'display_name': metadata.display_name,
+            'source': 'preset',
+            'parameters': parameters
+        })
+
+    full_csv_path = os.path.join(root, csv_path) if csv_path else None
+    if full_csv_path and os.path.exists(full_csv_path):
+        known = {entry['id'] for entry in entries}
+        with open(full_csv_path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                preset_id = row.get('preset_id')
+                if not preset_id or preset_id in known:
+                    continue
+                known.add(preset_id)
+                entries.append({
+                    'id': preset_id,
+                    'display_name': row.get('display_name') or preset_id,
+                    'source': 'csv',
+                    'parameters': {key: value for key, value in row.items()
+                                   if key not in CSV_METADATA_COLUMNS and value not in (None, '')}
+                })
+    return entries
+
+
+class PresetIndex:
+    """Normalised per-family vectors of known instruments."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        """
+        Args:
+            entries: Catalogue entries {id, display_name, source, parameters}
+                     (see load_catalogue); entries that cannot be resolved
+                     are skipped with a warning
+        """
+        by_family: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            try:
+                params = ParameterSet.resolve(entry['parameters'])
+            except ValueError as e:
+                print(f"Warning: Skipping preset {entry['id']}: {e}")
+                continue
+            by_family.setdefault(params.instrument_family, []).append({**entry, 'parameters': params})
+
+        self.entries = [entry for family in by_family.values() for entry in family]
+        self._families: Dict[str, Dict[str, Any]] = {}
+        for family, family_entries in by_family.items():
+            keys = numeric_inputs(family)
+            vectors = np.array([[float(entry['parameters'][key]) for key in keys] for entry in family_entries])
+            span = np.array([np.subtract(*input_range(key)[::-1]) for key in keys])
+            std = vectors.std(axis=0)
+            scale = np.where(std > 0, std, span)
+            normalized = (vectors - vectors.mean(axis=0)) / scale
+            self._families[family] = {
+                'keys': keys,
+                'entries': family_entries,
+                'vectors': vectors,
+                'mean': vectors.mean(axis=0),
+                'scale': scale,
+                'normalized': normalized,
+                'squared_norms': np.einsum('ij,ij->i', normalized, normalized)
+            }
+
+    @classmethod
+    def from_catalogue(cls, presets_dir: str = 'presets',
+                       csv_path: Optional[str] = CATALOGUE_CSV) -> 'PresetIndex':
+        """Build an index over load_catalogue()."""
+        return cls(load_catalogue(presets_dir, csv_path))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def query(self, params: Dict[str, Any], k: int = DEFAULT_K) -> List[Dict[str, Any]]:
+        """
+        The k known instruments of the design's family closest to it.
+
+        Args:
+            params: Current design
+            k: Number of neighbours
+
+        Returns:
+            List, nearest first, of {
+                id, display_name, source,
+                distance: normalised Euclidean distance,
+                deltas: {input: preset value - current value}, largest
+                        normalised difference first
+            }
+        """
+        params = ParameterSet.resolve(params)
+        family = self._families.get(params.instrument_family)
+        if family is None or k <= 0:
+            return []
+
+        keys = family['keys']
+        current = np.array([float(params[key]) for key in keys])
+        point = (current - family['mean']) / family['scale']
+        # |a - b|^2 = |a|^2 - 2 a.b + |b|^2: one matrix-vector product per query
+        squared = family['squared_norms'] - 2.0 * (family['normalized'] @ point) + point @ point
+        k = min(k, len(squared))
+        nearest = np.argpartition(squared, k - 1)[:k]
+        nearest = nearest[np.argsort(squared[nearest], kind='stable')]
+
+        # Exact offsets for the k neighbours only
+        offsets = family['normalized'][nearest] - point
+        distances = np.sqrt(np.einsum('ij,ij->i', offsets, offsets))
+        deltas = family['vectors'][nearest] - current
+        orders = np.argsort(-np.abs(offsets), axis=1, kind='stable')
+
+        results = []
+        for row, i in enumerate(nearest):
+            entry = family['entries'][i]
+            results.append({
+                'id': entry['id'],
+                'display_name': entry['display_name'],
+                'source': entry['source'],
+                'distance': float(distances[row]),
+                'deltas': dict(zip([keys[j] for j in orders[row]], deltas[row, orders[row]].tolist()))
+            })
+        return results
+
+
+def get_preset_index() -> PresetIndex:
+    """The index over the bundled catalogue (built on first use)."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = PresetIndex.from_catalogue()
+    return _INDEX
+
+
+def reset_preset_index() -> None:
+    """Drop the cached index so the next query reloads the catalogue."""
+    global _INDEX
+    _INDEX = None
+
+
+def find_nearest_presets(params: Dict[str, Any], k: int = DEFAULT_K) -> List[Dict[str, Any]]:
+    """The k known instruments closest to a design (see PresetIndex.query)."""
+    return get_preset_index().query(params, k)
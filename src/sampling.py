@@ -0,0 +1,79 @@
+"""
+Overstand - Sampling
+
+Input samples over ranges of numeric registry inputs, as columns for the
+batch engine: a full factorial grid or a Latin-hypercube sample. Used by
+sweep (parameter sweeps) and design_optimizer (candidate designs).
+"""
+
+import numpy as np
+from typing import Dict, Optional, Tuple
+from parameter_set import input_range, is_integer_input
+
+DEFAULT_GRID_STEPS = 11
+
+# A range is (min, max), (min, max, steps) or None for the registry range
+RangeSpec = Optional[Tuple[float, ...]]
+
+
+def _bounds(key: str, spec: RangeSpec) -> Tuple[float, float]:
+    registry = input_range(key)
+    if spec is None:
+        return registry
+    return float(spec[0]), float(spec[1])
+
+
+def _finish(key: str, values: np.ndarray) -> np.ndarray:
+    """Round samples of integer-valued inputs to whole numbers."""
+    return np.round(values) if is_integer_input(key) else values
+
+
+def grid_columns(ranges: Dict[str, RangeSpec], steps: int = DEFAULT_GRID_STEPS) -> Dict[str, np.ndarray]:
+    """
+    Full factorial grid over the given inputs.
+
+    Args:
+        ranges: {input: (min, max) | (min, max, steps) | None}; None uses
+                the registry range and steps defaults to steps
+        steps: Points per input when a range does not give its own
+
+    Returns:
+        {input: flattened column}; the row count is the product of the steps
+    """
+    axes = []
+    for key, spec in ranges.items():
+        lo, hi = _bounds(key, spec)
+        count = int(spec[2]) if spec is not None and len(spec) > 2 else steps
+        if count < 1:
+            raise ValueError(f"Sweep of {key} needs at least one step")
+        axes.append(_finish(key, np.linspace(lo, hi, count)))
+
+    mesh = np.meshgrid(*axes, indexing='ij')
+    return {key: m.ravel() for key, m in zip(ranges, mesh)}
+
+
+def latin_hypercube_columns(ranges: Dict[str, RangeSpec], samples: int,
+                            seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Latin-hypercube sample: each input's range is cut into samples equal
+    strata, each stratum is hit exactly once and the strata are paired at
+    random across inputs.
+
+    Args:
+        ranges: {input: (min, max) | None}; None uses the registry range
+        samples: Number of rows
+        seed: Random seed for reproducible samples
+
+    Returns:
+        {input: column of length samples}
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for key, spec in ranges.items():
+        lo, hi = _bounds(key, spec)
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns[key] = _finish(key, lo + strata * (hi - lo))
+    return columns
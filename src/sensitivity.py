@@ -0,0 +1,121 @@
+"""
+Overstand - Sensitivity Analysis
+
+Jacobian of every derived output with respect to every continuous input.
+
+The 2N perturbed designs (input i nudged up and down by its step) are
+evaluated in one call to the batch engine and combined as central
+differences:
+
+    d(output)/d(input_i) ~= (f(x + h_i) - f(x - h_i)) / (2 h_i)
+
+Integer-valued inputs (fret_join, no_frets) have no derivative and are
+excluded. Outputs that are undefined at a perturbed design (e.g. impossible
+guitar geometry) get NaN entries.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+from batch_engine import calculate_derived_values_batch
+from instrument_geometry import calculate_derived_values
+from parameter_set import ParameterSet, continuous_inputs, input_range
+
+# Step size relative to max(|value|, 1)
+DEFAULT_RELATIVE_STEP = 1e-6
+
+
+def calculate_jacobian(params: Dict[str, Any], inputs: Optional[Sequence[str]] = None,
+                       relative_step: float = DEFAULT_RELATIVE_STEP) -> Dict[str, Any]:
+    """
+    Central-difference Jacobian of the derived outputs.
+
+    Args:
+        params: Design parameters
+        inputs: Inputs to differentiate by; defaults to every continuous
+                input of the design's instrument family
+        relative_step: Perturbation relative to max(|value|, 1)
+
+    Returns:
+        Dictionary with:
+            - inputs: list of input keys (columns)
+            - outputs: list of derived output keys (rows)
+            - jacobian: (n_outputs, n_inputs) array of d(output)/d(input)
+            - values: {output: value} at the unperturbed design
+    """
+    params = ParameterSet.resolve(params)
+    if inputs is None:
+        inputs = continuous_inputs(params.instrument_family)
+    inputs = list(inputs)
+
+    base = calculate_derived_values(params)
+    outputs = list(base)
+
+    x = np.array([float(params[key]) for key in inputs])
+    steps = relative_step * np.maximum(np.abs(x), 1.0)
+
+    # Rows 2i and 2i+1 perturb input i up and down
+    n = len(inputs)
+    columns: Dict[str, Any] = dict(params)
+    for i, key in enumerate(inputs):
+        column = np.full(2 * n, x[i])
+        column[2 * i] += steps[i]
+        column[2 * i + 1] -= steps[i]
+        columns[key] = column
+
+    batch = calculate_derived_values_batch(columns, size=2 * n)
+    jacobian = np.empty((len(outputs), n))
+    for row, key in enumerate(outputs):
+        values = batch[key]
+        jacobian[row] = (values[0::2] - values[1::2]) / (2 * steps)
+
+    return {
+        'inputs': inputs,
+        'outputs': outputs,
+        'jacobian': jacobian,
+        'values': base
+    }
+
+
+def rank_inputs(sensitivity: Dict[str, Any], output_key: str, scale: str = 'raw',
+                top: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Rank inputs by their effect on one output.
+
+    Args:
+        sensitivity: Result of calculate_jacobian
+        output_key: Output to rank for
+        scale: 'raw' ranks by |d(output)/d(input)| (output change per unit
+               of input, e.g. per mm); 'range' multiplies by the input's
+               registry span
+        top: Keep only the first top entries
+
+    Returns:
+        List of {input, derivative, impact} sorted by descending |impact|
+    """
+    if output_key not in sensitivity['outputs']:
+        raise ValueError(f"Unknown derived output '{output_key}'")
+    if scale not in ('raw', 'range'):
+        raise ValueError(f"Unknown scale '{scale}'")
+
+    row = sensitivity['jacobian'][sensitivity['outputs'].index(output_key)]
+    ranked = []
+    for key, derivative in zip(sensitivity['inputs'], row):
+        impact = derivative
+        if scale == 'range':
+            lo, hi = input_range(key)
+            impact = derivative * (hi - lo)
+        ranked.append({'input': key, 'derivative': float(derivative), 'impact': float(impact)})
+
+    ranked.sort(key=lambda r: -abs(r['impact']) if not np.isnan(r['impact']) else 0.0)
+    return ranked[:top] if top is not None else ranked
+
+
+def jacobian_to_dict(sensitivity: Dict[str, Any]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Nested {output: {input: derivative}} form for JSON (NaN becomes None)."""
+    return {
+        output: {
+            key: (None if np.isnan(value) else float(value))
+            for key, value in zip(sensitivity['inputs'], row)
+        }
+        for output, row in zip(sensitivity['outputs'], sensitivity['jacobian'])
+    }
@@ -0,0 +1,189 @@
+"""
+Overstand - Stage Cache
+
+Read-set-tracking memoization for geometry_engine stages.
+
+Each stage reads only a handful of keys from params. The first time a stage
+runs, it is given a TrackingParams wrapper that records every key it reads
+(and the value it saw). The result is cached under just those values plus
+the stage's other arguments, so changing an unrelated parameter - e.g.
+dragging the overstand slider - still hits the cache for
+calculate_fingerboard_thickness, while only the stages that read overstand
+recompute.
+
+Hit/miss counters per stage are available via get_cache_stats().
+"""
+
+import functools
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+# Maximum cached results kept per stage (least recently used are evicted)
+STAGE_CACHE_SIZE = 128
+
+_MISSING = object()
+
+
+class TrackingParams(Mapping):
+    """Read-only params view that records every key read through it."""
+
+    def __init__(self, params: Mapping):
+        self._params = params
+        self.reads: Dict[str, Any] = {}
+        self.read_all = False
+
+    def _record(self, key: str) -> Any:
+        value = self._params.get(key, _MISSING)
+        self.reads[key] = value
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._record(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._record(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key: object) -> bool:
+        return self._record(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        # Iteration can observe any key, so the read set is the whole dict
+        self.read_all = True
+        return iter(self._params)
+
+    def __len__(self) -> int:
+        self.read_all = True
+        return len(self._params)
+
+
+class _StageCache:
+    """Cache for one stage: results grouped by the read set that produced them."""
+
+    def __init__(self, name: str, max_entries: int = STAGE_CACHE_SIZE):
+        self.name = name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # read-key tuple -> number of cached entries using it
+        self.signatures: Dict[Tuple[str, ...], int] = {}
+        # (read keys, read values, args key) -> result
+        self.entries: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    def lookup(self, params: Mapping, args_key: tuple) -> Any:
+        for keys in self.signatures:
+            values = tuple(params.get(k, _MISSING) for k in keys)
+            entry_key = (keys, values, args_key)
+            try:
+                result = self.entries[entry_key]
+            except (KeyError, TypeError):
+                continue
+            self.entries.move_to_end(entry_key)
+            return result
+        return _MISSING
+
+    def store(self, reads: Dict[str, Any], args_key: tuple, result: Any) -> None:
+        keys = tuple(sorted(reads))
+        entry_key = (keys, tuple(reads[k] for k in keys), args_key)
+        try:
+            hash(entry_key)
+        except TypeError:
+            return  # Unhashable parameter values are never cached
+        self.entries[entry_key] = result
+        self.signatures[keys] = self.signatures.get(keys, 0) + 1
+        while len(self.entries) > self.max_entries:
+            (old_keys, _, _), _ = self.entries.popitem(last=False)
+            self.signatures[old_keys] -= 1
+            if self.signatures[old_keys] == 0:
+                del self.signatures[old_keys]
+
+    def clear(self) -> None:
+        self.signatures.clear()
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_STAGE_CACHES: Dict[str, _StageCache] = {}
+_enabled = True
+
+
+def _freeze(value: Any) -> Any:
+    """Make list/dict arguments hashable for use in a cache key."""
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _copy_result(result: Any) -> Any:
+    # Stage records are frozen and can be shared; dict results are copied
+    # because callers may add keys to them
+    return dict(result) if isinstance(result, dict) else result
+
+
+def memoized_stage(func: Callable) -> Callable:
+    """
+    Memoize a geometry stage whose first argument is the params mapping.
+
+    The cache key is the set of params values the stage actually read plus
+    its remaining arguments.
+    """
+    cache = _STAGE_CACHES.setdefault(func.__name__, _StageCache(func.__name__))
+
+    @functools.wraps(func)
+    def wrapper(params, *args, **kwargs):
+        if not _enabled:
+            return func(params, *args, **kwargs)
+
+        try:
+            args_key = (_freeze(args), _freeze(kwargs))
+            hash(args_key)
+        except TypeError:
+            cache.misses += 1
+            return func(params, *args, **kwargs)
+
+        result = cache.lookup(params, args_key)
+        if result is not _MISSING:
+            cache.hits += 1
+            return _copy_result(result)
+
+        cache.misses += 1
+        tracking = TrackingParams(params)
+        result = func(tracking, *args, **kwargs)
+        if not tracking.read_all:
+            cache.store(tracking.reads, args_key, _copy_result(result))
+        return result
+
+    wrapper.stage_cache = cache
+    return wrapper
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters and entry counts for every memoized stage."""
+    return {
+        name: {'hits': cache.hits, 'misses': cache.misses, 'entries': len(cache.entries)}
+        for name, cache in _STAGE_CACHES.items()
+    }
+
+
+def clear_stage_caches() -> None:
+    """Drop all cached stage results and reset the counters."""
+    for cache in _STAGE_CACHES.values():
+        cache.clear()
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Enable or disable stage memoization globally."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_cache_enabled() -> bool:
+    """Whether stage memoization is enabled."""
+    return _enabled
@@ -16,11 +16,14 @@ from dimension_helpers import (
 )
 import math
 from typing import Tuple
+from constants import SVG_PRECISION
 
 def setup_exporter(show_measurements: bool) -> ExportSVG:
     """Create and configure SVG exporter with all necessary layers."""
-    exporter = ExportSVG(scale=1.0, unit=Unit.MM, line_weight=0.5)
-    exporter.add_layer("text", fill_color=(0,0,255), line_type=LineType.HIDDEN)
+    # One <g> per layer, painted in the order added here (text last, on top),
+    # with compact relative paths
+    exporter = ExportSVG(scale=1.0, unit=Unit.MM, line_weight=0.5, group_layers=True, precision=SVG_PRECISION,
+                         coalesce_edges=True, compact=True)
     exporter.add_layer("drawing", fill_color=None, line_color=(0,0,0), line_type=LineType.CONTINUOUS)
     exporter.add_layer("schematic", fill_color=None, line_color=(0,0,0), line_type=LineType.DASHED)
     exporter.add_layer("schematic_dotted", fill_color=None, line_color=(100,100,100), line_type=LineType.DOTTED)
@@ -29,6 +32,7 @@ def setup_exporter(show_measurements: bool) -> ExportSVG:
     exporter.add_layer("dimensions", fill_color=dim_color, line_color=dim_color, line_type=LineType.DASHED)
     exporter.add_layer("extensions", fill_color=None, line_color=dim_color, line_type=LineType.CONTINUOUS)
     exporter.add_layer("arrows", fill_color=dim_color, line_color=dim_color, line_type=LineType.CONTINUOUS)
+    exporter.add_layer("text", fill_color=(0,0,255), line_type=LineType.HIDDEN)
 
     return exporter
 
@@ -0,0 +1,201 @@
+"""
+Overstand - Parameter Sweep
+
+Evaluate derived values over a large design space: a full grid or a
+Latin-hypercube sample (see sampling) over any numeric registry inputs.
+
+Rows are split into chunks that are evaluated by the batch engine, in
+parallel across a process pool when more than one worker is available.
+Results are either returned as in-memory columns or written as one .npy file
+per column plus a manifest.json, so that a million-row sweep can be analysed
+with np.load(..., mmap_mode='r') without reading it all into memory:
+
+    sweep_dir/
+        manifest.json         rows, input and output keys, base params
+        overstand.npy         one file per swept input ...
+        neck_angle.npy        ... and per derived output
+
+Rows the engine rejects (impossible geometry) are NaN in every output.
+"""
+
+import json
+import os
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+from batch_engine import calculate_derived_values_batch
+from parameter_set import ParameterSet, numeric_inputs
+from sampling import DEFAULT_GRID_STEPS, RangeSpec, grid_columns, latin_hypercube_columns
+
+DEFAULT_CHUNK_SIZE = 50000
+# Chunks submitted to the pool per worker at any time (each holds its input
+# slice and, once done, its derived columns until stored)
+IN_FLIGHT_PER_WORKER = 2
+MANIFEST_FILE = 'manifest.json'
+
+
+def _evaluate_chunk(params: Dict[str, Any], chunk: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+    """Worker entry point: derived values of one chunk of rows."""
+    return calculate_derived_values_batch({**params, **chunk}, size=size)
+
+
+def _chunks(columns: Dict[str, np.ndarray], rows: int, chunk_size: int):
+    for start in range(0, rows, chunk_size):
+        stop = min(start + chunk_size, rows)
+        yield start, stop, {key: values[start:stop] for key, values in columns.items()}
+
+
+def run_sweep(params: Dict[str, Any], columns: Dict[str, np.ndarray],
+              output_dir: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Evaluate derived values for every row of the swept input columns.
+
+    Args:
+        params: Base design; inputs not in columns keep these values
+        columns: {input: array}, all of the same length; every key must be
+                 a numeric input of the design's family
+        output_dir: If given, write one .npy per column and a manifest there
+                    and return memory-mapped (read-only) columns
+        chunk_size: Rows per batch-engine call
+        workers: Worker processes (default: CPU count); 1 evaluates in this
+                 process. At most IN_FLIGHT_PER_WORKER chunks per worker
+                 are submitted at a time, and each result is stored as soon
+                 as it completes
+
+    Returns:
+        Dictionary with:
+            - rows: number of rows
+            - inputs: swept input keys
+            - outputs: derived output keys (a derived value named like a
+              swept input, such as body_stop, is left out: the column holds
+              the swept values)
+            - columns: {key: array} for every input and output
+            - path: output_dir (None when kept in memory)
+    """
+    params = ParameterSet.resolve(params)
+    allowed = numeric_inputs(params.instrument_family)
+    params = params.to_dict()
+    inputs = list(columns)
+    rows = len(next(iter(columns.values()))) if columns else 0
+    for key, values in columns.items():
+        if key not in allowed:
+            raise ValueError(f"'{key}' is not a numeric input for {params['instrument_family']}")
+        if len(values) != rows:
+            raise ValueError(f"Column '{key}' has {len(values)} rows, expected {rows}")
+    if rows == 0:
+        raise ValueError("A sweep needs at least one row")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    outputs = [key for key in calculate_derived_values_batch(params, size=1) if key not in columns]
+    columns = {key: np.asarray(values, dtype=float) for key, values in columns.items()}
+
+    if output_dir is not None:
+        path = Path(output_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        results = {
+            key: np.lib.format.open_memmap(path / f'{key}.npy', mode='w+', dtype=float, shape=(rows,))
+            for key in inputs + outputs
+        }
+        for key in inputs:
+            results[key][:] = columns[key]
+    else:
+        path = None
+        results = dict(columns)
+        results.update({key: np.empty(rows) for key in outputs})
+
+    def store(start: int, stop: int, derived: Dict[str, np.ndarray]) -> None:
+        for key in outputs:
+            results[key][start:stop] = derived[key]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or rows <= chunk_size:
+        for start, stop, chunk in _chunks(columns, rows, chunk_size):
+            store(start, stop, _evaluate_chunk(params, chunk, stop - start))
+    else:
+        limit = workers * IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+
+            def collect() -> None:
+                # Store finished chunks as they complete and let them go
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(*pending.pop(future), future.result())
+
+            for start, stop, chunk in _chunks(columns, rows, chunk_size):
+                while len(pending) >= limit:
+                    collect()
+                pending[executor.submit(_evaluate_chunk, params, chunk, stop - start)] = (start, stop)
+            while pending:
+                collect()
+
+    if path is not None:
+        for array in results.values():
+            array.flush()
+        manifest = {'rows': rows, 'inputs': inputs, 'outputs': outputs, 'params': params}
+        with open(path / MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        del results
+        return {**manifest, 'columns': load_sweep(path)['columns'], 'path': str(path)}
+
+    return {'rows': rows, 'inputs': inputs, 'outputs': outputs, 'params': params, 'columns': results, 'path': None}
+
+
+def sweep(params: Dict[str, Any], ranges: Dict[str, RangeSpec], method: str = 'grid',
+          steps: int = DEFAULT_GRID_STEPS, samples: int = 10000, seed: Optional[int] = None,
+          output_dir: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Sweep a design over ranges of numeric inputs.
+
+    Args:
+        params: Base design
+        ranges: {input: (min, max) | (min, max, steps) | None}; None uses
+                the registry range
+        method: 'grid' (full factorial) or 'lhs' (Latin hypercube)
+        steps: Grid points per input (grid only)
+        samples: Number of rows (lhs only)
+        seed: Random seed (lhs only)
+        output_dir, chunk_size, workers: see run_sweep
+
+    Returns:
+        run_sweep result, with method added
+    """
+    if not ranges:
+        raise ValueError("At least one input range is required")
+    if method == 'grid':
+        columns = grid_columns(ranges, steps)
+    elif method == 'lhs':
+        columns = latin_hypercube_columns(ranges, samples, seed)
+    else:
+        raise ValueError(f"Unknown sweep method '{method}'")
+
+    result = run_sweep(params, columns, output_dir=output_dir, chunk_size=chunk_size, workers=workers)
+    result['method'] = method
+    return result
+
+
+def load_sweep(path: str, mmap_mode: Optional[str] = 'r') -> Dict[str, Any]:
+    """
+    Open a sweep written by run_sweep.
+
+    Args:
+        path: Sweep directory
+        mmap_mode: Passed to np.load; 'r' memory-maps the columns, None
+                   reads them into memory
+
+    Returns:
+        The manifest, with columns: {key: array} for every input and output
+    """
+    path = Path(path)
+    with open(path / MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    keys: Sequence[str] = manifest['inputs'] + manifest['outputs']
+    manifest['columns'] = {key: np.load(path / f'{key}.npy', mmap_mode=mmap_mode) for key in keys}
+    return manifest
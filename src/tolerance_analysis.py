@@ -0,0 +1,185 @@
+"""
+Overstand - Tolerance Analysis
+
+Monte Carlo analysis of how machining tolerances on the inputs spread the
+derived outputs.
+
+Each toleranced input is sampled around its nominal value and all samples
+are evaluated in a single pass of the batch engine, so tens of thousands of
+designs take well under a second. The result reports, per output, the
+nominal value, mean, standard deviation, extremes, percentiles and a
+histogram.
+
+Tolerances are symmetric (+/- tol). With the default 'normal' distribution
+the tolerance is treated as 3 standard deviations; with 'uniform' samples
+are spread evenly over the full +/- tol band.
+
+Samples are clipped to the input's registry min/max, since a part cannot be
+made outside them (a tailpiece_height of 0 +/- 1 gives heights in [0, 1],
+never negative ones). Clipped samples are kept, so values pile up at the
+bound, and the result reports how many were clipped per input.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+from batch_engine import calculate_derived_values_batch
+from instrument_geometry import calculate_derived_values
+from parameter_set import ParameterSet, continuous_inputs, input_range
+
+DEFAULT_SAMPLES = 20000
+DEFAULT_OUTPUTS = ['neck_angle', 'string_height_at_fb_end', 'downward_force_percent']
+DEFAULT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+HISTOGRAM_BINS = 20
+
+# Tolerance band covered by +/- this many standard deviations (normal mode)
+SIGMA_PER_TOLERANCE = 3.0
+
+
+def clip_to_ranges(columns: Dict[str, np.ndarray]) -> Dict[str, int]:
+    """
+    Clip sampled columns in place to their registry min/max.
+
+    Returns:
+        {input: number of samples clipped}
+    """
+    clipped = {}
+    for key, values in columns.items():
+        lo, hi = input_range(key)
+        clipped[key] = int(np.count_nonzero((values < lo) | (values > hi)))
+        np.clip(values, lo, hi, out=values)
+    return clipped
+
+
+def sample_inputs(params: Dict[str, Any], tolerances: Dict[str, float], samples: int,
+                  distribution: str = 'normal', seed: Optional[int] = None,
+                  clip: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Draw perturbed values for each toleranced input.
+
+    Args:
+        clip: Clip samples to the registry range (see clip_to_ranges)
+
+    Returns:
+        {input: array of length samples}
+    """
+    if distribution not in ('normal', 'uniform'):
+        raise ValueError(f"Unknown distribution '{distribution}'")
+
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for key, tolerance in tolerances.items():
+        nominal = float(params[key])
+        if tolerance < 0:
+            raise ValueError(f"Tolerance for {key} must not be negative")
+        if distribution == 'normal':
+            columns[key] = rng.normal(nominal, tolerance / SIGMA_PER_TOLERANCE, samples)
+        else:
+            columns[key] = rng.uniform(nominal - tolerance, nominal + tolerance, samples)
+    if clip:
+        clip_to_ranges(columns)
+    return columns
+
+
+def summarize(values: np.ndarray, nominal: float,
+              percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """Distribution statistics of one output (NaN samples ignored)."""
+    valid = values[~np.isnan(values)]
+    if valid.size == 0:
+        return {'nominal': nominal, 'valid_samples': 0}
+
+    counts, edges = np.histogram(valid, bins=HISTOGRAM_BINS)
+    return {
+        'nominal': nominal,
+        'valid_samples': int(valid.size),
+        'mean': float(valid.mean()),
+        'std': float(valid.std()),
+        'min': float(valid.min()),
+        'max': float(valid.max()),
+        'percentiles': {str(p): float(v) for p, v in zip(percentiles, np.percentile(valid, percentiles))},
+        'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()}
+    }
+
+
+def run_tolerance_analysis(params: Dict[str, Any], tolerances: Dict[str, float],
+                           samples: int = DEFAULT_SAMPLES,
+                           outputs: Optional[List[str]] = None,
+                           distribution: str = 'normal',
+                           seed: Optional[int] = None,
+                           percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """
+    Monte Carlo tolerance analysis around a design.
+
+    Args:
+        params: Nominal design parameters
+        tolerances: {input: +/- tolerance} for each toleranced input
+        samples: Number of perturbed designs
+        outputs: Derived outputs to report (default: neck_angle,
+                 string_height_at_fb_end, downward_force_percent)
+        distribution: 'normal' (tolerance = 3 sigma) or 'uniform'
+        seed: Random seed for reproducible runs
+        percentiles: Percentiles to report
+
+    Returns:
+        Dictionary with:
+            - samples: number of designs evaluated
+            - invalid_samples: designs the engine rejected (impossible geometry)
+            - clipped_samples: {input: samples clipped to its registry range}
+            - tolerances, distribution
+            - outputs: {output: summarize() result}
+    """
+    params = ParameterSet.resolve(params)
+    if not tolerances:
+        raise ValueError("At least one tolerance is required")
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+
+    allowed = continuous_inputs(params.instrument_family)
+    for key in tolerances:
+        if key not in allowed:
+            raise ValueError(f"'{key}' is not a continuous input for {params.instrument_family}")
+
+    nominal = calculate_derived_values(params)
+    outputs = outputs or DEFAULT_OUTPUTS
+    for key in outputs:
+        if key not in nominal:
+            raise ValueError(f"Unknown derived output '{key}'")
+
+    sampled = sample_inputs(params, tolerances, samples, distribution, seed, clip=False)
+    clipped = clip_to_ranges(sampled)
+    columns = dict(params)
+    columns.update(sampled)
+    batch = calculate_derived_values_batch(columns, size=samples)
+
+    invalid = np.isnan(batch['neck_angle'])
+    return {
+        'samples': samples,
+        'invalid_samples': int(invalid.sum()),
+        'clipped_samples': clipped,
+        'tolerances': dict(tolerances),
+        'distribution': distribution,
+        'outputs': {key: summarize(batch[key], nominal[key], percentiles) for key in outputs}
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Plain-text report of a tolerance analysis (used by the CLI)."""
+    lines = [
+        f"Tolerance analysis: {result['samples']} samples ({result['distribution']})",
+        "Tolerances: " + ", ".join(f"{k} ±{v}" for k, v in result['tolerances'].items())
+    ]
+    if result['invalid_samples']:
+        lines.append(f"Rejected (impossible geometry): {result['invalid_samples']}")
+    for key, count in result['clipped_samples'].items():
+        if count:
+            lines.append(f"Clipped to the {key} range: {count}")
+    lines.append("")
+
+    for key, stats in result['outputs'].items():
+        lines.append(key)
+        if not stats['valid_samples']:
+            lines.append("  no valid samples")
+            continue
+        lines.append(f"  nominal {stats['nominal']:.4f}  mean {stats['mean']:.4f}  std {stats['std']:.4f}")
+        lines.append(f"  min {stats['min']:.4f}  max {stats['max']:.4f}")
+        lines.append("  " + "  ".join(f"p{p} {v:.4f}" for p, v in stats['percentiles'].items()))
+    return "\n".join(lines)
@@ -4,28 +4,24 @@ Overstand - View Generator
 This module handles the generation of HTML-based views like fret position tables.
 """
 
-from typing import Dict, Any
-from geometry_engine import calculate_fret_positions
-from parameter_registry import InstrumentFamily
+from typing import Dict, Any, List, Optional
+from geometry_engine import calculate_fret_positions, resolve_fret_count
 
-def generate_fret_positions_view(params: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate fret positions data for display."""
-    vsl = params.get('vsl') or 0
-    instrument_family = params.get('instrument_family') or InstrumentFamily.VIOLIN.name
+def generate_fret_positions_view(params: Dict[str, Any],
+                                 fret_positions: Optional[List[float]] = None) -> Dict[str, Any]:
+    """
+    Generate fret positions data for display.
 
-    if params.get('no_frets') is not None:
-        no_frets = params.get('no_frets')
-    elif instrument_family == InstrumentFamily.VIOL.name:
-        no_frets = 7
-    elif instrument_family == InstrumentFamily.GUITAR_MANDOLIN.name:
-        no_frets = 20
-    else:
-        no_frets = 0
+    Pass fret_positions to reuse positions already computed for this generation.
+    """
+    vsl = params.get('vsl') or 0
+    no_frets = resolve_fret_count(params)
 
     if no_frets == 0:
         return {'available': False, 'message': 'Fret positions not applicable for violin family'}
 
-    fret_positions = calculate_fret_positions(vsl, no_frets)
+    if fret_positions is None:
+        fret_positions = calculate_fret_positions(vsl, no_frets)
 
     html = '<div class="fret-table-container">'
     html += '<table class="fret-table">'
@@ -0,0 +1,132 @@
+"""
+Test suite for batch_engine.py
+
+Validates that the vectorized derived-value engine matches the scalar
+calculate_derived_values path for every instrument family.
+"""
+
+import json
+import pytest
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from batch_engine import (
+    calculate_derived_values_batch,
+    columns_from_params,
+    derived_row,
+    infer_batch_size
+)
+from instrument_geometry import calculate_derived_values
+
+
+def load_preset_params():
+    """Load the parameters of every preset file."""
+    presets_dir = Path(__file__).parent.parent / 'presets'
+    result = []
+    for preset_file in sorted(presets_dir.glob('*.json')):
+        if preset_file.name == 'presets.json':
+            continue
+        with open(preset_file) as f:
+            data = json.load(f)
+        if 'parameters' in data:
+            result.append(data['parameters'])
+    return result
+
+
+def assert_matches_scalar(params_list):
+    """Evaluate params_list in one batch and compare each row to the scalar path."""
+    batch = calculate_derived_values_batch(columns_from_params(params_list))
+    for i, params in enumerate(params_list):
+        try:
+            scalar = calculate_derived_values(params)
+        except (ValueError, ZeroDivisionError, IndexError):
+            # Rows the scalar path rejects must be NaN in the batch
+            assert np.isnan(batch['neck_angle'][i]), f"row {i} should be rejected"
+            continue
+        for key, value in scalar.items():
+            assert key in batch, f"Missing batch key {key}"
+            np.testing.assert_allclose(batch[key][i], value, rtol=1e-9, atol=1e-9,
+                                       err_msg=f"row {i} key {key}")
+
+
+class TestMatchesScalarPath:
+    """The batch engine must reproduce calculate_derived_values row by row."""
+
+    def test_default_families(self, default_violin_params, default_viol_params, default_guitar_params):
+        """Defaults for all three families in a single mixed batch"""
+        assert_matches_scalar([default_violin_params, default_viol_params, default_guitar_params])
+
+    def test_all_presets(self):
+        """Every shipped preset, including ones with missing keys"""
+        assert_matches_scalar(load_preset_params())
+
+    def test_random_perturbations(self, default_violin_params, default_viol_params, default_guitar_params):
+        """Randomly perturbed designs across families, including blended fillets"""
+        rng = np.random.default_rng(42)
+        params_list = []
+        for base in (default_violin_params, default_viol_params, default_guitar_params):
+            for _ in range(20):
+                params = base.copy()
+                params['overstand'] = base['overstand'] * rng.uniform(0.5, 1.5)
+                params['bridge_height'] = base['bridge_height'] * rng.uniform(0.8, 1.2)
+                params['arching_height'] = base['arching_height'] * rng.uniform(0.5, 1.5)
+                params['fb_blend_percent'] = rng.uniform(0, 100)
+                params['fingerboard_width_at_end'] = rng.uniform(30, 45)
+                params_list.append(params)
+        assert_matches_scalar(params_list)
+
+    def test_zero_values_use_scalar_fallbacks(self, default_violin_params):
+        """Zero radius falls back to the default radius, as in the scalar path"""
+        params = default_violin_params.copy()
+        params['fingerboard_radius'] = 0
+        assert_matches_scalar([params])
+
+
+class TestBatchInputs:
+    """Tests for struct-of-arrays input handling"""
+
+    def test_scalars_broadcast_over_array_column(self, default_violin_params):
+        """A single varied column produces one row per value"""
+        overstands = np.linspace(6, 18, 25)
+        batch = calculate_derived_values_batch({**default_violin_params, 'overstand': overstands})
+        assert batch['neck_angle'].shape == (25,)
+        for i in (0, 12, 24):
+            params = {**default_violin_params, 'overstand': float(overstands[i])}
+            expected = calculate_derived_values(params)['neck_angle']
+            assert abs(batch['neck_angle'][i] - expected) < 1e-9
+
+    def test_mismatched_column_lengths_rejected(self):
+        """Array columns of different lengths are an error"""
+        with pytest.raises(ValueError):
+            infer_batch_size({'vsl': [325, 330], 'body_stop': [195, 195, 195]})
+
+    def test_invalid_family_rejected(self, default_violin_params):
+        """Unknown instrument families raise like the scalar path"""
+        with pytest.raises(ValueError):
+            calculate_derived_values_batch({**default_violin_params, 'instrument_family': 'HARP'})
+
+    def test_impossible_guitar_rows_are_nan(self, default_guitar_params):
+        """Rows the scalar path rejects come back as NaN without affecting others"""
+        batch = calculate_derived_values_batch({
+            **default_guitar_params,
+            'bridge_height': np.array([25.0, 5000.0])
+        })
+        assert np.isfinite(batch['neck_angle'][0])
+        assert np.isnan(batch['neck_angle'][1])
+
+    def test_viol_only_keys_are_nan_for_violins(self, default_violin_params, default_viol_params):
+        """break_* keys exist only for viol rows; back_break_length is zero otherwise"""
+        batch = calculate_derived_values_batch(columns_from_params([default_violin_params, default_viol_params]))
+        assert np.isnan(batch['break_end_x'][0])
+        assert batch['back_break_length'][0] == 0
+        assert np.isfinite(batch['break_end_x'][1])
+
+    def test_derived_row_matches_scalar_keys(self, default_violin_params):
+        """derived_row returns the same keys as the scalar path"""
+        batch = calculate_derived_values_batch(default_violin_params)
+        row = derived_row(batch, 0)
+        assert set(row) == set(calculate_derived_values(default_violin_params))
@@ -0,0 +1,146 @@
+"""
+Test suite for bezier.py
+
+Validates the closed-form cubic solve, exact bounds and batched evaluation.
+"""
+
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from bezier import (
+    cubic_bounds,
+    evaluate_cubic_bezier,
+    evaluate_cubic_bezier_batch,
+    find_t_for_coordinate,
+    find_t_for_coordinate_batch,
+    quadratic_bounds,
+    solve_cubic,
+    solve_cubic_batch
+)
+from buildprimitives import ExportSVG, Spline
+
+
+class TestSolveCubic:
+    """Tests for the closed-form real root solve"""
+
+    @pytest.mark.parametrize('roots, tol', [
+        ((0.2, 0.5, 0.9), 1e-9),   # three distinct real roots
+        ((0.3, 0.3, 0.7), 1e-6),   # double root
+        ((0.4, 0.4, 0.4), 1e-4),   # triple root (ill-conditioned, ~cbrt(eps))
+    ])
+    def test_recovers_known_roots(self, roots, tol):
+        """Roots of (t - r1)(t - r2)(t - r3) are recovered"""
+        r1, r2, r3 = roots
+        a, b, c, d = 2.0, -2.0 * (r1 + r2 + r3), 2.0 * (r1*r2 + r1*r3 + r2*r3), -2.0 * r1 * r2 * r3
+        found = solve_cubic(a, b, c, d)
+        for r in roots:
+            assert min(abs(f - r) for f in found) < tol
+
+    def test_single_real_root(self):
+        """t^3 + t - 2 has the single real root 1"""
+        found = solve_cubic(1.0, 0.0, 1.0, -2.0)
+        assert len(found) == 1
+        assert found[0] == pytest.approx(1.0, abs=1e-12)
+
+    def test_degenerates_to_quadratic_and_linear(self):
+        """A vanishing leading coefficient falls back to lower degree"""
+        assert sorted(solve_cubic(0.0, 1.0, -1.0, 0.0)) == pytest.approx([0.0, 1.0])
+        assert solve_cubic(0.0, 0.0, 2.0, -1.0) == pytest.approx([0.5])
+
+    def test_batch_matches_scalar(self):
+        """solve_cubic_batch finds the same real roots as solve_cubic"""
+        rng = np.random.default_rng(0)
+        coeffs = rng.normal(size=(200, 4))
+        coeffs[:20, 0] = 0.0  # quadratic rows
+        batch = solve_cubic_batch(*coeffs.T)
+        for row, found in zip(coeffs, batch):
+            expected = sorted(solve_cubic(*row))
+            got = sorted(found[~np.isnan(found)])
+            assert len(got) == len(expected)
+            np.testing.assert_allclose(got, expected, atol=1e-7)
+
+
+class TestFindT:
+    """Tests for t-at-coordinate lookup"""
+
+    def test_inverse_of_evaluation(self):
+        """Evaluating at the found t reproduces the target y"""
+        p0, cp1, cp2, p3 = (0, 0), (3, 1), (5, 8), (6, 10)
+        for t in np.linspace(0, 1, 11):
+            _, y = evaluate_cubic_bezier(p0, cp1, cp2, p3, t)
+            found = find_t_for_coordinate(p0, cp1, cp2, p3, y)
+            assert evaluate_cubic_bezier(p0, cp1, cp2, p3, found)[1] == pytest.approx(y, abs=1e-9)
+
+    def test_non_monotonic_returns_first_crossing(self):
+        """A curve that rises then falls returns the smallest t"""
+        p0, cp1, cp2, p3 = (0, 0), (1, 10), (2, 10), (3, 0)
+        t = find_t_for_coordinate(p0, cp1, cp2, p3, 5.0)
+        assert t < 0.5
+        assert evaluate_cubic_bezier(p0, cp1, cp2, p3, t)[1] == pytest.approx(5.0)
+
+    def test_unreachable_target_returns_closest_endpoint(self):
+        """Targets outside the curve's range clamp to an endpoint"""
+        p0, cp1, cp2, p3 = (0, 0), (0, 1), (0, 2), (0, 3)
+        assert find_t_for_coordinate(p0, cp1, cp2, p3, -5.0) == 0.0
+        assert find_t_for_coordinate(p0, cp1, cp2, p3, 50.0) == 1.0
+
+    def test_batch_matches_scalar(self):
+        """find_t_for_coordinate_batch agrees with the scalar lookup per row"""
+        rng = np.random.default_rng(1)
+        pts = rng.uniform(-10, 10, size=(100, 4, 2))
+        targets = rng.uniform(-10, 10, size=100)
+        batch = find_t_for_coordinate_batch(
+            (pts[:, 0, 0], pts[:, 0, 1]), (pts[:, 1, 0], pts[:, 1, 1]),
+            (pts[:, 2, 0], pts[:, 2, 1]), (pts[:, 3, 0], pts[:, 3, 1]), targets)
+        for i in range(100):
+            expected = find_t_for_coordinate(*[tuple(p) for p in pts[i]], targets[i])
+            assert batch[i] == pytest.approx(expected, abs=1e-7)
+
+
+class TestBounds:
+    """Tests for exact curve bounds"""
+
+    def test_cubic_bounds_catch_extremum_between_samples(self):
+        """The bulge peak of a symmetric curve is the exact max, not a sample"""
+        p0, cp1, cp2, p3 = (0, 0), (0, 4), (1, 4), (1, 0)
+        min_x, min_y, max_x, max_y = cubic_bounds(p0, cp1, cp2, p3)
+        assert max_y == pytest.approx(3.0)
+        assert (min_x, min_y, max_x) == pytest.approx((0.0, 0.0, 1.0))
+
+    def test_cubic_bounds_enclose_dense_samples(self):
+        """Densely sampled points never fall outside the exact bounds"""
+        p0, cp1, cp2, p3 = (0, 0), (-3, 7), (9, -4), (2, 1)
+        min_x, min_y, max_x, max_y = cubic_bounds(p0, cp1, cp2, p3)
+        xs, ys = evaluate_cubic_bezier_batch(p0, cp1, cp2, p3, np.linspace(0, 1, 10001))
+        assert xs.min() >= min_x - 1e-12 and xs.max() <= max_x + 1e-12
+        assert ys.min() >= min_y - 1e-12 and ys.max() <= max_y + 1e-12
+        assert xs.max() == pytest.approx(max_x, abs=1e-6)
+
+    def test_quadratic_bounds(self):
+        """Quadratic peak is half the control point height"""
+        assert quadratic_bounds((0, 0), (1, 2), (2, 0)) == pytest.approx((0, 0, 2, 1))
+
+    def test_exporter_uses_exact_cubic_bounds(self):
+        """ExportSVG bounds match the curve's true extent"""
+        exporter = ExportSVG()
+        exporter.add_layer('drawing')
+        exporter.add_shape(Spline.cubic_bezier((0, 0), (0, 4), (1, 4), (1, 0)), layer='drawing')
+        m = exporter.margin
+        assert exporter._calculate_bounds() == pytest.approx((-m, -m, 1 + m, 3 + m))
+
+
+class TestBatchEvaluation:
+    """Tests for evaluation over arrays of t"""
+
+    def test_matches_scalar_evaluation(self):
+        """Batched evaluation equals the scalar formula at every t"""
+        p0, cp1, cp2, p3 = (1, 2), (3, 5), (6, 1), (8, 4)
+        ts = np.linspace(0, 1, 17)
+        xs, ys = evaluate_cubic_bezier_batch(p0, cp1, cp2, p3, ts)
+        for t, x, y in zip(ts, xs, ys):
+            assert (x, y) == pytest.approx(evaluate_cubic_bezier(p0, cp1, cp2, p3, t))
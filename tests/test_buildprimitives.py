@@ -0,0 +1,367 @@
+"""
+Test suite for buildprimitives.py
+
+Validates per-primitive bounding boxes, the exporter's running extent,
+layer-grouped output and compact path encoding.
+"""
+
+import math
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from buildprimitives import (
+    Edge, Arc, Rectangle, Spline, Polygon, Polyline, Text, Location, Axis, Point, ExportSVG,
+    Shape, ShapeStore, chain_edges, encode_path, format_number
+)
+
+
+class TestShapeBounds:
+    """Tests for Shape.bounds()"""
+
+    def test_edge(self):
+        """Edge bounds span both endpoints in any order"""
+        assert Edge((3, -1), (1, 2)).bounds() == (1, -1, 3, 2)
+
+    def test_arc_crossing_extremes(self):
+        """A half circle reaches the top of its circle"""
+        bounds = Arc((0, 0), 2, 0, math.pi).bounds()
+        assert bounds == pytest.approx((-2, 0, 2, 2))
+
+    def test_arc_wrapping_zero(self):
+        """An arc from 315° to 45° includes the 0° extreme"""
+        bounds = Arc((0, 0), 1, 7 * math.pi / 4, math.pi / 4).bounds()
+        assert bounds[2] == pytest.approx(1)
+        assert bounds[0] == pytest.approx(math.cos(math.pi / 4))
+
+    def test_rectangle(self):
+        """Rectangles are centred on their location"""
+        assert Rectangle(4, 2).move(Location((1, 1))).bounds() == (-1, 0, 3, 2)
+
+    def test_quadratic_spline(self):
+        """Quadratic spline bounds are exact, not the control polygon"""
+        assert Spline((0, 0), (1, 2), (2, 0)).bounds() == pytest.approx((0, 0, 2, 1))
+
+    def test_polygon_offset(self):
+        """Polygon bounds include its location offset"""
+        polygon = Polygon([(0, 0), (2, 0), (1, 3)]).move(Location((10, 5)))
+        assert polygon.bounds() == (10, 5, 12, 8)
+
+    def test_text_estimate(self):
+        """Text bounds are centred on its position"""
+        bounds = Text('ab', 2).move(Location((5, 5))).bounds()
+        assert bounds == pytest.approx((3.8, 4, 6.2, 6))
+
+    def test_empty_shapes(self):
+        """Shapes without points have no bounds"""
+        assert Spline().bounds() is None
+        assert Polygon([]).bounds() is None
+
+    def test_bounds_cached(self):
+        """Bounds are computed once per shape"""
+        arc = Arc((0, 0), 1, 0, math.pi)
+        assert arc.bounds() is arc.bounds()
+
+    def test_shape_requires_compute_bounds(self):
+        """A primitive without _compute_bounds cannot be instantiated"""
+        class Unbounded(Shape):
+            __slots__ = ()
+
+        with pytest.raises(TypeError):
+            Unbounded()
+
+
+class TestExporterExtent:
+    """Tests for the running extent in ExportSVG"""
+
+    def test_extent_grows_as_shapes_are_added(self):
+        """The extent is available mid-construction"""
+        exporter = ExportSVG()
+        assert exporter.extent() is None
+        exporter.add_shape(Edge((0, 0), (1, 1)))
+        assert exporter.extent() == (0, 0, 1, 1)
+        exporter.add_shape(Rectangle(2, 2).move(Location((5, -3))))
+        assert exporter.extent() == (0, -4, 6, 1)
+
+    def test_empty_shapes_ignored(self):
+        """Empty shapes do not affect the extent"""
+        exporter = ExportSVG()
+        exporter.add_shape(Polygon([]))
+        exporter.add_shape(Edge((1, 1), (2, 2)))
+        assert exporter.extent() == (1, 1, 2, 2)
+
+    def test_calculate_bounds_adds_margin(self):
+        """Write-time bounds are the extent plus the margin"""
+        exporter = ExportSVG()
+        exporter.add_shape(Edge((0, 0), (10, 5)))
+        m = exporter.margin
+        assert exporter._calculate_bounds() == (-m, -m, 10 + m, 5 + m)
+        assert f'viewBox="{-m} {-5 - m} {10 + 2 * m} {5 + 2 * m}"' in exporter.write()
+
+
+class TestLayerGroups:
+    """Tests for group_layers output"""
+
+    def make_exporter(self, group_layers):
+        exporter = ExportSVG(group_layers=group_layers)
+        exporter.add_layer('drawing', line_color=(0, 0, 0))
+        exporter.add_layer('arrows', fill_color=(255, 0, 0), line_color=(255, 0, 0))
+        exporter.add_layer('hidden')
+        exporter.add_layer('text', fill_color=(0, 0, 255))
+        exporter.add_shape(Text('label', 2), layer='text')
+        exporter.add_shape(Edge((0, 0), (1, 1)), layer='drawing')
+        exporter.add_shape(Polygon([(0, 0), (1, 0), (0, 1)], filled=True), layer='arrows')
+        exporter.add_shape(Edge((0, 1), (1, 0)), layer='drawing')
+        exporter.add_shape(Edge((5, 5), (6, 6)), layer='hidden')
+        return exporter
+
+    def test_style_stated_once_per_layer(self):
+        """Each visible layer is one group carrying its style"""
+        svg = self.make_exporter(True).write()
+        assert svg.count('<g class="layer-drawing" stroke="rgb(0,0,0)"') == 1
+        assert svg.count('stroke-width') == 2 + 1  # stroked groups plus the hatch pattern
+        assert '<path d="M 0,0 L 1,1"/>' in svg
+
+    def test_groups_follow_layer_order(self):
+        """Groups are painted in add_layer order and skip invisible layers"""
+        svg = self.make_exporter(True).write()
+        assert svg.index('layer-drawing') < svg.index('layer-arrows') < svg.index('layer-text')
+        assert 'layer-hidden' not in svg
+
+    def test_filled_shapes_and_text(self):
+        """Filled polygons keep their fill; text is not stroked by its group"""
+        svg = self.make_exporter(True).write()
+        assert 'fill="rgb(255,0,0)"/>' in svg
+        assert 'fill="rgb(0,0,255)" stroke="none"' in svg
+
+    def test_ungrouped_by_default(self):
+        """Without group_layers every path carries its own style"""
+        svg = self.make_exporter(False).write()
+        assert '<g class=' not in svg
+        assert svg.count('stroke="rgb(0,0,0)" stroke-width="0.5"') == 2
+
+
+def parse_relative(path):
+    """Absolute vertices of an encoded M/l/h/v/z path"""
+    import re
+    x = y = 0.0
+    points = []
+    for command, numbers in re.findall(r'([MlhvzZ])([^MlhvzZ]*)', path):
+        values = [float(v) for v in re.findall(r'-?(?:\d+\.?\d*|\.\d+)', numbers)]
+        if command == 'M':
+            x, y = values
+        elif command == 'l':
+            for dx, dy in zip(values[::2], values[1::2]):
+                x, y = x + dx, y + dy
+                points.append((x, y))
+            continue
+        elif command == 'h':
+            x += sum(values)
+        elif command == 'v':
+            y += sum(values)
+        else:
+            continue
+        points.append((x, y))
+    return points
+
+
+class TestCompactEncoding:
+    """Tests for format_number and encode_path"""
+
+    @pytest.mark.parametrize('value, text', [
+        (0.5, '.5'), (-0.25, '-.25'), (123.45678, '123.457'), (100.0, '100'),
+        (-0.0001, '0'), (2.5e-4, '0'), (-3.1, '-3.1'), (0, '0')
+    ])
+    def test_format_number(self, value, text):
+        """Shortest form at three decimals"""
+        assert format_number(value, 3) == text
+
+    def test_minimal_separators(self):
+        """Signs and second decimal points separate numbers without spaces"""
+        polygon = Polygon([(0, 0), (0.5, -0.25), (0.75, 0.1), (0.2, 0.1)])
+        assert encode_path(polygon.path_commands(), 3, relative=True) == 'M0 0l.5-.25.25.35h-.55z'
+        assert encode_path(polygon.path_commands(), 3, relative=False) == 'M0 0L.5-.25.75.1.2.1Z'
+
+    def test_curves_and_arcs(self):
+        """q, c and a commands are relative to the current point"""
+        assert encode_path(Spline((1, 1), (2, 3), (3, 1)).path_commands()) == 'M1 1q1 2 2 0'
+        cubic = Spline.cubic_bezier((0, 0), (0, 4), (1, 4), (1, 0))
+        assert encode_path(cubic.path_commands()) == 'M0 0c0 4 1 4 1 0'
+        assert encode_path(Arc((0, 0), 5, 0, math.pi).path_commands()) == 'M5 0a5 5 0 0 1-10 0'
+
+    def test_no_relative_drift(self):
+        """Relative offsets land exactly on the rounded absolute points"""
+        vertices = [(i * 0.1234567, math.sin(i) * 10.0004) for i in range(500)]
+        path = encode_path(Polygon(vertices).path_commands(), 3)
+        parsed = parse_relative(path)
+        assert len(parsed) == len(vertices)
+        for (x, y), (px, py) in zip(vertices, parsed):
+            assert px == pytest.approx(round(x, 3), abs=1e-9)
+            assert py == pytest.approx(round(y, 3), abs=1e-9)
+
+    def test_exporter_precision(self):
+        """ExportSVG rounds paths, text and the viewBox when precision is set"""
+        exporter = ExportSVG(precision=2)
+        exporter.add_shape(Edge((0, 0), (1 / 3, 2 / 3)))
+        exporter.add_shape(Text('t', 1 / 3).move(Location((1 / 7, 0))))
+        svg = exporter.write()
+        assert '<path d="M0 0l.33.67"' in svg
+        assert 'translate(.14 0)' in svg
+        assert 'font-size=".33"' in svg
+        assert '0.333333' not in svg
+
+    def test_exporter_default_unchanged(self):
+        """Without precision, paths keep full-precision absolute commands"""
+        exporter = ExportSVG()
+        exporter.add_shape(Edge((0, 0), (1 / 3, 1)))
+        assert f'd="M 0,0 L {1 / 3},1"' in exporter.write()
+
+
+class TestEdgeChaining:
+    """Connected edges of a layer are written as single polylines"""
+
+    def test_chain_becomes_one_polyline(self):
+        """Edges sharing endpoints join whichever way round they were drawn"""
+        shapes = [(Edge((0, 0), (1, 0)), 'a'), (Edge((2, 1), (1, 0)), 'a'), (Edge((2, 1), (3, 1)), 'a')]
+        chained = chain_edges(shapes)
+        assert len(chained) == 1
+        polyline, layer = chained[0]
+        assert isinstance(polyline, Polyline) and layer == 'a'
+        assert polyline.points == [(0, 0), (1, 0), (2, 1), (3, 1)]
+        assert not polyline.closed
+
+    def test_loop_is_closed(self):
+        """A chain returning to its start is closed without repeating the point"""
+        square = [((0, 0), (1, 0)), ((1, 0), (1, 1)), ((1, 1), (0, 1)), ((0, 1), (0, 0))]
+        (polyline, _), = chain_edges([(Edge(p1, p2), 'a') for p1, p2 in square])
+        assert polyline.closed
+        assert len(polyline.points) == 4
+        assert polyline.to_svg_path() == "M 0,0 L 1,0 L 1,1 L 0,1 Z"
+
+    def test_endpoint_tolerance(self):
+        """Endpoints within the tolerance are treated as the same point"""
+        shapes = [(Edge((0, 0), (1, 0)), 'a'), (Edge((1 + 1e-9, 0), (2, 0)), 'a')]
+        assert len(chain_edges(shapes)) == 1
+        assert len(chain_edges(shapes, tolerance=1e-12)) == 2
+
+    def test_layers_and_other_shapes_kept_apart(self):
+        """Only Edges on the same layer chain; other shapes keep their order"""
+        text = Text('t', 1)
+        shapes = [(Edge((0, 0), (1, 0)), 'a'), (text, 'text'), (Edge((1, 0), (2, 0)), 'b'),
+                  (Edge((5, 5), (6, 6)), 'a')]
+        assert chain_edges(shapes) == shapes
+
+    def test_chain_takes_place_of_last_edge(self):
+        """Chained edges move later in painting order, never earlier"""
+        first, second = Edge((0, 0), (1, 0)), Edge((1, 0), (2, 0))
+        fill = Polygon([(0, 0), (1, 0), (1, 1)], filled=True)
+        chained = chain_edges([(first, 'a'), (fill, 'b'), (second, 'a')])
+        assert chained[0] == (fill, 'b')
+        assert isinstance(chained[1][0], Polyline)
+
+    def test_exporter_coalesce_edges(self):
+        """coalesce_edges writes one path per chain and leaves shapes untouched"""
+        exporter = ExportSVG(precision=3, coalesce_edges=True)
+        for p1, p2 in [((0, 0), (1, 0)), ((1, 0), (1, 1)), ((1, 1), (0, 0))]:
+            exporter.add_shape(Edge(p1, p2))
+        body = exporter.write().split('</defs>')[1]
+        assert body.count('<path') == 1
+        assert 'd="M0 0h1v1z"' in body
+        assert len(exporter.shapes) == 3
+
+    def test_exporter_default_unchanged(self):
+        """Without coalesce_edges every edge is its own path"""
+        exporter = ExportSVG()
+        exporter.add_shape(Edge((0, 0), (1, 0)))
+        exporter.add_shape(Edge((1, 0), (2, 0)))
+        assert exporter.write().split('</defs>')[1].count('<path') == 2
+
+
+def sample_shapes():
+    """One of each primitive over a few layers, with a chain of edges"""
+    return [
+        (Edge((0, 0), (10, 0)), 'drawing'),
+        (Arc((5, 5), 3, 0, math.pi), 'schematic'),
+        (Edge((10, 0), (10, 8)), 'drawing'),
+        (Rectangle(4, 2).move(Location((1, 2))), 'drawing'),
+        (Spline.interpolate_three_points((0, 0), (1, 2), (2, 0)), 'schematic'),
+        (Spline.cubic_bezier((0, 0), (0, 4), (1, 4), (1, 0)), 'schematic'),
+        (Polygon([(0, 0), (2, 0), (1, 1)], filled=True, fill_pattern='diagonalHatch').move(Location((3, 1))), 'fill'),
+        (Polyline([(0, 0), (1, 1), (2, 0)], closed=True), 'drawing'),
+        (Text('Label', 2.5).rotate(Axis((1, 1, 0), (0, 0, 1)), 30).move(Location((4, 4))), 'text'),
+    ]
+
+
+class TestShapeStore:
+    """Array-backed shape storage"""
+
+    def test_primitives_have_no_instance_dict(self):
+        """Primitives use __slots__"""
+        for shape in [Point(0, 0), Location((0, 0)), Axis((0, 0, 0), (0, 0, 1))] + [s for s, _ in sample_shapes()]:
+            assert not hasattr(shape, '__dict__')
+
+    def test_round_trip(self):
+        """Iterating a store rebuilds equal shapes in the order added"""
+        store = ShapeStore()
+        for item in sample_shapes():
+            store.append(item)
+        assert len(store) == len(sample_shapes())
+        for (original, layer), (rebuilt, rebuilt_layer) in zip(sample_shapes(), store):
+            assert type(rebuilt) is type(original) and rebuilt_layer == layer
+            assert rebuilt.bounds() == pytest.approx(original.bounds())
+        text = store[-1][0]
+        assert (text.text, text.x, text.rotation, text.rotation_center) == ('Label', 4, 30, (1, 1))
+        assert store[6][0].fill_pattern == 'diagonalHatch'
+        assert store[5][0]._is_cubic
+
+    def test_unknown_objects_kept(self):
+        """Objects the store cannot encode are held as they are"""
+        store = ShapeStore()
+        marker = object()
+        store.append((marker, 'a'))
+        store.append((Polygon(5), 'a'))
+        assert store[0] == (marker, 'a')
+        assert isinstance(store[1][0], Polygon)
+
+    def test_indexing_rebuilds_one_shape(self, monkeypatch):
+        """Indexing decodes only the requested record and checks the range"""
+        import buildprimitives
+        store = ShapeStore()
+        for item in sample_shapes():
+            store.append(item)
+        decoded = []
+        decode = buildprimitives._decode
+        monkeypatch.setattr(buildprimitives, '_decode', lambda *args: decoded.append(args[0]) or decode(*args))
+        assert isinstance(store[-2][0], Polyline)
+        assert len(decoded) == 1
+        with pytest.raises(IndexError):
+            store[len(store)]
+
+    def test_nbytes(self):
+        """Each edge takes one opcode byte, four doubles and one order entry"""
+        store = ShapeStore()
+        for i in range(4):
+            store.append((Edge((i, 0), (i, 1)), 'a'))
+        assert store.nbytes == 4 * (1 + 4 * 8 + store._order.itemsize)
+
+    @pytest.mark.parametrize('group_layers', [False, True])
+    @pytest.mark.parametrize('coalesce_edges', [False, True])
+    def test_compact_output_matches(self, group_layers, coalesce_edges):
+        """A compact exporter writes the same SVG as one holding objects"""
+        outputs = []
+        for compact in (False, True):
+            exporter = ExportSVG(precision=3, group_layers=group_layers, coalesce_edges=coalesce_edges,
+                                 compact=compact)
+            exporter.add_layer('fill', fill_color=(10, 20, 30), line_color=None)
+            for shape, layer in sample_shapes():
+                exporter.add_shape(shape, layer)
+            outputs.append(exporter.write())
+        assert outputs[0] == outputs[1]
+
+    def test_compact_requires_precision(self):
+        """Doubles do not keep ints, so full-precision output is not offered"""
+        with pytest.raises(ValueError):
+            ExportSVG(compact=True)
@@ -0,0 +1,105 @@
+"""
+Test suite for change_impact.py
+
+Validates the traced view dependencies, perturbation-based output
+dependencies, the conservative handling of unknown keys and partial
+regeneration in generate_violin_neck.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import stage_cache
+from change_impact import VIEWS, affected_by, build_dependency_map, get_dependency_map
+from instrument_generator import generate_violin_neck, get_change_impact
+
+
+class TestDependencyMap:
+    """Tests for the traced dependency map"""
+
+    def test_instrument_name_does_not_affect_radius_template(self):
+        """The radius template does not read instrument_name"""
+        impact = affected_by(['instrument_name'])
+        assert 'radius_template' not in impact['views']
+        assert 'side' in impact['views']
+        assert impact['outputs'] == []
+
+    def test_fb_blend_percent_affects_cross_section_only(self):
+        """fb_blend_percent shapes the cross-section but not the side view"""
+        impact = affected_by(['fb_blend_percent'])
+        assert impact['views'] == ['cross_section']
+        assert 'neck_angle' not in impact['outputs']
+
+    def test_fingerboard_radius_affects_radius_template(self):
+        """The radius template is drawn from fingerboard_radius"""
+        assert 'radius_template' in affected_by(['fingerboard_radius'])['views']
+
+    def test_geometry_inputs_affect_outputs(self):
+        """Inputs of the string geometry change the neck angle"""
+        impact = affected_by(['overstand'])
+        assert 'neck_angle' in impact['outputs']
+        assert 'side' in impact['views']
+
+    def test_fret_count_affects_fret_positions(self):
+        """no_frets drives the fret table"""
+        assert 'fret_positions' in affected_by(['no_frets'])['views']
+
+    def test_unknown_key_affects_everything(self):
+        """Keys the map has not traced are assumed to change everything"""
+        impact = affected_by(['not_a_parameter'])
+        assert impact['views'] == list(VIEWS)
+        assert 'neck_angle' in impact['outputs']
+
+    def test_no_changes_affect_nothing(self):
+        """An empty change set affects nothing"""
+        assert affected_by([]) == {'outputs': [], 'views': []}
+
+    def test_tracing_restores_cache_setting(self, default_violin_params):
+        """Stage caches are re-enabled after tracing"""
+        build_dependency_map([default_violin_params])
+        assert stage_cache.is_cache_enabled()
+
+    def test_map_covers_every_input(self, default_violin_params):
+        """Every key of a traced design has an entry"""
+        dependency_map = get_dependency_map()
+        for key in default_violin_params:
+            assert key in dependency_map['views']
+            assert key in dependency_map['outputs']
+
+
+class TestPartialGeneration:
+    """Tests for changed_keys_json in generate_violin_neck"""
+
+    def test_skips_unaffected_views(self, default_violin_params):
+        """Only the views affected by the changed keys are rendered"""
+        result = json.loads(generate_violin_neck(json.dumps(default_violin_params),
+                                                 json.dumps(['fb_blend_percent'])))
+        assert result['success']
+        assert set(result['views']) == {'cross_section'}
+        assert 'side' in result['skipped_views']
+        assert result['fret_positions'] is None
+
+    def test_rendered_views_match_full_generation(self, default_violin_params):
+        """A partial generation renders the same SVG as a full one"""
+        full = json.loads(generate_violin_neck(json.dumps(default_violin_params)))
+        partial = json.loads(generate_violin_neck(json.dumps(default_violin_params),
+                                                  json.dumps(['fingerboard_radius'])))
+        assert full['skipped_views'] == []
+        for view, svg in partial['views'].items():
+            assert svg == full['views'][view]
+
+    def test_change_impact_endpoint(self):
+        """The JSON endpoint reports affected outputs and views"""
+        result = json.loads(get_change_impact(json.dumps(['instrument_name'])))
+        assert result['success']
+        assert 'radius_template' not in result['views']
+
+    def test_change_impact_endpoint_invalid_json(self):
+        """Invalid JSON reports an error"""
+        result = json.loads(get_change_impact('not json'))
+        assert not result['success']
+        assert result['errors']
@@ -198,6 +198,34 @@ class TestCLIIntegration:
         content = output_file.read_text()
         assert '<!DOCTYPE html>' in content
 
+    def test_cli_heatmap_view(self, sample_preset_path, cli_path, tmp_path):
+        """Test CLI generates the design-space heatmap SVG."""
+        output_file = tmp_path / 'heatmap.svg'
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path),
+             '--view', 'heatmap', '--heatmap-x', 'overstand', '--heatmap-y', 'arching_height',
+             '--heatmap-value', 'string_break_angle', '--output', str(output_file)],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode == 0
+        content = output_file.read_text()
+        assert '<svg' in content
+        assert 'Arching Height' in content
+
+    def test_cli_heatmap_unknown_output(self, sample_preset_path, cli_path):
+        """Test CLI rejects an unknown --heatmap-value."""
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path),
+             '--view', 'heatmap', '--heatmap-value', 'not_an_output'],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode != 0
+        assert 'not_an_output' in result.stderr
+
     def test_cli_all_creates_multiple_files(self, sample_preset_path, cli_path, tmp_path):
         """Test CLI --all creates SVG and HTML files (native formats)."""
         output_dir = tmp_path / 'output'
@@ -246,6 +274,72 @@ class TestCLIIntegration:
         )
         assert result.returncode != 0
 
+    def test_cli_tolerance_report(self, sample_preset_path, cli_path):
+        """Test CLI --tolerance prints a tolerance analysis report."""
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path),
+             '--tolerance', 'overstand=0.2', '--samples', '500', '--seed', '1'],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode == 0
+        assert 'neck_angle' in result.stdout
+        assert 'p95' in result.stdout
+
+    def test_cli_tolerance_to_json(self, sample_preset_path, cli_path, tmp_path):
+        """Test CLI --tolerance with --output writes the JSON report."""
+        output_file = tmp_path / 'tolerances.json'
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path),
+             '--tolerance', 'overstand=0.2', '--samples', '500', '--output', str(output_file)],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode == 0
+        report = json.loads(output_file.read_text())
+        assert report['samples'] == 500
+        assert 'neck_angle' in report['outputs']
+
+    def test_cli_tolerance_invalid_spec(self, sample_preset_path, cli_path):
+        """Test CLI rejects malformed --tolerance values."""
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path), '--tolerance', 'overstand'],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode != 0
+        assert 'KEY=TOL' in result.stderr
+
+    def test_cli_sweep_writes_columns(self, sample_preset_path, cli_path, tmp_path):
+        """Test CLI --sweep writes a manifest and one .npy per column."""
+        output_dir = tmp_path / 'sweep'
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path),
+             '--sweep', 'overstand=5:15:6', '--sweep', 'bridge_height',
+             '--steps', '3', '--workers', '1', '--output-dir', str(output_dir)],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode == 0
+        manifest = json.loads((output_dir / 'manifest.json').read_text())
+        assert manifest['rows'] == 18
+        assert (output_dir / 'neck_angle.npy').exists()
+
+    def test_cli_sweep_requires_output_dir(self, sample_preset_path, cli_path):
+        """Test CLI --sweep requires --output-dir."""
+        result = subprocess.run(
+            [sys.executable, str(cli_path), str(sample_preset_path), '--sweep', 'overstand'],
+            capture_output=True,
+            text=True,
+            cwd=str(cli_path.parent)
+        )
+        assert result.returncode != 0
+        assert 'output-dir' in result.stderr.lower()
+
     def test_cli_pdf_auto_filename(self, sample_preset_path, cli_path, tmp_path):
         """Test CLI --pdf auto-generates filename when --output not specified."""
         from conftest import has_cairo_deps
@@ -0,0 +1,129 @@
+"""
+Test suite for design_catalogue.py
+
+Validates bulk ingest, incremental updates, indexed range queries and
+recomputation after an engine version change.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import design_catalogue
+from design_catalogue import DesignCatalogue
+from instrument_geometry import calculate_derived_values
+
+
+def write_design(directory, name, params):
+    """Write a design file in the CLI's wrapped format"""
+    path = directory / f'{name}.json'
+    path.write_text(json.dumps({'metadata': {}, 'parameters': params}))
+    return path
+
+
+@pytest.fixture
+def designs(tmp_path, default_violin_params, default_guitar_params):
+    """Directory with violins at three overstands and one guitar"""
+    for overstand in (10.0, 12.0, 14.0):
+        write_design(tmp_path, f'violin_{overstand:.0f}',
+                     {**default_violin_params, 'overstand': overstand, 'instrument_name': f'Violin {overstand:.0f}'})
+    write_design(tmp_path, 'guitar', {**default_guitar_params, 'instrument_name': 'Guitar'})
+    return tmp_path
+
+
+class TestIngest:
+    """Tests for DesignCatalogue.ingest"""
+
+    def test_ingest_directory(self, designs):
+        """Every design file becomes one row with scalar-engine values"""
+        with DesignCatalogue() as catalogue:
+            result = catalogue.ingest([str(designs)])
+            assert result == {'ingested': 4, 'skipped': 0, 'errors': []}
+            assert len(catalogue) == 4
+            row = catalogue.query(name_like='Violin 12', columns=['neck_angle', 'overstand'])[0]
+            expected = calculate_derived_values(catalogue.load_design(row['path']))
+            assert row['neck_angle'] == pytest.approx(expected['neck_angle'], abs=1e-9)
+            assert row['overstand'] == 12.0
+
+    def test_unchanged_files_are_skipped(self, designs, default_violin_params):
+        """A second ingest only updates files whose content changed"""
+        with DesignCatalogue() as catalogue:
+            catalogue.ingest([str(designs)])
+            write_design(designs, 'violin_10', {**default_violin_params, 'overstand': 11.0})
+            result = catalogue.ingest([str(designs)])
+            assert result['ingested'] == 1
+            assert result['skipped'] == 3
+            assert len(catalogue) == 4
+            assert catalogue.load_design(str(designs / 'violin_10.json')).overstand == 11.0
+
+    def test_bad_files_are_reported(self, tmp_path):
+        """Unreadable or non-design JSON is listed in errors"""
+        (tmp_path / 'broken.json').write_text('{')
+        (tmp_path / 'manifest.json').write_text(json.dumps({'presets': []}))
+        with DesignCatalogue() as catalogue:
+            result = catalogue.ingest([str(tmp_path)])
+            assert result['ingested'] == 0
+            assert len(result['errors']) == 2
+
+    def test_catalogue_persists(self, designs, tmp_path):
+        """A file-backed catalogue keeps its rows"""
+        db_path = str(tmp_path / 'catalogue.db')
+        with DesignCatalogue(db_path) as catalogue:
+            catalogue.ingest([str(designs)])
+        with DesignCatalogue(db_path) as catalogue:
+            assert len(catalogue) == 4
+            assert catalogue.ingest([str(designs)])['skipped'] == 4
+
+
+class TestQuery:
+    """Tests for DesignCatalogue.query"""
+
+    def test_range_query_within_family(self, designs):
+        """Only violins inside the neck angle range are returned"""
+        with DesignCatalogue() as catalogue:
+            catalogue.ingest([str(designs)])
+            angles = sorted(row['neck_angle'] for row in catalogue.query(family='VIOLIN', columns=['neck_angle']))
+            low, high = angles[0], angles[1]
+            rows = catalogue.query(family='VIOLIN', ranges={'neck_angle': (low - 1e-9, high + 1e-9)},
+                                   columns=['neck_angle'], order_by='neck_angle')
+            assert [row['neck_angle'] for row in rows] == [low, high]
+            assert all(row['instrument_family'] == 'VIOLIN' for row in rows)
+
+    def test_range_query_uses_index(self):
+        """Family + neck angle range queries are index range scans"""
+        with DesignCatalogue() as catalogue:
+            plan = catalogue.connection.execute(
+                'EXPLAIN QUERY PLAN SELECT path FROM designs '
+                'WHERE instrument_family = ? AND neck_angle >= ? AND neck_angle <= ?',
+                ('VIOLIN', 84, 86)).fetchall()
+            assert 'idx_designs_neck_angle' in plan[0][3]
+
+    def test_unknown_column_rejected(self):
+        """Column names are validated before building SQL"""
+        with DesignCatalogue() as catalogue:
+            with pytest.raises(ValueError):
+                catalogue.query(ranges={'neck_angle; DROP TABLE designs': (0, 1)})
+
+
+class TestRecompute:
+    """Tests for DesignCatalogue.recompute"""
+
+    def test_engine_version_change_recomputes_stale_rows(self, designs, monkeypatch):
+        """Rows from an older engine are recomputed, current rows are left alone"""
+        with DesignCatalogue() as catalogue:
+            catalogue.ingest([str(designs)])
+            catalogue.connection.execute(
+                "UPDATE designs SET engine_version = 0, neck_angle = NULL WHERE name = 'Guitar'")
+            assert catalogue.stale_count() == 1
+            assert catalogue.recompute() == 1
+            assert catalogue.stale_count() == 0
+            assert catalogue.query(name_like='Guitar', columns=['neck_angle'])[0]['neck_angle'] is not None
+
+            monkeypatch.setattr(design_catalogue, 'ENGINE_VERSION', design_catalogue.ENGINE_VERSION + 1)
+            assert catalogue.stale_count() == 4
+            assert catalogue.recompute() == 4
+            assert {row['engine_version'] for row in catalogue.query()} == {design_catalogue.ENGINE_VERSION}
@@ -0,0 +1,153 @@
+"""
+Test suite for design_history.py
+
+Validates undo/redo order, the entry bound, byte accounting with shared
+view content, LRU eviction of cached results and undo through a
+DesignSession.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from design_history import DesignHistory
+from design_session import DesignSession
+from instrument_generator import start_design_session, update_design_session, undo_design_session, redo_design_session
+from parameter_set import ParameterSet
+
+
+def push(history, overstand, side='side', template='template'):
+    """Push a snapshot with small fake views"""
+    params = ParameterSet.resolve({'overstand': overstand})
+    history.push(params, {'neck_angle': overstand}, {'side': side, 'radius_template': template},
+                 {'side': side, 'radius_template': template})
+
+
+class TestDesignHistory:
+    """Tests for DesignHistory"""
+
+    def test_undo_redo_order(self):
+        """Undo walks back, redo forward, and both stop at the ends"""
+        history = DesignHistory()
+        for value in (5, 6, 7):
+            push(history, value, side=f'side{value}')
+        assert history.undo()['params']['overstand'] == 6
+        assert history.undo()['params']['overstand'] == 5
+        assert history.undo() is None
+        assert history.redo()['params']['overstand'] == 6
+        assert history.can_redo
+
+    def test_push_discards_redo(self):
+        """A new design after undo drops the undone designs"""
+        history = DesignHistory()
+        for value in (5, 6, 7):
+            push(history, value, side=f'side{value}')
+        history.undo()
+        history.undo()
+        push(history, 9, side='side9')
+        assert len(history) == 2
+        assert not history.can_redo
+
+    def test_max_entries_drops_oldest(self):
+        """The buffer keeps only max_entries snapshots"""
+        history = DesignHistory(max_entries=3)
+        for value in range(5):
+            push(history, value, side=f'side{value}')
+        assert len(history) == 3
+        history.undo()
+        assert history.undo()['params']['overstand'] == 2
+        assert history.undo() is None
+
+    def test_shared_views_counted_once(self):
+        """A view shared between snapshots is stored once"""
+        history = DesignHistory()
+        push(history, 5, side='a' * 1000, template='b' * 1000)
+        single = history.total_bytes
+        push(history, 6, side='c' * 1000, template='b' * 1000)
+        # One new side view plus the derived values, not another template
+        assert history.total_bytes - single < 1100
+
+    def test_lru_eviction_by_bytes(self):
+        """Over budget, the least recently used results are evicted"""
+        history = DesignHistory(max_bytes=3500)
+        for value in range(4):
+            push(history, value, side=str(value) * 1000, template=f't{value}')
+        assert history.total_bytes <= 3500
+        stats = history.stats()
+        assert stats['entries'] == 4
+        assert stats['cached_entries'] < 4
+        # The oldest lost its results but keeps its parameters
+        history.undo()
+        history.undo()
+        oldest = history.undo()
+        assert oldest['params']['overstand'] == 0
+        assert oldest['derived'] is None
+
+    def test_release_returns_bytes(self):
+        """Discarded redo snapshots free the views only they used"""
+        history = DesignHistory()
+        push(history, 5, side='a' * 1000)
+        before = history.total_bytes
+        push(history, 6, side='b' * 1000)
+        history.undo()
+        push(history, 7, side='a' * 1000)
+        # Only the new derived values are added; the 'b' view is gone
+        assert history.total_bytes == before + len(json.dumps({'neck_angle': 7}))
+
+
+class TestSessionUndo:
+    """Tests for undo/redo through DesignSession"""
+
+    def test_undo_restores_cached_design(self, default_violin_params):
+        """Undo returns the previous design's views without regenerating"""
+        session = DesignSession(default_violin_params)
+        start = session.start()
+        session.update({'overstand': session.params['overstand'] + 1})
+        result = session.undo()
+        assert result['success']
+        assert result['params']['overstand'] == default_violin_params['overstand']
+        assert result['views']['side'] == start['views']['side']
+        assert result['view_hashes'] == start['view_hashes']
+        assert result['can_redo']
+        assert not result['can_undo']
+
+    def test_undo_regenerates_evicted_design(self, default_violin_params):
+        """Undo still works when the cached results were evicted"""
+        session = DesignSession(default_violin_params, DesignHistory(max_bytes=0))
+        start = session.start()
+        session.update({'overstand': session.params['overstand'] + 1})
+        assert session.history.stats()['cached_entries'] == 1
+        result = session.undo()
+        assert result['success']
+        assert result['view_hashes']['side'] == start['view_hashes']['side']
+
+    def test_redo_after_undo(self, default_violin_params):
+        """Redo reapplies the undone patch"""
+        session = DesignSession(default_violin_params)
+        session.start()
+        session.update({'instrument_name': 'Renamed'})
+        session.undo()
+        result = session.redo()
+        assert result['changed_keys'] == ['instrument_name']
+        assert result['params']['instrument_name'] == 'Renamed'
+
+    def test_nothing_to_undo(self, default_violin_params):
+        """Undo with no earlier design reports an error"""
+        session = DesignSession(default_violin_params)
+        session.start()
+        result = session.undo()
+        assert not result['success']
+        assert result['errors'] == ['Nothing to undo']
+
+    def test_endpoints(self, default_violin_params):
+        """undo_design_session and redo_design_session round-trip"""
+        start_design_session(json.dumps(default_violin_params))
+        update_design_session(json.dumps({'overstand': default_violin_params['overstand'] + 2}))
+        undone = json.loads(undo_design_session())
+        assert undone['success']
+        assert undone['params']['overstand'] == default_violin_params['overstand']
+        redone = json.loads(redo_design_session())
+        assert redone['params']['overstand'] == default_violin_params['overstand'] + 2
@@ -0,0 +1,143 @@
+"""
+Test suite for design_optimizer.py
+
+Validates Pareto dominance, objective handling and the returned front.
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from design_optimizer import DEFAULT_OUTPUT_BOUNDS, optimize_design, pareto_front, front_to_csv
+from instrument_geometry import calculate_derived_values
+
+
+def dominates(a, b):
+    return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+
+class TestParetoFront:
+    """Tests for non-dominated sorting"""
+
+    def test_matches_brute_force(self):
+        """The front is exactly the set of non-dominated rows"""
+        costs = np.random.default_rng(0).random((300, 3))
+        expected = [i for i in range(len(costs))
+                    if not any(dominates(costs[j], costs[i]) for j in range(len(costs)))]
+        assert sorted(pareto_front(costs).tolist()) == expected
+
+    def test_single_objective_is_minimum(self):
+        """With one objective the front is the best row"""
+        costs = np.array([[3.0], [1.0], [2.0]])
+        assert pareto_front(costs).tolist() == [1]
+
+    def test_duplicates_kept_once(self):
+        """Identical rows do not dominate each other but only one is kept"""
+        costs = np.array([[1.0, 2.0], [1.0, 2.0], [2.0, 1.0]])
+        assert len(pareto_front(costs)) == 2
+
+
+class TestOptimizeDesign:
+    """Tests for optimize_design"""
+
+    def test_front_is_non_dominated(self, default_violin_params):
+        """No front row dominates another"""
+        objectives = {'string_break_angle': 'max', 'downward_force_percent': 'max'}
+        result = optimize_design(default_violin_params, ['overstand', 'bridge_height'], objectives,
+                                 samples=500, rounds=1, seed=0, view_points=0)
+        costs = [(-row['string_break_angle'], -row['downward_force_percent']) for row in result['front']]
+        assert len(costs) > 1
+        for a in costs:
+            assert not any(dominates(b, a) for b in costs)
+
+    def test_target_objective(self, default_violin_params):
+        """A numeric objective is a target: the best row hits it closely"""
+        result = optimize_design(default_violin_params, ['overstand'], {'neck_angle': 86.0},
+                                 samples=200, rounds=3, seed=1, view_points=0)
+        assert len(result['front']) == 1
+        assert result['front'][0]['neck_angle'] == pytest.approx(86.0, abs=0.05)
+
+    def test_rows_match_scalar_engine(self, default_viol_params):
+        """Front rows are real designs with matching derived values"""
+        result = optimize_design(default_viol_params, ['overstand', 'arching_height'],
+                                 {'neck_angle': 'max', 'string_height_at_fb_end': 'min'},
+                                 bounds={'overstand': (5, 20), 'arching_height': (10, 25)},
+                                 samples=300, rounds=1, seed=2, view_points=0)
+        row = result['front'][0]
+        assert 5 <= row['overstand'] <= 20
+        derived = calculate_derived_values({**default_viol_params, 'overstand': row['overstand'],
+                                            'arching_height': row['arching_height']})
+        assert row['neck_angle'] == pytest.approx(derived['neck_angle'])
+
+    def test_front_is_physically_meaningful(self, default_violin_params):
+        """Rows outside the default output bounds never reach the front"""
+        objectives = {'string_break_angle': 'min', 'downward_force_percent': 'max', 'string_height_at_fb_end': 4.0}
+        inputs = ['overstand', 'bridge_height', 'body_stop']
+        result = optimize_design(default_violin_params, inputs, objectives,
+                                 samples=1000, rounds=1, seed=0, view_points=0)
+        assert result['within_bounds'] < result['feasible']
+        for row in result['front']:
+            derived = calculate_derived_values({**default_violin_params, **{key: row[key] for key in inputs}})
+            for key, (lo, hi) in DEFAULT_OUTPUT_BOUNDS.items():
+                assert lo is None or derived[key] >= lo
+                assert hi is None or derived[key] <= hi
+
+    def test_output_bounds_option(self, default_violin_params):
+        """Caller bounds narrow the front; (None, None) lifts a default"""
+        objectives = {'string_break_angle': 'max', 'downward_force_percent': 'max'}
+        result = optimize_design(default_violin_params, ['overstand', 'bridge_height'], objectives,
+                                 output_bounds={'downward_force_percent': (None, 30.0)},
+                                 samples=500, rounds=1, seed=0, view_points=0)
+        assert result['front']
+        assert all(row['downward_force_percent'] <= 30.0 for row in result['front'])
+        lifted = optimize_design(default_violin_params, ['overstand'], {'neck_angle': 'max'},
+                                 output_bounds={key: (None, None) for key in DEFAULT_OUTPUT_BOUNDS},
+                                 samples=100, rounds=0, seed=0, view_points=0)
+        assert lifted['within_bounds'] == lifted['feasible']
+        with pytest.raises(ValueError):
+            optimize_design(default_violin_params, ['overstand'], {'neck_angle': 'max'},
+                            output_bounds={'not_an_output': (0, 1)})
+
+    def test_side_views_for_front_points(self, default_violin_params):
+        """SVG side views are rendered for a few front points"""
+        result = optimize_design(default_violin_params, ['overstand', 'bridge_height'],
+                                 {'string_break_angle': 'max', 'downward_force_percent': 'max'},
+                                 samples=200, rounds=0, seed=3, view_points=2)
+        assert len(result['views']) == 2
+        assert all('<svg' in view['svg'] for view in result['views'])
+        assert all(0 <= view['index'] < len(result['front']) for view in result['views'])
+
+    def test_csv_table(self, default_violin_params):
+        """The front exports as CSV with input and objective columns"""
+        result = optimize_design(default_violin_params, ['overstand'], {'neck_angle': 'max'},
+                                 samples=50, rounds=0, seed=4, view_points=0)
+        lines = front_to_csv(result).splitlines()
+        assert lines[0] == 'overstand,neck_angle'
+        assert len(lines) == len(result['front']) + 1
+
+    def test_invalid_arguments(self, default_violin_params):
+        """Unknown outputs, bad goals and non-numeric inputs raise"""
+        with pytest.raises(ValueError):
+            optimize_design(default_violin_params, ['overstand'], {'nope': 'min'})
+        with pytest.raises(ValueError):
+            optimize_design(default_violin_params, ['overstand'], {'neck_angle': 'largest'})
+        with pytest.raises(ValueError):
+            optimize_design(default_violin_params, ['instrument_family'], {'neck_angle': 'min'})
+
+    def test_json_endpoint(self, default_violin_params):
+        """instrument_generator.optimize_design returns JSON"""
+        from instrument_generator import optimize_design as optimize_json
+        result = json.loads(optimize_json(json.dumps(default_violin_params), json.dumps(['overstand']),
+                                          json.dumps({'neck_angle': 86})))
+        assert result['success'] is True
+        assert result['front']
+        bounded = json.loads(optimize_json(json.dumps(default_violin_params), json.dumps(['overstand']),
+                                           json.dumps({'neck_angle': 'max'}),
+                                           json.dumps({'neck_angle': [None, 86.0]})))
+        assert bounded['success'] is True
+        assert all(row['neck_angle'] <= 86.0 for row in bounded['front'])
@@ -0,0 +1,139 @@
+"""
+Test suite for design_session.py
+
+Validates delta updates (only changed derived values and views are
+returned), content hashes, handling of rejected patches and the JSON
+session endpoints.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from design_session import DesignSession, content_hash, get_session
+from instrument_generator import generate_violin_neck, start_design_session, update_design_session
+from parameter_set import ParameterSet
+
+
+@pytest.fixture
+def session(default_violin_params):
+    """Started session for the default violin"""
+    session = DesignSession(default_violin_params)
+    session.start()
+    return session
+
+
+class TestDesignSession:
+    """Tests for DesignSession"""
+
+    def test_start_renders_everything(self, default_violin_params):
+        """The first render returns every view, hash and derived value"""
+        result = DesignSession(default_violin_params).start()
+        assert result['success']
+        assert set(result['views']) == {'side', 'cross_section', 'radius_template', 'fret_positions'}
+        assert set(result['view_hashes']) == set(result['views'])
+        assert 'neck_angle' in result['derived_values']
+
+    def test_views_match_stateless_generation(self, default_violin_params):
+        """Session views are the same SVG as generate_violin_neck"""
+        result = DesignSession(default_violin_params).start()
+        full = json.loads(generate_violin_neck(json.dumps(default_violin_params)))
+        for view in ('side', 'cross_section', 'radius_template'):
+            assert result['views'][view] == full['views'][view]
+            assert result['view_hashes'][view] == content_hash(full['views'][view])
+
+    def test_update_returns_only_changes(self, session):
+        """Changing overstand redraws the side view but not the radius template"""
+        hashes = dict(session.view_hashes)
+        result = session.update({'overstand': session.params['overstand'] + 1})
+        assert result['success']
+        assert result['changed_keys'] == ['overstand']
+        assert 'side' in result['views']
+        assert 'radius_template' not in result['views']
+        assert result['view_hashes']['radius_template'] == hashes['radius_template']
+        assert result['view_hashes']['side'] != hashes['side']
+        assert 'neck_angle' in result['derived_values']
+        assert 'fb_thickness_at_nut' not in result['derived_values']
+
+    def test_unchanged_patch_returns_nothing(self, session):
+        """Re-sending the current value changes nothing"""
+        result = session.update({'overstand': session.params['overstand']})
+        assert result['success']
+        assert result['changed_keys'] == []
+        assert result['views'] == {}
+        assert result['derived_values'] == {}
+
+    def test_name_change_skips_radius_template(self, session):
+        """A new name changes the labelled views only"""
+        result = session.update({'instrument_name': 'Renamed'})
+        assert result['changed_keys'] == ['instrument_name']
+        assert 'radius_template' not in result['views']
+        assert result['derived_values'] == {}
+
+    def test_rejected_patch_keeps_rendered_state(self, session):
+        """An invalid patch renders nothing, and fixing it diffs against the last good design"""
+        original = session.params['bridge_height']
+        hashes = dict(session.view_hashes)
+        result = session.update({'bridge_height': -5})
+        assert not result['success']
+        assert result['errors']
+        assert session.view_hashes == hashes
+
+        result = session.update({'bridge_height': original, 'overstand': session.params['overstand'] + 1})
+        assert result['success']
+        assert result['changed_keys'] == ['overstand']
+
+    def test_family_change_reports_removed_values(self, default_viol_params):
+        """Values that only exist for one family are reported as removed"""
+        session = DesignSession(default_viol_params)
+        start = session.start()
+        result = session.update({'instrument_family': 'VIOLIN'})
+        assert result['success']
+        removed = set(start['derived_values']) - set(session.derived)
+        assert removed
+        assert set(result['removed_values']) == removed
+
+    def test_null_resets_to_family_default(self, session):
+        """A null value resets a key to its default for the session's family"""
+        session.update({'no_frets': 12})
+        result = session.update({'no_frets': None})
+        assert result['success']
+        assert session.params['no_frets'] == ParameterSet.resolve({'instrument_family': 'VIOLIN'})['no_frets']
+
+    def test_family_switch_matches_stateless_generation(self):
+        """Switching family takes the new family's fret count, as a fresh generation would"""
+        session = DesignSession({'instrument_family': 'VIOLIN'})
+        session.start()
+        result = session.update({'instrument_family': 'GUITAR_MANDOLIN'})
+        assert result['success']
+        guitar = ParameterSet.resolve({'instrument_family': 'GUITAR_MANDOLIN'})
+        assert session.params['no_frets'] == guitar['no_frets'] > 0
+        full = json.loads(generate_violin_neck(json.dumps({'instrument_family': 'GUITAR_MANDOLIN'})))
+        assert session.views['fret_positions'] == full['fret_positions']
+        assert result['view_hashes']['side'] == content_hash(full['views']['side'])
+
+
+class TestSessionEndpoints:
+    """Tests for the JSON session endpoints"""
+
+    def test_start_and_update(self, default_violin_params):
+        """start_design_session renders all, update_design_session the delta"""
+        start = json.loads(start_design_session(json.dumps(default_violin_params)))
+        assert start['success']
+        assert 'neck_angle' in start['derived_formatted']
+
+        result = json.loads(update_design_session(json.dumps({'instrument_name': 'Patched'})))
+        assert result['success']
+        assert result['changed_keys'] == ['instrument_name']
+        assert get_session().params['instrument_name'] == 'Patched'
+
+    def test_update_invalid_json(self, default_violin_params):
+        """Invalid patch JSON reports an error"""
+        start_design_session(json.dumps(default_violin_params))
+        result = json.loads(update_design_session('not json'))
+        assert not result['success']
+        assert result['errors']
@@ -0,0 +1,97 @@
+"""
+Test suite for feasibility.py
+
+Validates the closed-form pre-check against the full generation pipeline.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from feasibility import check_feasibility, radius_template_fits, FailureCode
+from instrument_geometry import calculate_derived_values
+from instrument_generator import generate_violin_neck
+
+
+def codes(result):
+    return [failure['code'] for failure in result['failures']]
+
+
+class TestCheckFeasibility:
+    """Tests for the individual constraints"""
+
+    def test_defaults_are_feasible(self, default_violin_params, default_viol_params, default_guitar_params):
+        """Default designs of every family pass"""
+        for params in (default_violin_params, default_viol_params, default_guitar_params):
+            assert check_feasibility(params) == {'feasible': True, 'failures': []}
+
+    def test_impossible_guitar_string_angle(self, default_guitar_params):
+        """asin domain: a bridge far too high for the scale"""
+        params = {**default_guitar_params, 'vsl': 20.0}
+        result = check_feasibility(params)
+        assert codes(result) == [FailureCode.STRING_ANGLE_IMPOSSIBLE.name]
+        with pytest.raises(ValueError, match="Geometric constraints are impossible"):
+            calculate_derived_values(params)
+
+    def test_fret_join_beyond_frets(self, default_guitar_params):
+        """fret_join must index an existing fret"""
+        result = check_feasibility({**default_guitar_params, 'fret_join': 20, 'no_frets': 20})
+        assert codes(result) == [FailureCode.FRET_JOIN_BEYOND_FRETS.name]
+        assert set(result['failures'][0]['parameters']) == {'fret_join', 'no_frets'}
+
+    def test_too_few_frets(self, default_guitar_params):
+        """Guitar geometry reads the 12th fret"""
+        result = check_feasibility({**default_guitar_params, 'fret_join': 10, 'no_frets': 12})
+        assert codes(result) == [FailureCode.TOO_FEW_FRETS.name]
+
+    def test_zero_lengths_for_bowed_instruments(self, default_violin_params):
+        """body_stop and fingerboard_length are divisors"""
+        result = check_feasibility({**default_violin_params, 'body_stop': 0, 'fingerboard_length': 0})
+        assert codes(result) == [FailureCode.BODY_STOP_ZERO.name, FailureCode.FINGERBOARD_LENGTH_ZERO.name]
+
+    def test_radius_too_small_for_template(self, default_violin_params):
+        """The radius template needs radius > (width + margin) / 2"""
+        assert radius_template_fits(41.0, 42.0)
+        assert not radius_template_fits(20.0, 42.0)
+        result = check_feasibility({**default_violin_params, 'fingerboard_radius': 20.0})
+        assert codes(result) == [FailureCode.RADIUS_TOO_SMALL.name]
+
+
+class TestGeneratorIntegration:
+    """generate_violin_neck runs the pre-check before any geometry"""
+
+    def test_infeasible_design_returns_failures(self, default_guitar_params):
+        """The JSON result carries structured failure codes"""
+        result = json.loads(generate_violin_neck(json.dumps({**default_guitar_params, 'vsl': 20.0})))
+        assert result['success'] is False
+        assert result['failures'][0]['code'] == 'STRING_ANGLE_IMPOSSIBLE'
+        assert result['errors'] == [result['failures'][0]['message']]
+
+    def test_no_geometry_work_for_infeasible_design(self, default_violin_params):
+        """Infeasible designs never reach the generation context"""
+        from unittest.mock import patch
+        with patch('instrument_geometry.build_generation_context') as build:
+            result = json.loads(generate_violin_neck(json.dumps({**default_violin_params, 'fingerboard_radius': 20.0})))
+        assert result['success'] is False
+        build.assert_not_called()
+
+    @pytest.mark.parametrize('key,value', [
+        ('vsl', 20.0), ('vsl', 400.0), ('fret_join', 19), ('no_frets', 12),
+        ('bridge_height', 100.0), ('fingerboard_radius', 25.0), ('fingerboard_radius', 500.0)
+    ])
+    def test_precheck_agrees_with_generation(self, default_guitar_params, key, value):
+        """Feasible exactly when the full pipeline succeeds"""
+        params = {**default_guitar_params, key: value}
+        feasible = check_feasibility(params)['feasible']
+        try:
+            calculate_derived_values(params)
+            from radius_template import generate_radius_template_svg
+            generate_radius_template_svg(params)
+            built = True
+        except (ValueError, IndexError, ZeroDivisionError):
+            built = False
+        assert feasible == built
@@ -0,0 +1,85 @@
+"""
+Test suite for feasible_ranges.py
+
+Validates that reported intervals agree with the scalar engine and that
+boundaries are refined beyond the grid spacing.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from feasible_ranges import feasible_ranges, clamp_to_feasible, GRID_POINTS
+from instrument_geometry import calculate_derived_values
+from parameter_set import input_range
+
+
+def builds(params):
+    """True if the scalar engine accepts the design"""
+    try:
+        calculate_derived_values(params)
+        return True
+    except (ValueError, ZeroDivisionError):
+        return False
+
+
+class TestFeasibleRanges:
+    """Tests for feasible_ranges"""
+
+    def test_bowed_defaults_are_unconstrained(self, default_violin_params):
+        """A default violin can use the full range of overstand"""
+        ranges = feasible_ranges(default_violin_params, inputs=['overstand'])
+        entry = ranges['overstand']
+        assert entry['current_feasible'] is True
+        assert (entry['min'], entry['max']) == input_range('overstand')
+        assert entry['limited'] is False
+
+    def test_guitar_vsl_lower_bound_matches_scalar_engine(self, default_guitar_params):
+        """Just inside the boundary builds, just outside raises"""
+        entry = feasible_ranges(default_guitar_params, inputs=['vsl'])['vsl']
+        lo, hi = input_range('vsl')
+        assert entry['limited'] is True
+        assert lo < entry['min'] < entry['current']
+        assert builds({**default_guitar_params, 'vsl': entry['min']})
+        step = (hi - lo) / (GRID_POINTS - 1)
+        outside = entry['min'] - step / 100
+        assert not builds({**default_guitar_params, 'vsl': outside})
+
+    def test_integer_inputs_use_whole_values(self, default_guitar_params):
+        """fret_join stops below no_frets without refinement"""
+        entry = feasible_ranges(default_guitar_params, inputs=['fret_join'])['fret_join']
+        assert entry['max'] == float(int(entry['max']))
+        assert entry['max'] < default_guitar_params['no_frets']
+        assert builds({**default_guitar_params, 'fret_join': int(entry['max'])})
+
+    def test_every_numeric_input_reported(self, default_viol_params):
+        """By default every numeric input of the family is analysed"""
+        ranges = feasible_ranges(default_viol_params)
+        assert 'overstand' in ranges and 'no_frets' in ranges
+        assert all(entry['min'] is not None for entry in ranges.values())
+
+    def test_radius_template_constraint(self, default_violin_params):
+        """fingerboard_radius stops where the radius template no longer fits"""
+        entry = feasible_ranges(default_violin_params, inputs=['fingerboard_radius'])['fingerboard_radius']
+        half_template = (default_violin_params['fingerboard_width_at_end'] + 10.0) / 2
+        assert entry['min'] == pytest.approx(half_template, abs=0.01)
+        assert entry['min'] > half_template
+
+    def test_clamp_to_feasible(self):
+        """Slider values are clamped into the interval"""
+        entry = {'min': 10.0, 'max': 20.0}
+        assert clamp_to_feasible(5.0, entry) == 10.0
+        assert clamp_to_feasible(15.0, entry) == 15.0
+        assert clamp_to_feasible(25.0, entry) == 20.0
+        assert clamp_to_feasible(15.0, {'min': None, 'max': None}) is None
+
+    def test_json_endpoint(self, default_guitar_params):
+        """instrument_generator.get_feasible_ranges returns JSON ranges"""
+        from instrument_generator import get_feasible_ranges
+        result = json.loads(get_feasible_ranges(json.dumps(default_guitar_params)))
+        assert result['success'] is True
+        assert result['ranges']['vsl']['limited'] is True
@@ -0,0 +1,98 @@
+"""
+Test suite for fret_kernel.py
+
+Validates table-based, batched and multiscale fret positions.
+"""
+
+import math
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from fret_kernel import fret_position_batch, fret_positions, fret_positions_batch, fret_ratio, multiscale_frets
+
+
+def reference_positions(vsl, no_frets):
+    """The original per-call formula."""
+    return [vsl - (vsl / (2 ** (i / 12))) for i in range(1, no_frets + 1)]
+
+
+class TestFretPositions:
+    """Tests for single-scale positions"""
+
+    def test_matches_reference_formula_exactly(self):
+        """Table lookup gives bit-identical results to the original loop"""
+        for vsl in (325.0, 650.0, 355.6):
+            assert fret_positions(vsl, 24) == reference_positions(vsl, 24)
+
+    def test_table_grows_beyond_default(self):
+        """More frets than the initial table are supported"""
+        assert fret_positions(650, 40) == pytest.approx(reference_positions(650, 40))
+
+    def test_fret_ratio(self):
+        """The octave is half the scale"""
+        assert fret_ratio(0) == 0.0
+        assert fret_ratio(12) == pytest.approx(0.5)
+
+
+class TestBatch:
+    """Tests for many scales at once"""
+
+    def test_shape_and_rows(self):
+        """Each row matches the single-scale positions"""
+        scales = np.linspace(300, 700, 30)
+        batch = fret_positions_batch(scales, 22)
+        assert batch.shape == (30, 22)
+        for i in (0, 15, 29):
+            np.testing.assert_allclose(batch[i], reference_positions(scales[i], 22), rtol=1e-12)
+
+    def test_one_fret_per_scale(self):
+        """Each row takes its own fret from the same table; bad fret numbers are NaN"""
+        scales = np.array([650.0, 325.0, 600.0, 600.0, 600.0])
+        frets = np.array([12, 7, 40, np.nan, -1])
+        positions = fret_position_batch(scales, frets)
+        assert positions[0] == fret_positions(650.0, 12)[11]
+        assert positions[1] == fret_positions(325.0, 7)[6]
+        assert positions[2] == pytest.approx(reference_positions(600.0, 40)[39])
+        assert np.isnan(positions[3:]).all()
+
+
+class TestMultiscale:
+    """Tests for fanned-fret layouts"""
+
+    def test_equal_scales_are_square(self):
+        """With one scale every slot is perpendicular"""
+        layout = multiscale_frets(650, 650, 6, 20, 50.0, perpendicular_fret=7)
+        np.testing.assert_allclose(layout['slot_angles'], 0.0, atol=1e-12)
+
+    def test_perpendicular_fret_is_square(self):
+        """The chosen fret is square; others fan either side"""
+        layout = multiscale_frets(686, 648, 6, 24, 52.0, perpendicular_fret=7)
+        angles = layout['slot_angles']
+        assert angles[7] == pytest.approx(0.0, abs=1e-12)
+        assert angles[0] < 0 < angles[24]
+        np.testing.assert_allclose(layout['offsets'][:, 7], 0.0, atol=1e-9)
+
+    def test_per_string_positions(self):
+        """Each string's frets follow its own interpolated scale"""
+        layout = multiscale_frets(686, 648, 7, 24, 60.0)
+        assert layout['scales'][0] == 686 and layout['scales'][-1] == 648
+        assert layout['positions'].shape == (7, 24)
+        np.testing.assert_allclose(layout['positions'][3], reference_positions(layout['scales'][3], 24))
+
+    def test_slot_angle_geometry(self):
+        """Slot angle matches the offset difference across the string span"""
+        layout = multiscale_frets(686, 648, 6, 12, 50.0)
+        expected = math.degrees(math.atan2((686 - 648) * 0.5, 50.0))
+        assert layout['slot_angles'][12] == pytest.approx(expected)
+
+    def test_invalid_layout_rejected(self):
+        """Too few strings or an out-of-range perpendicular fret raise"""
+        with pytest.raises(ValueError):
+            multiscale_frets(686, 648, 1, 24, 50.0)
+        with pytest.raises(ValueError):
+            multiscale_frets(686, 648, 6, 24, 50.0, perpendicular_fret=30)
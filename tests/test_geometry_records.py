@@ -0,0 +1,67 @@
+"""
+Test suite for geometry_records.py
+
+Validates the fixed-field stage records and the DerivedGeometry record.
+"""
+
+import dataclasses
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from geometry_records import DerivedGeometry, FingerboardThickness
+from instrument_geometry import calculate_derived_geometry, calculate_derived_values
+
+
+class TestStageRecords:
+    """Tests for the per-stage records"""
+
+    def test_missing_field_fails_at_construction(self):
+        """A stage that forgets a value fails immediately"""
+        with pytest.raises(TypeError):
+            FingerboardThickness(sagitta_at_nut=1.0, sagitta_at_join=1.0, fb_thickness_at_nut=5.0)
+
+    def test_records_are_slotted_and_frozen(self):
+        """Records have no per-instance dict and cannot be mutated"""
+        record = FingerboardThickness(1.0, 2.0, 5.0, 6.0)
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.sagitta_at_nut = 0.0
+
+    def test_key_access(self):
+        """Records support record['key'], 'key' in record and to_dict()"""
+        record = FingerboardThickness(1.0, 2.0, 5.0, 6.0)
+        assert record['fb_thickness_at_join'] == 6.0
+        assert 'sagitta_at_nut' in record
+        assert 'neck_angle' not in record
+        with pytest.raises(KeyError):
+            record['neck_angle']
+        assert record.to_dict() == {
+            'sagitta_at_nut': 1.0, 'sagitta_at_join': 2.0,
+            'fb_thickness_at_nut': 5.0, 'fb_thickness_at_join': 6.0
+        }
+
+
+class TestDerivedGeometry:
+    """Tests for the combined derived-geometry record"""
+
+    def test_to_dict_matches_derived_values(self, default_violin_params, default_viol_params, default_guitar_params):
+        """to_dict() is exactly what calculate_derived_values returns"""
+        for params in (default_violin_params, default_viol_params, default_guitar_params):
+            geometry = calculate_derived_geometry(params)
+            assert isinstance(geometry, DerivedGeometry)
+            assert geometry.to_dict() == calculate_derived_values(params)
+
+    def test_back_break_only_for_viols(self, default_violin_params, default_viol_params):
+        """Violins have no back break record and a zero back_break_length"""
+        violin = calculate_derived_geometry(default_violin_params)
+        assert violin.back_break is None
+        assert violin.back_break_length == 0
+        assert 'break_end_x' not in violin.to_dict()
+
+        viol = calculate_derived_geometry(default_viol_params)
+        assert viol.back_break is not None
+        assert viol.back_break_length == viol.back_break.back_break_length
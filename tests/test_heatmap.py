@@ -0,0 +1,127 @@
+"""
+Test suite for heatmap.py
+
+Validates the grid against the scalar engine, the marching-squares
+contours and the rendered SVG.
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from heatmap import (
+    calculate_heatmap_grid,
+    contour_segments,
+    default_range,
+    generate_heatmap_svg,
+    band_colors
+)
+from instrument_generator import generate_heatmap
+from instrument_geometry import calculate_derived_values
+from parameter_set import ParameterSet
+
+
+class TestHeatmapGrid:
+    """Tests for calculate_heatmap_grid"""
+
+    def test_grid_matches_scalar_engine(self, default_violin_params):
+        """Cells equal the scalar neck angle at their inputs"""
+        grid = calculate_heatmap_grid(default_violin_params, resolution=7)
+        assert grid['values'].shape == (7, 7)
+        for row, col in [(0, 0), (3, 5), (6, 2)]:
+            params = {**default_violin_params, 'overstand': grid['x'][col], 'bridge_height': grid['y'][row]}
+            expected = calculate_derived_values(params)['neck_angle']
+            assert grid['values'][row, col] == pytest.approx(expected, abs=1e-9)
+
+    def test_default_range_contains_current_design(self, default_violin_params):
+        """The default axes are centred on the current values"""
+        grid = calculate_heatmap_grid(default_violin_params, resolution=11)
+        cx, cy = grid['current']
+        assert grid['x'][0] < cx < grid['x'][-1]
+        assert grid['y'][0] < cy < grid['y'][-1]
+        assert grid['x'][5] == pytest.approx(cx)
+        assert grid['current_value'] == pytest.approx(grid['values'][5, 5])
+
+    def test_default_range_clipped_to_registry(self):
+        """Axes never leave the registry range"""
+        params = ParameterSet.resolve({'overstand': 2.0})
+        lo, hi = default_range(params, 'overstand')
+        assert lo == 1.0
+        assert hi == 3.0
+
+    def test_infeasible_cells_are_nan(self, default_guitar_params):
+        """Impossible guitar string angles leave NaN cells"""
+        grid = calculate_heatmap_grid(default_guitar_params, x_key='vsl', y_key='bridge_height',
+                                      resolution=20, x_range=(10.0, 200.0))
+        assert np.isnan(grid['values']).any()
+        assert np.isfinite(grid['values']).any()
+
+    def test_rejects_unknown_keys(self, default_violin_params):
+        """Unknown inputs, outputs and identical axes raise ValueError"""
+        with pytest.raises(ValueError):
+            calculate_heatmap_grid(default_violin_params, x_key='instrument_name')
+        with pytest.raises(ValueError):
+            calculate_heatmap_grid(default_violin_params, output_key='not_an_output')
+        with pytest.raises(ValueError):
+            calculate_heatmap_grid(default_violin_params, x_key='overstand', y_key='overstand')
+
+
+class TestContours:
+    """Tests for contour_segments"""
+
+    def test_linear_field_contour_lies_on_level(self):
+        """Every segment end point of x + y = 4.5 satisfies the equation"""
+        y, x = np.mgrid[0:6, 0:6].astype(float)
+        segments = contour_segments(x + y, 4.5)
+        assert len(segments) > 0
+        assert np.allclose(segments[:, 0] + segments[:, 1], 4.5)
+        assert np.allclose(segments[:, 2] + segments[:, 3], 4.5)
+
+    def test_nan_squares_are_skipped(self):
+        """No segment touches a square with a NaN corner"""
+        values = np.arange(16, dtype=float).reshape(4, 4)
+        values[:, :2] = np.nan
+        segments = contour_segments(values, 7.5)
+        assert len(segments) > 0
+        assert np.all(segments[:, [0, 2]] >= 2)
+
+    def test_saddle_produces_two_segments(self):
+        """A saddle square is split into two segments"""
+        values = np.array([[1.0, 0.0], [0.0, 1.0]])
+        assert len(contour_segments(values, 0.5)) == 2
+
+
+class TestHeatmapSvg:
+    """Tests for generate_heatmap_svg"""
+
+    def test_svg_has_bands_contours_and_marker(self, default_violin_params):
+        """Band colours, contour lines and the marker are drawn"""
+        svg = generate_heatmap_svg(default_violin_params, resolution=30)
+        assert svg.startswith('<svg')
+        first, last = band_colors()[0], band_colors()[-1]
+        assert f'fill="rgb({first[0]},{first[1]},{first[2]})"' in svg
+        assert f'fill="rgb({last[0]},{last[1]},{last[2]})"' in svg
+        assert 'stroke="rgb(40,40,40)"' in svg
+        assert 'stroke="rgb(255,0,0)"' in svg
+        assert 'Neck Angle' in svg
+
+
+class TestGenerateHeatmapEndpoint:
+    """Tests for instrument_generator.generate_heatmap"""
+
+    def test_success(self, default_violin_params):
+        """The endpoint returns the SVG"""
+        result = json.loads(generate_heatmap(json.dumps(default_violin_params), resolution=20))
+        assert result['success'] is True
+        assert '<svg' in result['svg']
+
+    def test_error_reported(self, default_violin_params):
+        """Invalid arguments are reported as errors"""
+        result = json.loads(generate_heatmap(json.dumps(default_violin_params), output_key='nope'))
+        assert result['success'] is False
+        assert result['errors']
@@ -101,3 +101,44 @@ def test_afterlength_angle_decreases_with_tailpiece_height():
 
     # Higher tailpiece means smaller angle (string goes down less steeply)
     assert result_with_height['afterlength_angle'] < result_no_height['afterlength_angle']
+
+
+def test_generation_context_matches_derived_values():
+    """Generation context holds the same derived values as the direct call"""
+    from instrument_geometry import build_generation_context
+    params = get_default_values()
+    params['instrument_family'] = InstrumentFamily.GUITAR_MANDOLIN.name
+    params['no_frets'] = 20
+    context = build_generation_context(params)
+
+    assert context.derived == calculate_derived_values(params)
+    assert len(context.fret_positions) == context.no_frets == 20
+
+
+def test_generate_violin_neck_computes_geometry_once(monkeypatch):
+    """Derived values and cross-section geometry are computed once per generation"""
+    import json
+    import geometry_engine
+    import instrument_geometry
+    from instrument_generator import generate_violin_neck
+
+    calls = {'derived': 0, 'cross_section': 0}
+    original_derived = instrument_geometry.calculate_derived_geometry
+    original_cross_section = geometry_engine.calculate_cross_section_geometry
+
+    def counting_derived(*args, **kwargs):
+        calls['derived'] += 1
+        return original_derived(*args, **kwargs)
+
+    def counting_cross_section(*args, **kwargs):
+        calls['cross_section'] += 1
+        return original_cross_section(*args, **kwargs)
+
+    monkeypatch.setattr(instrument_geometry, 'calculate_derived_geometry', counting_derived)
+    monkeypatch.setattr(geometry_engine, 'calculate_cross_section_geometry', counting_cross_section)
+
+    params = get_default_values()
+    result = json.loads(generate_violin_neck(json.dumps(params)))
+
+    assert result['success'] is True
+    assert calls == {'derived': 1, 'cross_section': 1}
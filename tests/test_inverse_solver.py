@@ -0,0 +1,80 @@
+"""
+Test suite for inverse_solver.py
+
+Validates bracketing and refinement of target derived outputs.
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from inverse_solver import solve_for_target, solve_single_input
+from instrument_geometry import calculate_derived_values
+
+
+class TestSingleInput:
+    """Tests for solving with one free input"""
+
+    @pytest.mark.parametrize('free_input', ['overstand', 'bridge_height', 'arching_height'])
+    def test_hits_neck_angle(self, default_violin_params, free_input):
+        """Solved value reproduces the target on the scalar path"""
+        result = solve_single_input(default_violin_params, 'neck_angle', 86.0, free_input)
+        assert result['success']
+        params = {**default_violin_params, free_input: result['value']}
+        assert calculate_derived_values(params)['neck_angle'] == pytest.approx(86.0, abs=1e-8)
+
+    def test_string_height_target(self, default_violin_params):
+        """Other outputs can be targeted too"""
+        result = solve_single_input(default_violin_params, 'string_height_at_fb_end', 3.5, 'string_height_eof')
+        assert result['success']
+        assert result['achieved'] == pytest.approx(3.5, abs=1e-8)
+
+    def test_guitar_target(self, default_guitar_params):
+        """The guitar path solves as well"""
+        current = calculate_derived_values(default_guitar_params)['string_break_angle']
+        result = solve_single_input(default_guitar_params, 'string_break_angle', current + 2, 'bridge_height')
+        assert result['success']
+
+    def test_unreachable_target(self, default_violin_params):
+        """Targets outside the input's range fail with the closest value"""
+        result = solve_single_input(default_violin_params, 'neck_angle', 170.0, 'overstand',
+                                    bounds=(0.0, 20.0))
+        assert not result['success']
+        assert 'not reachable' in result['message']
+        assert 0.0 <= result['value'] <= 20.0
+
+    def test_unknown_target_rejected(self, default_violin_params):
+        """Unknown outputs raise"""
+        with pytest.raises(ValueError):
+            solve_single_input(default_violin_params, 'not_an_output', 1.0, 'overstand')
+
+
+class TestSolveForTarget:
+    """Tests for the multi-input API"""
+
+    def test_best_is_smallest_relative_change(self, default_violin_params):
+        """With several free inputs, the best needs the least relative change"""
+        result = solve_for_target(default_violin_params, 'neck_angle', 86.0,
+                                  ['overstand', 'fingerboard_radius'])
+        assert result['success']
+        assert set(result['solutions']) == {'overstand', 'fingerboard_radius'}
+        best = result['best']
+        assert result['params'][best] == result['solutions'][best]['value']
+
+    def test_integer_inputs_rejected(self, default_violin_params):
+        """Integer-valued inputs cannot be free"""
+        with pytest.raises(ValueError):
+            solve_for_target(default_violin_params, 'neck_angle', 86.0, 'fret_join')
+
+    def test_json_endpoint(self, default_violin_params):
+        """instrument_generator.solve_for_target returns JSON"""
+        from instrument_generator import solve_for_target as solve_json
+        result = json.loads(solve_json(json.dumps(default_violin_params), 'neck_angle', 86.0,
+                                       json.dumps(['overstand'])))
+        assert result['success'] is True
+        assert result['errors'] == []
+        assert result['solutions']['overstand']['achieved'] == pytest.approx(86.0)
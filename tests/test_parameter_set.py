@@ -0,0 +1,124 @@
+"""
+Test suite for parameter_set.py
+
+Validates registry resolution, coercion, immutability and hashing.
+"""
+
+import pickle
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from parameter_set import ParameterSet, canonical_float
+from parameter_registry import InstrumentFamily, get_default_values
+from instrument_geometry import build_generation_context, calculate_derived_values
+
+
+class TestResolve:
+    """Tests for resolving raw params against the registry"""
+
+    def test_empty_params_resolve_to_registry_defaults(self):
+        """Every registry input is present with its InputConfig default"""
+        params = ParameterSet.resolve({})
+        defaults = get_default_values()
+        for key, value in defaults.items():
+            if key != 'no_frets':
+                assert params[key] == value, key
+
+    def test_no_frets_defaults_by_family(self):
+        """no_frets falls back to the family default, not the registry's"""
+        assert ParameterSet.resolve({'instrument_family': 'VIOLIN'}).no_frets == 0
+        assert ParameterSet.resolve({'instrument_family': 'VIOL'}).no_frets == 7
+        assert ParameterSet.resolve({'instrument_family': 'GUITAR_MANDOLIN'}).no_frets == 20
+        assert ParameterSet.resolve({'instrument_family': 'VIOL', 'no_frets': 5}).no_frets == 5
+
+    def test_none_values_take_defaults(self):
+        """Explicit None is treated as missing"""
+        assert ParameterSet.resolve({'overstand': None}).overstand == 12.0
+
+    def test_type_coercion(self):
+        """Numbers become floats (or ints for fret counts), strings parse"""
+        params = ParameterSet.resolve({'vsl': 325, 'overstand': '7.5', 'fret_join': 12.0})
+        assert isinstance(params.vsl, float) and params.vsl == 325.0
+        assert params.overstand == 7.5
+        assert isinstance(params.fret_join, int) and params.fret_join == 12
+
+    def test_enum_values_become_names(self):
+        """Enum members and display values resolve to enum names"""
+        assert ParameterSet.resolve({'instrument_family': InstrumentFamily.VIOL}).instrument_family == 'VIOL'
+        by_value = ParameterSet.resolve({'instrument_family': InstrumentFamily.GUITAR_MANDOLIN.value})
+        assert by_value.instrument_family == 'GUITAR_MANDOLIN'
+
+    def test_invalid_values_raise(self):
+        """Uncoercible values raise ValueError"""
+        with pytest.raises(ValueError):
+            ParameterSet.resolve({'instrument_family': 'HARP'})
+        with pytest.raises(ValueError):
+            ParameterSet.resolve({'vsl': 'long'})
+
+    def test_unknown_keys_pass_through(self):
+        """Keys that are not registry inputs are kept"""
+        assert ParameterSet.resolve({'custom_note': 'x'})['custom_note'] == 'x'
+
+
+class TestImmutabilityAndHashing:
+    """Tests for use as a cache key"""
+
+    def test_immutable(self):
+        """Attributes cannot be set; replace() returns a new set"""
+        params = ParameterSet.resolve({})
+        with pytest.raises(AttributeError):
+            params.overstand = 3.0
+        changed = params.replace(overstand=3)
+        assert changed.overstand == 3.0
+        assert params.overstand == 12.0
+
+    def test_replace_none_uses_family_default(self):
+        """None resets a key to the same default resolve() gives the family"""
+        violin = ParameterSet.resolve({'instrument_family': 'VIOLIN', 'no_frets': 12})
+        assert violin.replace(no_frets=None)['no_frets'] == ParameterSet.resolve({'instrument_family': 'VIOLIN'})['no_frets']
+        guitar = violin.replace(instrument_family='GUITAR_MANDOLIN', no_frets=None)
+        assert guitar['no_frets'] == ParameterSet.resolve({'instrument_family': 'GUITAR_MANDOLIN'})['no_frets']
+        assert violin.replace(overstand=None).overstand == ParameterSet.resolve({}).overstand
+
+    def test_family_switch_redefaults_family_keys(self):
+        """Changing family moves keys still at the old family's default to the new one's"""
+        violin = ParameterSet.resolve({'instrument_family': 'VIOLIN'})
+        guitar = violin.replace(instrument_family='GUITAR_MANDOLIN')
+        assert guitar['no_frets'] == ParameterSet.resolve({'instrument_family': 'GUITAR_MANDOLIN'})['no_frets']
+        assert guitar.replace(instrument_family='VIOLIN')['no_frets'] == violin['no_frets']
+        custom = violin.replace(no_frets=5).replace(instrument_family='VIOL')
+        assert custom['no_frets'] == 5
+        assert violin.replace(instrument_family='GUITAR_MANDOLIN', no_frets=22)['no_frets'] == 22
+
+    def test_float_noise_hashes_equal(self):
+        """Values equal up to float noise are the same key"""
+        a = ParameterSet.resolve({'overstand': 0.1 + 0.2})
+        b = ParameterSet.resolve({'overstand': 0.3})
+        assert a == b
+        assert hash(a) == hash(b)
+        assert len({a, b}) == 1
+        assert canonical_float(0.1 + 0.2) == 0.3
+
+    def test_pickle_round_trip(self):
+        """ParameterSets survive pickling (for process pools)"""
+        params = ParameterSet.resolve({'vsl': 330})
+        assert pickle.loads(pickle.dumps(params)) == params
+
+
+class TestEngineIntegration:
+    """ParameterSet is a drop-in params mapping for the engine"""
+
+    def test_derived_values_match_plain_dict(self, default_violin_params):
+        """A resolved full parameter dict gives identical derived values"""
+        params = ParameterSet.resolve(default_violin_params)
+        assert calculate_derived_values(params) == pytest.approx(calculate_derived_values(default_violin_params))
+
+    def test_generation_context_resolves_params(self):
+        """The generation context carries the resolved ParameterSet"""
+        context = build_generation_context({'instrument_family': 'VIOLIN'})
+        assert isinstance(context.params, ParameterSet)
+        assert context.params.vsl == 325.0
@@ -0,0 +1,129 @@
+"""
+Test suite for preset_index.py
+
+Validates catalogue loading, nearest-neighbour order, per-parameter deltas
+and agreement with brute-force search on a large catalogue.
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from preset_index import PresetIndex, load_catalogue, get_preset_index, find_nearest_presets
+from instrument_generator import find_similar_presets
+from parameter_set import ParameterSet, numeric_inputs, input_range
+
+PRESETS_DIR = Path(__file__).parent.parent / 'presets'
+
+
+def preset_parameters(name):
+    """Parameters of a bundled preset"""
+    return json.loads((PRESETS_DIR / f'{name}.json').read_text())['parameters']
+
+
+def entry(preset_id, params):
+    """Catalogue entry for tests"""
+    return {'id': preset_id, 'display_name': preset_id, 'source': 'csv', 'parameters': params}
+
+
+class TestCatalogue:
+    """Tests for load_catalogue"""
+
+    def test_presets_and_csv_rows_are_deduplicated(self):
+        """Each bundled instrument appears once, from its JSON preset"""
+        entries = load_catalogue()
+        ids = [e['id'] for e in entries]
+        assert len(ids) == len(set(ids))
+        assert 'violin' in ids
+        assert all(e['source'] == 'preset' for e in entries if e['id'] == 'violin')
+
+    def test_csv_rows_have_only_design_columns(self):
+        """CSV metadata columns and empty cells are dropped"""
+        entries = load_catalogue(presets_dir='no_such_dir')
+        assert entries
+        for e in entries:
+            assert e['source'] == 'csv'
+            assert 'display_name' not in e['parameters']
+            assert '' not in e['parameters'].values()
+
+
+class TestPresetIndex:
+    """Tests for PresetIndex.query"""
+
+    def test_exact_preset_is_nearest(self):
+        """A bundled preset finds itself at distance zero"""
+        results = find_nearest_presets(preset_parameters('viola'), k=3)
+        assert results[0]['id'] == 'viola'
+        assert results[0]['distance'] == pytest.approx(0.0, abs=1e-6)
+        assert all(value == pytest.approx(0.0, abs=1e-9) for value in results[0]['deltas'].values())
+
+    def test_results_stay_in_family(self):
+        """Only presets of the design's family are returned"""
+        index = get_preset_index()
+        families = {e['id']: e['parameters'].instrument_family for e in index.entries}
+        for result in find_nearest_presets(preset_parameters('mandolin'), k=10):
+            assert families[result['id']] == 'GUITAR_MANDOLIN'
+
+    def test_deltas_and_order(self, default_violin_params):
+        """Neighbours are sorted by distance and deltas are preset minus current"""
+        index = PresetIndex([
+            entry('near', {**default_violin_params, 'overstand': 13.0}),
+            entry('far', {**default_violin_params, 'overstand': 20.0, 'bridge_height': 40.0}),
+            entry('same', dict(default_violin_params))
+        ])
+        results = index.query(default_violin_params, k=2)
+        assert [r['id'] for r in results] == ['same', 'near']
+        assert results[1]['deltas']['overstand'] == pytest.approx(13.0 - default_violin_params['overstand'])
+        assert next(iter(results[1]['deltas'])) == 'overstand'
+
+    def test_k_larger_than_catalogue(self, default_viol_params):
+        """k is capped at the family's catalogue size"""
+        index = PresetIndex([entry('a', default_viol_params), entry('b', {**default_viol_params, 'vsl': 700.0})])
+        assert len(index.query(default_viol_params, k=10)) == 2
+
+    def test_unknown_family_returns_nothing(self, default_guitar_params, default_violin_params):
+        """A family without presets has no neighbours"""
+        index = PresetIndex([entry('violin', default_violin_params)])
+        assert index.query(default_guitar_params) == []
+
+    def test_large_catalogue_matches_brute_force(self, default_violin_params):
+        """Over thousands of instruments, query returns the exact k nearest"""
+        entries = [entry(f'v{i}', {**default_violin_params, 'vsl': 300.0 + i * 0.02, 'overstand': 5.0 + (i % 15)})
+                   for i in range(3000)]
+        index = PresetIndex(entries)
+        query = {**default_violin_params, 'vsl': 330.013, 'overstand': 11.3}
+
+        keys = numeric_inputs('VIOLIN')
+        resolved = [ParameterSet.resolve(e['parameters']) for e in entries]
+        vectors = np.array([[float(params[key]) for key in keys] for params in resolved])
+        std = vectors.std(axis=0)
+        scale = np.where(std > 0, std, [input_range(key)[1] - input_range(key)[0] for key in keys])
+        point = np.array([float(ParameterSet.resolve(query)[key]) for key in keys])
+        distances = np.sqrt((((vectors - point) / scale) ** 2).sum(axis=1))
+        expected = np.argsort(distances, kind='stable')[:10]
+
+        results = index.query(query, k=10)
+        assert [r['id'] for r in results] == [f'v{i}' for i in expected]
+        assert [r['distance'] for r in results] == pytest.approx(distances[expected].tolist())
+
+
+class TestFindSimilarPresetsEndpoint:
+    """Tests for instrument_generator.find_similar_presets"""
+
+    def test_success(self):
+        """The endpoint returns the nearest presets"""
+        result = json.loads(find_similar_presets(json.dumps(preset_parameters('cello')), k=2))
+        assert result['success'] is True
+        assert result['presets'][0]['id'] == 'cello'
+        assert len(result['presets']) == 2
+
+    def test_error_reported(self):
+        """Invalid JSON is reported as an error"""
+        result = json.loads(find_similar_presets('not json'))
+        assert result['success'] is False
+        assert result['errors']
@@ -0,0 +1,53 @@
+"""
+Test suite for sampling.py
+
+Validates grid and Latin-hypercube sampling of input columns.
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from sampling import grid_columns, latin_hypercube_columns
+from parameter_set import input_range
+
+
+class TestSampling:
+    """Tests for building input columns"""
+
+    def test_grid_is_full_factorial(self):
+        """Every combination of the axis values appears once"""
+        columns = grid_columns({'overstand': (5, 15, 3), 'bridge_height': (30, 40)}, steps=4)
+        assert len(columns['overstand']) == 12
+        pairs = set(zip(columns['overstand'], columns['bridge_height']))
+        assert len(pairs) == 12
+        assert set(columns['overstand']) == {5.0, 10.0, 15.0}
+
+    def test_none_uses_registry_range(self):
+        """A range of None spans the registry min/max"""
+        columns = grid_columns({'overstand': None}, steps=5)
+        lo, hi = input_range('overstand')
+        assert columns['overstand'][0] == lo
+        assert columns['overstand'][-1] == hi
+
+    def test_latin_hypercube_hits_every_stratum(self):
+        """Each of the samples equal strata holds exactly one value"""
+        samples = 50
+        columns = latin_hypercube_columns({'overstand': (0, 10), 'vsl': (300, 400)}, samples, seed=0)
+        for key, (lo, hi) in (('overstand', (0, 10)), ('vsl', (300, 400))):
+            strata = np.floor((columns[key] - lo) / (hi - lo) * samples).astype(int)
+            assert sorted(strata) == list(range(samples))
+
+    def test_integer_inputs_are_rounded(self):
+        """Integer-valued inputs such as no_frets only take whole values"""
+        columns = latin_hypercube_columns({'no_frets': (15, 24)}, 30, seed=1)
+        np.testing.assert_array_equal(columns['no_frets'], np.round(columns['no_frets']))
+
+    def test_non_numeric_input_raises(self):
+        """Only numeric registry inputs can be swept"""
+        with pytest.raises(ValueError):
+            grid_columns({'instrument_family': None})
@@ -0,0 +1,100 @@
+"""
+Test suite for sensitivity.py
+
+Validates the batched central-difference Jacobian and input ranking.
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from sensitivity import calculate_jacobian, jacobian_to_dict, rank_inputs
+from instrument_geometry import calculate_derived_values
+
+
+def scalar_derivative(params, output_key, input_key, h=1e-5):
+    """Reference derivative from two scalar evaluations."""
+    up = calculate_derived_values({**params, input_key: params[input_key] + h})[output_key]
+    down = calculate_derived_values({**params, input_key: params[input_key] - h})[output_key]
+    return (up - down) / (2 * h)
+
+
+class TestJacobian:
+    """Tests for calculate_jacobian"""
+
+    def test_shape_covers_outputs_and_continuous_inputs(self, default_violin_params):
+        """One row per derived output, one column per continuous input"""
+        result = calculate_jacobian(default_violin_params)
+        assert result['outputs'] == list(calculate_derived_values(default_violin_params))
+        assert 'fret_join' not in result['inputs'] and 'no_frets' not in result['inputs']
+        assert 'overstand' in result['inputs']
+        assert result['jacobian'].shape == (len(result['outputs']), len(result['inputs']))
+
+    @pytest.mark.parametrize('output_key, input_key', [
+        ('neck_angle', 'overstand'),
+        ('neck_angle', 'bridge_height'),
+        ('string_length', 'vsl'),
+        ('neck_block_max_width', 'fb_blend_percent'),
+    ])
+    def test_matches_scalar_differences(self, default_violin_params, output_key, input_key):
+        """Batched derivatives agree with scalar central differences"""
+        params = {**default_violin_params, 'fb_blend_percent': 40.0}
+        result = calculate_jacobian(params)
+        row = result['outputs'].index(output_key)
+        col = result['inputs'].index(input_key)
+        expected = scalar_derivative(params, output_key, input_key)
+        assert result['jacobian'][row, col] == pytest.approx(expected, rel=1e-4, abs=1e-7)
+
+    def test_unrelated_input_has_zero_derivative(self, default_violin_params):
+        """Body length does not affect the neck angle"""
+        result = calculate_jacobian(default_violin_params, inputs=['body_length'])
+        row = result['outputs'].index('neck_angle')
+        assert result['jacobian'][row, 0] == 0.0
+
+    def test_guitar_excludes_body_stop(self, default_guitar_params):
+        """body_stop is an output for guitars, so it is not differentiated"""
+        result = calculate_jacobian(default_guitar_params)
+        assert 'body_stop' not in result['inputs']
+        assert np.isfinite(result['jacobian']).any()
+
+
+class TestRanking:
+    """Tests for rank_inputs"""
+
+    def test_ranked_by_magnitude(self, default_violin_params):
+        """Rankings are sorted by descending |impact|"""
+        ranking = rank_inputs(calculate_jacobian(default_violin_params), 'neck_angle')
+        impacts = [abs(r['impact']) for r in ranking]
+        assert impacts == sorted(impacts, reverse=True)
+
+    def test_range_scale_and_top(self, default_violin_params):
+        """'range' scaling multiplies by the registry span"""
+        sensitivity = calculate_jacobian(default_violin_params, inputs=['overstand', 'vsl'])
+        ranking = rank_inputs(sensitivity, 'neck_angle', scale='range', top=1)
+        assert len(ranking) == 1
+        entry = ranking[0]
+        span = 100.0 if entry['input'] == 'overstand' else 990.0
+        assert entry['impact'] == pytest.approx(entry['derivative'] * span)
+
+    def test_unknown_output_rejected(self, default_violin_params):
+        """Unknown outputs raise"""
+        with pytest.raises(ValueError):
+            rank_inputs(calculate_jacobian(default_violin_params, inputs=['vsl']), 'nope')
+
+
+class TestJsonEndpoint:
+    """Tests for instrument_generator.get_sensitivities"""
+
+    def test_json_endpoint(self, default_viol_params):
+        """The endpoint returns a nested jacobian and a ranking"""
+        from instrument_generator import get_sensitivities
+        result = json.loads(get_sensitivities(json.dumps(default_viol_params), 'neck_angle'))
+        assert result['success'] is True
+        assert 'overstand' in result['jacobian']['neck_angle']
+        assert result['ranking'][0]['input'] in result['inputs']
+        assert jacobian_to_dict({'inputs': ['a'], 'outputs': ['b'], 'jacobian': np.array([[np.nan]])}) == {'b': {'a': None}}
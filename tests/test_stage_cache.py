@@ -0,0 +1,150 @@
+"""
+Test suite for stage_cache.py
+
+Validates read-set tracking and memoization of geometry_engine stages.
+"""
+
+import dataclasses
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import stage_cache
+from stage_cache import TrackingParams, memoized_stage, get_cache_stats, clear_stage_caches
+from geometry_engine import (
+    calculate_cross_section_geometry,
+    calculate_fingerboard_thickness,
+    calculate_viol_back_break
+)
+from instrument_geometry import calculate_derived_values
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    """Start every test with empty caches and caching enabled."""
+    clear_stage_caches()
+    stage_cache.set_cache_enabled(True)
+    yield
+    clear_stage_caches()
+    stage_cache.set_cache_enabled(True)
+
+
+class TestTrackingParams:
+    """Tests for the read-recording params wrapper"""
+
+    def test_records_get_and_getitem(self):
+        """Both access styles are recorded, including missing keys"""
+        tracking = TrackingParams({'vsl': 325.0, 'overstand': 12.0})
+        tracking.get('vsl')
+        tracking['overstand']
+        tracking.get('missing', 5)
+        assert set(tracking.reads) == {'vsl', 'overstand', 'missing'}
+
+    def test_getitem_missing_raises(self):
+        """Missing keys still raise KeyError"""
+        with pytest.raises(KeyError):
+            TrackingParams({})['vsl']
+
+    def test_iteration_marks_full_read(self):
+        """Iterating makes the whole dict part of the read set"""
+        tracking = TrackingParams({'vsl': 325.0})
+        list(tracking)
+        assert tracking.read_all
+
+
+class TestMemoizedStages:
+    """Tests for memoized geometry_engine stages"""
+
+    def test_repeat_call_hits(self, default_violin_params):
+        """Calling a stage twice with the same params is a hit"""
+        first = calculate_fingerboard_thickness(default_violin_params)
+        second = calculate_fingerboard_thickness(default_violin_params)
+        assert first == second
+        stats = get_cache_stats()['calculate_fingerboard_thickness']
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_unread_key_change_still_hits(self, default_violin_params):
+        """Changing a key the stage never reads does not invalidate it"""
+        calculate_fingerboard_thickness(default_violin_params)
+        params = dict(default_violin_params, overstand=20.0, bridge_height=40.0)
+        calculate_fingerboard_thickness(params)
+        assert get_cache_stats()['calculate_fingerboard_thickness']['hits'] == 1
+
+    def test_read_key_change_misses(self, default_violin_params):
+        """Changing a key the stage reads recomputes it"""
+        first = calculate_fingerboard_thickness(default_violin_params)
+        params = dict(default_violin_params, fingerboard_radius=60.0)
+        second = calculate_fingerboard_thickness(params)
+        assert second['sagitta_at_nut'] != first['sagitta_at_nut']
+        assert get_cache_stats()['calculate_fingerboard_thickness']['misses'] == 2
+
+    def test_viol_back_break_reads_five_keys(self, default_viol_params):
+        """The back break stage depends only on its five keys"""
+        calculate_viol_back_break(default_viol_params)
+        calculate_viol_back_break(dict(default_viol_params, vsl=500.0, overstand=3.0))
+        assert get_cache_stats()['calculate_viol_back_break']['hits'] == 1
+
+    def test_cached_result_is_immutable(self, default_violin_params):
+        """Cached stage records are frozen, so sharing them is safe"""
+        result = calculate_fingerboard_thickness(default_violin_params)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.sagitta_at_nut = -1
+        assert calculate_fingerboard_thickness(default_violin_params) is result
+
+    def test_cached_dict_result_is_not_shared(self, default_violin_params):
+        """Mutating a returned dict result does not corrupt the cache"""
+        result = calculate_cross_section_geometry(default_violin_params)
+        result['y_button'] = -1
+        again = calculate_cross_section_geometry(default_violin_params)
+        assert again['y_button'] != -1
+
+    def test_slider_drag_only_recomputes_dependent_stages(self, default_violin_params):
+        """Changing overstand reuses the fingerboard thickness stage"""
+        calculate_derived_values(default_violin_params)
+        params = dict(default_violin_params, overstand=default_violin_params['overstand'] + 1)
+        derived = calculate_derived_values(params)
+
+        stats = get_cache_stats()
+        assert stats['calculate_fingerboard_thickness']['hits'] == 1
+        assert stats['calculate_neck_geometry']['hits'] == 0
+
+        # Results are identical to an uncached evaluation
+        clear_stage_caches()
+        stage_cache.set_cache_enabled(False)
+        assert derived == calculate_derived_values(params)
+
+    def test_disabled_cache_counts_nothing(self, default_violin_params):
+        """With caching disabled stages run directly"""
+        stage_cache.set_cache_enabled(False)
+        calculate_fingerboard_thickness(default_violin_params)
+        calculate_fingerboard_thickness(default_violin_params)
+        stats = get_cache_stats()['calculate_fingerboard_thickness']
+        assert stats['hits'] == 0 and stats['misses'] == 0
+
+    def test_lru_eviction(self):
+        """The per-stage cache is bounded"""
+        @memoized_stage
+        def _test_stage(params):
+            return {'value': params.get('x')}
+
+        for i in range(stage_cache.STAGE_CACHE_SIZE + 10):
+            _test_stage({'x': i})
+        assert len(_test_stage.stage_cache.entries) == stage_cache.STAGE_CACHE_SIZE
+
+
+class TestCacheStatsEndpoint:
+    """Tests for the JSON counters exposed to the browser"""
+
+    def test_get_cache_stats_json(self, default_violin_params):
+        """instrument_generator.get_cache_stats reports per-stage counters"""
+        from instrument_generator import get_cache_stats as get_cache_stats_json
+        calculate_derived_values(default_violin_params)
+        calculate_derived_values(default_violin_params)
+        result = json.loads(get_cache_stats_json())
+        assert result['success'] is True
+        assert result['stages']['calculate_neck_geometry']['hits'] == 1
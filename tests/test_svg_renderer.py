@@ -460,14 +460,29 @@ class TestFullSVGGeneration:
 
         svg = generate_side_view_svg(params)
 
-        # Count dotted lines - should not include tailpiece reference
+        # Count dotted segments (connected edges share one path, so count the
+        # drawing commands in the dotted layer's group) - should not include tailpiece reference
         import re
-        dotted_count_zero = len(re.findall(r'stroke-dasharray="1,2"', svg))
+        arguments = {'l': 2, 'h': 1, 'v': 1, 'a': 7, 'q': 4, 'c': 6}
+
+        def dotted_count(svg):
+            group = re.search(r'<g class="layer-schematic_dotted"[^>]*>(.*?)</g>', svg, re.S)
+            if not group:
+                return 0
+            count = 0
+            for path in re.findall(r'd="([^"]*)"', group.group(1)):
+                for command, numbers in re.findall(r'([a-zA-Z])([^a-zA-Z]*)', path):
+                    values = re.findall(r'-?(?:\d+\.?\d*|\.\d+)', numbers)
+                    if command.lower() in arguments:
+                        count += len(values) // arguments[command.lower()]
+            return count
+
+        dotted_count_zero = dotted_count(svg)
 
         # Now with tailpiece height
         params['tailpiece_height'] = 10.0
         svg_with = generate_side_view_svg(params)
-        dotted_count_with = len(re.findall(r'stroke-dasharray="1,2"', svg_with))
+        dotted_count_with = dotted_count(svg_with)
 
         # Should have more dotted lines with tailpiece height
         assert dotted_count_with > dotted_count_zero
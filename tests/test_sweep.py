@@ -0,0 +1,136 @@
+"""
+Test suite for sweep.py
+
+Validates chunked evaluation, input checks and the memory-mappable on-disk
+layout.
+"""
+
+import json
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import sweep as sweep_module
+from concurrent.futures import Future
+from sampling import latin_hypercube_columns
+from sweep import run_sweep, sweep, load_sweep, MANIFEST_FILE
+from instrument_geometry import calculate_derived_values
+
+
+class TestRunSweep:
+    """Tests for evaluating a sweep"""
+
+    def test_rows_match_scalar_engine(self, default_violin_params):
+        """Each row equals the scalar derived values for that design"""
+        result = sweep(default_violin_params, {'overstand': (8, 14, 4), 'bridge_height': (30, 36, 3)})
+        columns = result['columns']
+        assert result['rows'] == 12
+        for i in (0, 5, 11):
+            design = {**default_violin_params, 'overstand': columns['overstand'][i],
+                      'bridge_height': columns['bridge_height'][i]}
+            expected = calculate_derived_values(design)
+            assert columns['neck_angle'][i] == pytest.approx(expected['neck_angle'])
+
+    def test_chunking_does_not_change_results(self, default_viol_params):
+        """Results are identical however the rows are chunked"""
+        columns = latin_hypercube_columns({'overstand': None, 'vsl': None}, 101, seed=2)
+        whole = run_sweep(default_viol_params, columns, workers=1)
+        chunked = run_sweep(default_viol_params, columns, chunk_size=7, workers=1)
+        np.testing.assert_array_equal(whole['columns']['neck_angle'], chunked['columns']['neck_angle'])
+
+    def test_process_pool_matches_single_process(self, default_violin_params):
+        """Chunks evaluated in worker processes land in the right rows"""
+        columns = latin_hypercube_columns({'overstand': None}, 40, seed=3)
+        local = run_sweep(default_violin_params, columns, chunk_size=10, workers=1)
+        pooled = run_sweep(default_violin_params, columns, chunk_size=10, workers=2)
+        np.testing.assert_array_equal(local['columns']['neck_angle'], pooled['columns']['neck_angle'])
+
+    def test_pool_keeps_bounded_chunks_in_flight(self, default_violin_params, monkeypatch):
+        """With workers > 1, at most IN_FLIGHT_PER_WORKER chunks per worker are held at once"""
+        held = {'current': 0, 'max': 0}
+
+        class CountingFuture(Future):
+            def result(self, timeout=None):
+                held['current'] -= 1
+                return super().result(timeout)
+
+        class InlineExecutor:
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def submit(self, fn, *args):
+                future = CountingFuture()
+                future.set_result(fn(*args))
+                held['current'] += 1
+                held['max'] = max(held['max'], held['current'])
+                return future
+
+        monkeypatch.setattr(sweep_module, 'ProcessPoolExecutor', InlineExecutor)
+        columns = latin_hypercube_columns({'overstand': None}, 200, seed=4)
+        pooled = run_sweep(default_violin_params, columns, chunk_size=5, workers=2)
+        local = run_sweep(default_violin_params, columns, chunk_size=5, workers=1)
+        assert held['current'] == 0
+        assert held['max'] == 2 * sweep_module.IN_FLIGHT_PER_WORKER
+        np.testing.assert_array_equal(pooled['columns']['neck_angle'], local['columns']['neck_angle'])
+
+    def test_invalid_rows_are_nan(self, default_guitar_params):
+        """Impossible geometry gives NaN rather than an exception"""
+        result = sweep(default_guitar_params, {'fret_join': (10, 20, 11)})
+        assert np.isnan(result['columns']['neck_angle']).any()
+
+    def test_input_of_other_family_raises(self, default_guitar_params):
+        """Keys must be numeric inputs of the design's own family"""
+        with pytest.raises(ValueError):
+            run_sweep(default_guitar_params, {'body_stop': np.array([180.0, 190.0, 200.0])}, workers=1)
+
+    def test_swept_input_not_overwritten_by_output(self, default_violin_params, tmp_path):
+        """A derived value named like a swept input does not replace its column"""
+        values = np.array([180.0, 190.0, 200.0])
+        result = run_sweep(default_violin_params, {'body_stop': values}, output_dir=str(tmp_path), workers=1)
+        assert result['outputs'].count('body_stop') == 0
+        np.testing.assert_array_equal(result['columns']['body_stop'], values)
+        np.testing.assert_array_equal(np.load(tmp_path / 'body_stop.npy'), values)
+        assert len(np.unique(result['columns']['neck_angle'])) == 3
+
+    def test_workers_must_be_positive(self, default_violin_params):
+        """workers=0 is rejected rather than meaning every CPU"""
+        with pytest.raises(ValueError):
+            run_sweep(default_violin_params, {'overstand': np.array([5.0, 6.0])}, workers=0)
+
+    def test_unknown_method_raises(self, default_violin_params):
+        """Only grid and lhs are supported"""
+        with pytest.raises(ValueError):
+            sweep(default_violin_params, {'overstand': None}, method='sobol')
+
+
+class TestOnDisk:
+    """Tests for the .npy-per-column layout"""
+
+    def test_writes_manifest_and_columns(self, default_violin_params, tmp_path):
+        """One .npy per input and output, described by the manifest"""
+        result = sweep(default_violin_params, {'overstand': (5, 15, 6)}, output_dir=str(tmp_path))
+        manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+        assert manifest['rows'] == 6
+        assert manifest['inputs'] == ['overstand']
+        for key in manifest['inputs'] + manifest['outputs']:
+            assert (tmp_path / f'{key}.npy').exists()
+        assert isinstance(result['columns']['neck_angle'], np.memmap)
+
+    def test_load_sweep_round_trip(self, default_violin_params, tmp_path):
+        """load_sweep memory-maps the same values that were computed"""
+        in_memory = sweep(default_violin_params, {'overstand': (5, 15, 6)})
+        sweep(default_violin_params, {'overstand': (5, 15, 6)}, output_dir=str(tmp_path))
+        loaded = load_sweep(str(tmp_path))
+        assert isinstance(loaded['columns']['neck_angle'], np.memmap)
+        np.testing.assert_array_equal(loaded['columns']['neck_angle'], in_memory['columns']['neck_angle'])
+        assert np.load(tmp_path / 'neck_angle.npy').shape == (6,)
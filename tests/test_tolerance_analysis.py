@@ -0,0 +1,129 @@
+"""
+Test suite for tolerance_analysis.py
+
+Validates sampling, summary statistics and agreement with the scalar engine.
+"""
+
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tolerance_analysis import run_tolerance_analysis, sample_inputs, summarize, format_report
+from instrument_geometry import calculate_derived_values
+
+
+class TestSampling:
+    """Tests for drawing perturbed inputs"""
+
+    def test_uniform_samples_stay_within_tolerance(self, default_violin_params):
+        """Uniform samples cover +/- tol and never exceed it"""
+        columns = sample_inputs(default_violin_params, {'overstand': 0.5}, 5000,
+                                distribution='uniform', seed=0)
+        values = columns['overstand']
+        nominal = default_violin_params['overstand']
+        assert values.shape == (5000,)
+        assert values.min() >= nominal - 0.5
+        assert values.max() <= nominal + 0.5
+
+    def test_normal_tolerance_is_three_sigma(self, default_violin_params):
+        """The normal distribution uses sigma = tol / 3"""
+        columns = sample_inputs(default_violin_params, {'overstand': 0.3}, 50000, seed=0)
+        assert np.std(columns['overstand']) == pytest.approx(0.1, rel=0.02)
+
+    def test_seed_is_reproducible(self, default_violin_params):
+        """The same seed draws the same samples"""
+        a = sample_inputs(default_violin_params, {'overstand': 0.3}, 100, seed=42)
+        b = sample_inputs(default_violin_params, {'overstand': 0.3}, 100, seed=42)
+        np.testing.assert_array_equal(a['overstand'], b['overstand'])
+
+    @pytest.mark.parametrize('distribution', ['normal', 'uniform'])
+    def test_samples_clipped_to_registry_range(self, default_violin_params, distribution):
+        """A 0-nominal input never goes below its registry minimum"""
+        params = {**default_violin_params, 'tailpiece_height': 0.0}
+        columns = sample_inputs(params, {'tailpiece_height': 1.0}, 2000, distribution=distribution, seed=0)
+        assert columns['tailpiece_height'].min() == 0.0
+        assert (columns['tailpiece_height'] > 0).any()
+        unclipped = sample_inputs(params, {'tailpiece_height': 1.0}, 2000, distribution=distribution,
+                                  seed=0, clip=False)
+        assert unclipped['tailpiece_height'].min() < 0
+
+    def test_unknown_distribution_raises(self, default_violin_params):
+        """Only normal and uniform are supported"""
+        with pytest.raises(ValueError):
+            sample_inputs(default_violin_params, {'overstand': 0.3}, 10, distribution='triangular')
+
+
+class TestAnalysis:
+    """Tests for run_tolerance_analysis"""
+
+    def test_reports_default_outputs(self, default_violin_params):
+        """neck_angle, string_height_at_fb_end and downward_force_percent are reported"""
+        result = run_tolerance_analysis(default_violin_params, {'overstand': 0.2}, samples=1000, seed=1)
+        assert set(result['outputs']) == {'neck_angle', 'string_height_at_fb_end', 'downward_force_percent'}
+        stats = result['outputs']['neck_angle']
+        assert stats['valid_samples'] == 1000
+        assert stats['min'] <= stats['percentiles']['50'] <= stats['max']
+        assert sum(stats['histogram']['counts']) == 1000
+
+    def test_nominal_matches_scalar_engine(self, default_violin_params):
+        """Nominal values come from the scalar derived-value engine"""
+        result = run_tolerance_analysis(default_violin_params, {'bridge_height': 0.5}, samples=100, seed=1)
+        derived = calculate_derived_values(default_violin_params)
+        assert result['outputs']['neck_angle']['nominal'] == derived['neck_angle']
+
+    def test_zero_tolerance_has_no_spread(self, default_violin_params):
+        """With zero tolerance every sample equals the nominal design"""
+        result = run_tolerance_analysis(default_violin_params, {'overstand': 0.0}, samples=50, seed=1)
+        stats = result['outputs']['neck_angle']
+        assert stats['std'] == pytest.approx(0.0, abs=1e-9)
+        assert stats['mean'] == pytest.approx(stats['nominal'], abs=1e-9)
+
+    def test_samples_match_scalar_engine(self, default_viol_params):
+        """Extremes of a uniform sample are bounded by the scalar engine at +/- tol"""
+        tol = 0.5
+        result = run_tolerance_analysis(default_viol_params, {'overstand': tol}, samples=2000,
+                                        distribution='uniform', seed=3)
+        nominal = default_viol_params['overstand']
+        low = calculate_derived_values({**default_viol_params, 'overstand': nominal - tol})['neck_angle']
+        high = calculate_derived_values({**default_viol_params, 'overstand': nominal + tol})['neck_angle']
+        stats = result['outputs']['neck_angle']
+        assert min(low, high) - 1e-9 <= stats['min']
+        assert stats['max'] <= max(low, high) + 1e-9
+
+    def test_invalid_samples_are_counted(self, default_guitar_params):
+        """Designs the engine rejects are excluded from the statistics and counted"""
+        summary = summarize(np.array([1.0, np.nan, 3.0]), nominal=2.0)
+        assert summary['valid_samples'] == 2
+        assert summary['mean'] == 2.0
+        result = run_tolerance_analysis(default_guitar_params, {'overstand': 0.1}, samples=100, seed=1)
+        assert result['invalid_samples'] + result['outputs']['neck_angle']['valid_samples'] == 100
+
+    def test_rejects_non_continuous_inputs(self, default_violin_params):
+        """Tolerances must name continuous inputs"""
+        with pytest.raises(ValueError):
+            run_tolerance_analysis(default_violin_params, {'no_frets': 1})
+        with pytest.raises(ValueError):
+            run_tolerance_analysis(default_violin_params, {'not_a_param': 1.0})
+        with pytest.raises(ValueError):
+            run_tolerance_analysis(default_violin_params, {})
+
+    def test_clipped_samples_are_reported(self, default_violin_params):
+        """The result and report count samples clipped to the registry range"""
+        params = {**default_violin_params, 'tailpiece_height': 0.0}
+        result = run_tolerance_analysis(params, {'tailpiece_height': 1.0, 'overstand': 0.2},
+                                        samples=1000, seed=1)
+        assert 400 < result['clipped_samples']['tailpiece_height'] < 600
+        assert result['clipped_samples']['overstand'] == 0
+        assert 'Clipped to the tailpiece_height range' in format_report(result)
+
+    def test_format_report(self, default_violin_params):
+        """The text report lists every output with its percentiles"""
+        result = run_tolerance_analysis(default_violin_params, {'overstand': 0.2}, samples=200, seed=1)
+        report = format_report(result)
+        assert 'neck_angle' in report
+        assert 'p95' in report
+        assert 'overstand ±0.2' in report
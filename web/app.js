@@ -112,7 +112,12 @@ async function initializePython() {
             'constants.py', 'buildprimitives.py', 'dimension_helpers.py',
             'parameter_registry.py', 'ui_metadata.py', 'preset_loader.py',
             'radius_template.py', 'instrument_geometry.py', 'instrument_generator.py',
-            'geometry_engine.py', 'svg_renderer.py', 'view_generator.py'
+            'geometry_engine.py', 'svg_renderer.py', 'view_generator.py',
+            'stage_cache.py', 'bezier.py', 'geometry_records.py', 'parameter_set.py',
+            'fret_kernel.py', 'batch_engine.py', 'inverse_solver.py',
+            'sensitivity.py', 'feasible_ranges.py', 'feasibility.py',
+            'sampling.py', 'design_optimizer.py', 'heatmap.py', 'preset_index.py',
+            'change_impact.py', 'design_session.py', 'design_history.py'
         ];
 
         for (const moduleName of modules) {
@@ -131,7 +136,7 @@ async function initializePython() {
                 sys.path.insert(0, '')
             
             # Import dependencies first
-            import constants, buildprimitives, dimension_helpers, parameter_registry, radius_template
+            import constants, buildprimitives, dimension_helpers, parameter_registry, radius_template, stage_cache, bezier, geometry_records, parameter_set, fret_kernel
             import geometry_engine, svg_renderer, view_generator
             # Then orchestrators
             import instrument_geometry, instrument_generator
@@ -315,6 +320,24 @@ function classifyErrors(errors) {
     return 'transient';
 }
 
+function parameterPatch(previous, params) {
+    // Changed keys with their new values; removed keys reset to their default
+    const patch = {};
+    for (const key of new Set([...Object.keys(previous), ...Object.keys(params)])) {
+        if (key === '_generator_url') continue;
+        if (JSON.stringify(previous[key]) !== JSON.stringify(params[key])) {
+            patch[key] = key in params ? params[key] : null;
+        }
+    }
+    return patch;
+}
+
+function mergeValues(current, changed, removed) {
+    const merged = { ...current, ...changed };
+    for (const key of removed || []) delete merged[key];
+    return merged;
+}
+
 async function generateNeck() {
     if (state.isGenerating) return;
     ui.hideErrors();
@@ -328,24 +351,34 @@ async function generateNeck() {
     try {
         const params = collectParameters();
         params._generator_url = window.location.href;
-        const paramsJson = JSON.stringify(params);
 
+        // The design session sends back only the values and views that changed
+        const call = state.lastParams
+            ? `update_design_session('${JSON.stringify(parameterPatch(state.lastParams, params)).replace(/'/g, "\\'")}')`
+            : `start_design_session('${JSON.stringify(params).replace(/'/g, "\\'")}')`;
         const resultJson = await state.pyodide.runPythonAsync(`
-            from instrument_generator import generate_violin_neck
-            generate_violin_neck('${paramsJson.replace(/'/g, "\\'")}')
+            from instrument_generator import start_design_session, update_design_session
+            ${call}
         `);
         const result = JSON.parse(resultJson);
+        // changed_keys is present once the session holds these parameters
+        if ('changed_keys' in result) state.lastParams = params;
 
         if (result.success) {
-            state.views = result.views;
-            state.fretPositions = result.fret_positions || null;
-            state.derivedValues = result.derived_values || {};
-            state.derivedFormatted = result.derived_formatted || {};
-            state.derivedMetadata = result.derived_metadata || state.derivedMetadata;
+            const changedViews = result.views || {};
+            state.views = { ...state.views, ...changedViews };
+            delete state.views.heatmap;
+            if ('fret_positions' in changedViews) state.fretPositions = changedViews.fret_positions || null;
+            state.derivedValues = mergeValues(state.derivedValues, result.derived_values, result.removed_values);
+            state.derivedFormatted = mergeValues(state.derivedFormatted, result.derived_formatted, result.removed_values);
+            state.derivedMetadata = mergeValues(state.derivedMetadata, result.derived_metadata, result.removed_values);
 
             state.views.dimensions = ui.generateDimensionsTableHTML(params, state.derivedValues, state.derivedFormatted);
             state.views.fret_positions = state.fretPositions;
-            ui.displayCurrentView();
+            if (state.currentView === 'heatmap') await refreshHeatmap(params);
+            // Unchanged SVG views keep their DOM (and zoom)
+            const unchanged = state.currentView in result.view_hashes && !(state.currentView in changedViews);
+            if (!unchanged || elements.preview.innerHTML === '') ui.displayCurrentView();
             ui.updateTabStates(params);
             elements.preview.classList.add('has-content');
             ui.setStatus('ready', '✅ Preview updated');
@@ -487,9 +520,25 @@ function updateCoreMetricsPanel(values, metadata, params) {
     }
 }
 
-function switchView(viewName) {
+async function refreshHeatmap(params) {
+    // The heatmap costs a 100x100 batch evaluation, so it is only computed while its tab is shown
+    const paramsJson = JSON.stringify(params);
+    const resultJson = await state.pyodide.runPythonAsync(`
+        from instrument_generator import generate_heatmap
+        generate_heatmap('${paramsJson.replace(/'/g, "\\'")}')
+    `);
+    const result = JSON.parse(resultJson);
+    if (result.success) {
+        state.views.heatmap = result.svg;
+    } else {
+        ui.showErrors(result.errors, classifyErrors(result.errors));
+    }
+}
+
+async function switchView(viewName) {
     if (!state.views) return;
     state.currentView = viewName;
+    if (viewName === 'heatmap' && !state.views.heatmap) await refreshHeatmap(collectParameters());
     ui.displayCurrentView();
     analytics.trackViewChanged(viewName);
 }
@@ -519,7 +568,7 @@ function downloadFile(content, filename, mimeType) {
 
 function downloadSVG() {
     if (!state.views || !state.views[state.currentView]) return;
-    const viewNames = { 'side': 'side-view', 'top': 'top-view', 'cross_section': 'cross-section', 'radius_template': 'radius-template' };
+    const viewNames = { 'side': 'side-view', 'top': 'top-view', 'cross_section': 'cross-section', 'radius_template': 'radius-template', 'heatmap': 'heatmap' };
     const filename = `${getInstrumentFilename()}_${viewNames[state.currentView]}.svg`;
     downloadFile(state.views[state.currentView], filename, 'image/svg+xml');
     analytics.trackSVGDownloaded(state.currentView);
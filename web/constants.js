@@ -26,7 +26,8 @@ export const VIEW_NAMES = {
     cross_section: 'Cross-Section',
     dimensions: 'Dimensions',
     fret_positions: 'Fret Positions',
-    radius_template: 'Radius Template'
+    radius_template: 'Radius Template',
+    heatmap: 'Design Space'
 };
 
 // File download MIME types
@@ -24,7 +24,8 @@ export async function downloadPDF(collectParameters, sanitizeFilename) {
             'side': 'side-view',
             'cross_section': 'cross-section',
             'dimensions': 'dimensions',
-            'fret_positions': 'fret-positions'
+            'fret_positions': 'fret-positions',
+            'heatmap': 'heatmap'
         };
 
         const params = collectParameters();
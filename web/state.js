@@ -3,6 +3,7 @@ export const state = {
     pyodide: null,
     isGenerating: false,
     views: null,              // Stores all 3 SVG views + dimensions table
+    lastParams: null,         // Parameters last sent to the design session
     currentView: 'side',      // Currently displayed view (default to side)
     svgCanvas: null,          // SVG.js canvas for zoom/pan
     initialViewBox: null,     // Initial viewBox for zoom reset